@@ -1,9 +1,31 @@
+import os
+import shutil
+
+# Threaded workers: each worker serves several requests at once, so a webhook waiting
+# on Zoom, Kajabi or Salesforce doesn't hold up the others. The services share their
+# HTTP sessions, tokens and Salesforce login between a worker's threads;
+# OUTBOUND_POOL_MAXSIZE must be at least the number of threads.
 bind = "127.0.0.1:8000"
 workers = 3
-worker_class = "sync"
-worker_connections = 1000
+worker_class = "gthread"
+threads = 4
 max_requests = 1000
 max_requests_jitter = 100
 timeout = 30
 keepalive = 2
 
+# Prometheus multiprocess mode: each worker writes its metrics to files in this
+# directory and /metrics/ aggregates them. Must be set before Django is loaded.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/kajabi-prometheus")
+
+
+def on_starting(server):
+    # Start from a clean directory so metrics from a previous run aren't counted
+    metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
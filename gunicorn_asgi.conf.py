@@ -0,0 +1,34 @@
+import os
+import shutil
+
+# ASGI profile: uvicorn workers under gunicorn, serving kajabi_project.asgi:application.
+# Set ASYNC_WEBHOOKS = True in the settings so the webhooks use the async views.
+#
+#   gunicorn kajabi_project.asgi:application -c gunicorn_asgi.conf.py
+#
+# Each worker runs an event loop, so a webhook waiting on Zoom, Kajabi or Graph
+# doesn't block the others; sync views run in the worker's thread pool. Webhooks
+# in flight are capped by RATE_LIMIT_MAX_IN_FLIGHT_ASYNC, not RATE_LIMIT_MAX_IN_FLIGHT.
+bind = "127.0.0.1:8000"
+workers = 3
+worker_class = "uvicorn_worker.UvicornWorker"
+max_requests = 1000
+max_requests_jitter = 100
+timeout = 30
+keepalive = 2
+
+# Prometheus multiprocess mode: each worker writes its metrics to files in this
+# directory and /metrics/ aggregates them. Must be set before Django is loaded.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/kajabi-prometheus")
+
+
+def on_starting(server):
+    # Start from a clean directory so metrics from a previous run aren't counted
+    metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
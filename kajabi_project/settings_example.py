@@ -47,10 +47,13 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'webinars.middleware.MetricsMiddleware',
+    'webinars.middleware.RateLimitMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'webinars.middleware.ReplicaStickinessMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -86,9 +89,32 @@ DATABASES = {
         'PASSWORD': 'your_database_password',
         'HOST': 'localhost',
         'PORT': '3306',
+        # Keep each worker thread's connection open between requests instead of
+        # connecting per request; keep it under MySQL's wait_timeout (8 hours by default).
+        # The health check pings a reused connection first, so one MySQL dropped is replaced.
+        'CONN_MAX_AGE': 300,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Read replica for the reporting and list views and GET API requests (see webinars/db_router.py).
+# Add a 'replica' entry to DATABASES pointing at a MySQL replica to turn it on; without one
+# all reads go to the primary. webinars.test_db_router.ReplicaDatabaseTests runs against a
+# second local alias mirroring the default database:
+#
+#     DATABASES['replica'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+DATABASE_ROUTERS = ['webinars.db_router.ReplicaRouter']
+READ_REPLICA_ALIAS = 'replica'
+READ_REPLICA_MAX_LAG = 5  # seconds of replication lag before reads go back to the primary
+READ_REPLICA_STICKY_SECONDS = 15  # reads stay on the primary this long after a user's POST
+
+# Requests over either limit are logged with their most repeated queries and
+# counted in webinars_http_requests_over_query_budget_total (see webinars/middleware.py)
+QUERY_BUDGET = {
+    'queries': 50,
+    'db_seconds': 0.5,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -137,7 +163,42 @@ LOGIN_URL = 'login'
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 DEFAULT_FROM_EMAIL = 'noreply@awesometechtraining.com'
 
+# Notification emails are queued in the outbox and sent by the deliver_emails command.
+# Failed deliveries are retried with exponential backoff (seconds) up to the max attempts.
+EMAIL_OUTBOX_MAX_ATTEMPTS = 8
+EMAIL_OUTBOX_RETRY_BASE_DELAY = 60
+EMAIL_OUTBOX_RETRY_MAX_DELAY = 60 * 60
+
+# Repeats of the same error notification within this many seconds are sent as one digest (0 disables)
+ERROR_DIGEST_WINDOW = 15 * 60
+
+# Periodic jobs are run by `manage.py run_scheduler` (one process per node; only the
+# node holding the scheduler lease runs jobs). Intervals can be overridden per job, in seconds.
+SCHEDULER_LEASE_SECONDS = 60
+SCHEDULER_INTERVALS = {
+    # 'sync_salesforce': 30 * 60,
+}
+
+# Long admin actions (bulk activation, calendar invites, Zoom webinar creation) run as
+# background jobs, processed by `manage.py run_background_jobs` or the scheduler.
+BACKGROUND_JOB_CHUNK_SIZE = 20
+BACKGROUND_JOB_CLAIM_SECONDS = 5 * 60
+
+# Retention job: days to keep webhook logs, sent outbox emails and job history (scheduler runs and
+# finished background jobs)
+WEBHOOK_LOG_RETENTION_DAYS = 90
+EMAIL_OUTBOX_RETENTION_DAYS = 30
+JOB_RUN_RETENTION_DAYS = 30
+
+# Archive job: attendees of webinar and bundle dates this many days past, once all activated
+# and synced to Salesforce, move to the archive tables (see webinars/archive.py)
+ARCHIVE_AFTER_DAYS = 180
+ARCHIVE_BATCH_SIZE = 500
+
 # Logging configuration
+# The webinars loggers only enqueue records; a background listener thread formats
+# them and writes JSON lines to webhook.log (rotated daily and at 50 MB) plus the
+# console. Request headers/bodies go to 'webinars.payloads', which is sampled.
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -146,6 +207,15 @@ LOGGING = {
             'format': '{levelname} {asctime} {module} {message}',
             'style': '{',
         },
+        'json': {
+            '()': 'webinars.log_pipeline.JsonFormatter',
+        },
+    },
+    'filters': {
+        'sample_payloads': {
+            '()': 'webinars.log_pipeline.SamplingFilter',
+            'rate': 0.1,  # keep 10% of payload dumps; warnings and errors are always kept
+        },
     },
     'handlers': {
         'console': {
@@ -155,9 +225,16 @@ LOGGING = {
         },
         'file': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
+            'class': 'webinars.log_pipeline.SizedTimedRotatingFileHandler',
             'filename': BASE_DIR / 'webhook.log',
-            'formatter': 'verbose',
+            'when': 'midnight',
+            'backupCount': 14,
+            'maxBytes': 50 * 1024 * 1024,
+            'formatter': 'json',
+        },
+        'queue': {
+            '()': 'webinars.log_pipeline.QueueListenerHandler',
+            'handlers': ['console', 'file'],
         },
     },
     'loggers': {
@@ -167,13 +244,83 @@ LOGGING = {
             'propagate': True,
         },
         'webinars': {
-            'handlers': ['console', 'file'],
+            'handlers': ['queue'],
             'level': 'INFO',
             'propagate': False,
         },
+        'webinars.payloads': {
+            'handlers': ['queue'],
+            'level': 'INFO',
+            'filters': ['sample_payloads'],
+            'propagate': False,
+        },
     },
 }
 
+# Shared cache - outbound circuit breaker state must be visible to every worker,
+# so use a cache shared between processes (run `python manage.py createcachetable`)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+    }
+}
+
+# Outbound integration calls (see webinars/outbound.py)
+OUTBOUND_TIMEOUTS = {
+    'zoom': (3.05, 10),  # (connect, read) seconds
+    'graph': (3.05, 15),
+}
+OUTBOUND_BREAKER = {
+    'failure_threshold': 5,  # consecutive failures before the breaker opens
+    'reset_timeout': 60,  # seconds before a probe call is allowed through
+}
+OUTBOUND_WEBHOOK_DEADLINE = 20  # seconds of outbound calls per webhook request
+OUTBOUND_POOL_MAXSIZE = 10  # pooled connections per host; at least gunicorn's threads per worker
+
+# Seconds a shared Salesforce login is reused before logging in again
+SALESFORCE_SESSION_SECONDS = 3600
+
+# Serve the webhook endpoints with the async views (webinars/async_views.py). Turn on when
+# running on the ASGI entry point with gunicorn_asgi.conf.py; needs httpx for the async HTTP client.
+ASYNC_WEBHOOKS = False
+
+# Rate limits for the webhook and cron endpoints (see webinars/rate_limit.py): burst is the
+# most requests at once, rate the requests per second allowed after that
+RATE_LIMITS = {
+    'ip': {'burst': 30, 'rate': 0.5},  # per client IP and endpoint
+    'endpoint': {'burst': 300, 'rate': 10},  # per endpoint, all clients together
+}
+RATE_LIMIT_CLIENT_IP_HEADER = 'HTTP_X_FORWARDED_FOR'  # set by the proxy in front of gunicorn
+RATE_LIMIT_MAX_IN_FLIGHT = 3  # webhook requests per worker at once; keep below gunicorn's threads
+RATE_LIMIT_MAX_IN_FLIGHT_ASYNC = None  # the same for uvicorn workers (gunicorn_asgi.conf.py); None for no cap
+
+# JSON codec for webhooks, responses, the API and JSON columns (see webinars/codec.py):
+# 'auto' uses orjson when it's installed, 'stdlib' the json module
+JSON_CODEC = 'auto'
+
+# Compression for webhook bodies, payloads and error columns (see webinars/compression.py):
+# 'zlib', or 'zstd' with the zstandard package installed. After changing it, or after
+# migrating existing data, run: python manage.py recompress_fields
+FIELD_COMPRESSION = 'zlib'
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'webinars.renderers.CodecJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'webinars.renderers.CodecJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Prometheus scrape endpoint (/metrics/): scrapers send this as a bearer token. Required in
+# production; left empty the endpoint is closed unless DEBUG is on, when it answers scrapers
+# on loopback, private or INTERNAL_IPS addresses
+METRICS_TOKEN = ''
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
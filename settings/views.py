@@ -154,7 +154,8 @@ Kajabi Webinar Manager
                 send_notification_email(
                     to_email=test_email,
                     subject="Test Email from Kajabi Webinar Manager",
-                    message=message
+                    message=message,
+                    queue=False
                 )
                 
                 messages.success(
@@ -1,7 +1,11 @@
 import requests
 import logging
+from asgiref.sync import sync_to_async
 from django.utils import timezone
 from django.conf import settings
+from . import async_http
+from .timing import timed
+from .metrics import track_outbound_call
 
 logger = logging.getLogger(__name__)
 
@@ -9,103 +13,135 @@ logger = logging.getLogger(__name__)
 class KajabiActivationService:
     """Service for triggering Kajabi grant offer activations."""
     
+    HEADERS = {
+        'Content-Type': 'application/json',
+        'User-Agent': 'Kajabi-Webinar-Manager/1.0'
+    }
+    SUCCESS_STATUSES = (200, 201, 202)
+    
     def __init__(self):
         self.timeout = 30  # 30 second timeout for HTTP requests
     
+    @timed('kajabi_activation')
     def activate_attendee(self, attendee):
         """
         Activate grant offer for a single attendee.
         Returns (success, message)
         """
+        activation_url, attendee_type = self._activation_target(attendee)
+        
+        try:
+            payload = self._activation_payload(attendee, attendee_type)
+            
+            # Make HTTP POST request to Kajabi webhook
+            with track_outbound_call('kajabi') as call:
+                response = requests.post(
+                    activation_url,
+                    json=payload,
+                    headers=self.HEADERS,
+                    timeout=self.timeout
+                )
+                if response.status_code not in self.SUCCESS_STATUSES:
+                    call.outcome = 'error'
+            
+            result = self._record_response(attendee, response)
+        except Exception as e:
+            result = self._record_error(attendee, e)
+        
+        attendee.save()
+        return result
+    
+    @timed('kajabi_activation')
+    async def aactivate_attendee(self, attendee):
+        """Async version of activate_attendee on the async HTTP client."""
+        # Loading the webinar or bundle may query the database
+        activation_url, attendee_type = await sync_to_async(self._activation_target)(attendee)
+        
+        try:
+            payload = self._activation_payload(attendee, attendee_type)
+            
+            with track_outbound_call('kajabi') as call:
+                response = await async_http.send(
+                    'POST',
+                    activation_url,
+                    json=payload,
+                    headers=self.HEADERS,
+                    timeout=self.timeout
+                )
+                if response.status_code not in self.SUCCESS_STATUSES:
+                    call.outcome = 'error'
+            
+            result = self._record_response(attendee, response)
+        except Exception as e:
+            result = self._record_error(attendee, e)
+        
+        await attendee.asave()
+        return result
+    
+    def _activation_target(self, attendee):
+        """Return the grant activation hook URL for an attendee and its activation type."""
         if hasattr(attendee, 'webinar_date'):
             # Regular webinar attendee
-            activation_url = attendee.webinar_date.webinar.kajabi_grant_activation_hook_url
-            attendee_type = "webinar"
+            return attendee.webinar_date.webinar.kajabi_grant_activation_hook_url, "webinar"
         elif hasattr(attendee, 'webinar'):
             # On-demand attendee
-            activation_url = attendee.webinar.kajabi_grant_activation_hook_url
-            attendee_type = "on_demand"
+            return attendee.webinar.kajabi_grant_activation_hook_url, "on_demand"
         else:
             # Bundle attendee
-            activation_url = attendee.bundle_date.bundle.kajabi_grant_activation_hook_url
-            attendee_type = "bundle"
+            return attendee.bundle_date.bundle.kajabi_grant_activation_hook_url, "bundle"
+    
+    def _activation_payload(self, attendee, attendee_type):
+        # Combine first and last name as Kajabi expects a 'name' field
+        full_name = f"{attendee.first_name} {attendee.last_name}".strip()
         
-        try:
-            # Prepare payload for Kajabi webhook
-            # Combine first and last name as Kajabi expects a 'name' field
-            full_name = f"{attendee.first_name} {attendee.last_name}".strip()
-            
-            payload = {
-                'email': attendee.email,
-                'name': full_name,
-                'first_name': attendee.first_name,
-                'last_name': attendee.last_name,
-                'activation_type': attendee_type,
-                'timestamp': timezone.now().isoformat()
-            }
-            
-            # Make HTTP POST request to Kajabi webhook
-            response = requests.post(
-                activation_url,
-                json=payload,
-                headers={
-                    'Content-Type': 'application/json',
-                    'User-Agent': 'Kajabi-Webinar-Manager/1.0'
-                },
-                timeout=self.timeout
-            )
-            
-            # Check if request was successful
-            if response.status_code in [200, 201, 202]:
-                # Update attendee activation status
-                attendee.activation_sent_at = timezone.now()
-                attendee.activation_success = True
-                attendee.activation_error = ''
-                attendee.save()
-                
-                logger.info(f"Successfully activated grant for {attendee.email}")
-                return True, f"Grant activation sent successfully for {attendee.email}"
+        return {
+            'email': attendee.email,
+            'name': full_name,
+            'first_name': attendee.first_name,
+            'last_name': attendee.last_name,
+            'activation_type': attendee_type,
+            'timestamp': timezone.now().isoformat()
+        }
+    
+    def _record_response(self, attendee, response):
+        """Record the activation response on the attendee (the caller saves it). Returns (success, message)"""
+        attendee.activation_sent_at = timezone.now()
+        
+        # Check if request was successful
+        if response.status_code in self.SUCCESS_STATUSES:
+            attendee.activation_success = True
+            attendee.activation_error = ''
             
-            else:
-                # Handle HTTP error
-                error_msg = f"HTTP {response.status_code}: {response.text}"
-                attendee.activation_sent_at = timezone.now()
-                attendee.activation_success = False
-                attendee.activation_error = error_msg
-                attendee.save()
-                
-                logger.error(f"Failed to activate grant for {attendee.email}: {error_msg}")
-                return False, f"Activation failed for {attendee.email}: {error_msg}"
-        
-        except requests.exceptions.Timeout:
+            logger.info(f"Successfully activated grant for {attendee.email}")
+            return True, f"Grant activation sent successfully for {attendee.email}"
+        
+        # Handle HTTP error
+        error_msg = f"HTTP {response.status_code}: {response.text}"
+        attendee.activation_success = False
+        attendee.activation_error = error_msg
+        
+        logger.error(f"Failed to activate grant for {attendee.email}: {error_msg}")
+        return False, f"Activation failed for {attendee.email}: {error_msg}"
+    
+    def _record_error(self, attendee, e):
+        """Record a failed activation request on the attendee (the caller saves it). Returns (success, message)"""
+        if isinstance(e, requests.exceptions.Timeout):
             error_msg = "Request timeout"
-            attendee.activation_sent_at = timezone.now()
-            attendee.activation_success = False
-            attendee.activation_error = error_msg
-            attendee.save()
-            
             logger.error(f"Timeout activating grant for {attendee.email}")
-            return False, f"Activation timeout for {attendee.email}"
-        
-        except requests.exceptions.RequestException as e:
+            message = f"Activation timeout for {attendee.email}"
+        elif isinstance(e, requests.exceptions.RequestException):
             error_msg = f"Request error: {str(e)}"
-            attendee.activation_sent_at = timezone.now()
-            attendee.activation_success = False
-            attendee.activation_error = error_msg
-            attendee.save()
-            
             logger.error(f"Request error activating grant for {attendee.email}: {str(e)}")
-            return False, f"Activation error for {attendee.email}: {str(e)}"
-        
-        except Exception as e:
+            message = f"Activation error for {attendee.email}: {str(e)}"
+        else:
             error_msg = f"Unexpected error: {str(e)}"
-            attendee.activation_sent_at = timezone.now()
-            attendee.activation_success = False
-            attendee.activation_error = error_msg
-            attendee.save()
-            
             logger.error(f"Unexpected error activating grant for {attendee.email}: {str(e)}")
-            return False, f"Unexpected error for {attendee.email}: {str(e)}"
+            message = f"Unexpected error for {attendee.email}: {str(e)}"
+        
+        attendee.activation_sent_at = timezone.now()
+        attendee.activation_success = False
+        attendee.activation_error = error_msg
+        return False, message
     
     def activate_webinar_date_attendees(self, webinar_date):
         """
@@ -145,8 +181,7 @@ class KajabiActivationService:
         messages = []
         
         # Find regular attendees who need activation
-        attendees = Attendee.objects.filter(
-            deleted_at=None,
+        attendees = Attendee.alive.filter(
             activation_sent_at=None
         ).select_related('webinar_date', 'webinar_date__webinar')
         
@@ -160,8 +195,7 @@ class KajabiActivationService:
                 messages.append(message)
         
         # Find bundle attendees who need activation
-        bundle_attendees = BundleAttendee.objects.filter(
-            deleted_at=None,
+        bundle_attendees = BundleAttendee.alive.filter(
             activation_sent_at=None
         ).select_related('bundle_date', 'bundle_date__bundle')
         
@@ -183,6 +217,12 @@ def activate_attendee(attendee):
     return service.activate_attendee(attendee)
 
 
+async def aactivate_attendee(attendee):
+    """Convenience function to activate a single attendee from async code."""
+    service = KajabiActivationService()
+    return await service.aactivate_attendee(attendee)
+
+
 def activate_webinar_date_attendees(webinar_date):
     """Convenience function to activate all attendees for a webinar date."""
     service = KajabiActivationService()
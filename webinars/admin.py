@@ -2,7 +2,11 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
-from .models import Webinar, WebinarDate, Attendee, WebinarBundle, BundleDate, BundleAttendee, OnDemandAttendee, WebhookLog, Download, ClinicBooking
+from django.utils import timezone
+from django.db.models import Count, Q
+from . import codec
+from .admin_filters import AutocompleteFilter, ChangelistAdmin
+from .models import Webinar, WebinarDate, Attendee, WebinarBundle, BundleDate, BundleAttendee, OnDemandAttendee, WebhookLog, OutboundEmail, JobRun, BackgroundJob, BackgroundJobItem, Download, ClinicBooking
 
 
 class WebinarDateInline(admin.TabularInline):
@@ -11,14 +15,19 @@ class WebinarDateInline(admin.TabularInline):
     fields = ['date_time', 'zoom_meeting_id', 'attendee_count']
     readonly_fields = ['attendee_count']
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _attendee_count=Count('attendee_history', filter=Q(attendee_history__deleted_at=None))
+        )
+    
     def attendee_count(self, obj):
-        return obj.attendee_count if obj.id else 0
+        return getattr(obj, '_attendee_count', 0)
     
     attendee_count.short_description = 'Attendees'
 
 
 @admin.register(Webinar)
-class WebinarAdmin(admin.ModelAdmin):
+class WebinarAdmin(ChangelistAdmin):
     list_display = ['name', 'date_count', 'created_at', 'updated_at', 'is_deleted']
     search_fields = ['name']
     list_filter = ['created_at', 'updated_at']
@@ -34,10 +43,16 @@ class WebinarAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _date_count=Count('webinardate', filter=Q(webinardate__deleted_at=None))
+        )
+    
     def date_count(self, obj):
-        return obj.active_dates().count()
+        return obj._date_count
     
     date_count.short_description = 'Dates'
+    date_count.admin_order_field = '_date_count'
     
     def is_deleted(self, obj):
         return obj.is_deleted
@@ -53,12 +68,25 @@ class AttendeeInline(admin.TabularInline):
 
 
 @admin.register(WebinarDate)
-class WebinarDateAdmin(admin.ModelAdmin):
+class WebinarDateAdmin(ChangelistAdmin):
     list_display = ['webinar', 'date_time', 'zoom_meeting_id', 'attendee_count', 'created_at', 'is_deleted']
-    list_filter = ['webinar', 'date_time', 'created_at']
+    list_filter = [('webinar', AutocompleteFilter), 'date_time', 'created_at']
+    list_select_related = ['webinar']
     search_fields = ['webinar__name', 'zoom_meeting_id']
+    autocomplete_fields = ['webinar']
     inlines = [AttendeeInline]
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _attendee_count=Count('attendee_history', filter=Q(attendee_history__deleted_at=None))
+        )
+    
+    def attendee_count(self, obj):
+        return obj._attendee_count
+    
+    attendee_count.short_description = 'Attendee count'
+    attendee_count.admin_order_field = '_attendee_count'
+    
     def is_deleted(self, obj):
         return obj.is_deleted
     
@@ -67,10 +95,17 @@ class WebinarDateAdmin(admin.ModelAdmin):
 
 
 @admin.register(Attendee)
-class AttendeeAdmin(admin.ModelAdmin):
+class AttendeeAdmin(ChangelistAdmin):
     list_display = ['full_name', 'email', 'webinar_name', 'webinar_date', 'zoom_status_display', 'zoom_actions', 'created_at', 'is_deleted']
-    list_filter = ['webinar_date__webinar', 'webinar_date__date_time', 'created_at', 'zoom_registrant_id']
+    list_filter = [
+        ('webinar_date__webinar', AutocompleteFilter),
+        'webinar_date__date_time',
+        'created_at',
+        ('zoom_registrant_id', admin.EmptyFieldListFilter),
+    ]
+    list_select_related = ['webinar_date__webinar']
     search_fields = ['first_name', 'last_name', 'email', 'webinar_date__webinar__name', 'zoom_registrant_id']
+    autocomplete_fields = ['webinar_date']
     
     class Media:
         js = ('js/attendee_admin.js',)
@@ -84,11 +119,13 @@ class AttendeeAdmin(admin.ModelAdmin):
         return obj.webinar_date.webinar.name
     
     webinar_name.short_description = 'Webinar'
+    webinar_name.admin_order_field = 'webinar_date__webinar__name'
     
     def webinar_date(self, obj):
         return obj.webinar_date.date_time.strftime('%Y-%m-%d %H:%M')
     
     webinar_date.short_description = 'Date'
+    webinar_date.admin_order_field = 'webinar_date__date_time'
     
     def is_deleted(self, obj):
         return obj.is_deleted
@@ -127,25 +164,35 @@ class AttendeeAdmin(admin.ModelAdmin):
     zoom_actions.short_description = 'Actions'
     zoom_actions.allow_tags = True
 
+def annotate_bundle_date_counts(queryset):
+    return queryset.annotate(
+        _webinar_count=Count('webinar_dates', distinct=True),
+        _attendee_count=Count('attendee_history', filter=Q(attendee_history__deleted_at=None), distinct=True),
+    )
+
+
 class BundleDateInline(admin.TabularInline):
     model = BundleDate
     extra = 0
     fields = ['date', 'webinar_count', 'attendee_count']
     readonly_fields = ['webinar_count', 'attendee_count']
     
+    def get_queryset(self, request):
+        return annotate_bundle_date_counts(super().get_queryset(request))
+    
     def webinar_count(self, obj):
-        return obj.webinar_dates.count() if obj.id else 0
+        return getattr(obj, '_webinar_count', 0)
     
     webinar_count.short_description = 'Webinars'
     
     def attendee_count(self, obj):
-        return obj.attendee_count if obj.id else 0
+        return getattr(obj, '_attendee_count', 0)
     
     attendee_count.short_description = 'Attendees'
 
 
 @admin.register(WebinarBundle)
-class WebinarBundleAdmin(admin.ModelAdmin):
+class WebinarBundleAdmin(ChangelistAdmin):
     list_display = ['name', 'date_count', 'created_at', 'updated_at', 'is_deleted']
     search_fields = ['name']
     list_filter = ['created_at', 'updated_at']
@@ -161,10 +208,16 @@ class WebinarBundleAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _date_count=Count('bundledate', filter=Q(bundledate__deleted_at=None))
+        )
+    
     def date_count(self, obj):
-        return obj.active_dates().count()
+        return obj._date_count
     
     date_count.short_description = 'Dates'
+    date_count.admin_order_field = '_date_count'
     
     def is_deleted(self, obj):
         return obj.is_deleted
@@ -180,17 +233,29 @@ class BundleAttendeeInline(admin.TabularInline):
 
 
 @admin.register(BundleDate)
-class BundleDateAdmin(admin.ModelAdmin):
+class BundleDateAdmin(ChangelistAdmin):
     list_display = ['bundle', 'date', 'webinar_count', 'attendee_count', 'created_at', 'is_deleted']
-    list_filter = ['bundle', 'date', 'created_at']
+    list_filter = [('bundle', AutocompleteFilter), 'date', 'created_at']
+    list_select_related = ['bundle']
     search_fields = ['bundle__name']
+    autocomplete_fields = ['bundle']
     inlines = [BundleAttendeeInline]
     filter_horizontal = ['webinar_dates']
     
+    def get_queryset(self, request):
+        return annotate_bundle_date_counts(super().get_queryset(request))
+    
     def webinar_count(self, obj):
-        return obj.webinar_dates.count()
+        return obj._webinar_count
     
     webinar_count.short_description = 'Webinars'
+    webinar_count.admin_order_field = '_webinar_count'
+    
+    def attendee_count(self, obj):
+        return obj._attendee_count
+    
+    attendee_count.short_description = 'Attendee count'
+    attendee_count.admin_order_field = '_attendee_count'
     
     def is_deleted(self, obj):
         return obj.is_deleted
@@ -200,10 +265,12 @@ class BundleDateAdmin(admin.ModelAdmin):
 
 
 @admin.register(BundleAttendee)
-class BundleAttendeeAdmin(admin.ModelAdmin):
+class BundleAttendeeAdmin(ChangelistAdmin):
     list_display = ['full_name', 'email', 'bundle_name', 'bundle_date_display', 'created_at', 'is_deleted']
-    list_filter = ['bundle_date__bundle', 'bundle_date__date', 'created_at']
+    list_filter = [('bundle_date__bundle', AutocompleteFilter), 'bundle_date__date', 'created_at']
+    list_select_related = ['bundle_date__bundle']
     search_fields = ['first_name', 'last_name', 'email', 'bundle_date__bundle__name']
+    autocomplete_fields = ['bundle_date']
     
     def full_name(self, obj):
         return f"{obj.first_name} {obj.last_name}"
@@ -214,11 +281,13 @@ class BundleAttendeeAdmin(admin.ModelAdmin):
         return obj.bundle_date.bundle.name
     
     bundle_name.short_description = 'Bundle'
+    bundle_name.admin_order_field = 'bundle_date__bundle__name'
     
     def bundle_date_display(self, obj):
         return obj.bundle_date.date.strftime('%Y-%m-%d')
     
     bundle_date_display.short_description = 'Date'
+    bundle_date_display.admin_order_field = 'bundle_date__date'
     
     def is_deleted(self, obj):
         return obj.is_deleted
@@ -228,15 +297,24 @@ class BundleAttendeeAdmin(admin.ModelAdmin):
 
 
 @admin.register(WebhookLog)
-class WebhookLogAdmin(admin.ModelAdmin):
+class WebhookLogAdmin(ChangelistAdmin):
     list_display = ['created_at', 'method', 'path', 'status_icon', 'body_preview', 'response_status', 'processing_time_display']
+    # The body is compressed, so it's loaded for the preview rather than cut in the database
+    list_select_related = ['body_blob']
+    changelist_defer = ['headers', 'response_body', 'error_message', 'timings']
     list_filter = ['success', 'method', 'created_at', 'response_status']
-    search_fields = ['body', 'error_message', 'path']
+    # Bodies and errors are stored compressed and can't be searched in the database
+    search_fields = ['path']
     readonly_fields = ['created_at', 'method', 'path', 'headers', 'formatted_body_display', 
                       'response_status', 'formatted_response_display', 'success', 'error_message', 
-                      'processing_time_ms']
+                      'processing_time_ms', 'timings']
     date_hierarchy = 'created_at'
     
+    def body_preview(self, obj):
+        return obj.body_preview
+    
+    body_preview.short_description = 'Body preview'
+    
     def status_icon(self, obj):
         if obj.success:
             return format_html('<span style="color: green; font-size: 20px;">✓</span>')
@@ -265,9 +343,7 @@ class WebhookLogAdmin(admin.ModelAdmin):
     def formatted_response_display(self, obj):
         if obj.response_body:
             try:
-                import json
-                data = json.loads(obj.response_body)
-                formatted = json.dumps(data, indent=2)
+                formatted = codec.dumps_pretty(codec.loads(obj.response_body))
             except:
                 formatted = obj.response_body
             return format_html('<pre style="white-space: pre-wrap; word-wrap: break-word;">{}</pre>', formatted)
@@ -291,16 +367,85 @@ class WebhookLogAdmin(admin.ModelAdmin):
             'fields': ('response_status', 'formatted_response_display', 'success', 'error_message')
         }),
         ('Performance', {
-            'fields': ('processing_time_ms',)
+            'fields': ('processing_time_ms', 'timings')
         }),
     )
 
 
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(ChangelistAdmin):
+    list_display = ['created_at', 'to_email', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_via']
+    changelist_defer = ['message', 'last_error']
+    list_filter = ['status', 'sent_via', 'created_at']
+    search_fields = ['to_email', 'subject', 'last_error']
+    readonly_fields = ['created_at', 'to_email', 'from_email', 'subject', 'message', 'status',
+                      'attempts', 'next_attempt_at', 'last_error', 'sent_at', 'sent_via']
+    date_hierarchy = 'created_at'
+    actions = ['retry_now']
+    
+    def has_add_permission(self, request):
+        # Emails are only queued by the application
+        return False
+    
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status=OutboundEmail.STATUS_SENT).update(
+            status=OutboundEmail.STATUS_PENDING,
+            next_attempt_at=timezone.now()
+        )
+        self.message_user(request, f"{updated} emails queued for immediate delivery.")
+    
+    retry_now.short_description = "Retry delivery now"
+
+
+@admin.register(JobRun)
+class JobRunAdmin(ChangelistAdmin):
+    list_display = ['job', 'started_at', 'duration_ms', 'success', 'holder']
+    changelist_defer = ['output', 'error']
+    list_filter = ['job', 'success', 'started_at']
+    search_fields = ['job', 'output', 'error']
+    readonly_fields = ['job', 'started_at', 'finished_at', 'success', 'duration_ms', 'output', 'error', 'holder']
+    date_hierarchy = 'started_at'
+    
+    def has_add_permission(self, request):
+        # Runs are only recorded by the scheduler
+        return False
+
+
+class BackgroundJobItemInline(admin.TabularInline):
+    model = BackgroundJobItem
+    extra = 0
+    fields = ['position', 'success', 'message']
+    readonly_fields = ['position', 'success', 'message']
+    can_delete = False
+
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(ChangelistAdmin):
+    list_display = ['created_at', 'kind', 'object_id', 'status', 'processed', 'total', 'succeeded', 'failed', 'requested_by']
+    changelist_defer = ['message']
+    list_filter = ['kind', 'status', 'created_at']
+    readonly_fields = ['kind', 'object_id', 'status', 'requested_by', 'created_at', 'started_at', 'finished_at',
+                      'claimed_until', 'total', 'processed', 'succeeded', 'failed', 'message']
+    exclude = ['item_keys']
+    date_hierarchy = 'created_at'
+    inlines = [BackgroundJobItemInline]
+    
+    def get_queryset(self, request):
+        # The item keys can list thousands of attendees and are never displayed
+        return super().get_queryset(request).defer('item_keys')
+    
+    def has_add_permission(self, request):
+        # Jobs are queued from the webinar and bundle pages
+        return False
+
+
 @admin.register(OnDemandAttendee)
-class OnDemandAttendeeAdmin(admin.ModelAdmin):
+class OnDemandAttendeeAdmin(ChangelistAdmin):
     list_display = ['first_name', 'last_name', 'email', 'webinar', 'activation_status_display', 'created_at']
-    list_filter = ['webinar', 'activation_success', 'created_at']
+    list_filter = [('webinar', AutocompleteFilter), 'activation_success', 'created_at']
+    list_select_related = ['webinar']
     search_fields = ['first_name', 'last_name', 'email', 'webinar__name']
+    autocomplete_fields = ['webinar']
     readonly_fields = ['created_at', 'updated_at']
     fieldsets = (
         (None, {
@@ -328,8 +473,9 @@ class OnDemandAttendeeAdmin(admin.ModelAdmin):
 
 
 @admin.register(Download)
-class DownloadAdmin(admin.ModelAdmin):
+class DownloadAdmin(ChangelistAdmin):
     list_display = ['full_name', 'email', 'form_title', 'organization', 'salesforce_status_display', 'created_at', 'is_deleted']
+    changelist_defer = ['legacy_payload']
     list_filter = ['form_title', 'salesforce_sync_pending', 'salesforce_synced_at', 'created_at']
     search_fields = ['first_name', 'last_name', 'email', 'form_title', 'organization']
     readonly_fields = ['created_at', 'updated_at', 'formatted_payload_display']
@@ -380,8 +526,7 @@ class DownloadAdmin(admin.ModelAdmin):
     def formatted_payload_display(self, obj):
         if obj.payload:
             try:
-                import json
-                formatted = json.dumps(obj.payload, indent=2)
+                formatted = codec.dumps_pretty(obj.payload)
             except:
                 formatted = str(obj.payload)
             return format_html('<pre style="white-space: pre-wrap; word-wrap: break-word;">{}</pre>', formatted)
@@ -391,8 +536,9 @@ class DownloadAdmin(admin.ModelAdmin):
 
 
 @admin.register(ClinicBooking)
-class ClinicBookingAdmin(admin.ModelAdmin):
+class ClinicBookingAdmin(ChangelistAdmin):
     list_display = ['full_name', 'email', 'clinic_date', 'organization', 'zoom_status_display', 'calendar_status_display', 'salesforce_status_display', 'created_at', 'is_deleted']
+    changelist_defer = ['question']
     list_filter = ['clinic_date', 'zoom_created_at', 'calendar_invite_sent_at', 'salesforce_sync_pending', 'salesforce_synced_at', 'created_at']
     search_fields = ['first_name', 'last_name', 'email', 'organization', 'website', 'question']
     readonly_fields = ['created_at', 'updated_at', 'zoom_created_at', 'calendar_invite_sent_at', 'salesforce_synced_at']
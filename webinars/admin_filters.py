@@ -0,0 +1,75 @@
+"""
+Admin list filters for large tables.
+
+Django's RelatedFieldListFilter renders a link for every related object, so
+filtering attendees by webinar loads every webinar on each changelist page.
+AutocompleteFilter instead shows a select2 box that searches the related
+admin (like autocomplete_fields) and only loads the selected object.
+"""
+from django import forms
+from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+
+
+class AutocompleteFilter(admin.RelatedFieldListFilter):
+    """
+    Filter on a foreign key, or a path ending in one, picked with the admin's
+    autocomplete. The related model's admin must define search_fields.
+    
+    Use as ('webinar_date__webinar', AutocompleteFilter) in list_filter, on an
+    admin inheriting ChangelistAdmin (which loads the select2 media).
+    """
+    template = 'admin/webinars/autocomplete_filter.html'
+    
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        super().__init__(field, request, params, model, model_admin, field_path)
+        self.form_field = forms.ModelChoiceField(
+            queryset=field.remote_field.model._default_manager.all(),
+            to_field_name=field.target_field.name,
+            required=False,
+            widget=AutocompleteSelect(field, model_admin.admin_site, attrs={'data-filter-param': self.lookup_kwarg}),
+        )
+    
+    def has_output(self):
+        return True
+    
+    def field_choices(self, field, request, model_admin):
+        # Only the selected object is loaded, not the whole related table
+        if not self.lookup_val:
+            return []
+        related = field.remote_field.model._default_manager.filter(
+            **{f'{field.target_field.name}__in': self.lookup_val}
+        )
+        return [(getattr(obj, field.target_field.attname), str(obj)) for obj in related]
+    
+    def widget_html(self):
+        value = self.lookup_val[-1] if self.lookup_val else None
+        return self.form_field.widget.render(f'filter-{self.field_path}', value)
+    
+    @classmethod
+    def media(cls, admin_site):
+        return AutocompleteSelect(None, admin_site).media
+
+
+class ChangelistAdmin(admin.ModelAdmin):
+    """
+    Base ModelAdmin for tables that grow large. Skips the unfiltered COUNT(*)
+    on the changelist, defers changelist_defer columns on the changelist only,
+    and loads the select2 media used by AutocompleteFilter.
+    """
+    show_full_result_count = False
+    changelist_defer = ()
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        match = getattr(request, 'resolver_match', None)
+        if self.changelist_defer and match and match.url_name and match.url_name.endswith('_changelist'):
+            queryset = queryset.defer(*self.changelist_defer)
+        return queryset
+    
+    @property
+    def media(self):
+        media = super().media
+        if any(isinstance(f, tuple) and f[1] is AutocompleteFilter for f in self.list_filter):
+            media += AutocompleteFilter.media(self.admin_site)
+        return media
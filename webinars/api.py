@@ -1,18 +1,101 @@
-from rest_framework import viewsets, permissions, status
+import hashlib
+
+from rest_framework import serializers, viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+from django.db.models import Count, Max, Q
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.utils.dateparse import parse_datetime
 
 from .models import Webinar, WebinarDate, Attendee
+from .serializers import WebinarSerializer, WebinarDateSerializer, AttendeeSerializer, BulkAttendeeSerializer
+from .db_router import replica_reads
+from .import_service import AttendeeImportService
+
+
+class ApiCursorPagination(CursorPagination):
+    """Stable cursor pagination ordered by primary key."""
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    ordering = 'id'
 
 
-class WebinarViewSet(viewsets.ModelViewSet):
+class IncrementalSyncMixin:
+    """
+    Shared list behaviour for the API viewsets:
+    
+    - ``?updated_since=<ISO datetime>`` limits results to rows changed since then
+    - cursor pagination
+    - an ETag for every collection, so an unchanged collection returns 304
+      to a matching ``If-None-Match`` without serializing anything
+    """
+    pagination_class = ApiCursorPagination
+    
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return self.filter_updated_since(queryset)
+    
+    def filter_updated_since(self, queryset):
+        updated_since = self.request.query_params.get('updated_since')
+        if not updated_since:
+            return queryset
+        
+        parsed = parse_datetime(updated_since)
+        if not parsed:
+            raise ValidationError({'updated_since': 'Expected an ISO 8601 datetime.'})
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return queryset.filter(updated_at__gte=parsed)
+    
+    def collection_etag(self, queryset):
+        """Build an ETag from the collection's size and latest change plus the request URL."""
+        stats = queryset.aggregate(total=Count('pk'), last_updated=Max('updated_at'))
+        last_updated = stats['last_updated'].isoformat() if stats['last_updated'] else ''
+        key = f"{self.request.get_full_path()}|{stats['total']}|{last_updated}"
+        return '"%s"' % hashlib.md5(key.encode('utf-8')).hexdigest()
+    
+    def etag_matches(self, etag):
+        if_none_match = self.request.headers.get('If-None-Match', '')
+        candidates = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        return etag in candidates or '*' in candidates
+    
+    def conditional_list(self, queryset, serialize):
+        """Return a paginated response for queryset, or 304 if the client's copy is current."""
+        etag = self.collection_etag(queryset)
+        if self.etag_matches(etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+        
+        page = self.paginate_queryset(queryset)
+        response = self.get_paginated_response(serialize(page))
+        response['ETag'] = etag
+        return response
+    
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional_list(
+            queryset,
+            lambda page: self.get_serializer(page, many=True).data
+        )
+
+
+@method_decorator(replica_reads, name='dispatch')
+class WebinarViewSet(IncrementalSyncMixin, viewsets.ModelViewSet):
     """
     API endpoint for Webinars
     """
-    queryset = Webinar.objects.filter(deleted_at=None)
+    queryset = Webinar.alive.all()
+    serializer_class = WebinarSerializer
     permission_classes = [permissions.IsAuthenticated]
     
+    def get_queryset(self):
+        return super().get_queryset().annotate(
+            date_count=Count('webinardate', filter=Q(webinardate__deleted_at=None))
+        )
+    
     def perform_destroy(self, instance):
         # Soft delete instead of hard delete
         instance.deleted_at = timezone.now()
@@ -22,34 +105,40 @@ class WebinarViewSet(viewsets.ModelViewSet):
     def dates(self, request, pk=None):
         """Get all dates for a specific webinar"""
         webinar = self.get_object()
-        dates = webinar.active_dates()
-        
-        result = []
-        for date in dates:
-            result.append({
-                'id': date.id,
-                'date_time': date.date_time,
-                'zoom_meeting_id': date.zoom_meeting_id,
-                'attendee_count': date.attendee_count,
-                'created_at': date.created_at,
-                'updated_at': date.updated_at
-            })
-        
-        return Response(result)
+        dates = self.filter_updated_since(
+            webinar.active_dates().annotate(
+                active_attendee_count=Count('attendee_history', filter=Q(attendee_history__deleted_at=None))
+            )
+        )
+        
+        return self.conditional_list(
+            dates,
+            lambda page: WebinarDateSerializer(page, many=True, context=self.get_serializer_context()).data
+        )
 
 
-class WebinarDateViewSet(viewsets.ModelViewSet):
+@method_decorator(replica_reads, name='dispatch')
+class WebinarDateViewSet(IncrementalSyncMixin, viewsets.ModelViewSet):
     """
     API endpoint for WebinarDates
     """
-    queryset = WebinarDate.objects.filter(deleted_at=None)
+    queryset = WebinarDate.alive.all()
+    serializer_class = WebinarDateSerializer
     permission_classes = [permissions.IsAuthenticated]
     
+    # Fields the attendees action can return, read straight from the database
+    ATTENDEE_FIELDS = ['id', 'first_name', 'last_name', 'email', 'organization', 'created_at', 'updated_at']
+    
+    def get_queryset(self):
+        return super().get_queryset().annotate(
+            active_attendee_count=Count('attendee_history', filter=Q(attendee_history__deleted_at=None))
+        )
+    
     def perform_destroy(self, instance):
         # Only allow deletion if there are no attendees
         if instance.has_attendees:
             return Response(
-                {'error': 'Cannot delete a webinar date with attendees'}, 
+                {'error': 'Cannot delete a webinar date with attendees'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
@@ -61,21 +150,34 @@ class WebinarDateViewSet(viewsets.ModelViewSet):
     def attendees(self, request, pk=None):
         """Get all attendees for a specific webinar date"""
         webinar_date = self.get_object()
-        attendees = webinar_date.active_attendees()
-        
-        result = []
-        for attendee in attendees:
-            result.append({
-                'id': attendee.id,
-                'first_name': attendee.first_name,
-                'last_name': attendee.last_name,
-                'email': attendee.email,
-                'organization': attendee.organization,
-                'created_at': attendee.created_at,
-                'updated_at': attendee.updated_at
-            })
-        
-        return Response(result)
+        
+        fields = self.ATTENDEE_FIELDS
+        requested = request.query_params.get('fields')
+        if requested:
+            wanted = {name.strip() for name in requested.split(',')}
+            # Always keep the id, the cursor paginates on it
+            fields = [name for name in fields if name in wanted or name == 'id']
+        
+        # Read through the history view so attendees already archived are still exported
+        attendees = self.filter_updated_since(
+            webinar_date.attendee_history.alive()
+        ).values(*fields)
+        
+        # Datetimes go through the serializer's fields so they match the other endpoints (Z, not +00:00)
+        serializer_fields = AttendeeSerializer().fields
+        datetime_fields = {
+            name: serializer_fields[name] for name in fields
+            if isinstance(serializer_fields[name], serializers.DateTimeField)
+        }
+        
+        def represent(page):
+            for row in page:
+                for name, field in datetime_fields.items():
+                    if row[name] is not None:
+                        row[name] = field.to_representation(row[name])
+            return list(page)
+        
+        return self.conditional_list(attendees, represent)
     
     @action(detail=True, methods=['post'])
     def create_zoom(self, request, pk=None):
@@ -90,14 +192,59 @@ class WebinarDateViewSet(viewsets.ModelViewSet):
         return Response({'status': 'Zoom webinar creation initiated (placeholder)'})
 
 
-class AttendeeViewSet(viewsets.ModelViewSet):
+@method_decorator(replica_reads, name='dispatch')
+class AttendeeViewSet(IncrementalSyncMixin, viewsets.ModelViewSet):
     """
     API endpoint for Attendees
     """
-    queryset = Attendee.objects.filter(deleted_at=None)
+    queryset = Attendee.alive.all()
+    serializer_class = AttendeeSerializer
     permission_classes = [permissions.IsAuthenticated]
     
+    # Largest list the bulk action accepts in one request
+    BULK_MAX_ITEMS = 1000
+    
     def perform_destroy(self, instance):
         # Soft delete instead of hard delete
         instance.deleted_at = timezone.now()
-        instance.save()
\ No newline at end of file
+        instance.save()
+    
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Upsert a list of registrations across any number of webinar dates.
+        
+        Every item is validated, then all valid items are written in one
+        transaction. Zoom registration, Salesforce sync and activation are left
+        to the register_zoom_pending, sync_salesforce and activate_pending jobs.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            return Response({'error': 'Expected a list of registrations'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > self.BULK_MAX_ITEMS:
+            return Response(
+                {'error': f'At most {self.BULK_MAX_ITEMS} registrations per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        results = {}
+        valid = []
+        for index, item in enumerate(items):
+            serializer = BulkAttendeeSerializer(data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                results[index] = {'status': 'error', 'errors': serializer.errors}
+        
+        if valid:
+            results.update(AttendeeImportService().import_registrations(valid))
+        
+        summary = {name: 0 for name in ['created', 'updated', 'restored', 'unchanged', 'duplicate', 'error']}
+        for result in results.values():
+            summary[result['status']] += 1
+        
+        return Response({
+            'summary': summary,
+            'results': [dict(index=index, **results[index]) for index in range(len(items))],
+        })
+
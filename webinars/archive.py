@@ -0,0 +1,89 @@
+"""
+Hot/cold archival of attendees of webinar and bundle dates long past.
+
+Once a date is ARCHIVE_AFTER_DAYS old and every live attendee on it has been
+activated and synced to Salesforce, nothing works on its attendees any more.
+archive_dates() moves them, deleted ones included, to ArchivedAttendee and
+ArchivedBundleAttendee in batches of BATCH_SIZE, each batch in its own
+transaction, keeping their ids. Attendee and BundleAttendee then only hold
+the attendees of current and upcoming dates, which every pending-work scan
+and admin changelist goes through.
+
+Reporting and export read AttendeeHistory and BundleAttendeeHistory, database
+views that union the hot and archive tables back together.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .models import (
+    Attendee, ArchivedAttendee, BundleAttendee, ArchivedBundleAttendee, WebinarDate, BundleDate
+)
+
+logger = logging.getLogger(__name__)
+
+# Days after a date before its attendees can be archived
+ARCHIVE_AFTER_DAYS = getattr(settings, 'ARCHIVE_AFTER_DAYS', 180)
+
+# Attendees moved in each transaction
+BATCH_SIZE = getattr(settings, 'ARCHIVE_BATCH_SIZE', 500)
+
+# Live attendees that still have work to do keep their date hot
+OUTSTANDING = Q(deleted_at=None) & (
+    Q(activation_sent_at=None) | ~Q(activation_success=True) | Q(salesforce_sync_pending=True)
+)
+
+
+def archivable_webinar_dates(now=None, days=ARCHIVE_AFTER_DAYS):
+    """Webinar dates past the cutoff with attendees to archive and none outstanding."""
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    return WebinarDate.objects.filter(on_demand=False, date_time__lt=cutoff).filter(
+        Exists(Attendee.objects.filter(webinar_date=OuterRef('pk'))),
+        ~Exists(Attendee.objects.filter(OUTSTANDING, webinar_date=OuterRef('pk'))),
+    )
+
+
+def archivable_bundle_dates(now=None, days=ARCHIVE_AFTER_DAYS):
+    """Bundle dates past the cutoff with attendees to archive and none outstanding."""
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    return BundleDate.objects.filter(date__lt=cutoff.date()).filter(
+        Exists(BundleAttendee.objects.filter(bundle_date=OuterRef('pk'))),
+        ~Exists(BundleAttendee.objects.filter(OUTSTANDING, bundle_date=OuterRef('pk'))),
+    )
+
+
+def move_rows(queryset, archive_model, batch_size=BATCH_SIZE):
+    """
+    Copy the rows of queryset into archive_model and delete them, batch_size
+    rows per transaction. Returns the number of rows moved.
+    """
+    columns = [field.attname for field in queryset.model._meta.concrete_fields]
+    moved = 0
+    while True:
+        with transaction.atomic():
+            rows = list(queryset.order_by('pk').select_for_update().values(*columns)[:batch_size])
+            if not rows:
+                return moved
+            archive_model.objects.bulk_create([archive_model(**row) for row in rows])
+            queryset.model.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+        moved += len(rows)
+
+
+def archive_dates(now=None, days=ARCHIVE_AFTER_DAYS, batch_size=BATCH_SIZE):
+    """Archive the attendees of every archivable date. Returns (dates, attendees, bundle dates, bundle attendees)."""
+    dates = attendees = bundle_dates = bundle_attendees = 0
+    for webinar_date in archivable_webinar_dates(now, days):
+        attendees += move_rows(Attendee.objects.filter(webinar_date=webinar_date), ArchivedAttendee, batch_size)
+        dates += 1
+        logger.info(f"Archived attendees of {webinar_date}")
+    for bundle_date in archivable_bundle_dates(now, days):
+        bundle_attendees += move_rows(
+            BundleAttendee.objects.filter(bundle_date=bundle_date), ArchivedBundleAttendee, batch_size
+        )
+        bundle_dates += 1
+        logger.info(f"Archived attendees of {bundle_date}")
+    return dates, attendees, bundle_dates, bundle_attendees
@@ -0,0 +1,102 @@
+"""
+Async HTTP calls to the integrations, used by the async webhook views.
+
+request() is the async counterpart of outbound.request: the same circuit
+breakers, timeouts, deadline budget and metrics, on one shared
+httpx.AsyncClient per event loop so connections are pooled across requests.
+httpx timeouts and connection errors are raised as requests.Timeout and
+requests.ConnectionError, so the services handle both clients' errors the
+same way. Without httpx installed the calls are made with requests in a
+worker thread instead.
+"""
+import asyncio
+import weakref
+
+import requests
+from asgiref.sync import sync_to_async
+
+from . import metrics, outbound
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Connection pool of each shared client
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_client():
+    """Return the shared AsyncClient for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+        ))
+        _clients[loop] = client
+    return client
+
+
+def raise_for_status(response):
+    """Raise requests.HTTPError for a 4xx or 5xx response from either client."""
+    if response.status_code >= 400:
+        raise requests.HTTPError(f"{response.status_code} Error for url: {response.url}", response=response)
+
+
+async def send(method, url, timeout=None, **kwargs):
+    """
+    Make one HTTP request on the shared client, without a circuit breaker.
+    timeout is a (connect, read) tuple or a number of seconds, as for requests.
+    """
+    if httpx is None:
+        return await sync_to_async(requests.request, thread_sensitive=False)(method, url, timeout=timeout, **kwargs)
+    
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        timeout = httpx.Timeout(read, connect=connect)
+    try:
+        return await get_client().request(method, url, timeout=timeout, **kwargs)
+    except httpx.TimeoutException as e:
+        raise requests.Timeout(str(e)) from e
+    except httpx.TransportError as e:
+        raise requests.ConnectionError(str(e)) from e
+
+
+async def request(integration, method, url, **kwargs):
+    """
+    Make an HTTP request to an integration through its circuit breaker,
+    with the integration's timeout and the current deadline budget applied.
+    
+    Connection errors, timeouts and 5xx responses count as failures.
+    Raises CircuitOpenError or DeadlineExceededError without making the call.
+    """
+    breaker = outbound.CircuitBreaker(integration)
+    # The breaker state is in the cache, which may be a database cache
+    if await sync_to_async(breaker.is_open)():
+        metrics.record_skipped_call(integration)
+        raise outbound.CircuitOpenError(f"{integration} is unavailable (circuit open), call skipped")
+    
+    try:
+        timeout = outbound.get_timeout(integration)
+    except outbound.DeadlineExceededError:
+        metrics.record_skipped_call(integration)
+        raise
+    
+    with metrics.track_outbound_call(integration) as call:
+        try:
+            response = await send(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            await sync_to_async(breaker.record_failure)()
+            raise
+        
+        if response.status_code >= 500:
+            call.outcome = 'error'
+            await sync_to_async(breaker.record_failure)()
+        else:
+            await sync_to_async(breaker.record_success)()
+    return response
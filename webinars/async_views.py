@@ -0,0 +1,279 @@
+"""
+Async versions of the webhook endpoints, served when ASYNC_WEBHOOKS is on
+(see gunicorn_asgi.conf.py).
+
+Under uvicorn workers a webhook waiting on Zoom, Kajabi or Graph doesn't tie
+up a worker thread: the outbound calls are made on the async HTTP client, and
+the Zoom registrations and activations a Kajabi webhook leaves as followups
+run concurrently. Matching a payload to a webinar and the attendee upsert
+reuse the sync code in a worker thread; the Download, ClinicBooking and
+WebhookLog writes use the async ORM. Responses and WebhookLog rows are the
+same as those of the sync views.
+"""
+import logging
+import time
+import traceback
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+
+from . import codec
+from .codec import json_response, response_text
+from .models import ClinicBooking, Download, PayloadBlob, WebhookLog
+from .outbound import with_deadline, WEBHOOK_DEADLINE
+from .timing import traced, current_timings
+
+logger = logging.getLogger('webinars')
+payload_logger = logging.getLogger('webinars.payloads')
+
+
+async def _log_webhook(request, body, response, start_time, success, error_message='', body_blob=None):
+    await WebhookLog.objects.acreate(
+        method=request.method,
+        path=request.path,
+        headers=dict(request.headers),
+        body=body,
+        body_blob=body_blob,
+        response_status=response.status_code,
+        response_body=response_text(response),
+        success=success,
+        error_message=error_message,
+        processing_time_ms=int((time.time() - start_time) * 1000),
+        timings=current_timings()
+    )
+
+
+async def _ok_response(request, start_time):
+    """Always return 200 OK for non-POST requests (GET, HEAD, OPTIONS)."""
+    logger.info("Non-POST request (%s) - returning 200 OK", request.method)
+    response = HttpResponse('OK', content_type='text/plain', status=200)
+    await _log_webhook(request, '', response, start_time, success=True)
+    return response
+
+
+def _parse_body(request):
+    """
+    Return the request body, its data parsed as JSON or else as form data,
+    and whether it was JSON.
+    """
+    body_unicode = request.body.decode('utf-8')
+    payload_logger.info("POST body: %s", body_unicode)
+    try:
+        data = codec.loads(request.body) if request.body else {}
+        return body_unicode, data, bool(request.body)
+    except codec.JSONDecodeError:
+        data = request.POST.dict()
+        payload_logger.info("Parsed as form data: %s", data)
+        return body_unicode, data, False
+
+
+async def _error_response(request, body_unicode, start_time, e):
+    error_message = f"Unhandled exception: {str(e)}\n{traceback.format_exc()}"
+    logger.error("Webhook exception - %s", error_message)
+    
+    response = json_response({'status': 'error', 'message': str(e)}, status=500)
+    await _log_webhook(request, body_unicode, response, start_time, success=False, error_message=error_message)
+    return response
+
+
+@csrf_exempt
+@with_deadline(WEBHOOK_DEADLINE)
+@traced
+async def attendee_webhook(request):
+    """Async webhook endpoint for registering attendees from Kajabi."""
+    from .utils import aprocess_kajabi_webhook, send_webhook_error_email
+    from .views import handle_direct_webhook
+    
+    start_time = time.time()
+    logger.info("Webhook request received - Method: %s, Path: %s", request.method, request.path)
+    payload_logger.info("Headers: %s", dict(request.headers))
+    
+    if request.method != 'POST':
+        return await _ok_response(request, start_time)
+    
+    body_unicode, data, _ = _parse_body(request)
+    try:
+        # Direct API calls are internal and rare, so they keep the sync handler
+        if 'webinar_date_id' in data or 'webinar_date_id' in request.GET:
+            logger.info("Processing as direct webhook call")
+            response = await sync_to_async(handle_direct_webhook)(request, data)
+            success = response.status_code < 400
+            await _log_webhook(request, body_unicode, response, start_time, success,
+                               '' if success else 'Direct webhook error')
+            return response
+        
+        logger.info("Processing Kajabi webhook data")
+        success, message, attendee_id = await aprocess_kajabi_webhook(data, request)
+        
+        if success:
+            logger.info("Webhook processed successfully - Message: %s, Attendee ID: %s", message, attendee_id)
+            response = json_response({'status': 'success', 'message': message, 'attendee_id': attendee_id})
+        else:
+            logger.warning("Webhook processing failed - Message: %s", message)
+            response = json_response({'status': 'error', 'message': message}, status=400)
+        await _log_webhook(request, body_unicode, response, start_time, success, '' if success else message)
+        return response
+    
+    except Exception as e:
+        try:
+            await sync_to_async(send_webhook_error_email)(
+                "info@awesometechtraining.com",
+                f"Unhandled exception: {str(e)}\n{traceback.format_exc()}",
+                {'request_body': body_unicode or None,
+                 'request_POST': dict(request.POST),
+                 'request_GET': dict(request.GET)}
+            )
+        except Exception as email_error:
+            logger.error("Failed to send error email: %s", str(email_error))
+        return await _error_response(request, body_unicode, start_time, e)
+
+
+@csrf_exempt
+@with_deadline(WEBHOOK_DEADLINE)
+@traced
+async def download_webhook(request):
+    """Async webhook endpoint for download form submissions."""
+    start_time = time.time()
+    logger.info("Download webhook request received - Method: %s, Path: %s", request.method, request.path)
+    payload_logger.info("Headers: %s", dict(request.headers))
+    
+    if request.method != 'POST':
+        return await _ok_response(request, start_time)
+    
+    body_unicode, data, is_json = _parse_body(request)
+    body_blob = None
+    try:
+        if is_json:
+            # The payload is the body itself, stored once for the download and its log entry
+            body_blob = await sync_to_async(PayloadBlob.store)(body_unicode)
+        
+        if 'event' in data and 'payload' in data:
+            # Kajabi webhook format
+            payload = data.get('payload', {})
+            first_name = payload.get('First Name', '')
+            last_name = payload.get('Surname', '') or payload.get('Last Name', '')
+            email = payload.get('Email', '')
+            form_title = payload.get('form_title', '')
+            organization = (payload.get('custom_field_organisation') or
+                            payload.get('Organisation') or
+                            payload.get('Organization') or
+                            payload.get('organisation') or
+                            payload.get('organization') or '')
+        else:
+            # Direct API call format
+            first_name = data.get('first_name', '')
+            last_name = data.get('last_name', '')
+            email = data.get('email', '')
+            form_title = data.get('form_title', '')
+            organization = data.get('organization', '')
+        
+        if not all([first_name, email, form_title]):
+            logger.warning("Download webhook missing required fields - first_name: '%s', email: '%s', form_title: '%s'", first_name, email, form_title)
+            response = json_response({
+                'status': 'error',
+                'message': 'Missing required fields: first_name, email, form_title'
+            }, status=400)
+            await _log_webhook(request, body_unicode, response, start_time, success=False,
+                               error_message='Missing required fields', body_blob=body_blob)
+            return response
+        
+        if body_blob:
+            payload_fields = {'payload_blob': body_blob}
+        else:
+            payload_fields = {'payload': data}
+        download = await Download.objects.acreate(
+            first_name=first_name,
+            last_name=last_name,
+            email=email,
+            form_title=form_title,
+            **payload_fields,
+            organization=organization,
+            salesforce_sync_pending=True
+        )
+        logger.info("Created download record %s for %s - %s", download.id, email, form_title)
+        
+        response = json_response({
+            'status': 'success',
+            'message': f'Download recorded for {email}',
+            'download_id': download.id
+        })
+        await _log_webhook(request, body_unicode, response, start_time, success=True, body_blob=body_blob)
+        return response
+    
+    except Exception as e:
+        return await _error_response(request, body_unicode, start_time, e)
+
+
+@csrf_exempt
+@with_deadline(WEBHOOK_DEADLINE)
+@traced
+async def clinic_booking_webhook(request):
+    """Async webhook endpoint for clinic booking form submissions."""
+    from dateutil import parser
+    from .utils import aprocess_clinic_booking
+    
+    start_time = time.time()
+    logger.info("Clinic booking webhook request received - Method: %s, Path: %s", request.method, request.path)
+    payload_logger.info("Headers: %s", dict(request.headers))
+    
+    if request.method != 'POST':
+        return await _ok_response(request, start_time)
+    
+    body_unicode, data, _ = _parse_body(request)
+    try:
+        first_name = data.get("first_name", "")
+        last_name = data.get("last_name", "") or data.get("surname", "")
+        email = data.get("email", "")
+        organization = data.get("organization", "") or data.get("organisation", "")
+        clinic_date = data.get("clinic_date", "")
+        website = data.get("website", "")
+        question = data.get("question", "")
+        
+        if not all([first_name, last_name, email, clinic_date, question]):
+            logger.warning("Clinic booking webhook missing required fields - first_name: \"%s\", last_name: \"%s\", email: \"%s\", clinic_date: \"%s\", question: \"%s\"", first_name, last_name, email, clinic_date, question)
+            response = json_response({
+                "status": "error",
+                "message": "Missing required fields: first_name, last_name, email, clinic_date, question"
+            }, status=400)
+            await _log_webhook(request, body_unicode, response, start_time, success=False,
+                               error_message="Missing required fields")
+            return response
+        
+        clinic_datetime = timezone.now()
+        try:
+            clinic_datetime = parser.parse(clinic_date)
+            if timezone.is_naive(clinic_datetime):
+                clinic_datetime = timezone.make_aware(clinic_datetime)
+        except Exception as e:
+            logger.warning("Could not parse clinic date \"%s\": %s", clinic_date, e)
+        
+        clinic_booking = await ClinicBooking.objects.acreate(
+            first_name=first_name,
+            last_name=last_name,
+            email=email,
+            organization=organization,
+            clinic_date=clinic_datetime,
+            website=website,
+            question=question,
+            salesforce_sync_pending=True
+        )
+        logger.info("Created clinic booking record %s for %s - %s", clinic_booking.id, email, clinic_datetime)
+        
+        # Zoom meeting creation and calendar invites; failures don't fail the webhook
+        try:
+            await aprocess_clinic_booking(clinic_booking)
+        except Exception as e:
+            logger.error(f"Error processing clinic booking {clinic_booking.id}: {e}")
+        
+        response = json_response({
+            "status": "success",
+            "message": f"Clinic booking recorded for {email}",
+            "booking_id": clinic_booking.id
+        })
+        await _log_webhook(request, body_unicode, response, start_time, success=True)
+        return response
+    
+    except Exception as e:
+        return await _error_response(request, body_unicode, start_time, e)
@@ -0,0 +1,359 @@
+"""
+Background jobs for the long admin actions.
+
+Activating a whole webinar or bundle date, sending a calendar invite and
+creating a Zoom webinar are queued as a BackgroundJob and the view returns
+the job id straight away. A worker (the run_background_jobs command, which the
+scheduler also runs) claims pending jobs and works through their items in
+chunks of CHUNK_SIZE, updating the progress counters after each chunk; the UI
+polls them from the job status endpoint. Per-item results are stored as
+BackgroundJobItem rows and paged by the job results endpoint.
+
+A job whose worker died is claimed again once claimed_until passes and
+resumes after the last completed chunk. The claim is renewed before every
+item, so a slow chunk doesn't let another worker take the job over, and
+progress is only saved while claimed_until is still the value this worker
+set; a worker that finds it changed has lost the job and stops.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import BackgroundJob, BackgroundJobItem
+
+logger = logging.getLogger(__name__)
+
+# Items processed between progress updates
+CHUNK_SIZE = getattr(settings, 'BACKGROUND_JOB_CHUNK_SIZE', 20)
+
+# Seconds a worker's claim on a job lasts; renewed before every item, so it
+# only has to outlast the slowest single item (outbound calls time out well within it)
+CLAIM_SECONDS = getattr(settings, 'BACKGROUND_JOB_CLAIM_SECONDS', 300)
+
+HANDLERS = {}
+
+
+class ClaimLost(Exception):
+    """Another worker claimed the job after this worker's claim expired."""
+
+
+def _update_claimed(job, **fields):
+    """
+    Save fields on job only if this worker still holds its claim. The claim's
+    expiry doubles as its token: a worker that claims the job after it expires
+    sets a new one, and this worker's conditional update then matches nothing.
+    """
+    updated = BackgroundJob.objects.filter(
+        pk=job.pk, status=BackgroundJob.STATUS_RUNNING, claimed_until=job.claimed_until
+    ).update(**fields)
+    if not updated:
+        raise ClaimLost(f"Lost the claim on background job {job.pk}")
+    for name, value in fields.items():
+        setattr(job, name, value)
+
+
+def renew_claim(job):
+    """Extend this worker's claim on job, raising ClaimLost if another worker has taken it."""
+    _update_claimed(job, claimed_until=timezone.now() + timedelta(seconds=CLAIM_SECONDS))
+
+
+def handler(kind):
+    """Class decorator registering the handler for a job kind."""
+    def decorator(cls):
+        HANDLERS[kind] = cls
+        return cls
+    return decorator
+
+
+class JobHandler:
+    """
+    Base class for job kinds. items() lists the work as JSON-serializable keys
+    when the job starts; process() handles one key and returns (success, message),
+    with success None for a skipped item.
+    """
+    
+    def __init__(self, job):
+        self.job = job
+    
+    def items(self):
+        raise NotImplementedError
+    
+    def process(self, key):
+        raise NotImplementedError
+    
+    def process_chunk(self, keys):
+        results = []
+        for key in keys:
+            renew_claim(self.job)
+            try:
+                results.append(self.process(key))
+            except Exception as e:
+                logger.exception("Error processing %s item %s", self.job, key)
+                results.append((False, f"Error: {str(e)}"))
+        return results
+    
+    def summary(self, job):
+        return f"Processed {job.processed} items: {job.succeeded} successful, {job.failed} failed."
+
+
+class ActivationHandler(JobHandler):
+    """Activates the Kajabi grant offers of a list of attendees, skipping those already activated."""
+    
+    def __init__(self, job):
+        super().__init__(job)
+        from .activation_service import KajabiActivationService
+        self.service = KajabiActivationService()
+    
+    def process_chunk(self, keys):
+        from .models import Attendee, BundleAttendee
+        
+        models = {'attendee': Attendee, 'bundle_attendee': BundleAttendee}
+        loaded = {
+            kind: model.objects.in_bulk([pk for key_kind, pk in keys if key_kind == kind])
+            for kind, model in models.items()
+        }
+        
+        results = []
+        for kind, pk in keys:
+            renew_claim(self.job)
+            attendee = loaded[kind].get(pk)
+            if attendee is None:
+                results.append((None, f"Skipped {kind} {pk} (no longer exists)"))
+            elif attendee.activation_sent_at:
+                results.append((None, f"Skipped {attendee.email} (already activated)"))
+            else:
+                try:
+                    results.append(self.service.activate_attendee(attendee))
+                except Exception as e:
+                    logger.exception("Error activating %s", attendee.email)
+                    results.append((False, f"Error activating {attendee.email}: {str(e)}"))
+        return results
+    
+    def summary(self, job):
+        total = job.succeeded + job.failed
+        if total == 0:
+            return "No attendees found to activate."
+        return f"Processed {total} attendees: {job.succeeded} successful, {job.failed} failed."
+
+
+@handler(BackgroundJob.KIND_ACTIVATE_WEBINAR_DATE)
+class ActivateWebinarDateHandler(ActivationHandler):
+    """Activates the direct and bundle attendees of a webinar date."""
+    
+    def items(self):
+        from .models import WebinarDate
+        
+        webinar_date = WebinarDate.objects.get(pk=self.job.object_id)
+        return [
+            ['bundle_attendee' if attendee.is_bundle_attendee else 'attendee', attendee.id]
+            for attendee in webinar_date.get_all_attendees()
+        ]
+
+
+@handler(BackgroundJob.KIND_ACTIVATE_BUNDLE_DATE)
+class ActivateBundleDateHandler(ActivationHandler):
+    """Activates the attendees of a bundle date."""
+    
+    def items(self):
+        from .models import BundleDate
+        
+        bundle_date = BundleDate.objects.get(pk=self.job.object_id)
+        return [['bundle_attendee', pk] for pk in bundle_date.active_attendees().values_list('id', flat=True)]
+
+
+@handler(BackgroundJob.KIND_SEND_CALENDAR_INVITE)
+class SendCalendarInviteHandler(JobHandler):
+    """Sends the staff calendar invite for a webinar date."""
+    
+    def items(self):
+        return [self.job.object_id]
+    
+    def process(self, key):
+        from .models import WebinarDate
+        from .ms365_service import MS365CalendarService
+        
+        webinar_date = WebinarDate.objects.select_related('webinar').get(pk=key)
+        return MS365CalendarService().send_manual_calendar_invite(webinar_date)
+    
+    def summary(self, job):
+        return job.items.values_list('message', flat=True).first() or ''
+
+
+@handler(BackgroundJob.KIND_SEND_PENDING_CALENDAR_INVITES)
+class SendPendingCalendarInvitesHandler(JobHandler):
+    """Sends the staff calendar invites of every pending webinar date, one Graph $batch per chunk."""
+    
+    def items(self):
+        from .ms365_service import pending_calendar_invite_dates
+        
+        return list(pending_calendar_invite_dates().values_list('id', flat=True))
+    
+    def process_chunk(self, keys):
+        from .ms365_service import MS365CalendarService, pending_calendar_invite_dates
+        
+        renew_claim(self.job)
+        # Dates whose invite went out since the job started drop out here
+        webinar_dates = list(pending_calendar_invite_dates().filter(pk__in=keys))
+        try:
+            result = MS365CalendarService().send_bulk_calendar_invites(webinar_dates)
+        except Exception as e:
+            logger.exception("Error sending calendar invites for %s", self.job)
+            return [(False, f"Error sending calendar invites: {str(e)}")] * len(keys)
+        if not result['success']:
+            return [(False, result['error'])] * len(keys)
+        
+        outcomes = {
+            webinar_date.id: (
+                webinar_date.calendar_invite_success,
+                webinar_date.calendar_invite_error or f"Calendar invite sent for {webinar_date}"
+            )
+            for webinar_date in webinar_dates
+        }
+        return [outcomes.get(pk, (None, f"Skipped webinar date {pk} (no longer pending)")) for pk in keys]
+    
+    def summary(self, job):
+        if job.total == 0:
+            return "No webinar dates need a calendar invite."
+        message = f"Calendar invites sent for {job.succeeded} webinar dates"
+        if job.failed:
+            message += f", {job.failed} failed"
+        return message
+
+
+@handler(BackgroundJob.KIND_CREATE_ZOOM_WEBINAR)
+class CreateZoomWebinarHandler(JobHandler):
+    """Creates the Zoom webinar for a webinar date."""
+    
+    def items(self):
+        return [self.job.object_id]
+    
+    def process(self, key):
+        from .models import WebinarDate
+        from .zoom_service import ZoomService
+        
+        webinar_date = WebinarDate.objects.select_related('webinar').get(pk=key)
+        if webinar_date.zoom_meeting_id:
+            return None, 'A Zoom meeting already exists for this webinar date.'
+        
+        try:
+            webinar_data = ZoomService().create_webinar(webinar_date)
+        except Exception as e:
+            return False, f'Failed to create Zoom webinar: {str(e)}. Please check your Zoom settings.'
+        webinar_date.zoom_meeting_id = webinar_data['webinar_id']
+        webinar_date.save(update_fields=['zoom_meeting_id', 'updated_at'])
+        return True, f'Zoom webinar created successfully! Webinar ID: {webinar_data["webinar_id"]}'
+    
+    def summary(self, job):
+        return job.items.values_list('message', flat=True).first() or ''
+
+
+def enqueue(kind, object_id, user=None):
+    """Queue a job, or return the unfinished job already queued for the same action and object."""
+    existing = BackgroundJob.objects.filter(
+        kind=kind,
+        object_id=object_id,
+        status__in=[BackgroundJob.STATUS_PENDING, BackgroundJob.STATUS_RUNNING]
+    ).first()
+    if existing:
+        return existing
+    
+    requested_by = user.get_username() if user is not None and user.is_authenticated else ''
+    job = BackgroundJob.objects.create(kind=kind, object_id=object_id, requested_by=requested_by)
+    logger.info("Queued background job %s", job)
+    return job
+
+
+def claim_job():
+    """Claim the oldest pending job, or a running one whose worker stopped renewing its claim."""
+    now = timezone.now()
+    with transaction.atomic():
+        job = BackgroundJob.objects.select_for_update(skip_locked=True).filter(
+            Q(status=BackgroundJob.STATUS_PENDING) |
+            Q(status=BackgroundJob.STATUS_RUNNING, claimed_until__lt=now)
+        ).order_by('created_at').first()
+        if job is None:
+            return None
+        job.status = BackgroundJob.STATUS_RUNNING
+        job.started_at = job.started_at or now
+        job.claimed_until = now + timedelta(seconds=CLAIM_SECONDS)
+        job.save(update_fields=['status', 'started_at', 'claimed_until'])
+    return job
+
+
+def _finish(job, status, message):
+    _update_claimed(job, status=status, message=message, finished_at=timezone.now(), claimed_until=None)
+    logger.info("Background job %s finished: %s", job, message)
+
+
+def run_job(job, chunk_size=CHUNK_SIZE):
+    """
+    Process a claimed job to the end, saving the results and progress after
+    every chunk. Stops without saving if another worker has taken the job over.
+    """
+    try:
+        try:
+            job_handler = HANDLERS[job.kind](job)
+            if job.processed == 0 and not job.item_keys:
+                item_keys = job_handler.items()
+                _update_claimed(job, item_keys=item_keys, total=len(item_keys))
+        except ClaimLost:
+            raise
+        except Exception as e:
+            logger.exception("Error starting background job %s", job)
+            _finish(job, BackgroundJob.STATUS_FAILED, f"Error: {str(e)}")
+            return job
+        
+        while job.processed < job.total:
+            chunk = job.item_keys[job.processed:job.processed + chunk_size]
+            results = job_handler.process_chunk(chunk)
+            with transaction.atomic():
+                position = job.processed
+                _update_claimed(
+                    job,
+                    processed=job.processed + len(chunk),
+                    succeeded=job.succeeded + sum(1 for success, _ in results if success),
+                    failed=job.failed + sum(1 for success, _ in results if success is False),
+                    claimed_until=timezone.now() + timedelta(seconds=CLAIM_SECONDS),
+                )
+                BackgroundJobItem.objects.bulk_create([
+                    BackgroundJobItem(job=job, position=position + index, success=success, message=message or '')
+                    for index, (success, message) in enumerate(results)
+                ])
+        
+        status = BackgroundJob.STATUS_FAILED if job.failed and not job.succeeded else BackgroundJob.STATUS_SUCCEEDED
+        _finish(job, status, job_handler.summary(job))
+    except ClaimLost:
+        logger.warning(f"Background job {job} was taken over by another worker; stopping")
+    return job
+
+
+def run_pending_jobs(limit=None):
+    """Claim and run jobs until none are pending (or limit jobs have run). Returns the jobs run."""
+    jobs = []
+    while limit is None or len(jobs) < limit:
+        job = claim_job()
+        if job is None:
+            break
+        jobs.append(run_job(job))
+    return jobs
+
+
+def job_status(job):
+    """The progress counters returned to the polling UI."""
+    return {
+        'job_id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'finished': job.is_finished,
+        'success': job.status == BackgroundJob.STATUS_SUCCEEDED,
+        'total': job.total,
+        'processed': job.processed,
+        'success_count': job.succeeded,
+        'failure_count': job.failed,
+        'progress': job.progress,
+        'message': job.message,
+    }
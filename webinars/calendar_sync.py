@@ -0,0 +1,217 @@
+"""
+Reconcile calendar invites with the MS365 owner calendar.
+
+Remote changes are read with a calendarView delta query: the first run pages
+through every event in the sync window, later runs only fetch events changed
+since the stored delta link. A snapshot of event times, kept in the shared
+cache, is updated from each delta. Local WebinarDates, BundleDates and
+ClinicBookings are compared with the snapshot, and only events whose times
+differ are PATCHed, in Graph $batch requests.
+"""
+import logging
+from datetime import datetime, timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from . import graph_client
+from .ms365_service import GRAPH_BATCH_SIZE, MS365CalendarService, event_times
+
+logger = logging.getLogger(__name__)
+
+GRAPH_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+# The delta link is only valid for the window it was created with; start a new
+# window once less than half of it is left
+DEFAULT_WINDOW_DAYS = 180
+
+
+def _graph_time(value):
+    # Graph returns '2025-08-21T10:00:00.0000000'; compare to the second
+    return value[:19]
+
+
+class CalendarReconciler:
+    """Diff local invites against the owner calendar and PATCH the ones that drifted."""
+    
+    def __init__(self, window_days=DEFAULT_WINDOW_DAYS, dry_run=False):
+        self.service = MS365CalendarService()
+        self.window_days = window_days
+        self.dry_run = dry_run
+        owner = self.service.settings.owner_email
+        self.state_key = f"calendar_sync:{owner}:state"
+        self.headers = None
+    
+    def _load_state(self, full):
+        state = None if full else cache.get(self.state_key)
+        now = timezone.now()
+        if state and datetime.fromisoformat(state['window_end']) > now + timedelta(days=self.window_days / 2):
+            return state
+        window_start = now - timedelta(days=1)
+        window_end = now + timedelta(days=self.window_days)
+        return {
+            'window_start': window_start.isoformat(),
+            'window_end': window_end.isoformat(),
+            'delta_link': None,
+            'events': {},
+        }
+    
+    def _fetch_changes(self, state):
+        """Apply the calendarView delta to the snapshot; returns the number of changed events."""
+        if state['delta_link']:
+            url, params = state['delta_link'], None
+        else:
+            url = f"{graph_client.GRAPH_URL}/users/{self.service.settings.owner_email}/calendarView/delta"
+            params = {'startDateTime': state['window_start'], 'endDateTime': state['window_end']}
+        
+        headers = {**self.headers, 'Prefer': 'outlook.timezone="UTC", odata.maxpagesize=100'}
+        changes = 0
+        while url:
+            response = graph_client.request('GET', url, headers=headers, params=params)
+            if response.status_code == 410:
+                # Delta link expired; start again with a full sync
+                state.update(delta_link=None, events={})
+                url = f"{graph_client.GRAPH_URL}/users/{self.service.settings.owner_email}/calendarView/delta"
+                params = {'startDateTime': state['window_start'], 'endDateTime': state['window_end']}
+                continue
+            response.raise_for_status()
+            data = response.json()
+            for event in data.get('value', []):
+                changes += 1
+                if '@removed' in event:
+                    state['events'].pop(event['id'], None)
+                    continue
+                state['events'][event['id']] = {
+                    'start': _graph_time(event.get('start', {}).get('dateTime', '')),
+                    'end': _graph_time(event.get('end', {}).get('dateTime', '')),
+                    'subject': event.get('subject', ''),
+                    'iCalUId': event.get('iCalUId', ''),
+                }
+            url, params = data.get('@odata.nextLink'), None
+            if not url:
+                state['delta_link'] = data.get('@odata.deltaLink')
+        return changes
+    
+    def _local_records(self, state):
+        from .models import WebinarDate, BundleDate, ClinicBooking
+        
+        start = timezone.now()
+        end = datetime.fromisoformat(state['window_end'])
+        return [
+            *WebinarDate.alive.filter(
+                on_demand=False, date_time__gte=start, date_time__lte=end
+            ).exclude(calendar_event_id='', calendar_invite_sent_at=None).select_related('webinar'),
+            *BundleDate.alive.filter(
+                date__gte=start.date(), date__lte=end.date()
+            ).exclude(calendar_event_id='').select_related('bundle'),
+            *ClinicBooking.alive.filter(
+                clinic_date__gte=start, clinic_date__lte=end
+            ).exclude(calendar_event_id='', calendar_invite_sent_at=None),
+        ]
+    
+    def _link_event(self, record, start, events):
+        """Find the event for an invite sent before event ids were stored, by start time and name."""
+        name = record.webinar.name if hasattr(record, 'webinar') else getattr(record, 'full_name', '')
+        for event_id, event in events.items():
+            if event['start'] == start and name and name in event['subject']:
+                return event_id
+        return None
+    
+    def reconcile(self, full=False):
+        """
+        Run one reconciliation. full=True discards the delta link and snapshot.
+        Returns a dict with success and counts, or an error
+        """
+        settings = self.service.settings
+        if not settings.client_id or not settings.client_secret:
+            return {'success': False, 'error': "MS365 not configured"}
+        access_token = self.service.get_access_token()
+        if not access_token:
+            return {'success': False, 'error': "Failed to get MS365 access token"}
+        self.headers = {'Authorization': f'Bearer {access_token}', 'Content-Type': 'application/json'}
+        
+        state = self._load_state(full)
+        try:
+            changes = self._fetch_changes(state)
+        except Exception as e:
+            logger.error(f"Error reading calendar delta: {str(e)}")
+            return {'success': False, 'error': f"Error reading calendar delta: {str(e)}"}
+        
+        counts = {'success': True, 'changes': changes, 'patched': 0, 'linked': 0,
+                  'missing': 0, 'unchanged': 0, 'failed': 0}
+        linked = []
+        to_patch = []
+        for record in self._local_records(state):
+            start, end = (value.strftime(GRAPH_TIME_FORMAT) for value in event_times(record))
+            if not record.calendar_event_id:
+                event_id = self._link_event(record, start, state['events'])
+                if not event_id:
+                    continue
+                record.calendar_event_id = event_id
+                record.calendar_ical_uid = state['events'][event_id]['iCalUId']
+                linked.append(record)
+                counts['linked'] += 1
+            
+            remote = state['events'].get(record.calendar_event_id)
+            if remote is None:
+                counts['missing'] += 1
+                logger.warning(f"Calendar event for {record} is missing from the owner calendar")
+            elif (remote['start'], remote['end']) == (start, end):
+                counts['unchanged'] += 1
+            else:
+                to_patch.append((record, start, end))
+        
+        if self.dry_run:
+            counts['patched'] = len(to_patch)
+            return counts
+        
+        for record in linked:
+            record.save(update_fields=['calendar_event_id', 'calendar_ical_uid'])
+        
+        for offset in range(0, len(to_patch), GRAPH_BATCH_SIZE):
+            chunk = to_patch[offset:offset + GRAPH_BATCH_SIZE]
+            patched = self._patch_events(chunk)
+            for record, start, end in chunk:
+                if record.calendar_event_id in patched:
+                    state['events'][record.calendar_event_id].update(start=start, end=end)
+                    counts['patched'] += 1
+                else:
+                    counts['failed'] += 1
+        
+        cache.set(self.state_key, state, None)
+        return counts
+    
+    def _patch_events(self, chunk):
+        """PATCH the start/end of up to GRAPH_BATCH_SIZE events; returns the ids that were updated."""
+        owner = self.service.settings.owner_email
+        batch = {
+            "requests": [
+                {
+                    "id": str(index),
+                    "method": "PATCH",
+                    "url": f"/users/{owner}/events/{record.calendar_event_id}",
+                    "headers": {"Content-Type": "application/json"},
+                    "body": {
+                        "start": {"dateTime": start, "timeZone": "UTC"},
+                        "end": {"dateTime": end, "timeZone": "UTC"},
+                    }
+                }
+                for index, (record, start, end) in enumerate(chunk)
+            ]
+        }
+        try:
+            response = graph_client.request('POST', f"{graph_client.GRAPH_URL}/$batch", headers=self.headers, json=batch)
+            response.raise_for_status()
+        except Exception as e:
+            logger.error(f"Error patching calendar events: {str(e)}")
+            return set()
+        
+        patched = set()
+        for item in response.json().get('responses', []):
+            record = chunk[int(item['id'])][0]
+            if item.get('status', 500) < 400:
+                patched.add(record.calendar_event_id)
+                logger.info(f"Updated calendar event for {record}")
+            else:
+                logger.error(f"Failed to update calendar event for {record}: {item.get('status')}")
+        return patched
@@ -0,0 +1,114 @@
+"""
+JSON encoding and decoding for webhooks, responses, the API and JSON columns.
+
+orjson is used when it's installed, the standard library json module
+otherwise; settings.JSON_CODEC = 'stdlib' forces the fallback. Both produce
+compact UTF-8 output, so stored bodies and responses look the same whichever
+codec wrote them.
+"""
+import datetime
+import decimal
+import json
+import uuid
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.functional import Promise
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Raised by loads() for invalid JSON; orjson's error subclasses it
+JSONDecodeError = json.JSONDecodeError
+
+
+def _default(obj):
+    """Encode the types Django's JSON encoder handles that the codecs don't."""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, Promise):
+        return str(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class StdlibCodec:
+    name = 'stdlib'
+    
+    def loads(self, data):
+        return json.loads(data)
+    
+    def dumps(self, obj):
+        return json.dumps(obj, default=_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    
+    def dumps_pretty(self, obj):
+        return json.dumps(obj, default=_default, indent=2, ensure_ascii=False)
+
+
+class OrjsonCodec:
+    name = 'orjson'
+    
+    def loads(self, data):
+        return orjson.loads(data)
+    
+    def dumps(self, obj):
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    
+    def dumps_pretty(self, obj):
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2).decode('utf-8')
+
+
+CODECS = {'stdlib': StdlibCodec}
+if orjson is not None:
+    CODECS['orjson'] = OrjsonCodec
+
+
+def get_codec(name=None):
+    """Return the configured codec: settings.JSON_CODEC, or orjson when it's installed."""
+    name = name or getattr(settings, 'JSON_CODEC', 'auto')
+    if name == 'auto':
+        name = 'orjson' if orjson is not None else 'stdlib'
+    return CODECS.get(name, StdlibCodec)()
+
+
+codec = get_codec()
+
+
+def loads(data):
+    """Parse JSON from bytes or str."""
+    return codec.loads(data)
+
+
+def dumps(obj):
+    """Serialize obj to compact JSON bytes."""
+    return codec.dumps(obj)
+
+
+def dumps_str(obj):
+    """Serialize obj to a compact JSON str, e.g. for a text column."""
+    return codec.dumps(obj).decode('utf-8')
+
+
+def dumps_pretty(obj):
+    """Serialize obj indented by two spaces, for emails and the admin."""
+    return codec.dumps_pretty(obj)
+
+
+def json_response(data, status=200):
+    """
+    Return an HttpResponse of data serialized once. Use response.content (or
+    response_text) to log the body rather than serializing data again.
+    """
+    return HttpResponse(dumps(data), content_type='application/json', status=status)
+
+
+def response_text(response):
+    """The body of a response as text, for WebhookLog.response_body."""
+    return response.content.decode('utf-8')
@@ -0,0 +1,85 @@
+"""
+Compression for the large text and JSON columns: webhook bodies and headers,
+payloads and error messages holding tracebacks.
+
+A stored value is a two-byte header followed by the data. The first byte is
+always zero, which text never starts with, and the second says how the rest
+is encoded. Rows written before a column was compressed hold plain text and
+are read back unchanged, so existing rows can be recompressed in batches
+(see the recompress_fields command) whenever convenient.
+"""
+import zlib
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# settings.FIELD_COMPRESSION: 'zlib', or 'zstd' when zstandard is installed
+METHOD = getattr(settings, 'FIELD_COMPRESSION', 'zlib')
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+# Shorter values gain nothing from compression and are stored as they are
+MIN_LENGTH = 64
+
+STORED = 0
+ZLIB = 1
+ZSTD = 2
+METHODS = {'stored': STORED, 'zlib': ZLIB, 'zstd': ZSTD}
+
+
+def _compress_zstd(data):
+    if zstandard is None:
+        raise ImproperlyConfigured("FIELD_COMPRESSION is 'zstd' but zstandard is not installed")
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+
+def _decompress_zstd(data):
+    if zstandard is None:
+        raise ImproperlyConfigured("A value is compressed with zstd but zstandard is not installed")
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+def compress(text, method=None):
+    """Encode text (str or UTF-8 bytes) for storage, falling back to stored if compression doesn't help."""
+    data = text.encode('utf-8') if isinstance(text, str) else bytes(text)
+    if not data:
+        return b''
+    method = METHODS[method or METHOD]
+    if method != STORED and len(data) >= MIN_LENGTH:
+        if method == ZSTD:
+            compressed = _compress_zstd(data)
+        else:
+            compressed = zlib.compress(data, ZLIB_LEVEL)
+        if len(compressed) < len(data):
+            return bytes((0, method)) + compressed
+    return bytes((0, STORED)) + data
+
+
+def decompress(value):
+    """Decode a stored value back to text. Plain text from before compression is returned as it is."""
+    if isinstance(value, str):
+        return value
+    data = bytes(value)
+    if not data.startswith(b'\x00'):
+        return data.decode('utf-8')
+    method, data = data[1], data[2:]
+    if method == ZLIB:
+        data = zlib.decompress(data)
+    elif method == ZSTD:
+        data = _decompress_zstd(data)
+    elif method != STORED:
+        raise ValueError(f"Unknown compression method {method}")
+    return data.decode('utf-8')
+
+
+def stored_size(value):
+    """Bytes a value read straight from the database takes up."""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    return len(bytes(value))
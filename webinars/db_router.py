@@ -0,0 +1,186 @@
+"""
+Read-replica routing for reporting and list views.
+
+Reads inside read_replica() (or a view decorated with replica_reads) go to
+the replica database alias; everything else, and every write, goes to the
+primary. Reads fall back to the primary when the replica isn't configured,
+can't be reached or is further behind than READ_REPLICA_MAX_LAG, and for a
+while after the same session POSTed (see pin_reads_to_primary), so users
+see their own changes.
+
+Settings:
+    DATABASE_ROUTERS = ['webinars.db_router.ReplicaRouter']
+    READ_REPLICA_ALIAS: the replica's DATABASES alias (default 'replica')
+    READ_REPLICA_MAX_LAG: seconds of replication lag tolerated (default 5)
+    READ_REPLICA_LAG_CHECK_SECONDS: how long a lag check is reused (default 10)
+    READ_REPLICA_STICKY_SECONDS: reads stay on the primary this long after a POST (default 15)
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+REPLICA_ALIAS = getattr(settings, 'READ_REPLICA_ALIAS', 'replica')
+MAX_LAG = getattr(settings, 'READ_REPLICA_MAX_LAG', 5)
+LAG_CHECK_SECONDS = getattr(settings, 'READ_REPLICA_LAG_CHECK_SECONDS', 10)
+# Longer than MAX_LAG, so a write has reached the replica by the time reads go back to it
+STICKY_SECONDS = getattr(settings, 'READ_REPLICA_STICKY_SECONDS', 15)
+
+STICKY_SESSION_KEY = '_read_primary_until'
+
+# The alias reads are routed to in the current context, or None for the primary
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def replica_configured():
+    return REPLICA_ALIAS != DEFAULT_DB_ALIAS and REPLICA_ALIAS in settings.DATABASES
+
+
+def replica_lag(alias):
+    """
+    Return how many seconds the replica is behind the primary, or None if
+    replication isn't running. Only MySQL reports lag; other backends
+    (such as a local SQLite copy) count as up to date.
+    """
+    connection = connections[alias]
+    if connection.vendor != 'mysql':
+        return 0
+    
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute('SHOW REPLICA STATUS')
+        except DatabaseError:
+            # MySQL before 8.0.22
+            cursor.execute('SHOW SLAVE STATUS')
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        status = dict(zip([column[0] for column in cursor.description], row))
+    return status.get('Seconds_Behind_Source', status.get('Seconds_Behind_Master'))
+
+
+def replica_available():
+    """
+    Whether reads can go to the replica. The lag check is cached for
+    LAG_CHECK_SECONDS so it isn't made on every request.
+    """
+    if not replica_configured():
+        return False
+    
+    cache_key = f'db_router:replica_ok:{REPLICA_ALIAS}'
+    available = cache.get(cache_key)
+    if available is None:
+        try:
+            lag = replica_lag(REPLICA_ALIAS)
+        except DatabaseError as e:
+            logger.warning("Replica %s unreachable, reading from the primary: %s", REPLICA_ALIAS, e)
+            lag = None
+        available = lag is not None and lag <= MAX_LAG
+        if lag is not None and not available:
+            logger.warning("Replica %s is %ss behind, reading from the primary", REPLICA_ALIAS, lag)
+        cache.set(cache_key, available, LAG_CHECK_SECONDS)
+    return available
+
+
+@contextmanager
+def read_replica():
+    """
+    Send the reads inside the block to the replica when it's available.
+    Writes still go to the primary. Also usable as a decorator for sync
+    functions such as exports.
+    """
+    token = _read_alias.set(REPLICA_ALIAS if replica_available() else None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+@contextmanager
+def read_primary():
+    """Send the reads inside the block to the primary, e.g. re-reading a row just written."""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def on_replica(queryset):
+    """Return queryset evaluated on the replica when it's available."""
+    return queryset.using(REPLICA_ALIAS) if replica_available() else queryset
+
+
+def pin_reads_to_primary(request):
+    """Keep the session's reads on the primary for STICKY_SECONDS, after it wrote."""
+    request.session[STICKY_SESSION_KEY] = time.time() + STICKY_SECONDS
+
+
+def reads_pinned_to_primary(request):
+    """Whether the request's session wrote recently, so it must read its own writes."""
+    session = getattr(request, 'session', None)
+    return session is not None and session.get(STICKY_SESSION_KEY, 0) > time.time()
+
+
+def _use_replica(request):
+    return request.method in ('GET', 'HEAD') and not reads_pinned_to_primary(request)
+
+
+def replica_reads(view_func):
+    """
+    View decorator sending the reads of GET and HEAD requests to the replica,
+    unless the session wrote recently.
+    """
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            if not await sync_to_async(_use_replica)(request):
+                return await view_func(request, *args, **kwargs)
+            
+            alias = REPLICA_ALIAS if await sync_to_async(replica_available)() else None
+            token = _read_alias.set(alias)
+            try:
+                return await view_func(request, *args, **kwargs)
+            finally:
+                _read_alias.reset(token)
+        return async_wrapper
+    
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not _use_replica(request):
+            return view_func(request, *args, **kwargs)
+        with read_replica():
+            return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+    """Routes reads to the replica inside read_replica(); everything else to the primary."""
+    
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+    
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+    
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        databases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+    
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from the primary
+        if db == REPLICA_ALIAS:
+            return False
+        return None
+
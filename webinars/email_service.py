@@ -1,61 +1,45 @@
 import logging
-import json
-import requests
+from datetime import timedelta
 from django.core.mail import send_mail
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from settings.models import MS365Settings
+from . import codec, graph_client
+from .notifications import notify_error, error_signature, registrant_line, render_digest
+from .timing import timed
 
 logger = logging.getLogger(__name__)
 
+# Graph accepts at most 20 requests per $batch call
+GRAPH_BATCH_SIZE = 20
+
+# Outbox retry policy, overridable in settings
+OUTBOX_MAX_ATTEMPTS = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 8)
+OUTBOX_RETRY_BASE_DELAY = getattr(settings, 'EMAIL_OUTBOX_RETRY_BASE_DELAY', 60)
+OUTBOX_RETRY_MAX_DELAY = getattr(settings, 'EMAIL_OUTBOX_RETRY_MAX_DELAY', 60 * 60)
+
+# How long a worker owns the emails it picked up before another worker may retry them
+OUTBOX_CLAIM_SECONDS = 5 * 60
+
 
 class EmailService:
     """Enhanced email service that can use MS365 Graph API or Django's email backend"""
     
     def __init__(self):
         self.ms365_settings = MS365Settings.get_settings()
-        self._access_token = None
     
     def get_access_token(self):
-        """Get Microsoft Graph API access token for email"""
-        if self._access_token:
-            return self._access_token
-            
-        try:
-            import msal
-            
-            app = msal.ConfidentialClientApplication(
-                client_id=self.ms365_settings.client_id,
-                client_credential=self.ms365_settings.client_secret,
-                authority=f"https://login.microsoftonline.com/{self.ms365_settings.tenant_id}"
-            )
-            
-            scopes = ['https://graph.microsoft.com/.default']
-            result = app.acquire_token_for_client(scopes)
-            
-            if "access_token" in result:
-                self._access_token = result['access_token']
-                return self._access_token
-            else:
-                logger.error(f"Unable to obtain access token for email: {result.get('error')}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"Error getting MS365 access token for email: {str(e)}")
-            return None
+        """
+        Get Microsoft Graph API access token for email. Not kept on the instance:
+        graph_client caches it per process under a lock until it's near expiry.
+        """
+        return graph_client.get_access_token(self.ms365_settings)
     
-    def send_email_via_ms365(self, to_email, subject, message, from_email=None):
-        """Send email using MS365 Graph API"""
-        if not self.ms365_settings.client_id or not self.ms365_settings.client_secret:
-            return False, "MS365 not configured"
-            
-        access_token = self.get_access_token()
-        if not access_token:
-            return False, "Could not get access token"
-            
-        from_email = from_email or self.ms365_settings.owner_email
-        
-        # Prepare email body
-        email_body = {
+    @staticmethod
+    def build_graph_message(to_email, subject, message):
+        """Build the Graph sendMail request body for a plain text email"""
+        return {
             "message": {
                 "subject": subject,
                 "body": {
@@ -71,6 +55,19 @@ class EmailService:
                 ]
             }
         }
+    
+    def send_email_via_ms365(self, to_email, subject, message, from_email=None):
+        """Send email using MS365 Graph API"""
+        if not self.ms365_settings.client_id or not self.ms365_settings.client_secret:
+            return False, "MS365 not configured"
+        
+        access_token = self.get_access_token()
+        if not access_token:
+            return False, "Could not get access token"
+        
+        from_email = from_email or self.ms365_settings.owner_email
+        
+        email_body = self.build_graph_message(to_email, subject, message)
         
         # Send the email
         headers = {
@@ -81,7 +78,7 @@ class EmailService:
         url = f"https://graph.microsoft.com/v1.0/users/{from_email}/sendMail"
         
         try:
-            response = requests.post(url, headers=headers, json=email_body)
+            response = graph_client.request('POST', url, headers=headers, json=email_body)
             
             if response.status_code == 202:  # Accepted
                 logger.info(f"Email sent successfully via MS365 to {to_email}")
@@ -94,6 +91,54 @@ class EmailService:
             logger.error(f"Error sending email via MS365: {str(e)}")
             return False, f"Exception: {str(e)}"
     
+    def send_batch_via_ms365(self, emails):
+        """
+        Send up to GRAPH_BATCH_SIZE OutboundEmail rows in one Graph $batch request.
+        Returns a dict of email id -> (success, message).
+        """
+        if not self.ms365_settings.client_id or not self.ms365_settings.client_secret:
+            return {email.id: (False, "MS365 not configured") for email in emails}
+        
+        access_token = self.get_access_token()
+        if not access_token:
+            return {email.id: (False, "Could not get access token") for email in emails}
+        
+        body = {
+            "requests": [
+                {
+                    "id": str(email.id),
+                    "method": "POST",
+                    "url": f"/users/{email.from_email or self.ms365_settings.owner_email}/sendMail",
+                    "headers": {"Content-Type": "application/json"},
+                    "body": self.build_graph_message(email.to_email, email.subject, email.message)
+                }
+                for email in emails
+            ]
+        }
+        headers = {
+            'Authorization': f'Bearer {access_token}',
+            'Content-Type': 'application/json'
+        }
+        
+        try:
+            response = graph_client.request('POST', f"{graph_client.GRAPH_URL}/$batch", headers=headers, json=body)
+        except Exception as e:
+            logger.error(f"Error sending email batch via MS365: {str(e)}")
+            return {email.id: (False, f"Exception: {str(e)}") for email in emails}
+        
+        if response.status_code != 200:
+            logger.error(f"Failed to send email batch via MS365: {response.status_code} - {response.text}")
+            return {email.id: (False, f"MS365 API error: {response.status_code}") for email in emails}
+        
+        results = {email.id: (False, "Missing from MS365 batch response") for email in emails}
+        for item in response.json().get('responses', []):
+            if item.get('status') == 202:
+                results[int(item['id'])] = (True, "Email sent successfully")
+            else:
+                error = (item.get('body') or {}).get('error', {}).get('message', '')
+                results[int(item['id'])] = (False, f"MS365 API error: {item.get('status')} {error}".strip())
+        return results
+    
     def send_email_via_django(self, to_email, subject, message, from_email=None):
         """Send email using Django's email backend"""
         try:
@@ -105,6 +150,7 @@ class EmailService:
             logger.error(f"Error sending email via Django: {str(e)}")
             return False, f"Django email error: {str(e)}"
     
+    @timed('email')
     def send_email(self, to_email, subject, message, from_email=None, prefer_ms365=True):
         """
         Send email with fallback mechanism.
@@ -116,20 +162,20 @@ class EmailService:
         # Try MS365 first if configured and preferred
         if prefer_ms365 and self.ms365_settings.client_id and self.ms365_settings.client_secret:
             logger.info(f"Attempting to send email via MS365 to {to_email}")
-            success, message = self.send_email_via_ms365(to_email, subject, message, from_email)
+            success, result_message = self.send_email_via_ms365(to_email, subject, message, from_email)
             if success:
-                return True, message
+                return True, result_message
             else:
-                error_messages.append(f"MS365: {message}")
-                logger.warning(f"MS365 email failed, trying Django backend: {message}")
+                error_messages.append(f"MS365: {result_message}")
+                logger.warning(f"MS365 email failed, trying Django backend: {result_message}")
         
         # Fall back to Django email backend
         logger.info(f"Attempting to send email via Django backend to {to_email}")
-        success, message = self.send_email_via_django(to_email, subject, message, from_email)
+        success, result_message = self.send_email_via_django(to_email, subject, message, from_email)
         if success:
-            return True, message
+            return True, result_message
         else:
-            error_messages.append(f"Django: {message}")
+            error_messages.append(f"Django: {result_message}")
         
         # Both methods failed
         full_error = "; ".join(error_messages)
@@ -137,17 +183,23 @@ class EmailService:
         return False, full_error
 
 
-def send_webhook_error_email(to_email, error_message, webhook_data):
+def send_webhook_error_email(to_email, error_message, webhook_data, scope=''):
     """
     Enhanced webhook error email function using the new EmailService.
     This replaces the basic send_mail function in utils.py.
+    
+    The email is queued in the outbox so the webhook doesn't wait on delivery;
+    repeats of the same error for the same scope (e.g. "webinar:12") are
+    coalesced into a digest (see notifications.notify_error). The message is
+    only built when an email is actually queued.
     """
     subject = "Kajabi Webhook Processing Error"
     
-    # Format webhook data as a pretty-printed JSON string
-    webhook_json = json.dumps(webhook_data, indent=2)
-    
-    message = f"""
+    def message():
+        # Format webhook data as a pretty-printed JSON string
+        webhook_json = codec.dumps_pretty(webhook_data)
+        
+        return f"""
 An error occurred while processing a Kajabi webhook:
 
 {error_message}
@@ -161,27 +213,28 @@ Please investigate this issue manually.
 This email was sent via the enhanced email service with MS365 Graph API support.
 """
     
-    email_service = EmailService()
-    success, result_message = email_service.send_email(
-        to_email=to_email,
-        subject=subject,
-        message=message,
-        prefer_ms365=True
+    notify_error(
+        to_email,
+        subject,
+        message,
+        signature=error_signature(error_message),
+        scope=scope,
+        registrant=registrant_line(webhook_data)
     )
-    
-    if not success:
-        logger.error(f"Failed to send webhook error email to {to_email}: {result_message}")
-        # Re-raise exception to maintain compatibility with existing error handling
-        raise Exception(f"Email delivery failed: {result_message}")
-    
-    logger.info(f"Webhook error email sent successfully to {to_email}")
 
 
-def send_notification_email(to_email, subject, message, from_email=None):
+def send_notification_email(to_email, subject, message, from_email=None, queue=True):
     """
     General purpose notification email function using the enhanced EmailService.
     Can be used for other types of notifications beyond webhook errors.
+    
+    Emails are queued in the outbox by default; pass queue=False to send now
+    and raise if delivery fails (e.g. for the settings test email).
     """
+    if queue:
+        enqueue_email(to_email, subject, message, from_email)
+        return True
+    
     email_service = EmailService()
     success, result_message = email_service.send_email(
         to_email=to_email,
@@ -196,4 +249,106 @@ def send_notification_email(to_email, subject, message, from_email=None):
         raise Exception(f"Email delivery failed: {result_message}")
     
     logger.info(f"Notification email sent successfully to {to_email}")
-    return True
\ No newline at end of file
+    return True
+
+
+def enqueue_email(to_email, subject, message, from_email=None):
+    """Add an email to the outbox for the deliver_emails command; a single insert."""
+    from .models import OutboundEmail
+    
+    email = OutboundEmail.objects.create(
+        to_email=to_email,
+        from_email=from_email or '',
+        subject=subject[:255],
+        message=message
+    )
+    logger.info(f"Queued email {email.id} to {to_email}: {subject}")
+    return email
+
+
+def retry_delay(attempts):
+    """Seconds to wait before the next delivery attempt: exponential backoff, capped."""
+    return min(OUTBOX_RETRY_BASE_DELAY * 2 ** (attempts - 1), OUTBOX_RETRY_MAX_DELAY)
+
+
+def claim_due_emails(limit):
+    """
+    Return up to limit pending emails that are due, pushing their next attempt
+    time out by OUTBOX_CLAIM_SECONDS so concurrent workers skip them.
+    """
+    from .models import OutboundEmail
+    
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True).filter(
+                status=OutboundEmail.STATUS_PENDING,
+                next_attempt_at__lte=now
+            ).order_by('next_attempt_at')[:limit]
+        )
+        if emails:
+            OutboundEmail.objects.filter(id__in=[email.id for email in emails]).update(
+                next_attempt_at=now + timedelta(seconds=OUTBOX_CLAIM_SECONDS)
+            )
+    return emails
+
+
+def deliver_outbox(limit=100):
+    """
+    Deliver due outbox emails. MS365 deliveries are grouped into Graph $batch
+    requests; emails MS365 can't send fall back to Django's email backend, and
+    emails neither can send are retried with backoff until OUTBOX_MAX_ATTEMPTS.
+    
+    Returns a dict with sent, retrying and failed counts.
+    """
+    from .models import OutboundEmail
+    
+    emails = claim_due_emails(limit)
+    counts = {'sent': 0, 'retrying': 0, 'failed': 0}
+    if not emails:
+        return counts
+    
+    for email in emails:
+        if email.digest_key:
+            render_digest(email)
+    
+    email_service = EmailService()
+    results = {}
+    if email_service.ms365_settings.client_id and email_service.ms365_settings.client_secret:
+        for start in range(0, len(emails), GRAPH_BATCH_SIZE):
+            results.update(email_service.send_batch_via_ms365(emails[start:start + GRAPH_BATCH_SIZE]))
+    
+    now = timezone.now()
+    for email in emails:
+        success, result_message = results.get(email.id, (False, "MS365 not configured"))
+        email.attempts += 1
+        if success:
+            email.sent_via = 'ms365'
+        else:
+            errors = [f"MS365: {result_message}"]
+            success, result_message = email_service.send_email_via_django(
+                email.to_email, email.subject, email.message, email.from_email or None
+            )
+            if success:
+                email.sent_via = 'django'
+            else:
+                errors.append(f"Django: {result_message}")
+                email.last_error = "; ".join(errors)
+        
+        if success:
+            email.status = OutboundEmail.STATUS_SENT
+            email.sent_at = now
+            counts['sent'] += 1
+        elif email.attempts >= OUTBOX_MAX_ATTEMPTS:
+            email.status = OutboundEmail.STATUS_FAILED
+            counts['failed'] += 1
+            logger.error(f"Giving up on email {email.id} to {email.to_email} after {email.attempts} attempts: {email.last_error}")
+        else:
+            email.next_attempt_at = now + timedelta(seconds=retry_delay(email.attempts))
+            counts['retrying'] += 1
+    
+    OutboundEmail.objects.bulk_update(
+        emails,
+        ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at', 'sent_via', 'message', 'digest_key']
+    )
+    return counts
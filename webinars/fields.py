@@ -0,0 +1,85 @@
+from django.db import models
+from django.db.models import expressions
+from django.db.models.fields.json import KeyTransform
+
+from . import codec, compression
+
+
+class CodecJSONField(models.JSONField):
+    """
+    JSONField encoded and decoded with the JSON codec (orjson when installed)
+    instead of json.dumps/json.loads, for columns written on every webhook.
+    Lookups and queries behave as for JSONField.
+    """
+    
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        # Some backends (SQLite at least) extract non-string values in their SQL datatypes
+        if isinstance(expression, KeyTransform) and not isinstance(value, str):
+            return value
+        try:
+            return codec.loads(value)
+        except codec.JSONDecodeError:
+            return value
+    
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if not prepared:
+            value = self.get_prep_value(value)
+        if isinstance(value, expressions.Value) and isinstance(value.output_field, models.JSONField):
+            value = value.value
+        elif hasattr(value, 'as_sql'):
+            return value
+        return codec.dumps_str(value)
+
+
+class CompressedTextField(models.TextField):
+    """
+    TextField stored compressed in a binary column (see webinars.compression).
+    Values read and write as str, and exact matches such as field='' still
+    work, but searches and functions on the column don't see the text.
+    """
+    
+    def get_internal_type(self):
+        return 'BinaryField'
+    
+    def get_placeholder(self, value, compiler, connection):
+        return connection.ops.binary_placeholder_sql(value)
+    
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return compression.decompress(value)
+    
+    def get_db_prep_value(self, value, connection, prepared=False):
+        value = super().get_db_prep_value(value, connection, prepared)
+        if value is None or hasattr(value, 'as_sql'):
+            return value
+        return connection.Database.Binary(compression.compress(value))
+
+
+class CompressedJSONField(CodecJSONField):
+    """
+    CodecJSONField stored compressed in a binary column. The database can't
+    see inside the JSON, so key lookups aren't available.
+    """
+    
+    def get_internal_type(self):
+        return 'BinaryField'
+    
+    def get_placeholder(self, value, compiler, connection):
+        return connection.ops.binary_placeholder_sql(value)
+    
+    def get_transform(self, name):
+        return super(models.JSONField, self).get_transform(name)
+    
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return super().from_db_value(compression.decompress(value), expression, connection)
+    
+    def get_db_prep_value(self, value, connection, prepared=False):
+        value = super().get_db_prep_value(value, connection, prepared)
+        if value is None or hasattr(value, 'as_sql'):
+            return value
+        return connection.Database.Binary(compression.compress(value))
@@ -101,9 +101,8 @@ class BundleDateForm(forms.ModelForm):
             try:
                 date_str = self.data.get('date')
                 selected_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                self.fields['webinar_dates'].queryset = WebinarDate.objects.filter(
-                    date_time__date=selected_date,
-                    deleted_at=None
+                self.fields['webinar_dates'].queryset = WebinarDate.alive.filter(
+                    date_time__date=selected_date
                 ).order_by('date_time', 'webinar__name')
             except:
                 pass
@@ -118,4 +117,17 @@ class BundleAttendeeForm(forms.ModelForm):
             'last_name': forms.TextInput(attrs={'class': 'form-control'}),
             'email': forms.EmailInput(attrs={'class': 'form-control'}),
             'organization': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Optional'}),
-        }
\ No newline at end of file
+        }
+
+class AttendeeImportForm(forms.Form):
+    csv_file = forms.FileField(
+        label='CSV file',
+        help_text='Columns: first name, last name, email and (optionally) organization. A header row is required.',
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,text/csv'})
+    )
+    
+    def clean_csv_file(self):
+        csv_file = self.cleaned_data['csv_file']
+        if not csv_file.name.lower().endswith('.csv'):
+            raise forms.ValidationError('Please upload a .csv file.')
+        return csv_file
@@ -0,0 +1,142 @@
+"""
+Shared Microsoft Graph client used by EmailService and MS365CalendarService.
+
+Each process keeps one MSAL ConfidentialClientApplication per set of MS365
+credentials, and its token cache is mirrored into the shared cache backend so
+workers reuse each other's app-only tokens instead of each calling
+login.microsoftonline.com. The current token is also kept in memory, so most
+lookups take no lock and make no cache query. Graph requests go through one
+pooled requests.Session with the 'graph' timeouts and circuit breaker from
+outbound.
+"""
+import hashlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import async_http, outbound
+
+logger = logging.getLogger(__name__)
+
+GRAPH_URL = 'https://graph.microsoft.com/v1.0'
+SCOPES = ['https://graph.microsoft.com/.default']
+
+# App-only tokens last about an hour; keep the serialized cache a little longer than that
+TOKEN_CACHE_TIMEOUT = 2 * 60 * 60
+
+# In-memory tokens are used until this many seconds before they expire, then refreshed through MSAL
+TOKEN_REFRESH_MARGIN = 5 * 60
+
+# Guards _locks; each set of credentials then has its own lock for filling and refreshing its token
+_lock = threading.Lock()
+_locks = {}
+_apps = {}
+_tokens = {}
+
+
+def _credentials_key(ms365_settings):
+    # Secrets aren't put in cache keys directly; a changed secret still gets a new app and cache entry
+    raw = f"{ms365_settings.tenant_id}:{ms365_settings.client_id}:{ms365_settings.client_secret}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def _token_cache_key(credentials_key):
+    return f"graph:token_cache:{credentials_key}"
+
+
+def _get_app(ms365_settings, credentials_key):
+    """Return the process-wide MSAL app for these credentials, creating it once."""
+    app = _apps.get(credentials_key)
+    if app is None:
+        import msal
+        
+        timeouts = {**outbound.DEFAULT_TIMEOUTS, **getattr(settings, 'OUTBOUND_TIMEOUTS', {})}
+        app = msal.ConfidentialClientApplication(
+            client_id=ms365_settings.client_id,
+            client_credential=ms365_settings.client_secret,
+            authority=f"https://login.microsoftonline.com/{ms365_settings.tenant_id}",
+            token_cache=msal.SerializableTokenCache(),
+            http_client=get_session(),
+            timeout=timeouts['graph']
+        )
+        _apps[credentials_key] = app
+    return app
+
+
+def _credentials_lock(credentials_key):
+    lock = _locks.get(credentials_key)
+    if lock is None:
+        with _lock:
+            lock = _locks.setdefault(credentials_key, threading.Lock())
+    return lock
+
+
+def _memory_token(credentials_key):
+    """The in-memory token for these credentials, if it isn't close to expiry."""
+    token, expires_at = _tokens.get(credentials_key, (None, 0))
+    if token and time.monotonic() < expires_at - TOKEN_REFRESH_MARGIN:
+        return token
+    return None
+
+
+def get_access_token(ms365_settings):
+    """
+    Return an app-only Graph access token, or None if one can't be obtained.
+    
+    The token is answered from memory until it is close to expiry. Only then
+    are MSAL and the shared cache consulted, under a lock per set of
+    credentials: MSAL answers from its token cache until the token is close to
+    expiry, and the cache is loaded from and saved back to the shared cache so
+    a token fetched by one worker is used by all of them.
+    """
+    credentials_key = _credentials_key(ms365_settings)
+    access_token = _memory_token(credentials_key)
+    if access_token:
+        return access_token
+    cache_key = _token_cache_key(credentials_key)
+    
+    try:
+        with _credentials_lock(credentials_key):
+            # Another thread may have refreshed it while we waited
+            access_token = _memory_token(credentials_key)
+            if access_token:
+                return access_token
+            
+            app = _get_app(ms365_settings, credentials_key)
+            shared_state = cache.get(cache_key)
+            if shared_state:
+                app.token_cache.deserialize(shared_state)
+            
+            result = app.acquire_token_for_client(SCOPES)
+            
+            if app.token_cache.has_state_changed:
+                cache.set(cache_key, app.token_cache.serialize(), TOKEN_CACHE_TIMEOUT)
+                app.token_cache.has_state_changed = False
+    except Exception as e:
+        logger.error("Error getting MS365 access token: %s", str(e))
+        return None
+    
+    if "access_token" in result:
+        if result.get('expires_in'):
+            _tokens[credentials_key] = (result['access_token'], time.monotonic() + int(result['expires_in']))
+        return result['access_token']
+    logger.error("Unable to obtain access token: %s", result.get('error'))
+    return None
+
+
+def get_session():
+    """Return the process-wide pooled requests.Session for Graph calls."""
+    return outbound.get_session('graph')
+
+
+def request(method, url, **kwargs):
+    """Make a Graph request on the pooled session through outbound.request('graph', ...)."""
+    return outbound.request('graph', method, url, session=get_session(), **kwargs)
+
+
+async def arequest(method, url, **kwargs):
+    """Make a Graph request on the shared async client through async_http.request('graph', ...)."""
+    return await async_http.request('graph', method, url, **kwargs)
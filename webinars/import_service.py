@@ -0,0 +1,274 @@
+import csv
+import io
+import logging
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+# Accepted CSV header spellings for each attendee field (compared lowercased)
+COLUMN_ALIASES = {
+    'first_name': ['first_name', 'first name', 'firstname', 'member_first_name'],
+    'last_name': ['last_name', 'last name', 'lastname', 'surname', 'member_last_name'],
+    'email': ['email', 'email address', 'e-mail', 'member_email'],
+    'organization': ['organization', 'organisation', 'custom_field_organisation', 'company'],
+}
+
+
+class AttendeeImportError(Exception):
+    """Raised when an uploaded CSV cannot be imported at all."""
+    pass
+
+
+class AttendeeImportService:
+    """
+    Bulk import attendees for a WebinarDate or BundleDate from a CSV upload.
+    
+    Rows are streamed from the uploaded file, validated and deduplicated in
+    memory, then upserted in chunks with a single bulk_create per chunk.
+    Downstream integrations are not called here: new rows are left with
+    salesforce_sync_pending=True for sync_salesforce, and scheduled attendees
+    without a Zoom registrant are picked up by register_zoom_pending.
+    """
+    
+    def __init__(self, chunk_size=500):
+        self.chunk_size = chunk_size
+    
+    def import_for_webinar_date(self, webinar_date, csv_file):
+        """Import attendees for a webinar date. Returns a result dict."""
+        from .models import Attendee
+        
+        if webinar_date.on_demand:
+            raise AttendeeImportError("Bulk import is not supported for on-demand webinar dates")
+        
+        return self._import(Attendee, 'webinar_date', webinar_date, csv_file)
+    
+    def import_for_bundle_date(self, bundle_date, csv_file):
+        """Import bundle attendees for a bundle date. Returns a result dict."""
+        from .models import BundleAttendee
+        
+        return self._import(BundleAttendee, 'bundle_date', bundle_date, csv_file)
+    
+    def _import(self, model, parent_field, parent, csv_file):
+        result = {
+            'created': 0,
+            'updated': 0,
+            'restored': 0,
+            'unchanged': 0,
+            'duplicates': 0,
+            'errors': [],
+        }
+        
+        # Load the existing attendees for this date once, keyed by lowercased email
+        existing = {}
+        for row in model.objects.filter(**{parent_field: parent}).values(
+            'email', 'first_name', 'last_name', 'organization', 'deleted_at'
+        ):
+            existing[row['email'].lower()] = row
+        
+        seen = set()
+        pending = []
+        
+        for line_number, row in self._read_rows(csv_file):
+            email = row['email']
+            if not row['first_name'] or not email:
+                result['errors'].append(f"Line {line_number}: missing first name or email")
+                continue
+            try:
+                validate_email(email)
+            except ValidationError:
+                result['errors'].append(f"Line {line_number}: invalid email '{email}'")
+                continue
+            
+            key = email.lower()
+            if key in seen:
+                result['duplicates'] += 1
+                continue
+            seen.add(key)
+            
+            current = existing.get(key)
+            status = self._classify(current, row)
+            result[status] += 1
+            if status == 'unchanged':
+                continue
+            if current is not None:
+                # Keep the stored spelling so the unique constraint matches on upsert
+                email = current['email']
+            
+            pending.append(model(**{
+                parent_field: parent,
+                'first_name': row['first_name'],
+                'last_name': row['last_name'],
+                'email': email,
+                'organization': row['organization'],
+                'deleted_at': None,
+            }))
+            
+            if len(pending) >= self.chunk_size:
+                self._upsert(model, parent_field, pending)
+                pending = []
+        
+        if pending:
+            self._upsert(model, parent_field, pending)
+        
+        logger.info(
+            f"Imported attendees for {parent}: {result['created']} created, {result['updated']} updated, "
+            f"{result['restored']} restored, {len(result['errors'])} errors"
+        )
+        return result
+    
+    def import_registrations(self, registrations):
+        """
+        Upsert attendee registrations spanning several webinar dates in one transaction.
+        
+        registrations is a list of (index, data) pairs where data holds a
+        webinar_date id, first_name, last_name, email and organization.
+        Returns a dict of per-item results keyed by index.
+        """
+        from .models import Attendee, WebinarDate
+        
+        date_ids = {data['webinar_date'] for _, data in registrations}
+        webinar_dates = WebinarDate.alive.filter(pk__in=date_ids).in_bulk()
+        
+        existing = {}
+        for row in Attendee.objects.filter(webinar_date_id__in=list(webinar_dates)).values(
+            'webinar_date_id', 'email', 'first_name', 'last_name', 'organization', 'deleted_at'
+        ):
+            existing[(row['webinar_date_id'], row['email'].lower())] = row
+        
+        results = {}
+        seen = set()
+        emails = set()
+        pending = []
+        
+        for index, data in registrations:
+            webinar_date = webinar_dates.get(data['webinar_date'])
+            if webinar_date is None:
+                results[index] = {'status': 'error', 'errors': {'webinar_date': ['Webinar date not found']}}
+                continue
+            if webinar_date.on_demand:
+                results[index] = {
+                    'status': 'error',
+                    'errors': {'webinar_date': ['Bulk registration is not supported for on-demand webinar dates']}
+                }
+                continue
+            
+            key = (webinar_date.pk, data['email'].lower())
+            if key in seen:
+                results[index] = {'status': 'duplicate'}
+                continue
+            seen.add(key)
+            
+            current = existing.get(key)
+            email = current['email'] if current else data['email']
+            emails.add(email)
+            status = self._classify(current, data)
+            results[index] = {'status': status, 'key': key}
+            if status == 'unchanged':
+                continue
+            
+            pending.append(Attendee(
+                webinar_date=webinar_date,
+                first_name=data['first_name'],
+                last_name=data['last_name'],
+                email=email,
+                organization=data['organization'],
+                deleted_at=None,
+            ))
+        
+        with transaction.atomic():
+            for start in range(0, len(pending), self.chunk_size):
+                self._upsert(Attendee, 'webinar_date', pending[start:start + self.chunk_size])
+            
+            # Not every backend returns ids from an upsert, so look them up in one query
+            ids = {}
+            if seen:
+                for date_id, email, pk in Attendee.objects.filter(
+                    webinar_date_id__in={date_id for date_id, _ in seen},
+                    email__in=emails
+                ).values_list('webinar_date_id', 'email', 'id'):
+                    ids[(date_id, email.lower())] = pk
+        
+        for result in results.values():
+            key = result.pop('key', None)
+            if key:
+                result['id'] = ids.get(key)
+        
+        logger.info(
+            f"Bulk registration upserted {len(pending)} attendees across {len(webinar_dates)} webinar dates"
+        )
+        return results
+    
+    def _classify(self, current, row):
+        """Return created/restored/updated/unchanged for an incoming row against the stored one."""
+        if current is None:
+            return 'created'
+        if current['deleted_at'] is not None:
+            return 'restored'
+        if (current['first_name'], current['last_name'], current['organization']) == (
+            row['first_name'], row['last_name'], row['organization']
+        ):
+            return 'unchanged'
+        return 'updated'
+    
+    def _upsert(self, model, parent_field, objs):
+        """Insert new rows and update changed/restored ones in one statement."""
+        now = timezone.now()
+        for obj in objs:
+            obj.updated_at = now
+        
+        with transaction.atomic():
+            model.objects.bulk_create(
+                objs,
+                batch_size=self.chunk_size,
+                update_conflicts=True,
+                unique_fields=[parent_field, 'email'],
+                update_fields=['first_name', 'last_name', 'organization', 'deleted_at', 'updated_at'],
+            )
+    
+    def _read_rows(self, csv_file):
+        """Yield (line_number, normalized_row) tuples from an uploaded CSV file."""
+        if hasattr(csv_file, 'open'):
+            csv_file.open('rb')
+        stream = io.TextIOWrapper(csv_file.file if hasattr(csv_file, 'file') else csv_file,
+                                  encoding='utf-8-sig', newline='')
+        try:
+            reader = csv.DictReader(stream)
+            columns = self._map_columns(reader.fieldnames or [])
+            
+            for row in reader:
+                yield reader.line_num, {
+                    field: (row.get(column) or '').strip() if column else ''
+                    for field, column in columns.items()
+                }
+        except (UnicodeDecodeError, csv.Error) as e:
+            raise AttendeeImportError(f"Could not read CSV file: {str(e)}")
+        finally:
+            # Don't let the wrapper close the underlying upload
+            stream.detach()
+    
+    def _map_columns(self, fieldnames):
+        """Map attendee fields to the CSV columns that hold them."""
+        lookup = {name.strip().lower(): name for name in fieldnames if name}
+        columns = {}
+        for field, aliases in COLUMN_ALIASES.items():
+            columns[field] = next((lookup[alias] for alias in aliases if alias in lookup), None)
+        
+        if not columns['email'] or not columns['first_name']:
+            raise AttendeeImportError("CSV must include first name and email columns")
+        return columns
+
+
+def import_webinar_date_attendees(webinar_date, csv_file):
+    """Convenience function to bulk import attendees for a webinar date."""
+    service = AttendeeImportService()
+    return service.import_for_webinar_date(webinar_date, csv_file)
+
+
+def import_bundle_date_attendees(bundle_date, csv_file):
+    """Convenience function to bulk import attendees for a bundle date."""
+    service = AttendeeImportService()
+    return service.import_for_bundle_date(bundle_date, csv_file)
@@ -0,0 +1,140 @@
+"""
+Non-blocking structured logging for the webinars loggers.
+
+Request threads only put log records on a queue (QueueListenerHandler); a
+background listener thread formats them as JSON lines (JsonFormatter) and
+writes them to the real handlers, e.g. a file rotated by size and time
+(SizedTimedRotatingFileHandler). SamplingFilter keeps a fraction of the
+verbose payload dumps. See LOGGING in settings_example.py.
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+from datetime import datetime, timezone
+
+# Attributes every LogRecord has; anything else was passed with extra= and is emitted as a field
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'taskName'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+    
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Let through only a fraction (rate, 0-1) of records below WARNING.
+    Attach it to a logger to sample everything that logger emits.
+    """
+    
+    def __init__(self, rate=1.0, name=''):
+        super().__init__(name)
+        self.rate = float(rate)
+    
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        return random.random() < self.rate
+
+
+class SizedTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """Rotate on a time schedule and also whenever the file grows past maxBytes."""
+    
+    def __init__(self, filename, maxBytes=0, **kwargs):
+        kwargs.setdefault('encoding', 'utf-8')
+        super().__init__(filename, **kwargs)
+        self.maxBytes = maxBytes
+    
+    def shouldRollover(self, record):
+        if super().shouldRollover(record):
+            return True
+        if self.maxBytes > 0 and self.stream is not None:
+            self.stream.seek(0, os.SEEK_END)
+            return self.stream.tell() >= self.maxBytes
+        return False
+
+
+def _get_handler(name):
+    if hasattr(logging, 'getHandlerByName'):
+        return logging.getHandlerByName(name)
+    return logging._handlers.get(name)
+
+
+class QueueListenerHandler(logging.handlers.QueueHandler):
+    """
+    Queue records from the calling thread and hand them to the named handlers
+    on a background QueueListener thread.
+    
+    Message formatting is deferred to the listener: prepare() only copies the
+    record, so the %-style arguments are interpolated off the request thread.
+    """
+    
+    def __init__(self, handlers, respect_handler_level=True):
+        super().__init__(queue.SimpleQueue())
+        self.targets = []
+        for name in handlers:
+            handler = _get_handler(name)
+            if handler is None:
+                # dictConfig retries handlers that fail this way once the others are configured
+                raise ValueError(f"Handler {name!r} is not available") from ValueError('target not configured yet')
+            self.targets.append(handler)
+        self.respect_handler_level = respect_handler_level
+        self.listener = None
+        self._start_lock = threading.Lock()
+        atexit.register(self.stop)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+    
+    def _start(self):
+        # Started on first use rather than at configuration, so a parent that forks workers doesn't need one
+        self.listener = logging.handlers.QueueListener(
+            self.queue,
+            *self.targets,
+            respect_handler_level=self.respect_handler_level
+        )
+        self.listener.start()
+    
+    def _reset_after_fork(self):
+        # The listener thread doesn't survive fork(); the child starts its own on first use
+        self.queue = queue.SimpleQueue()
+        self.listener = None
+        self._start_lock = threading.Lock()
+    
+    def prepare(self, record):
+        # Skip QueueHandler's eager formatting; the listener's handlers format the copy
+        return copy.copy(record)
+    
+    def emit(self, record):
+        if self.listener is None:
+            with self._start_lock:
+                if self.listener is None:
+                    self._start()
+        super().emit(record)
+    
+    def stop(self):
+        """Flush queued records and stop the listener thread."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
@@ -42,14 +42,12 @@ class Command(BaseCommand):
                 from webinars.models import Attendee, BundleAttendee
                 
                 # Count regular attendees who need activation
-                regular_attendees = Attendee.objects.filter(
-                    deleted_at=None,
+                regular_attendees = Attendee.alive.filter(
                     activation_sent_at=None
                 ).select_related('webinar_date', 'webinar_date__webinar')
                 
                 # Count bundle attendees who need activation  
-                bundle_attendees = BundleAttendee.objects.filter(
-                    deleted_at=None,
+                bundle_attendees = BundleAttendee.alive.filter(
                     activation_sent_at=None
                 ).select_related('bundle_date', 'bundle_date__bundle')
                 
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from webinars import archive
+
+
+class Command(BaseCommand):
+    help = 'Move attendees of webinar and bundle dates long past into the archive tables'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=archive.ARCHIVE_AFTER_DAYS,
+            help='Archive dates more than this many days in the past'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=archive.BATCH_SIZE,
+            help='Attendees to move in each transaction'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count the attendees that would be archived without moving anything'
+        )
+    
+    def handle(self, *args, **options):
+        days = options['days']
+        
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No changes will be made'))
+            dates = archive.archivable_webinar_dates(days=days).aggregate(
+                dates=Count('pk', distinct=True), attendees=Count('attendee')
+            )
+            bundle_dates = archive.archivable_bundle_dates(days=days).aggregate(
+                dates=Count('pk', distinct=True), attendees=Count('bundleattendee')
+            )
+            self.stdout.write(f"Webinar dates: {dates['dates']} dates, {dates['attendees']} attendees to archive")
+            self.stdout.write(
+                f"Bundle dates: {bundle_dates['dates']} dates, {bundle_dates['attendees']} attendees to archive"
+            )
+            return
+        
+        dates, attendees, bundle_dates, bundle_attendees = archive.archive_dates(
+            days=days, batch_size=options['batch_size']
+        )
+        self.stdout.write(self.style.SUCCESS(f'Webinar dates: archived {attendees} attendees of {dates} dates'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Bundle dates: archived {bundle_attendees} attendees of {bundle_dates} dates'
+        ))
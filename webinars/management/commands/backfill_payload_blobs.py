@@ -0,0 +1,78 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from webinars import codec
+from webinars.models import Download, PayloadBlob, WebhookLog
+
+
+class Command(BaseCommand):
+    help = 'Move download payloads and webhook log bodies written before payload blobs into the blob table'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Rows to move in each transaction'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count the rows that would be moved without changing anything'
+        )
+    
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+        
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No changes will be made'))
+        
+        sources = [
+            (
+                'Download payloads',
+                Download._base_manager.filter(payload_blob=None, legacy_payload__isnull=False),
+                'legacy_payload', 'payload_blob', None, codec.dumps_str,
+            ),
+            (
+                'WebhookLog bodies',
+                WebhookLog._base_manager.filter(body_blob=None).exclude(legacy_body=''),
+                'legacy_body', 'body_blob', '', str,
+            ),
+        ]
+        for label, queryset, legacy_field, blob_field, cleared, to_text in sources:
+            if dry_run:
+                self.stdout.write(f'{label}: {queryset.count()} rows to move')
+                continue
+            moved, digests = self.backfill(queryset, legacy_field, blob_field, cleared, to_text, batch_size)
+            self.stdout.write(self.style.SUCCESS(f'{label}: moved {moved} rows into {len(digests)} distinct payloads'))
+    
+    def backfill(self, queryset, legacy_field, blob_field, cleared, to_text, batch_size):
+        """Move one column in primary key batches. Returns (rows moved, set of blob digests)."""
+        model = queryset.model
+        moved = 0
+        digests = set()
+        last_pk = 0
+        
+        while True:
+            rows = list(queryset.filter(pk__gt=last_pk).order_by('pk').values_list('pk', legacy_field)[:batch_size])
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+            
+            texts = {pk: to_text(value) for pk, value in rows}
+            blobs = {PayloadBlob.digest_for(text): text for text in texts.values()}
+            with transaction.atomic():
+                PayloadBlob.objects.bulk_create(
+                    [PayloadBlob(digest=digest, data=text) for digest, text in blobs.items()],
+                    ignore_conflicts=True
+                )
+                for pk, text in texts.items():
+                    model._base_manager.filter(pk=pk).update(**{
+                        f'{blob_field}_id': PayloadBlob.digest_for(text),
+                        legacy_field: cleared,
+                    })
+            moved += len(rows)
+            digests.update(blobs)
+        
+        return moved, digests
@@ -0,0 +1,109 @@
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from webinars.codec import CODECS
+
+# Shapes of the payloads Kajabi sends, with headers as stored in WebhookLog
+HEADERS = {
+    'Content-Length': '612',
+    'Content-Type': 'application/json',
+    'Host': 'webinars.example.com',
+    'User-Agent': 'Kajabi-Webhooks/1.0',
+    'X-Forwarded-For': '203.0.113.5',
+    'X-Kajabi-Signature': 'sha256=9c1185a5c5e9fc54612808977ee8f548b2258d31',
+}
+
+PAYLOADS = {
+    'form_submission': {
+        'id': '0a49a63a-30b3-11f0-a9e9-072cd5d18f1b',
+        'event': 'form_submission.created',
+        'payload': {
+            'First Name': 'John',
+            'Surname': 'Doe',
+            'Email': 'john@example.com',
+            'Webinar options': '21 August, 10-11:00 BST',
+            'custom_field_organisation': 'Example Trust',
+            'form_title': 'Getting started with WordPress multiple dates',
+            'form_id': 2148601234,
+            'site_id': 2147556789,
+            'submitted_at': '2025-05-14T09:12:45.000Z',
+        },
+    },
+    'purchase': {
+        'id': '058d8e00-30d0-11f0-a9de-4760263d74c0',
+        'event': 'purchase.created',
+        'payload': {
+            'offer_id': 2150123456,
+            'offer_title': 'Getting started with wordpress paid',
+            'offer_reference': 'wp-paid',
+            'member_id': 2187654321,
+            'member_email': 'john@example.com',
+            'member_name': 'John Doe',
+            'member_first_name': 'John',
+            'member_last_name': 'Doe',
+            'amount_paid': 4900,
+            'amount_paid_decimal': '49.00',
+            'currency': 'GBP',
+            'payment_method': 'card',
+            'payment_processor': 'stripe',
+            'opt_in': True,
+            'trial': False,
+            'custom_field_getting_started_with_wordpress_dates': '19 June, 10-11:00 BST',
+            'address_line_1': '1 High Street',
+            'address_city': 'London',
+            'address_country': 'GB',
+            'address_zip': 'N1 1AA',
+        },
+    },
+    'download': {
+        'event': 'form_submission.created',
+        'payload': {
+            'First Name': 'Jane',
+            'Last Name': 'Smith',
+            'Email': 'jane@example.com',
+            'Organisation': 'Example Charity',
+            'form_title': 'WordPress security checklist',
+        },
+    },
+}
+
+RESPONSE = {'status': 'success', 'message': 'Attendee John Doe registered and registered in Zoom', 'attendee_id': 12345}
+
+
+class Command(BaseCommand):
+    help = 'Compare the JSON codecs on Kajabi webhook payload shapes (microseconds per operation)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--number',
+            type=int,
+            default=20000,
+            help='Operations to time for each payload and codec'
+        )
+    
+    def handle(self, *args, **options):
+        number = options['number']
+        codecs = {name: codec_class() for name, codec_class in CODECS.items()}
+        if 'orjson' not in codecs:
+            self.stdout.write(self.style.WARNING('orjson is not installed; timing the stdlib codec only'))
+        
+        operations = []
+        for name, payload in PAYLOADS.items():
+            body = codecs['stdlib'].dumps(payload)
+            operations.append((f'parse {name} ({len(body)} bytes)', lambda codec, body=body: codec.loads(body)))
+            operations.append((f'store {name} + headers', lambda codec, payload=payload: (
+                codec.dumps(payload), codec.dumps(HEADERS)
+            )))
+        operations.append(('serialize response', lambda codec: codec.dumps(RESPONSE)))
+        operations.append(('pretty-print purchase', lambda codec: codec.dumps_pretty(PAYLOADS['purchase'])))
+        
+        names = list(codecs)
+        self.stdout.write(f"{'operation':<40}" + ''.join(f'{name:>12}' for name in names))
+        for label, operation in operations:
+            timings = []
+            for name in names:
+                codec = codecs[name]
+                seconds = min(timeit.repeat(lambda: operation(codec), number=number, repeat=3))
+                timings.append(seconds / number * 1_000_000)
+            self.stdout.write(f'{label:<40}' + ''.join(f'{us:>10.2f}us' for us in timings))
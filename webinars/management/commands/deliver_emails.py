@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from webinars.email_service import deliver_outbox
+from webinars.models import OutboundEmail
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued outbox emails via MS365 ($batch) with Django email fallback, retrying failures with backoff'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=100,
+            help='Maximum number of emails to deliver in this run'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be delivered without sending anything'
+        )
+    
+    def handle(self, *args, **options):
+        limit = options['limit']
+        
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No emails will be sent'))
+            due = OutboundEmail.objects.filter(
+                status=OutboundEmail.STATUS_PENDING,
+                next_attempt_at__lte=timezone.now()
+            ).order_by('next_attempt_at')[:limit]
+            for email in due:
+                self.stdout.write(f'[DRY RUN] Would send email {email.id} to {email.to_email}: {email.subject}')
+            return
+        
+        counts = deliver_outbox(limit)
+        
+        if not any(counts.values()):
+            self.stdout.write(self.style.SUCCESS('No emails due for delivery'))
+            return
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"EMAIL DELIVERY COMPLETE: {counts['sent']} sent, {counts['retrying']} to retry, {counts['failed']} failed"
+            )
+        )
+        logger.info(f"Email delivery completed: {counts}")
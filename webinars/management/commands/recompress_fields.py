@@ -0,0 +1,115 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import BinaryField, ExpressionWrapper, F
+
+from webinars import codec, compression
+from webinars.fields import CompressedJSONField, CompressedTextField
+
+
+def compressed_fields(model):
+    """The model's compressed columns."""
+    return [
+        field for field in model._meta.concrete_fields
+        if isinstance(field, (CompressedTextField, CompressedJSONField))
+    ]
+
+
+def encode(field, value):
+    """The bytes field would store for value, as its get_db_prep_value writes them."""
+    if isinstance(field, CompressedJSONField):
+        return compression.compress(codec.dumps(value))
+    return compression.compress(value)
+
+
+def format_size(size):
+    for unit in ['B', 'KB', 'MB']:
+        if abs(size) < 1024:
+            return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1024
+    return f'{size:.1f} GB'
+
+
+class Command(BaseCommand):
+    help = 'Rewrite compressed columns with the current FIELD_COMPRESSION method and report the space saved'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            action='append',
+            help='Only recompress this model (e.g. WebhookLog); can be given more than once'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Rows to read and rewrite in each transaction'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report the space that would be saved without rewriting any rows'
+        )
+    
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        models = [model for model in apps.get_app_config('webinars').get_models() if compressed_fields(model)]
+        if options['model']:
+            names = {name.lower() for name in options['model']}
+            unknown = names - {model.__name__.lower() for model in models}
+            if unknown:
+                raise CommandError(f"No compressed fields on: {', '.join(sorted(unknown))}")
+            models = [model for model in models if model.__name__.lower() in names]
+        
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No changes will be made'))
+        
+        total_before = total_after = 0
+        for model in models:
+            before, after, rewritten = self.recompress(model, options['batch_size'], dry_run)
+            total_before += before
+            total_after += after
+            self.stdout.write(
+                f'{model.__name__}: {rewritten} rows rewritten, '
+                f'{format_size(before)} -> {format_size(after)}'
+            )
+        
+        saved = total_before - total_after
+        percent = saved / total_before * 100 if total_before else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'{"Would save" if dry_run else "Saved"} {format_size(saved)} of {format_size(total_before)} ({percent:.0f}%)'
+        ))
+    
+    def recompress(self, model, batch_size, dry_run):
+        """Recompress one model's columns in primary key batches. Returns (bytes before, bytes after, rows rewritten)."""
+        fields = compressed_fields(model)
+        # Read the stored bytes rather than the values the fields decode
+        raw = {f'_raw_{field.attname}': ExpressionWrapper(F(field.attname), output_field=BinaryField()) for field in fields}
+        queryset = model._base_manager.annotate(**raw).order_by('pk')
+        before = after = rewritten = 0
+        last_pk = None
+        
+        while True:
+            batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            rows = list(batch.values_list('pk', *raw)[:batch_size])
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+            
+            with transaction.atomic():
+                for pk, *values in rows:
+                    changes = {}
+                    for field, value in zip(fields, values):
+                        if value is None:
+                            continue
+                        decoded = field.from_db_value(value, None, None)
+                        stored = encode(field, decoded)
+                        before += compression.stored_size(value)
+                        after += len(stored)
+                        if isinstance(value, str) or bytes(value) != stored:
+                            changes[field.attname] = decoded
+                    if changes and not dry_run:
+                        model._base_manager.filter(pk=pk).update(**changes)
+                    rewritten += bool(changes)
+        
+        return before, after, rewritten
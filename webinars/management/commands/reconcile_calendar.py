@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from webinars.calendar_sync import CalendarReconciler, DEFAULT_WINDOW_DAYS
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Reconcile calendar invites with the MS365 owner calendar using delta queries, updating events whose times changed'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=DEFAULT_WINDOW_DAYS,
+            help='How many days ahead to keep in sync'
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Discard the stored delta link and re-read the whole calendar window'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be updated without changing any events'
+        )
+    
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No calendar events will be updated'))
+        
+        result = CalendarReconciler(window_days=options['days'], dry_run=options['dry_run']).reconcile(full=options['full'])
+        if not result['success']:
+            self.stdout.write(self.style.ERROR(f"Calendar reconciliation failed: {result['error']}"))
+            return
+        
+        summary = (
+            f"{result['changes']} remote changes, {result['patched']} updated, {result['linked']} linked, "
+            f"{result['unchanged']} unchanged, {result['missing']} missing, {result['failed']} failed"
+        )
+        self.stdout.write(self.style.SUCCESS(f'CALENDAR RECONCILIATION COMPLETE: {summary}'))
+        logger.info(f"Calendar reconciliation completed: {summary}")
@@ -0,0 +1,121 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from webinars.models import Attendee
+from webinars.zoom_service import ZoomService, ZoomAPIError
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Zoom accepts at most 30 registrants per batch_registrants call
+ZOOM_BATCH_SIZE = 30
+
+
+class Command(BaseCommand):
+    help = 'Register attendees that have no Zoom registration yet (e.g. from bulk imports) in batches'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=500,
+            help='Maximum number of attendees to process in this run'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be registered without calling Zoom'
+        )
+    
+    def handle(self, *args, **options):
+        limit = options['limit']
+        dry_run = options['dry_run']
+        
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No Zoom registrations will be made'))
+        
+        attendees = list(
+            Attendee.alive.filter(
+                zoom_registrant_id='',
+                zoom_registration_error='',
+                webinar_date__deleted_at=None,
+                webinar_date__on_demand=False,
+                webinar_date__date_time__gte=timezone.now(),
+                webinar_date__zoom_meeting_id__isnull=False,
+            ).exclude(
+                webinar_date__zoom_meeting_id=''
+            ).select_related('webinar_date').order_by('webinar_date_id', 'id')[:limit]
+        )
+        
+        if not attendees:
+            self.stdout.write(self.style.SUCCESS('No attendees pending Zoom registration'))
+            return
+        
+        # Group attendees by Zoom webinar so each batch goes to a single webinar
+        by_meeting = {}
+        for attendee in attendees:
+            by_meeting.setdefault(attendee.webinar_date.zoom_meeting_id, []).append(attendee)
+        
+        self.stdout.write(f'Found {len(attendees)} attendees pending Zoom registration across {len(by_meeting)} webinars')
+        
+        if dry_run:
+            for meeting_id, group in by_meeting.items():
+                self.stdout.write(f'[DRY RUN] Would register {len(group)} attendees in Zoom webinar {meeting_id}')
+            return
+        
+        try:
+            zoom_service = ZoomService()
+        except ZoomAPIError as e:
+            self.stdout.write(self.style.ERROR(f'Zoom is not available: {str(e)}'))
+            return
+        
+        success_count = 0
+        error_count = 0
+        retry_count = 0
+        
+        for meeting_id, group in by_meeting.items():
+            for start in range(0, len(group), ZOOM_BATCH_SIZE):
+                batch = group[start:start + ZOOM_BATCH_SIZE]
+                result = zoom_service.batch_register_attendees(meeting_id, [
+                    {'first_name': a.first_name, 'last_name': a.last_name, 'email': a.email}
+                    for a in batch
+                ])
+                
+                if not result['success'] and result.get('retryable'):
+                    # Zoom is unavailable; leave no error so the next run retries the batch
+                    logger.warning(f"Zoom unavailable, {len(batch)} registrations for webinar {meeting_id} left for retry: {result['error']}")
+                    retry_count += len(batch)
+                    continue
+                
+                now = timezone.now()
+                for attendee in batch:
+                    registrant = result.get('registrants', {}).get(attendee.email.lower()) if result['success'] else None
+                    if registrant and registrant.get('registrant_id'):
+                        attendee.zoom_registrant_id = registrant['registrant_id']
+                        attendee.zoom_join_url = registrant['join_url'] or ''
+                        attendee.zoom_invite_link = registrant['invite_link'] or ''
+                        attendee.zoom_registered_at = now
+                        attendee.zoom_registration_error = ''
+                        success_count += 1
+                    else:
+                        attendee.zoom_registration_error = result.get('error', 'Not returned by Zoom batch registration')
+                        error_count += 1
+                    attendee.updated_at = now
+                
+                Attendee.objects.bulk_update(batch, [
+                    'zoom_registrant_id', 'zoom_join_url', 'zoom_invite_link',
+                    'zoom_registered_at', 'zoom_registration_error', 'updated_at'
+                ])
+                
+                if not result['success']:
+                    logger.warning(f"Zoom batch registration failed for webinar {meeting_id}: {result['error']}")
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'ZOOM REGISTRATION COMPLETE: {success_count} successful, {error_count} failed, '
+                f'{retry_count} left for retry'
+            )
+        )
+        logger.info(
+            f"Zoom pending registration completed: {success_count} successful, {error_count} failed, "
+            f"{retry_count} left for retry"
+        )
@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+from webinars.models import ClinicBooking
+from webinars.utils import process_clinic_booking
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Retry Zoom meetings and calendar invites for clinic bookings queued while Zoom or Graph was unavailable'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=50,
+            help='Maximum number of clinic bookings to process in this run'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be retried without calling Zoom or Graph'
+        )
+    
+    def handle(self, *args, **options):
+        limit = options['limit']
+        dry_run = options['dry_run']
+        
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No Zoom meetings or calendar invites will be created'))
+        
+        # Bookings skipped because an integration was down have neither a result nor an error recorded
+        bookings = list(
+            ClinicBooking.alive.filter(
+                clinic_date__gte=timezone.now(),
+            ).filter(
+                Q(zoom_meeting_id='', zoom_creation_error='') |
+                Q(calendar_invite_sent_at=None, calendar_invite_error='')
+            ).order_by('clinic_date')[:limit]
+        )
+        
+        if not bookings:
+            self.stdout.write(self.style.SUCCESS('No clinic bookings queued for retry'))
+            return
+        
+        self.stdout.write(f'Found {len(bookings)} clinic bookings queued for retry')
+        
+        if dry_run:
+            for booking in bookings:
+                self.stdout.write(f'[DRY RUN] Would retry clinic booking {booking.id} for {booking.email}')
+            return
+        
+        completed_count = 0
+        for booking in bookings:
+            process_clinic_booking(booking)
+            if booking.zoom_meeting_id and booking.calendar_invite_sent_at:
+                completed_count += 1
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'CLINIC RETRY COMPLETE: {completed_count} of {len(bookings)} bookings completed')
+        )
+        logger.info(f"Clinic booking retry completed: {completed_count} of {len(bookings)} bookings completed")
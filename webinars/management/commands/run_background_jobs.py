@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from webinars.background_jobs import run_pending_jobs
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (bulk activations, calendar invites, Zoom webinar creation)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run the jobs that are pending now and exit'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Maximum number of jobs to run (with --once)'
+        )
+        parser.add_argument(
+            '--quiet',
+            action='store_true',
+            help='Print nothing when no jobs are pending (with --once)'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=int,
+            default=2,
+            help='Seconds to wait between checks for new jobs'
+        )
+    
+    def handle(self, *args, **options):
+        if options['once']:
+            jobs = run_pending_jobs(options.get('limit'))
+            if not jobs:
+                if options['quiet']:
+                    return
+                self.stdout.write(self.style.SUCCESS('No background jobs pending'))
+                return
+            for job in jobs:
+                self.stdout.write(f'Job {job.id} {job}: {job.message}')
+            self.stdout.write(self.style.SUCCESS(f'BACKGROUND JOBS COMPLETE: {len(jobs)} run'))
+            return
+        
+        self.stdout.write('Waiting for background jobs')
+        try:
+            while True:
+                close_old_connections()
+                for job in run_pending_jobs():
+                    logger.info(f"Background job {job.id} {job}: {job.message}")
+                time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.SUCCESS('Background job worker stopped'))
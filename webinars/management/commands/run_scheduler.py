@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand, CommandError
+from webinars.scheduler import JOBS, Scheduler
+import logging
+import signal
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Run the periodic jobs (activations, emails, Salesforce sync, calendar reconciliation, retention) on the node holding the scheduler lease'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run the jobs that are due once and exit'
+        )
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='List the registered jobs with their last run'
+        )
+        parser.add_argument(
+            '--job',
+            action='append',
+            help='Only run this job (can be repeated)'
+        )
+        parser.add_argument(
+            '--tick',
+            type=int,
+            default=5,
+            help='Seconds between checks for due jobs'
+        )
+    
+    def handle(self, *args, **options):
+        jobs = list(JOBS.values())
+        if options['job']:
+            unknown = set(options['job']) - set(JOBS)
+            if unknown:
+                raise CommandError(f"Unknown jobs: {', '.join(sorted(unknown))}")
+            jobs = [JOBS[name] for name in options['job']]
+        
+        scheduler = Scheduler(jobs=jobs, tick=options['tick'])
+        
+        if options['list']:
+            for job in jobs:
+                last = scheduler.last_run(job)
+                if last:
+                    status = 'running' if last.success is None else ('ok' if last.success else 'FAILED')
+                    last_text = f"last run {last.started_at.strftime('%Y-%m-%d %H:%M:%S')} ({status})"
+                else:
+                    last_text = 'never run'
+                self.stdout.write(f"{job.name}: every {job.interval}s (+{job.jitter}s jitter), {last_text}")
+            return
+        
+        if options['once']:
+            runs = scheduler.run_pending()
+            if not scheduler.is_leader:
+                self.stdout.write(self.style.WARNING('Another scheduler holds the lease; nothing run'))
+                return
+            failed = sum(1 for run in runs if not run.success)
+            self.stdout.write(
+                self.style.SUCCESS(f"SCHEDULER RUN COMPLETE: {len(runs) - failed} succeeded, {failed} failed")
+            )
+            return
+        
+        signal.signal(signal.SIGTERM, scheduler.stop)
+        signal.signal(signal.SIGINT, scheduler.stop)
+        self.stdout.write(f"Scheduler {scheduler.holder} started with {len(jobs)} jobs")
+        logger.info(f"Scheduler {scheduler.holder} started")
+        scheduler.run_forever()
+        self.stdout.write(self.style.SUCCESS('Scheduler stopped'))
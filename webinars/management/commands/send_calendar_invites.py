@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from webinars.ms365_service import MS365CalendarService, pending_calendar_invite_dates
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Send calendar invites for all upcoming webinar dates without one, using Graph $batch requests'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Maximum number of webinar dates to send invites for (default: no limit)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show which webinar dates would get invites without sending them'
+        )
+    
+    def handle(self, *args, **options):
+        webinar_dates = pending_calendar_invite_dates()
+        if options['limit']:
+            webinar_dates = webinar_dates[:options['limit']]
+        webinar_dates = list(webinar_dates)
+        
+        if not webinar_dates:
+            self.stdout.write(self.style.SUCCESS('No webinar dates waiting for calendar invites'))
+            return
+        
+        self.stdout.write(f'Found {len(webinar_dates)} webinar dates waiting for calendar invites')
+        
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No calendar invites will be sent'))
+            for webinar_date in webinar_dates:
+                self.stdout.write(f'[DRY RUN] Would send invite for {webinar_date}')
+            return
+        
+        result = MS365CalendarService().send_bulk_calendar_invites(webinar_dates)
+        if not result['success']:
+            self.stdout.write(self.style.ERROR(f"Calendar invites not sent: {result['error']}"))
+            return
+        
+        self.stdout.write(
+            self.style.SUCCESS(f"CALENDAR INVITES COMPLETE: {result['sent']} sent, {result['failed']} failed")
+        )
+        logger.info(f"Bulk calendar invites completed: {result['sent']} sent, {result['failed']} failed")
@@ -37,8 +37,7 @@ class Command(BaseCommand):
         pending_items = []
         
         # Get pending regular attendees
-        regular_attendees = Attendee.objects.filter(
-            deleted_at=None,
+        regular_attendees = Attendee.alive.filter(
             salesforce_sync_pending=True
         ).select_related('webinar_date__webinar')[:limit]
         
@@ -48,8 +47,7 @@ class Command(BaseCommand):
         # Get pending on-demand attendees
         if len(pending_items) < limit:
             remaining = limit - len(pending_items)
-            ondemand_attendees = OnDemandAttendee.objects.filter(
-                deleted_at=None,
+            ondemand_attendees = OnDemandAttendee.alive.filter(
                 salesforce_sync_pending=True
             ).select_related('webinar')[:remaining]
             
@@ -59,8 +57,7 @@ class Command(BaseCommand):
         # Get pending bundle attendees
         if len(pending_items) < limit:
             remaining = limit - len(pending_items)
-            bundle_attendees = BundleAttendee.objects.filter(
-                deleted_at=None,
+            bundle_attendees = BundleAttendee.alive.filter(
                 salesforce_sync_pending=True
             ).select_related('bundle_date__bundle')[:remaining]
             
@@ -70,8 +67,7 @@ class Command(BaseCommand):
         # Get pending downloads
         if len(pending_items) < limit:
             remaining = limit - len(pending_items)
-            downloads = Download.objects.filter(
-                deleted_at=None,
+            downloads = Download.alive.filter(
                 salesforce_sync_pending=True
             )[:remaining]
             
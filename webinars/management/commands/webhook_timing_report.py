@@ -0,0 +1,69 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from webinars.models import WebhookLog
+
+PERCENTILES = [50, 90, 95, 99]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, int(round(pct / 100 * len(sorted_values))) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+class Command(BaseCommand):
+    help = 'Report per-stage webhook processing time percentiles from WebhookLog timings'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=7,
+            help='Only include webhooks received in the last N days'
+        )
+        parser.add_argument(
+            '--path',
+            help='Only include webhooks for this path (e.g. /api/attendee-webhook/)'
+        )
+        parser.add_argument(
+            '--failed-only',
+            action='store_true',
+            help='Only include webhooks that failed'
+        )
+    
+    def handle(self, *args, **options):
+        logs = WebhookLog.objects.filter(
+            created_at__gte=timezone.now() - timedelta(days=options['days']),
+            timings__isnull=False
+        )
+        if options['path']:
+            logs = logs.filter(path=options['path'])
+        if options['failed_only']:
+            logs = logs.filter(success=False)
+        
+        stages = {}
+        totals = []
+        for timings, total in logs.values_list('timings', 'processing_time_ms').iterator():
+            for stage, duration in (timings or {}).items():
+                stages.setdefault(stage, []).append(duration)
+            if total is not None:
+                totals.append(total)
+        
+        if not totals:
+            self.stdout.write(self.style.WARNING('No webhook timings found for the selected period'))
+            return
+        
+        header = f"{'stage':<20}{'count':>8}" + ''.join(f"{f'p{pct}':>10}" for pct in PERCENTILES) + f"{'max':>10}"
+        self.stdout.write(f'Webhook timings (ms) over the last {options["days"]} days, {len(totals)} requests')
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        
+        rows = sorted(stages.items(), key=lambda item: -percentile(sorted(item[1]), 95))
+        rows.append(('total', totals))
+        for stage, values in rows:
+            values = sorted(values)
+            line = f'{stage:<20}{len(values):>8}'
+            line += ''.join(f'{percentile(values, pct):>10.1f}' for pct in PERCENTILES)
+            line += f'{values[-1]:>10.1f}'
+            self.stdout.write(line)
@@ -0,0 +1,184 @@
+import ipaddress
+import os
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.utils import timezone
+from prometheus_client import CollectorRegistry, Counter, Histogram, REGISTRY, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+
+# Request metrics, labelled by URL name so webhook endpoints each get their own series
+HTTP_REQUESTS = Counter(
+    'webinars_http_requests_total',
+    'HTTP requests handled, by view and response status',
+    ['view', 'status']
+)
+HTTP_LATENCY = Histogram(
+    'webinars_http_request_duration_seconds',
+    'Time spent handling HTTP requests, by view',
+    ['view'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30)
+)
+DB_QUERIES = Histogram(
+    'webinars_http_request_db_queries',
+    'Database queries executed per HTTP request, by view',
+    ['view'],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 250, 500)
+)
+DB_TIME = Histogram(
+    'webinars_http_request_db_seconds',
+    'Time spent in database queries per HTTP request, by view',
+    ['view'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+OVER_QUERY_BUDGET = Counter(
+    'webinars_http_requests_over_query_budget_total',
+    'HTTP requests that went over the query count or database time budget, by view',
+    ['view']
+)
+RATE_LIMITED = Counter(
+    'webinars_rate_limited_requests_total',
+    'Requests refused before reaching the view, by view and reason (ip, endpoint, shed)',
+    ['view', 'reason']
+)
+
+# Outbound integration metrics: zoom, graph, kajabi, salesforce
+OUTBOUND_REQUESTS = Counter(
+    'webinars_outbound_requests_total',
+    'Calls to external integrations, by outcome (ok, error, skipped)',
+    ['integration', 'outcome']
+)
+OUTBOUND_LATENCY = Histogram(
+    'webinars_outbound_request_duration_seconds',
+    'Time spent in calls to external integrations',
+    ['integration'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 15, 30)
+)
+
+
+class OutboundCall:
+    """Outcome holder for track_outbound_call; set outcome to 'error' for failed responses."""
+    
+    def __init__(self):
+        self.outcome = 'ok'
+
+
+@contextmanager
+def track_outbound_call(integration):
+    """Count and time one call to an integration. Exceptions count as errors."""
+    call = OutboundCall()
+    start = time.perf_counter()
+    try:
+        yield call
+    except Exception:
+        call.outcome = 'error'
+        raise
+    finally:
+        OUTBOUND_LATENCY.labels(integration).observe(time.perf_counter() - start)
+        OUTBOUND_REQUESTS.labels(integration, call.outcome).inc()
+
+
+def record_skipped_call(integration):
+    """Count a call that was skipped because the integration is unavailable."""
+    OUTBOUND_REQUESTS.labels(integration, 'skipped').inc()
+
+
+def track_outbound(integration):
+    """
+    Decorator version of track_outbound_call for service methods that return
+    (success, ...) tuples; a False success counts as an error.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with track_outbound_call(integration) as call:
+                result = func(*args, **kwargs)
+                if isinstance(result, tuple) and result and result[0] is False:
+                    call.outcome = 'error'
+                return result
+        return wrapper
+    return decorator
+
+
+class QueueDepthCollector:
+    """
+    Gauges for work waiting on background jobs, read from the database at
+    scrape time so every worker reports the same numbers.
+    """
+    
+    def collect(self):
+        from .models import Attendee, BundleAttendee, OnDemandAttendee, Download, ClinicBooking
+        
+        now = timezone.now()
+        
+        activations = GaugeMetricFamily(
+            'webinars_pending_activations',
+            'Attendees due a Kajabi grant activation that has not been sent',
+            labels=['kind']
+        )
+        activations.add_metric(['webinar'], Attendee.alive.filter(
+            activation_sent_at=None,
+            webinar_date__on_demand=False,
+            webinar_date__date_time__lte=now - timedelta(hours=2)
+        ).count())
+        activations.add_metric(['bundle'], BundleAttendee.alive.filter(
+            activation_sent_at=None,
+            bundle_date__date__lt=now.date()
+        ).count())
+        activations.add_metric(['on_demand'], OnDemandAttendee.alive.filter(
+            activation_sent_at=None
+        ).count())
+        yield activations
+        
+        salesforce = GaugeMetricFamily(
+            'webinars_pending_salesforce_syncs',
+            'Records waiting to be synced to Salesforce',
+            labels=['model']
+        )
+        for model in (Attendee, OnDemandAttendee, BundleAttendee, Download, ClinicBooking):
+            salesforce.add_metric([model.__name__], model.alive.filter(
+                salesforce_sync_pending=True
+            ).count())
+        yield salesforce
+        
+        yield GaugeMetricFamily(
+            'webinars_failed_zoom_registrations',
+            'Attendees whose Zoom registration failed',
+            value=Attendee.alive.filter(zoom_registrant_id='').exclude(
+                zoom_registration_error=''
+            ).count()
+        )
+
+
+_queue_registry = CollectorRegistry(auto_describe=False)
+_queue_registry.register(QueueDepthCollector())
+
+
+def render_metrics():
+    """
+    Return the Prometheus text exposition of all metrics.
+    
+    Under gunicorn set PROMETHEUS_MULTIPROC_DIR (see gunicorn.conf.py) so the
+    counters and histograms from every worker are aggregated from their files.
+    """
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry) + generate_latest(_queue_registry)
+
+
+def is_internal_address(ip):
+    """Whether ip is loopback, private or listed in settings.INTERNAL_IPS."""
+    if ip in getattr(settings, 'INTERNAL_IPS', []):
+        return True
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+    return address.is_loopback or address.is_private
@@ -0,0 +1,299 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+
+from . import rate_limit
+from .db_router import pin_reads_to_primary
+from .metrics import HTTP_REQUESTS, HTTP_LATENCY, DB_QUERIES, DB_TIME, OVER_QUERY_BUDGET, RATE_LIMITED
+
+logger = logging.getLogger(__name__)
+
+# Requests making more queries or spending longer in the database than this are logged
+# with their most repeated queries; overridable with settings.QUERY_BUDGET
+DEFAULT_QUERY_BUDGET = {
+    'queries': 50,
+    'db_seconds': 0.5,
+}
+
+# Repeated queries listed in the log line of a request over budget
+TOP_FINGERPRINTS = 5
+
+_IN_LIST = re.compile(r'\bIN \((?:%s|\?)(?:, (?:%s|\?))*\)', re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_SPACE = re.compile(r'\s+')
+
+
+def get_query_budget():
+    return {**DEFAULT_QUERY_BUDGET, **getattr(settings, 'QUERY_BUDGET', {})}
+
+
+def fingerprint(sql):
+    """
+    Reduce a query to its shape, so the queries of an N+1 loop that differ
+    only in their parameters or IN list lengths count as the same query.
+    """
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+
+class QueryStats:
+    """Query count, database time and query fingerprints of one request."""
+    
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.fingerprints = Counter()
+    
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+    
+    def over_budget(self, budget):
+        return self.count > budget['queries'] or self.seconds > budget['db_seconds']
+    
+    def top_repeated(self, n=TOP_FINGERPRINTS):
+        return [(sql, count) for sql, count in self.fingerprints.most_common(n) if count > 1]
+
+
+# QueryStats of the request being measured. Context variables follow a request
+# into the threads sync_to_async runs its queries in, which have their own connections.
+_current_queries = ContextVar('current_queries', default=None)
+
+
+def count_query(execute, sql, params, many, context):
+    """Execute wrapper adding the query to the QueryStats of the request being measured, if any."""
+    queries = _current_queries.get()
+    if queries is None:
+        return execute(sql, params, many, context)
+    return queries(execute, sql, params, many, context)
+
+
+def install_query_counter(connection, **kwargs):
+    """
+    Add count_query to a connection's execute wrappers once. It goes first, as
+    connection.execute_wrapper() removes the last wrapper when it exits.
+    """
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, count_query)
+
+
+# Connections are per thread; this covers the ones opened by sync_to_async's threads
+connection_created.connect(install_query_counter)
+
+
+class MetricsMiddleware:
+    """
+    Record request counts, latency and database query counts and time per view,
+    and log requests that go over the query budget.
+    Works on both the WSGI and ASGI entry points, so async views stay async,
+    and counts their queries in whichever thread sync_to_async runs them.
+    """
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        
+        with self.measure(request) as record:
+            response = self.get_response(request)
+            record(response)
+        return response
+    
+    async def __acall__(self, request):
+        with self.measure(request) as record:
+            response = await self.get_response(request)
+            record(response)
+        return response
+    
+    @contextmanager
+    def measure(self, request):
+        queries = QueryStats()
+        
+        def record(response):
+            duration = time.perf_counter() - start
+            
+            # Label by URL name rather than path to keep the number of series bounded
+            match = request.resolver_match
+            view = (match.url_name or match.view_name) if match else 'unresolved'
+            
+            HTTP_REQUESTS.labels(view, str(response.status_code)).inc()
+            HTTP_LATENCY.labels(view).observe(duration)
+            DB_QUERIES.labels(view).observe(queries.count)
+            DB_TIME.labels(view).observe(queries.seconds)
+            
+            if queries.over_budget(get_query_budget()):
+                OVER_QUERY_BUDGET.labels(view).inc()
+                logger.warning(
+                    "%s %s (%s) over query budget: %d queries, %.0fms in the database; most repeated: %s",
+                    request.method, request.path, view, queries.count, queries.seconds * 1000,
+                    '; '.join(f"{count}x {sql}" for sql, count in queries.top_repeated()) or 'none'
+                )
+        
+        start = time.perf_counter()
+        # Count queries on every alias, so reads routed to the replica are included
+        for alias in connections:
+            install_query_counter(connections[alias])
+        token = _current_queries.set(queries)
+        try:
+            yield record
+        finally:
+            _current_queries.reset(token)
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Keep a logged-in session's reads on the primary for a while after it makes
+    a POST, PUT, PATCH or DELETE, so it doesn't read from a replica that hasn't
+    caught up with its own write (see db_router). Goes after SessionMiddleware
+    and AuthenticationMiddleware; anonymous requests such as webhooks are
+    skipped so they don't create sessions.
+    """
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        
+        response = self.get_response(request)
+        if self.wrote(request):
+            pin_reads_to_primary(request)
+        return response
+    
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if await sync_to_async(self.wrote)(request):
+            pin_reads_to_primary(request)
+        return response
+    
+    def wrote(self, request):
+        if request.method in ('GET', 'HEAD', 'OPTIONS', 'TRACE'):
+            return False
+        user = getattr(request, 'user', None)
+        return user is not None and user.is_authenticated
+
+
+class RateLimitMiddleware:
+    """
+    Refuse requests to the public webhook and cron endpoints (see rate_limit)
+    with a 429 when the client's or the endpoint's token bucket is empty, and
+    with a 503 when the worker is already handling RATE_LIMIT_MAX_IN_FLIGHT of
+    them (RATE_LIMIT_MAX_IN_FLIGHT_ASYNC on the ASGI entry point). Goes before
+    SessionMiddleware, so refused requests cost a couple of cache calls and
+    never have their body read or a WebhookLog written. If the cache is down
+    requests are let through rather than refused.
+    """
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.in_flight = 0
+        self.lock = threading.Lock()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        
+        view_name = self.limited_view(request)
+        if view_name is None:
+            return self.get_response(request)
+        
+        refused = self.refuse(view_name, request, rate_limit.MAX_IN_FLIGHT)
+        if refused:
+            return refused
+        try:
+            return self.get_response(request)
+        finally:
+            self.finish()
+    
+    async def __acall__(self, request):
+        view_name = self.limited_view(request)
+        if view_name is None:
+            return await self.get_response(request)
+        
+        refused = await sync_to_async(self.refuse)(view_name, request, rate_limit.MAX_IN_FLIGHT_ASYNC)
+        if refused:
+            return refused
+        try:
+            return await self.get_response(request)
+        finally:
+            self.finish()
+    
+    def limited_view(self, request):
+        try:
+            url_name = resolve(request.path_info).url_name
+        except Resolver404:
+            return None
+        return url_name if url_name in rate_limit.RATE_LIMITED_VIEWS else None
+    
+    def refuse(self, view_name, request, max_in_flight):
+        """
+        Return the 429 or 503 response for a refused request, or None and count
+        it in flight. max_in_flight None means no cap on requests in flight.
+        """
+        with self.lock:
+            shed = max_in_flight is not None and self.in_flight >= max_in_flight
+            if not shed:
+                self.in_flight += 1
+        if shed:
+            RATE_LIMITED.labels(view_name, 'shed').inc()
+            logger.warning("Shedding %s from %s: %d requests in flight", view_name, rate_limit.client_ip(request), max_in_flight)
+            return self.too_busy(503, 1)
+        
+        try:
+            limited = rate_limit.check(view_name, request)
+        except Exception:
+            # A cache outage shouldn't take the webhooks down with it
+            logger.exception("Rate limit check for %s failed; letting the request through", view_name)
+            limited = None
+        if limited:
+            self.finish()
+            scope, retry_after = limited
+            RATE_LIMITED.labels(view_name, scope).inc()
+            logger.warning("Rate limited %s from %s (%s bucket empty)", view_name, rate_limit.client_ip(request), scope)
+            return self.too_busy(429, retry_after)
+        return None
+    
+    def finish(self):
+        with self.lock:
+            self.in_flight -= 1
+    
+    def too_busy(self, status, retry_after):
+        response = HttpResponse('Too Many Requests' if status == 429 else 'Service Unavailable',
+                                content_type='text/plain', status=status)
+        response['Retry-After'] = str(retry_after)
+        return response
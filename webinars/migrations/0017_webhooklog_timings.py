@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webinars', '0016_clinicbooking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhooklog',
+            name='timings',
+            field=models.JSONField(blank=True, help_text='Milliseconds spent in each processing stage', null=True),
+        ),
+    ]
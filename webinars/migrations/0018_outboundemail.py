@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webinars', '0017_webhooklog_timings'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='OutboundEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('to_email', models.EmailField(max_length=254)),
+                ('from_email', models.EmailField(blank=True, help_text='Sender; blank uses the MS365 owner or DEFAULT_FROM_EMAIL', max_length=254)),
+                ('subject', models.CharField(max_length=255)),
+                ('message', models.TextField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Not delivered before this time')),
+                ('last_error', models.TextField(blank=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('sent_via', models.CharField(blank=True, help_text='ms365 or django', max_length=10)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='webinars_ou_status_3a31d2_idx')],
+            },
+        ),
+    ]
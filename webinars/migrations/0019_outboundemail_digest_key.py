@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webinars', '0018_outboundemail'),
+    ]
+    
+    operations = [
+        migrations.AddField(
+            model_name='outboundemail',
+            name='digest_key',
+            field=models.CharField(blank=True, help_text='Set on error digests until their message is built', max_length=64),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webinars', '0019_outboundemail_digest_key'),
+    ]
+    
+    operations = [
+        migrations.AddField(
+            model_name='bundledate',
+            name='calendar_event_id',
+            field=models.CharField(blank=True, help_text='Microsoft Graph id of the calendar invite event', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='bundledate',
+            name='calendar_ical_uid',
+            field=models.CharField(blank=True, help_text='iCalUId of the calendar invite event', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='clinicbooking',
+            name='calendar_event_id',
+            field=models.CharField(blank=True, help_text='Microsoft Graph id of the calendar invite event', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='clinicbooking',
+            name='calendar_ical_uid',
+            field=models.CharField(blank=True, help_text='iCalUId of the calendar invite event', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='webinardate',
+            name='calendar_event_id',
+            field=models.CharField(blank=True, help_text='Microsoft Graph id of the calendar invite event', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='webinardate',
+            name='calendar_ical_uid',
+            field=models.CharField(blank=True, help_text='iCalUId of the calendar invite event', max_length=255),
+        ),
+    ]
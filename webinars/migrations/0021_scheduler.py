@@ -0,0 +1,40 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webinars', '0020_calendar_event_ids'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchedulerLease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('holder', models.CharField(blank=True, help_text='host:pid of the process holding the lease', max_length=255)),
+                ('expires_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='JobRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job', models.CharField(max_length=100)),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('success', models.BooleanField(blank=True, help_text='Empty while the job is running', null=True)),
+                ('duration_ms', models.IntegerField(blank=True, null=True)),
+                ('output', models.TextField(blank=True)),
+                ('error', models.TextField(blank=True)),
+                ('holder', models.CharField(blank=True, help_text='host:pid of the scheduler that ran the job', max_length=255)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['job', '-started_at'], name='webinars_jo_job_305a97_idx')],
+            },
+        ),
+    ]
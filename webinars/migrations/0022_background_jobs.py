@@ -0,0 +1,52 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webinars', '0021_scheduler'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackgroundJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('activate_webinar_date', 'Activate webinar date attendees'), ('activate_bundle_date', 'Activate bundle date attendees'), ('send_calendar_invite', 'Send calendar invite'), ('create_zoom_webinar', 'Create Zoom webinar')], max_length=50)),
+                ('object_id', models.IntegerField(help_text='Id of the webinar date or bundle date the job acts on')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('requested_by', models.CharField(blank=True, max_length=150)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('claimed_until', models.DateTimeField(blank=True, help_text='A running job whose claim expired is picked up by another worker', null=True)),
+                ('item_keys', models.JSONField(blank=True, default=list, help_text='Items to process, fixed when the job starts')),
+                ('total', models.IntegerField(default=0)),
+                ('processed', models.IntegerField(default=0)),
+                ('succeeded', models.IntegerField(default=0)),
+                ('failed', models.IntegerField(default=0)),
+                ('message', models.TextField(blank=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'claimed_until'], name='webinars_ba_status_115e18_idx'), models.Index(fields=['kind', 'object_id'], name='webinars_ba_kind_811118_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='BackgroundJobItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.IntegerField()),
+                ('success', models.BooleanField(blank=True, help_text='Empty if the item was skipped', null=True)),
+                ('message', models.TextField(blank=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='webinars.backgroundjob')),
+            ],
+            options={
+                'ordering': ['position'],
+                'indexes': [models.Index(fields=['job', 'position'], name='webinars_ba_job_id_7879a1_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:47
+
+import webinars.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webinars', '0022_background_jobs'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='download',
+            name='payload',
+            field=webinars.fields.CodecJSONField(help_text='Full webhook payload'),
+        ),
+        migrations.AlterField(
+            model_name='webhooklog',
+            name='headers',
+            field=webinars.fields.CodecJSONField(),
+        ),
+        migrations.AlterField(
+            model_name='webhooklog',
+            name='timings',
+            field=webinars.fields.CodecJSONField(blank=True, help_text='Milliseconds spent in each processing stage', null=True),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:53
+
+import webinars.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webinars', '0023_json_codec_fields'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='attendee',
+            name='activation_error',
+            field=webinars.fields.CompressedTextField(blank=True, help_text='Error message if activation failed'),
+        ),
+        migrations.AlterField(
+            model_name='attendee',
+            name='salesforce_sync_error',
+            field=webinars.fields.CompressedTextField(blank=True, help_text='Error message if Salesforce sync failed'),
+        ),
+        migrations.AlterField(
+            model_name='attendee',
+            name='zoom_registration_error',
+            field=webinars.fields.CompressedTextField(blank=True, help_text='Error message if Zoom registration failed'),
+        ),
+        migrations.AlterField(
+            model_name='bundleattendee',
+            name='activation_error',
+            field=webinars.fields.CompressedTextField(blank=True, help_text='Error message if activation failed'),
+        ),
+        migrations.AlterField(
+            model_name='bundleattendee',
+            name='salesforce_sync_error',
+            field=webinars.fields.CompressedTextField(blank=True, help_text='Error message if Salesforce sync failed'),
+        ),
+        migrations.AlterField(
+            model_name='clinicbooking',
+            name='calendar_invite_error',
+            field=webinars.fields.CompressedTextField(blank=True, help_text='Error message if calendar invite failed'),
+        ),
+        migrations.AlterField(
+            model_name='clinicbooking',
+            name='salesforce_sync_error',
+            field=webinars.fields.CompressedTextField(blank=True, help_text='Error message if Salesforce sync failed'),
+        ),
+        migrations.AlterField(
+            model_name='clinicbooking',
+            name='zoom_creation_error',
+            field=webinars.fields.CompressedTextField(blank=True, help_text='Error message if Zoom meeting creation failed'),
+        ),
+        migrations.AlterField(
+            model_name='download',
+            name='payload',
+            field=webinars.fields.CompressedJSONField(help_text='Full webhook payload'),
+        ),
+        migrations.AlterField(
+            model_name='download',
+            name='salesforce_sync_error',
+            field=webinars.fields.CompressedTextField(blank=True, help_text='Error message if Salesforce sync failed'),
+        ),
+        migrations.AlterField(
+            model_name='ondemandattendee',
+            name='activation_error',
+            field=webinars.fields.CompressedTextField(blank=True, help_text='Error message if activation failed'),
+        ),
+        migrations.AlterField(
+            model_name='ondemandattendee',
+            name='salesforce_sync_error',
+            field=webinars.fields.CompressedTextField(blank=True, help_text='Error message if Salesforce sync failed'),
+        ),
+        migrations.AlterField(
+            model_name='webhooklog',
+            name='body',
+            field=webinars.fields.CompressedTextField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name='webhooklog',
+            name='error_message',
+            field=webinars.fields.CompressedTextField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name='webhooklog',
+            name='headers',
+            field=webinars.fields.CompressedJSONField(),
+        ),
+        migrations.AlterField(
+            model_name='webhooklog',
+            name='response_body',
+            field=webinars.fields.CompressedTextField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name='webinardate',
+            name='calendar_invite_error',
+            field=webinars.fields.CompressedTextField(blank=True, help_text='Error message if calendar invite failed'),
+        ),
+    ]
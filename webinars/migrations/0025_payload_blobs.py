@@ -0,0 +1,53 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:57
+
+import django.db.models.deletion
+import webinars.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webinars', '0024_compressed_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayloadBlob',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('data', webinars.fields.CompressedTextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+        migrations.RenameField(
+            model_name='download',
+            old_name='payload',
+            new_name='legacy_payload',
+        ),
+        migrations.AlterField(
+            model_name='download',
+            name='legacy_payload',
+            field=webinars.fields.CompressedJSONField(blank=True, help_text='Payload of downloads written before payload blobs, until backfill_payload_blobs moves it', null=True),
+        ),
+        migrations.RenameField(
+            model_name='webhooklog',
+            old_name='body',
+            new_name='legacy_body',
+        ),
+        migrations.AlterField(
+            model_name='webhooklog',
+            name='legacy_body',
+            field=webinars.fields.CompressedTextField(blank=True, help_text='Body of logs written before payload blobs, until backfill_payload_blobs moves it'),
+        ),
+        migrations.AddField(
+            model_name='download',
+            name='payload_blob',
+            field=models.ForeignKey(blank=True, help_text='Full webhook payload', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='webinars.payloadblob'),
+        ),
+        migrations.AddField(
+            model_name='webhooklog',
+            name='body_blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='webinars.payloadblob'),
+        ),
+    ]
@@ -0,0 +1,168 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:02
+
+import django.db.models.deletion
+import webinars.fields
+from django.db import migrations, models
+
+# Columns of the attendee history views, in the same order for both halves of the UNION
+ATTENDEE_COLUMNS = """
+    id, created_at, updated_at, deleted_at, first_name, last_name, email,
+    organization, activation_sent_at, activation_success, activation_error,
+    salesforce_contact_id, salesforce_account_id, salesforce_task_id,
+    salesforce_sync_error, salesforce_synced_at, salesforce_sync_pending,
+    webinar_date_id, zoom_registrant_id, zoom_join_url, zoom_invite_link,
+    zoom_registered_at, zoom_registration_error,
+"""
+
+BUNDLE_ATTENDEE_COLUMNS = """
+    id, created_at, updated_at, deleted_at, first_name, last_name, email,
+    organization, activation_sent_at, activation_success, activation_error,
+    salesforce_contact_id, salesforce_account_id, salesforce_task_id,
+    salesforce_sync_error, salesforce_synced_at, salesforce_sync_pending,
+    bundle_date_id,
+"""
+
+
+def history_view(name, hot_table, archive_table, columns):
+    return migrations.RunSQL(
+        f"CREATE VIEW {name} AS "
+        f"SELECT {columns} FALSE AS archived FROM {hot_table} "
+        f"UNION ALL "
+        f"SELECT {columns} TRUE AS archived FROM {archive_table}",
+        f"DROP VIEW {name}",
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webinars', '0025_payload_blobs'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='AttendeeHistory',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('first_name', models.CharField(max_length=100)),
+                ('last_name', models.CharField(max_length=100)),
+                ('email', models.EmailField(max_length=254)),
+                ('organization', models.CharField(blank=True, max_length=255)),
+                ('activation_sent_at', models.DateTimeField(blank=True, null=True)),
+                ('activation_success', models.BooleanField(blank=True, null=True)),
+                ('activation_error', webinars.fields.CompressedTextField(blank=True)),
+                ('salesforce_contact_id', models.CharField(blank=True, max_length=50)),
+                ('salesforce_account_id', models.CharField(blank=True, max_length=50)),
+                ('salesforce_task_id', models.CharField(blank=True, max_length=50)),
+                ('salesforce_sync_error', webinars.fields.CompressedTextField(blank=True)),
+                ('salesforce_synced_at', models.DateTimeField(blank=True, null=True)),
+                ('salesforce_sync_pending', models.BooleanField(default=False)),
+                ('zoom_registrant_id', models.CharField(blank=True, max_length=100)),
+                ('zoom_join_url', models.URLField(blank=True, max_length=500)),
+                ('zoom_invite_link', models.URLField(blank=True, max_length=500)),
+                ('zoom_registered_at', models.DateTimeField(blank=True, null=True)),
+                ('zoom_registration_error', webinars.fields.CompressedTextField(blank=True)),
+                ('archived', models.BooleanField()),
+            ],
+            options={
+                'db_table': 'webinars_attendee_history',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='BundleAttendeeHistory',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('first_name', models.CharField(max_length=100)),
+                ('last_name', models.CharField(max_length=100)),
+                ('email', models.EmailField(max_length=254)),
+                ('organization', models.CharField(blank=True, max_length=255)),
+                ('activation_sent_at', models.DateTimeField(blank=True, null=True)),
+                ('activation_success', models.BooleanField(blank=True, null=True)),
+                ('activation_error', webinars.fields.CompressedTextField(blank=True)),
+                ('salesforce_contact_id', models.CharField(blank=True, max_length=50)),
+                ('salesforce_account_id', models.CharField(blank=True, max_length=50)),
+                ('salesforce_task_id', models.CharField(blank=True, max_length=50)),
+                ('salesforce_sync_error', webinars.fields.CompressedTextField(blank=True)),
+                ('salesforce_synced_at', models.DateTimeField(blank=True, null=True)),
+                ('salesforce_sync_pending', models.BooleanField(default=False)),
+                ('archived', models.BooleanField()),
+            ],
+            options={
+                'db_table': 'webinars_bundle_attendee_history',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedAttendee',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('first_name', models.CharField(max_length=100)),
+                ('last_name', models.CharField(max_length=100)),
+                ('email', models.EmailField(max_length=254)),
+                ('organization', models.CharField(blank=True, max_length=255)),
+                ('activation_sent_at', models.DateTimeField(blank=True, null=True)),
+                ('activation_success', models.BooleanField(blank=True, null=True)),
+                ('activation_error', webinars.fields.CompressedTextField(blank=True)),
+                ('salesforce_contact_id', models.CharField(blank=True, max_length=50)),
+                ('salesforce_account_id', models.CharField(blank=True, max_length=50)),
+                ('salesforce_task_id', models.CharField(blank=True, max_length=50)),
+                ('salesforce_sync_error', webinars.fields.CompressedTextField(blank=True)),
+                ('salesforce_synced_at', models.DateTimeField(blank=True, null=True)),
+                ('salesforce_sync_pending', models.BooleanField(default=False)),
+                ('zoom_registrant_id', models.CharField(blank=True, max_length=100)),
+                ('zoom_join_url', models.URLField(blank=True, max_length=500)),
+                ('zoom_invite_link', models.URLField(blank=True, max_length=500)),
+                ('zoom_registered_at', models.DateTimeField(blank=True, null=True)),
+                ('zoom_registration_error', webinars.fields.CompressedTextField(blank=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('webinar_date', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_attendees', to='webinars.webinardate')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedBundleAttendee',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('first_name', models.CharField(max_length=100)),
+                ('last_name', models.CharField(max_length=100)),
+                ('email', models.EmailField(max_length=254)),
+                ('organization', models.CharField(blank=True, max_length=255)),
+                ('activation_sent_at', models.DateTimeField(blank=True, null=True)),
+                ('activation_success', models.BooleanField(blank=True, null=True)),
+                ('activation_error', webinars.fields.CompressedTextField(blank=True)),
+                ('salesforce_contact_id', models.CharField(blank=True, max_length=50)),
+                ('salesforce_account_id', models.CharField(blank=True, max_length=50)),
+                ('salesforce_task_id', models.CharField(blank=True, max_length=50)),
+                ('salesforce_sync_error', webinars.fields.CompressedTextField(blank=True)),
+                ('salesforce_synced_at', models.DateTimeField(blank=True, null=True)),
+                ('salesforce_sync_pending', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('bundle_date', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_attendees', to='webinars.bundledate')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        history_view(
+            'webinars_attendee_history', 'webinars_attendee', 'webinars_archivedattendee', ATTENDEE_COLUMNS
+        ),
+        history_view(
+            'webinars_bundle_attendee_history', 'webinars_bundleattendee', 'webinars_archivedbundleattendee',
+            BUNDLE_ATTENDEE_COLUMNS
+        ),
+    ]
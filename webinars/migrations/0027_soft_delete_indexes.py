@@ -0,0 +1,77 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webinars', '0026_attendee_archive'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendee',
+            index=models.Index(fields=['webinar_date', 'deleted_at'], name='webinars_at_webinar_006e4b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendee',
+            index=models.Index(fields=['deleted_at', 'activation_sent_at'], name='webinars_at_deleted_951328_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendee',
+            index=models.Index(fields=['deleted_at', 'salesforce_sync_pending'], name='webinars_at_deleted_a710d8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bundleattendee',
+            index=models.Index(fields=['bundle_date', 'deleted_at'], name='webinars_bu_bundle__1b4833_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bundleattendee',
+            index=models.Index(fields=['deleted_at', 'activation_sent_at'], name='webinars_bu_deleted_835186_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bundleattendee',
+            index=models.Index(fields=['deleted_at', 'salesforce_sync_pending'], name='webinars_bu_deleted_6d934a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bundledate',
+            index=models.Index(fields=['bundle', 'deleted_at', 'date'], name='webinars_bu_bundle__135fcf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bundledate',
+            index=models.Index(fields=['deleted_at', 'date'], name='webinars_bu_deleted_ceb018_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clinicbooking',
+            index=models.Index(fields=['deleted_at', '-created_at'], name='webinars_cl_deleted_96e9d8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clinicbooking',
+            index=models.Index(fields=['deleted_at', 'salesforce_sync_pending'], name='webinars_cl_deleted_5db318_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='download',
+            index=models.Index(fields=['deleted_at', '-created_at'], name='webinars_do_deleted_ea35e8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='download',
+            index=models.Index(fields=['deleted_at', 'salesforce_sync_pending'], name='webinars_do_deleted_733bc1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ondemandattendee',
+            index=models.Index(fields=['webinar', 'deleted_at'], name='webinars_on_webinar_1e6b31_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ondemandattendee',
+            index=models.Index(fields=['deleted_at', 'salesforce_sync_pending'], name='webinars_on_deleted_b4800f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='webinardate',
+            index=models.Index(fields=['webinar', 'deleted_at', 'date_time'], name='webinars_we_webinar_65c444_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='webinardate',
+            index=models.Index(fields=['deleted_at', 'date_time'], name='webinars_we_deleted_c68eb5_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webinars', '0027_soft_delete_indexes'),
+    ]
+    
+    operations = [
+        migrations.AlterField(
+            model_name='backgroundjob',
+            name='kind',
+            field=models.CharField(choices=[('activate_webinar_date', 'Activate webinar date attendees'), ('activate_bundle_date', 'Activate bundle date attendees'), ('send_calendar_invite', 'Send calendar invite'), ('create_zoom_webinar', 'Create Zoom webinar'), ('send_pending_calendar_invites', 'Send pending calendar invites')], max_length=50),
+        ),
+    ]
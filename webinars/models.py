@@ -1,14 +1,50 @@
-from django.db import models
+import hashlib
+
+from django.db import connections, models, router
+from django.db.models import Exists, OuterRef
 from django.urls import reverse
 from django.utils import timezone
 
+from . import codec
+from .fields import CodecJSONField, CompressedJSONField, CompressedTextField
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    """QuerySet for soft-deleted models."""
+    
+    def alive(self):
+        """Rows that haven't been soft deleted."""
+        return self.filter(deleted_at=None)
+    
+    def deleted(self):
+        """Rows that have been soft deleted."""
+        return self.exclude(deleted_at=None)
+
+
+class AliveManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """Manager that leaves out soft-deleted rows."""
+    
+    def get_queryset(self):
+        return super().get_queryset().alive()
+
 
 class BaseModel(models.Model):
-    """Base model with common fields for all models."""
+    """
+    Base model with common fields for all models.
+    
+    Model.alive leaves out soft-deleted rows and Model.all_objects includes
+    them. objects stays the default manager, so the admin, related lookups
+    and cascades still see every row; it and related managers (e.g.
+    webinar.webinardate_set) also have .alive() and .deleted().
+    """
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
     
+    objects = SoftDeleteQuerySet.as_manager()
+    alive = AliveManager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+    
     class Meta:
         abstract = True
     
@@ -46,7 +82,7 @@ class Webinar(BaseModel):
     
     def active_dates(self):
         """Return all active (non-deleted) webinar dates."""
-        return self.webinardate_set.filter(deleted_at=None)
+        return self.webinardate_set.alive()
     
     def get_all_names(self):
         """Return a list of all names including the main name and aliases."""
@@ -66,7 +102,15 @@ class WebinarDate(BaseModel):
     zoom_meeting_id = models.CharField(max_length=100, blank=True, null=True)
     calendar_invite_sent_at = models.DateTimeField(null=True, blank=True, help_text="When calendar invites were sent to staff")
     calendar_invite_success = models.BooleanField(null=True, blank=True, help_text="Whether calendar invite sending was successful")
-    calendar_invite_error = models.TextField(blank=True, help_text="Error message if calendar invite failed")
+    calendar_invite_error = CompressedTextField(blank=True, help_text="Error message if calendar invite failed")
+    calendar_event_id = models.CharField(max_length=255, blank=True, help_text="Microsoft Graph id of the calendar invite event")
+    calendar_ical_uid = models.CharField(max_length=255, blank=True, help_text="iCalUId of the calendar invite event")
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['webinar', 'deleted_at', 'date_time']),
+            models.Index(fields=['deleted_at', 'date_time']),
+        ]
     
     def __str__(self):
         if self.on_demand:
@@ -78,10 +122,14 @@ class WebinarDate(BaseModel):
     
     def active_attendees(self):
         """Return all active (non-deleted) attendees."""
-        return self.attendee_set.filter(deleted_at=None)
+        return self.attendee_set.alive()
     
     def get_all_attendees(self):
-        """Return all attendees including those from bundles."""
+        """
+        Return all attendees including those from bundles. Only reads the hot
+        tables: these are the attendees that can still be worked on, so a date
+        whose attendees are archived returns none (see attendee_count).
+        """
         from itertools import chain
         
         # Get direct attendees
@@ -89,7 +137,7 @@ class WebinarDate(BaseModel):
         
         # Get bundle attendees
         bundle_attendees = []
-        for bundle_date in self.bundle_dates.filter(deleted_at=None):
+        for bundle_date in self.bundle_dates.alive():
             for attendee in bundle_date.active_attendees():
                 # Add a flag to identify bundle attendees
                 attendee.is_bundle_attendee = True
@@ -104,22 +152,27 @@ class WebinarDate(BaseModel):
     
     @property
     def attendee_count(self):
-        """Return the count of active attendees."""
-        return self.active_attendees().count()
+        """Return the count of active attendees, archived ones included."""
+        return self.attendee_history.alive().count()
+    
+    @property
+    def archived_attendee_count(self):
+        """Return the count of active attendees moved to the archive."""
+        return self.attendee_history.alive().filter(archived=True).count()
     
     @property
     def total_attendee_count(self):
         """Return the total count including bundle attendees."""
         bundle_count = sum(
             bundle_date.attendee_count 
-            for bundle_date in self.bundle_dates.filter(deleted_at=None)
+            for bundle_date in self.bundle_dates.alive()
         )
         return self.attendee_count + bundle_count
     
     @property
     def has_attendees(self):
-        """Check if this webinar date has any attendees."""
-        return self.attendee_count > 0
+        """Check if this webinar date has any attendees, archived ones included."""
+        return self.attendee_history.alive().exists()
     
     @property
     def calendar_invite_status(self):
@@ -141,23 +194,28 @@ class Attendee(BaseModel):
     organization = models.CharField(max_length=255, blank=True, help_text="Organization name")
     activation_sent_at = models.DateTimeField(null=True, blank=True, help_text="When the Kajabi grant offer activation was sent")
     activation_success = models.BooleanField(null=True, blank=True, help_text="Whether the activation was successful")
-    activation_error = models.TextField(blank=True, help_text="Error message if activation failed")
+    activation_error = CompressedTextField(blank=True, help_text="Error message if activation failed")
     zoom_registrant_id = models.CharField(max_length=100, blank=True, help_text="Zoom registrant ID if registered")
     zoom_join_url = models.URLField(max_length=500, blank=True, help_text="Personal Zoom join URL for this attendee")
     zoom_invite_link = models.URLField(max_length=500, blank=True, help_text="Meeting invite link for this attendee")
     zoom_registered_at = models.DateTimeField(null=True, blank=True, help_text="When registered in Zoom")
-    zoom_registration_error = models.TextField(blank=True, help_text="Error message if Zoom registration failed")
+    zoom_registration_error = CompressedTextField(blank=True, help_text="Error message if Zoom registration failed")
     
     # Salesforce integration fields
     salesforce_contact_id = models.CharField(max_length=50, blank=True, help_text="Salesforce Contact ID")
     salesforce_account_id = models.CharField(max_length=50, blank=True, help_text="Salesforce Account ID")
     salesforce_task_id = models.CharField(max_length=50, blank=True, help_text="Salesforce Task ID")
-    salesforce_sync_error = models.TextField(blank=True, help_text="Error message if Salesforce sync failed")
+    salesforce_sync_error = CompressedTextField(blank=True, help_text="Error message if Salesforce sync failed")
     salesforce_synced_at = models.DateTimeField(null=True, blank=True, help_text="When successfully synced to Salesforce")
     salesforce_sync_pending = models.BooleanField(default=True, help_text="Whether this attendee needs to be synced to Salesforce")
     
     class Meta:
         unique_together = ['webinar_date', 'email']
+        indexes = [
+            models.Index(fields=['webinar_date', 'deleted_at']),
+            models.Index(fields=['deleted_at', 'activation_sent_at']),
+            models.Index(fields=['deleted_at', 'salesforce_sync_pending']),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.email}"
@@ -263,7 +321,7 @@ class WebinarBundle(BaseModel):
     
     def active_dates(self):
         """Return all active (non-deleted) bundle dates."""
-        return self.bundledate_set.filter(deleted_at=None)
+        return self.bundledate_set.alive()
     
     def get_all_names(self):
         """Return a list of all names including the main name and aliases."""
@@ -280,6 +338,14 @@ class BundleDate(BaseModel):
     bundle = models.ForeignKey(WebinarBundle, on_delete=models.CASCADE)
     date = models.DateField()
     webinar_dates = models.ManyToManyField(WebinarDate, related_name='bundle_dates')
+    calendar_event_id = models.CharField(max_length=255, blank=True, help_text="Microsoft Graph id of the calendar invite event")
+    calendar_ical_uid = models.CharField(max_length=255, blank=True, help_text="iCalUId of the calendar invite event")
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['bundle', 'deleted_at', 'date']),
+            models.Index(fields=['deleted_at', 'date']),
+        ]
     
     def __str__(self):
         return f"{self.bundle.name} - {self.date.strftime('%Y-%m-%d')}"
@@ -289,17 +355,17 @@ class BundleDate(BaseModel):
     
     def active_attendees(self):
         """Return all active (non-deleted) bundle attendees."""
-        return self.bundleattendee_set.filter(deleted_at=None)
+        return self.bundleattendee_set.alive()
     
     @property
     def attendee_count(self):
-        """Return the count of active attendees."""
-        return self.active_attendees().count()
+        """Return the count of active attendees, archived ones included."""
+        return self.attendee_history.alive().count()
     
     @property
     def has_attendees(self):
-        """Check if this bundle date has any attendees."""
-        return self.attendee_count > 0
+        """Check if this bundle date has any attendees, archived ones included."""
+        return self.attendee_history.alive().exists()
     
     def get_webinars_on_date(self):
         """Get all webinar dates on this bundle's date."""
@@ -314,9 +380,8 @@ class BundleDate(BaseModel):
             start_datetime = timezone.make_aware(start_datetime)
             end_datetime = timezone.make_aware(end_datetime)
         
-        return WebinarDate.objects.filter(
-            date_time__date=self.date,
-            deleted_at=None
+        return WebinarDate.alive.filter(
+            date_time__date=self.date
         ).order_by('date_time', 'webinar__name')
 
 
@@ -329,18 +394,23 @@ class BundleAttendee(BaseModel):
     organization = models.CharField(max_length=255, blank=True, help_text="Organization name")
     activation_sent_at = models.DateTimeField(null=True, blank=True, help_text="When the Kajabi grant offer activation was sent")
     activation_success = models.BooleanField(null=True, blank=True, help_text="Whether the activation was successful")
-    activation_error = models.TextField(blank=True, help_text="Error message if activation failed")
+    activation_error = CompressedTextField(blank=True, help_text="Error message if activation failed")
     
     # Salesforce integration fields
     salesforce_contact_id = models.CharField(max_length=50, blank=True, help_text="Salesforce Contact ID")
     salesforce_account_id = models.CharField(max_length=50, blank=True, help_text="Salesforce Account ID")
     salesforce_task_id = models.CharField(max_length=50, blank=True, help_text="Salesforce Task ID")
-    salesforce_sync_error = models.TextField(blank=True, help_text="Error message if Salesforce sync failed")
+    salesforce_sync_error = CompressedTextField(blank=True, help_text="Error message if Salesforce sync failed")
     salesforce_synced_at = models.DateTimeField(null=True, blank=True, help_text="When successfully synced to Salesforce")
     salesforce_sync_pending = models.BooleanField(default=True, help_text="Whether this attendee needs to be synced to Salesforce")
     
     class Meta:
         unique_together = ['bundle_date', 'email']
+        indexes = [
+            models.Index(fields=['bundle_date', 'deleted_at']),
+            models.Index(fields=['deleted_at', 'activation_sent_at']),
+            models.Index(fields=['deleted_at', 'salesforce_sync_pending']),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.email} (Bundle)"
@@ -400,6 +470,93 @@ class BundleAttendee(BaseModel):
         return None
 
 
+class ArchivedAttendeeColumns(models.Model):
+    """
+    Columns attendees and bundle attendees keep once archived. The id and
+    timestamps are copied from the hot row rather than set on insert. Has
+    alive like BaseModel, and .alive() on related managers such as
+    webinar_date.attendee_history.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    first_name = models.CharField(max_length=100)
+    last_name = models.CharField(max_length=100)
+    email = models.EmailField()
+    organization = models.CharField(max_length=255, blank=True)
+    activation_sent_at = models.DateTimeField(null=True, blank=True)
+    activation_success = models.BooleanField(null=True, blank=True)
+    activation_error = CompressedTextField(blank=True)
+    salesforce_contact_id = models.CharField(max_length=50, blank=True)
+    salesforce_account_id = models.CharField(max_length=50, blank=True)
+    salesforce_task_id = models.CharField(max_length=50, blank=True)
+    salesforce_sync_error = CompressedTextField(blank=True)
+    salesforce_synced_at = models.DateTimeField(null=True, blank=True)
+    salesforce_sync_pending = models.BooleanField(default=False)
+    
+    objects = SoftDeleteQuerySet.as_manager()
+    alive = AliveManager()
+    
+    class Meta:
+        abstract = True
+    
+    def __str__(self):
+        return f"{self.first_name} {self.last_name} - {self.email}"
+
+
+class ArchivedAttendee(ArchivedAttendeeColumns):
+    """An attendee of a webinar date long past, moved out of Attendee by webinars.archive."""
+    webinar_date = models.ForeignKey(WebinarDate, on_delete=models.CASCADE, related_name='archived_attendees')
+    zoom_registrant_id = models.CharField(max_length=100, blank=True)
+    zoom_join_url = models.URLField(max_length=500, blank=True)
+    zoom_invite_link = models.URLField(max_length=500, blank=True)
+    zoom_registered_at = models.DateTimeField(null=True, blank=True)
+    zoom_registration_error = CompressedTextField(blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+
+class ArchivedBundleAttendee(ArchivedAttendeeColumns):
+    """A bundle attendee of a bundle date long past, moved out of BundleAttendee by webinars.archive."""
+    bundle_date = models.ForeignKey(BundleDate, on_delete=models.CASCADE, related_name='archived_attendees')
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+
+class AttendeeHistory(ArchivedAttendeeColumns):
+    """
+    Read-only view of Attendee and ArchivedAttendee together, for reporting
+    and export. The webinars_attendee_history database view is a UNION ALL of
+    the two tables, so a column added to Attendee needs adding to the
+    archive and the view too, and a migration that rebuilds either table
+    (any AlterField on SQLite) must drop the view first and recreate it after.
+    """
+    webinar_date = models.ForeignKey(
+        WebinarDate, on_delete=models.DO_NOTHING, db_constraint=False, related_name='attendee_history'
+    )
+    zoom_registrant_id = models.CharField(max_length=100, blank=True)
+    zoom_join_url = models.URLField(max_length=500, blank=True)
+    zoom_invite_link = models.URLField(max_length=500, blank=True)
+    zoom_registered_at = models.DateTimeField(null=True, blank=True)
+    zoom_registration_error = CompressedTextField(blank=True)
+    archived = models.BooleanField()
+    
+    class Meta:
+        managed = False
+        db_table = 'webinars_attendee_history'
+
+
+class BundleAttendeeHistory(ArchivedAttendeeColumns):
+    """Read-only view of BundleAttendee and ArchivedBundleAttendee together, like AttendeeHistory."""
+    bundle_date = models.ForeignKey(
+        BundleDate, on_delete=models.DO_NOTHING, db_constraint=False, related_name='attendee_history'
+    )
+    archived = models.BooleanField()
+    
+    class Meta:
+        managed = False
+        db_table = 'webinars_bundle_attendee_history'
+
+
 class OnDemandAttendee(BaseModel):
     """Model representing an attendee who has on-demand access to webinar recordings."""
     webinar = models.ForeignKey(Webinar, on_delete=models.CASCADE)
@@ -409,18 +566,22 @@ class OnDemandAttendee(BaseModel):
     organization = models.CharField(max_length=255, blank=True, help_text="Organization name")
     activation_sent_at = models.DateTimeField(null=True, blank=True, help_text="When the Kajabi grant offer activation was sent")
     activation_success = models.BooleanField(null=True, blank=True, help_text="Whether the activation was successful")
-    activation_error = models.TextField(blank=True, help_text="Error message if activation failed")
+    activation_error = CompressedTextField(blank=True, help_text="Error message if activation failed")
     
     # Salesforce integration fields
     salesforce_contact_id = models.CharField(max_length=50, blank=True, help_text="Salesforce Contact ID")
     salesforce_account_id = models.CharField(max_length=50, blank=True, help_text="Salesforce Account ID")
     salesforce_task_id = models.CharField(max_length=50, blank=True, help_text="Salesforce Task ID")
-    salesforce_sync_error = models.TextField(blank=True, help_text="Error message if Salesforce sync failed")
+    salesforce_sync_error = CompressedTextField(blank=True, help_text="Error message if Salesforce sync failed")
     salesforce_synced_at = models.DateTimeField(null=True, blank=True, help_text="When successfully synced to Salesforce")
     salesforce_sync_pending = models.BooleanField(default=True, help_text="Whether this attendee needs to be synced to Salesforce")
     
     class Meta:
         unique_together = ['webinar', 'email']
+        indexes = [
+            models.Index(fields=['webinar', 'deleted_at']),
+            models.Index(fields=['deleted_at', 'salesforce_sync_pending']),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.email} (On-Demand)"
@@ -480,24 +641,30 @@ class ClinicBooking(BaseModel):
     zoom_meeting_id = models.CharField(max_length=100, blank=True, help_text="Zoom meeting ID")
     zoom_join_url = models.URLField(max_length=500, blank=True, help_text="Zoom meeting join URL")
     zoom_created_at = models.DateTimeField(null=True, blank=True, help_text="When Zoom meeting was created")
-    zoom_creation_error = models.TextField(blank=True, help_text="Error message if Zoom meeting creation failed")
+    zoom_creation_error = CompressedTextField(blank=True, help_text="Error message if Zoom meeting creation failed")
     
     # Calendar invite fields
     calendar_invite_sent_at = models.DateTimeField(null=True, blank=True, help_text="When calendar invites were sent")
     calendar_invite_success = models.BooleanField(null=True, blank=True, help_text="Whether calendar invite sending was successful")
-    calendar_invite_error = models.TextField(blank=True, help_text="Error message if calendar invite failed")
+    calendar_invite_error = CompressedTextField(blank=True, help_text="Error message if calendar invite failed")
+    calendar_event_id = models.CharField(max_length=255, blank=True, help_text="Microsoft Graph id of the calendar invite event")
+    calendar_ical_uid = models.CharField(max_length=255, blank=True, help_text="iCalUId of the calendar invite event")
     
     # Salesforce integration fields
     salesforce_contact_id = models.CharField(max_length=50, blank=True, help_text="Salesforce Contact ID")
     salesforce_account_id = models.CharField(max_length=50, blank=True, help_text="Salesforce Account ID")
     salesforce_task_id = models.CharField(max_length=50, blank=True, help_text="Salesforce Task ID")
-    salesforce_sync_error = models.TextField(blank=True, help_text="Error message if Salesforce sync failed")
+    salesforce_sync_error = CompressedTextField(blank=True, help_text="Error message if Salesforce sync failed")
     salesforce_synced_at = models.DateTimeField(null=True, blank=True, help_text="When successfully synced to Salesforce")
     salesforce_sync_pending = models.BooleanField(default=True, help_text="Whether this needs to be synced to Salesforce")
     
     class Meta:
         ordering = ['-created_at']
         unique_together = ['email', 'clinic_date']
+        indexes = [
+            models.Index(fields=['deleted_at', '-created_at']),
+            models.Index(fields=['deleted_at', 'salesforce_sync_pending']),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.clinic_date.strftime('%Y-%m-%d %H:%M')}"
@@ -561,18 +728,69 @@ class ClinicBooking(BaseModel):
         return None
 
 
+class PayloadBlob(models.Model):
+    """
+    A webhook payload stored once however many rows refer to it, keyed by the
+    SHA-256 of its text. Download.payload and WebhookLog.body read through it.
+    created_at is moved forward each time the payload is stored again, so
+    retention's grace period covers blobs about to get a new referrer.
+    """
+    digest = models.CharField(max_length=64, primary_key=True)
+    data = CompressedTextField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    def __str__(self):
+        return self.digest[:12]
+    
+    @staticmethod
+    def digest_for(text):
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def store(cls, text, blob=None):
+        """
+        Return the blob holding text, inserting it if it isn't stored yet.
+        Pass blob, e.g. one already stored for the same request, to reuse it
+        without a query when it holds the same text.
+        """
+        if not text:
+            return None
+        digest = cls.digest_for(text)
+        if blob is not None and blob.digest == digest:
+            return blob
+        blob = cls(digest=digest, data=text)
+        # One upsert: if the payload is already stored, only its created_at is
+        # refreshed, so retention doesn't delete it before the caller's row refers to it.
+        # MySQL's ON DUPLICATE KEY UPDATE takes no conflict target.
+        unique_fields = ['digest'] if connections[router.db_for_write(cls)].features.supports_update_conflicts_with_target else None
+        cls.objects.bulk_create(
+            [blob], update_conflicts=True, unique_fields=unique_fields, update_fields=['created_at']
+        )
+        return blob
+    
+    @classmethod
+    def unreferenced(cls):
+        """Blobs no download or webhook log refers to any more."""
+        return cls.objects.filter(
+            ~Exists(Download.objects.filter(payload_blob=OuterRef('pk'))),
+            ~Exists(WebhookLog.objects.filter(body_blob=OuterRef('pk')))
+        )
+
+
 class WebhookLog(models.Model):
     """Model to store webhook request logs for debugging."""
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     method = models.CharField(max_length=10)
     path = models.CharField(max_length=200)
-    headers = models.JSONField()
-    body = models.TextField(blank=True)
+    headers = CompressedJSONField()
+    body_blob = models.ForeignKey(PayloadBlob, null=True, blank=True, on_delete=models.PROTECT, related_name='+')
+    legacy_body = CompressedTextField(blank=True, help_text="Body of logs written before payload blobs, until backfill_payload_blobs moves it")
     response_status = models.IntegerField()
-    response_body = models.TextField(blank=True)
+    response_body = CompressedTextField(blank=True)
     success = models.BooleanField(default=False)
-    error_message = models.TextField(blank=True)
+    error_message = CompressedTextField(blank=True)
     processing_time_ms = models.IntegerField(null=True, blank=True)
+    timings = CodecJSONField(null=True, blank=True, help_text="Milliseconds spent in each processing stage")
     
     class Meta:
         ordering = ['-created_at']
@@ -581,9 +799,31 @@ class WebhookLog(models.Model):
             models.Index(fields=['success']),
         ]
     
+    _new_body = None
+    
     def __str__(self):
         return f"{self.method} {self.path} - {self.created_at.strftime('%Y-%m-%d %H:%M:%S')}"
     
+    def save(self, *args, **kwargs):
+        if self._new_body is not None:
+            self.body_blob = PayloadBlob.store(self._new_body, self.body_blob)
+            self.legacy_body = ''
+            self._new_body = None
+        super().save(*args, **kwargs)
+    
+    @property
+    def body(self):
+        """The request body, stored in a payload blob when the log is saved."""
+        if self._new_body is not None:
+            return self._new_body
+        if self.body_blob_id:
+            return self.body_blob.data
+        return self.legacy_body
+    
+    @body.setter
+    def body(self, value):
+        self._new_body = value
+    
     @property
     def body_preview(self):
         """Return first 100 characters of body for preview."""
@@ -596,40 +836,210 @@ class WebhookLog(models.Model):
         """Return formatted JSON body if possible."""
         if self.body:
             try:
-                import json
-                data = json.loads(self.body)
-                return json.dumps(data, indent=2)
+                return codec.dumps_pretty(codec.loads(self.body))
             except:
                 return self.body
         return ''
 
 
+class OutboundEmail(models.Model):
+    """Email waiting in the outbox; delivered by the deliver_emails command."""
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    to_email = models.EmailField()
+    from_email = models.EmailField(blank=True, help_text="Sender; blank uses the MS365 owner or DEFAULT_FROM_EMAIL")
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now, help_text="Not delivered before this time")
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    sent_via = models.CharField(max_length=10, blank=True, help_text="ms365 or django")
+    digest_key = models.CharField(max_length=64, blank=True, help_text="Set on error digests until their message is built")
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email} ({self.status})"
+
+
+class SchedulerLease(models.Model):
+    """Lease row used to elect the one run_scheduler process that runs jobs."""
+    name = models.CharField(max_length=50, unique=True)
+    holder = models.CharField(max_length=255, blank=True, help_text="host:pid of the process holding the lease")
+    expires_at = models.DateTimeField()
+    
+    def __str__(self):
+        return f"{self.name} held by {self.holder or 'nobody'} until {self.expires_at}"
+
+
+class JobRun(models.Model):
+    """History of periodic jobs run by the scheduler."""
+    job = models.CharField(max_length=100)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+    success = models.BooleanField(null=True, blank=True, help_text="Empty while the job is running")
+    duration_ms = models.IntegerField(null=True, blank=True)
+    output = models.TextField(blank=True)
+    error = models.TextField(blank=True)
+    holder = models.CharField(max_length=255, blank=True, help_text="host:pid of the scheduler that ran the job")
+    
+    class Meta:
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['job', '-started_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.job} at {self.started_at.strftime('%Y-%m-%d %H:%M:%S')}"
+
+
+class BackgroundJob(models.Model):
+    """A long admin action run by a background worker, with progress counters the UI polls."""
+    KIND_ACTIVATE_WEBINAR_DATE = 'activate_webinar_date'
+    KIND_ACTIVATE_BUNDLE_DATE = 'activate_bundle_date'
+    KIND_SEND_CALENDAR_INVITE = 'send_calendar_invite'
+    KIND_CREATE_ZOOM_WEBINAR = 'create_zoom_webinar'
+    KIND_SEND_PENDING_CALENDAR_INVITES = 'send_pending_calendar_invites'
+    KIND_CHOICES = [
+        (KIND_ACTIVATE_WEBINAR_DATE, 'Activate webinar date attendees'),
+        (KIND_ACTIVATE_BUNDLE_DATE, 'Activate bundle date attendees'),
+        (KIND_SEND_CALENDAR_INVITE, 'Send calendar invite'),
+        (KIND_CREATE_ZOOM_WEBINAR, 'Create Zoom webinar'),
+        (KIND_SEND_PENDING_CALENDAR_INVITES, 'Send pending calendar invites'),
+    ]
+    
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    
+    kind = models.CharField(max_length=50, choices=KIND_CHOICES)
+    object_id = models.IntegerField(help_text="Id of the webinar date or bundle date the job acts on")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    requested_by = models.CharField(max_length=150, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    claimed_until = models.DateTimeField(null=True, blank=True, help_text="A running job whose claim expired is picked up by another worker")
+    item_keys = models.JSONField(default=list, blank=True, help_text="Items to process, fixed when the job starts")
+    total = models.IntegerField(default=0)
+    processed = models.IntegerField(default=0)
+    succeeded = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0)
+    message = models.TextField(blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'claimed_until']),
+            models.Index(fields=['kind', 'object_id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.object_id} ({self.status})"
+    
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_SUCCEEDED, self.STATUS_FAILED)
+    
+    @property
+    def progress(self):
+        """Percentage of items processed."""
+        if not self.total:
+            return 100 if self.is_finished else 0
+        return int(self.processed * 100 / self.total)
+
+
+class BackgroundJobItem(models.Model):
+    """Result of one item of a background job."""
+    job = models.ForeignKey(BackgroundJob, on_delete=models.CASCADE, related_name='items')
+    position = models.IntegerField()
+    success = models.BooleanField(null=True, blank=True, help_text="Empty if the item was skipped")
+    message = models.TextField(blank=True)
+    
+    class Meta:
+        ordering = ['position']
+        indexes = [
+            models.Index(fields=['job', 'position']),
+        ]
+    
+    def __str__(self):
+        return f"{self.job} item {self.position}"
+
+
 class Download(BaseModel):
     """Model to track download form submissions from Kajabi."""
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100, blank=True)
     email = models.EmailField()
     form_title = models.CharField(max_length=255, help_text="Title of the download form")
-    payload = models.JSONField(help_text="Full webhook payload")
+    payload_blob = models.ForeignKey(PayloadBlob, null=True, blank=True, on_delete=models.PROTECT, related_name='+', help_text="Full webhook payload")
+    legacy_payload = CompressedJSONField(null=True, blank=True, help_text="Payload of downloads written before payload blobs, until backfill_payload_blobs moves it")
     
     # Salesforce integration fields (same as attendees)
     organization = models.CharField(max_length=255, blank=True, help_text="Organization name")
     salesforce_contact_id = models.CharField(max_length=50, blank=True, help_text="Salesforce Contact ID")
     salesforce_account_id = models.CharField(max_length=50, blank=True, help_text="Salesforce Account ID")
     salesforce_task_id = models.CharField(max_length=50, blank=True, help_text="Salesforce Task ID")
-    salesforce_sync_error = models.TextField(blank=True, help_text="Error message if Salesforce sync failed")
+    salesforce_sync_error = CompressedTextField(blank=True, help_text="Error message if Salesforce sync failed")
     salesforce_synced_at = models.DateTimeField(null=True, blank=True, help_text="When successfully synced to Salesforce")
     salesforce_sync_pending = models.BooleanField(default=True, help_text="Whether this needs to be synced to Salesforce")
     
+    _new_payload = None
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['deleted_at', '-created_at']),
+            models.Index(fields=['deleted_at', 'salesforce_sync_pending']),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.form_title}"
     
+    def save(self, *args, **kwargs):
+        if self._new_payload is not None:
+            self.payload_blob = PayloadBlob.store(codec.dumps_str(self._new_payload))
+            self.legacy_payload = None
+            self._new_payload = None
+        super().save(*args, **kwargs)
+    
     def get_absolute_url(self):
         return reverse('download_detail', args=[self.id])
     
+    @property
+    def payload(self):
+        """The full webhook payload, stored in a payload blob when the download is saved."""
+        if self._new_payload is not None:
+            return self._new_payload
+        if self.payload_blob_id:
+            return codec.loads(self.payload_blob.data)
+        return self.legacy_payload
+    
+    @payload.setter
+    def payload(self, value):
+        self._new_payload = value
+    
     @property
     def full_name(self):
         """Return full name."""
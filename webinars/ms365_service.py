@@ -1,46 +1,70 @@
 import logging
+import time
 from datetime import datetime, timedelta
-import requests
 from django.contrib.auth.models import Group
 from settings.models import MS365Settings
+from . import graph_client
 
 logger = logging.getLogger(__name__)
 
+# Graph accepts at most 20 requests per $batch call
+GRAPH_BATCH_SIZE = 20
+
+# Throttled (429) invites are resent after their Retry-After this many times per run;
+# a longer Retry-After than THROTTLE_MAX_WAIT seconds leaves them for the next run
+THROTTLE_RETRIES = 2
+THROTTLE_MAX_WAIT = 10
+
+
+def retry_after(headers):
+    """Seconds to wait from a Retry-After header, defaulting to one."""
+    for name, value in (headers or {}).items():
+        if name.lower() == 'retry-after':
+            try:
+                return max(float(value), 0)
+            except (TypeError, ValueError):
+                break
+    return 1
+
+
+def event_times(obj):
+    """
+    Return the (start, end) of the calendar event for a WebinarDate, BundleDate
+    or ClinicBooking, as sent in its invite
+    """
+    from .models import WebinarDate, BundleDate
+    
+    if isinstance(obj, WebinarDate):
+        # Default to 1 hour duration
+        return obj.date_time, obj.date_time + timedelta(hours=1)
+    if isinstance(obj, BundleDate):
+        # Use 9 AM as default time for bundle dates, all day event
+        start_time = datetime.combine(obj.date, datetime.min.time().replace(hour=9))
+        return start_time, start_time + timedelta(hours=8)
+    # 30 minute clinic sessions
+    return obj.clinic_date, obj.clinic_date + timedelta(minutes=30)
+
+
+def store_event_ids(obj, event, save=True):
+    """Record the Graph event id and iCalUId of a created calendar invite on obj"""
+    obj.calendar_event_id = event.get('id', '')
+    obj.calendar_ical_uid = event.get('iCalUId', '')
+    if save:
+        obj.save(update_fields=['calendar_event_id', 'calendar_ical_uid'])
+
 
 class MS365CalendarService:
     """Service for creating Microsoft 365 calendar invites"""
     
     def __init__(self):
         self.settings = MS365Settings.get_settings()
-        self._access_token = None
     
     def get_access_token(self):
-        """Get Microsoft Graph API access token"""
-        if self._access_token:
-            return self._access_token
-            
-        try:
-            import msal
-            
-            app = msal.ConfidentialClientApplication(
-                client_id=self.settings.client_id,
-                client_credential=self.settings.client_secret,
-                authority=f"https://login.microsoftonline.com/{self.settings.tenant_id}"
-            )
-            
-            scopes = ['https://graph.microsoft.com/.default']
-            result = app.acquire_token_for_client(scopes)
-            
-            if "access_token" in result:
-                self._access_token = result['access_token']
-                return self._access_token
-            else:
-                logger.error(f"Unable to obtain access token: {result.get('error')}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"Error getting MS365 access token: {str(e)}")
-            return None
+        """
+        Get Microsoft Graph API access token. Not kept on the instance:
+        graph_client caches it per process under a lock until it's near expiry
+        """
+        return graph_client.get_access_token(self.settings)
     
     def create_webinar_meeting(self, webinar_date, was_auto_created=False):
         """Create a calendar invite for a webinar date"""
@@ -75,8 +99,7 @@ class MS365CalendarService:
             
         # Prepare meeting details
         webinar = webinar_date.webinar
-        start_time = webinar_date.date_time
-        end_time = start_time + timedelta(hours=1)  # Default to 1 hour duration
+        start_time, end_time = event_times(webinar_date)
         
         # Format times for Graph API
         start_time_str = start_time.strftime("%Y-%m-%dT%H:%M:%S")
@@ -127,7 +150,7 @@ class MS365CalendarService:
         url = f"https://graph.microsoft.com/v1.0/users/{self.settings.owner_email}/calendar/events"
         
         try:
-            response = requests.post(url, headers=headers, json=body)
+            response = graph_client.request('POST', url, headers=headers, json=body)
             
             if response.status_code >= 400:
                 logger.error(f"Failed to create MS365 meeting: {response.status_code}")
@@ -135,6 +158,7 @@ class MS365CalendarService:
                 return None
                 
             meeting = response.json()
+            store_event_ids(webinar_date, meeting)
             logger.info(f"Created MS365 calendar invite for {webinar.name} on {start_time}")
             return meeting
             
@@ -177,9 +201,7 @@ class MS365CalendarService:
         bundle = bundle_date.bundle
         date = bundle_date.date
         
-        # Use 9 AM as default time for bundle dates
-        start_time = datetime.combine(date, datetime.min.time().replace(hour=9))
-        end_time = start_time + timedelta(hours=8)  # All day event
+        start_time, end_time = event_times(bundle_date)
         
         # Format times for Graph API
         start_time_str = start_time.strftime("%Y-%m-%dT%H:%M:%S")
@@ -228,7 +250,7 @@ class MS365CalendarService:
         url = f"https://graph.microsoft.com/v1.0/users/{self.settings.owner_email}/calendar/events"
         
         try:
-            response = requests.post(url, headers=headers, json=body)
+            response = graph_client.request('POST', url, headers=headers, json=body)
             
             if response.status_code >= 400:
                 logger.error(f"Failed to create MS365 meeting: {response.status_code}")
@@ -236,6 +258,7 @@ class MS365CalendarService:
                 return None
                 
             meeting = response.json()
+            store_event_ids(bundle_date, meeting)
             logger.info(f"Created MS365 calendar invite for {bundle.name} on {date}")
             return meeting
             
@@ -287,7 +310,10 @@ class MS365CalendarService:
             return False, error_msg
     
     def create_webinar_meeting_with_custom_subject(self, webinar_date, subject):
-        """Create a calendar invite for a webinar date with custom subject"""
+        """
+        Create a calendar invite for a webinar date with custom subject.
+        If the date already has an invite it is updated in place rather than duplicated.
+        """
         if not self.settings.client_id or not self.settings.client_secret:
             logger.info("MS365 not configured, skipping calendar invite creation")
             return None
@@ -296,11 +322,74 @@ class MS365CalendarService:
         if not access_token:
             return None
             
-        # Get users in the calendar group
+        attendees = self.get_calendar_attendees()
+        if not attendees:
+            return None
+        
+        webinar = webinar_date.webinar
+        start_time = webinar_date.date_time
+        body = self.build_manual_webinar_event(webinar_date, subject, attendees)
+        
+        # Create the event
+        headers = {
+            'Authorization': f'Bearer {access_token}',
+            'Content-Type': 'application/json'
+        }
+        
+        try:
+            response = self.save_event(webinar_date, body, headers)
+            
+            if response.status_code >= 400:
+                logger.error(f"Failed to create MS365 meeting: {response.status_code}")
+                logger.error(f"Response: {response.text}")
+                return None
+            
+            meeting = response.json()
+            logger.info(f"Created manual MS365 calendar invite for {webinar.name} on {start_time}")
+            return meeting
+        
+        except Exception as e:
+            logger.error(f"Error creating manual MS365 calendar invite: {str(e)}")
+            return None
+    
+    def save_event(self, obj, body, headers):
+        """
+        Create the calendar event for obj, or PATCH it in place if obj already has
+        one, recording the new event's ids on obj (the caller saves obj).
+        Returns the Graph response
+        """
+        user_url = f"{graph_client.GRAPH_URL}/users/{self.settings.owner_email}"
+        if obj.calendar_event_id:
+            response = graph_client.request('PATCH', f"{user_url}/events/{obj.calendar_event_id}", headers=headers, json=body)
+            if response.status_code != 404:
+                return response
+            logger.warning(f"Calendar event for {obj} no longer exists, creating a new one")
+        
+        response = graph_client.request('POST', f"{user_url}/calendar/events", headers=headers, json=body)
+        if response.status_code < 400:
+            store_event_ids(obj, response.json(), save=False)
+        return response
+    
+    async def asave_event(self, obj, body, headers):
+        """Async version of save_event on the async HTTP client"""
+        user_url = f"{graph_client.GRAPH_URL}/users/{self.settings.owner_email}"
+        if obj.calendar_event_id:
+            response = await graph_client.arequest('PATCH', f"{user_url}/events/{obj.calendar_event_id}", headers=headers, json=body)
+            if response.status_code != 404:
+                return response
+            logger.warning(f"Calendar event for {obj} no longer exists, creating a new one")
+        
+        response = await graph_client.arequest('POST', f"{user_url}/calendar/events", headers=headers, json=body)
+        if response.status_code < 400:
+            store_event_ids(obj, response.json(), save=False)
+        return response
+    
+    def get_calendar_attendees(self):
+        """Return Graph attendee entries for the users in the calendar group, or [] if there are none"""
         calendar_group = Group.objects.filter(name='calendar').first()
         if not calendar_group:
             logger.warning("Calendar group not found, skipping calendar invite creation")
-            return None
+            return []
             
         attendees = []
         for user in calendar_group.user_set.all():
@@ -315,12 +404,12 @@ class MS365CalendarService:
         
         if not attendees:
             logger.info("No users in calendar group, skipping calendar invite creation")
-            return None
-            
-        # Prepare meeting details
+        return attendees
+    
+    def build_manual_webinar_event(self, webinar_date, subject, attendees):
+        """Build the Graph event body for a manually sent webinar date invite"""
         webinar = webinar_date.webinar
-        start_time = webinar_date.date_time
-        end_time = start_time + timedelta(hours=1)  # Default to 1 hour duration
+        start_time, end_time = event_times(webinar_date)
         
         # Format times for Graph API
         start_time_str = start_time.strftime("%Y-%m-%dT%H:%M:%S")
@@ -337,8 +426,7 @@ class MS365CalendarService:
         <p>Zoom meeting will be created when available.</p>
         """
         
-        # Prepare request body
-        body = {
+        return {
             "subject": subject,
             "body": {
                 "contentType": "HTML",
@@ -356,155 +444,281 @@ class MS365CalendarService:
             "isOnlineMeeting": False,
             "reminderMinutesBeforeStart": 15
         }
+    
+    def send_bulk_calendar_invites(self, webinar_dates):
+        """
+        Send calendar invites for many webinar dates using Graph JSON batching,
+        GRAPH_BATCH_SIZE events per request, and record the outcomes with bulk_update.
+        Throttled (429) invites are resent after their Retry-After; invites that
+        still fail keep calendar_invite_sent_at empty so a later run retries them.
+        Returns a dict with success, sent and failed counts, or an error
+        """
+        from django.utils import timezone
+        from .models import WebinarDate
+        
+        webinar_dates = list(webinar_dates)
+        if not webinar_dates:
+            return {'success': True, 'sent': 0, 'failed': 0}
+        if not self.settings.client_id or not self.settings.client_secret:
+            return {'success': False, 'error': "MS365 not configured"}
+        
+        access_token = self.get_access_token()
+        if not access_token:
+            return {'success': False, 'error': "Failed to get MS365 access token"}
+        
+        # The calendar group is read once for the whole run
+        attendees = self.get_calendar_attendees()
+        if not attendees:
+            return {'success': False, 'error': "No users in calendar group"}
         
-        # Create the event
         headers = {
             'Authorization': f'Bearer {access_token}',
             'Content-Type': 'application/json'
         }
+        events_url = f"/users/{self.settings.owner_email}/calendar/events"
         
-        url = f"https://graph.microsoft.com/v1.0/users/{self.settings.owner_email}/calendar/events"
-        
-        try:
-            response = requests.post(url, headers=headers, json=body)
-            
-            if response.status_code >= 400:
-                logger.error(f"Failed to create MS365 meeting: {response.status_code}")
-                logger.error(f"Response: {response.text}")
-                return None
+        outcomes = {}
+        events = {}
+        pending = webinar_dates
+        for attempt in range(THROTTLE_RETRIES + 1):
+            throttled = []
+            wait = 0
+            for start in range(0, len(pending), GRAPH_BATCH_SIZE):
+                chunk = pending[start:start + GRAPH_BATCH_SIZE]
+                batch = {
+                    "requests": [
+                        {
+                            "id": str(webinar_date.id),
+                            "method": "POST",
+                            "url": events_url,
+                            "headers": {"Content-Type": "application/json"},
+                            "body": self.build_manual_webinar_event(
+                                webinar_date,
+                                f"Webinar: {webinar_date.webinar.name}",
+                                attendees
+                            )
+                        }
+                        for webinar_date in chunk
+                    ]
+                }
                 
-            meeting = response.json()
-            logger.info(f"Created manual MS365 calendar invite for {webinar.name} on {start_time}")
-            return meeting
-            
-        except Exception as e:
-            logger.error(f"Error creating manual MS365 calendar invite: {str(e)}")
-            return None
+                try:
+                    response = graph_client.request('POST', f"{graph_client.GRAPH_URL}/$batch", headers=headers, json=batch)
+                    if response.status_code == 429:
+                        throttled.extend(chunk)
+                        wait = max(wait, retry_after(response.headers))
+                        for webinar_date in chunk:
+                            outcomes[webinar_date.id] = "MS365 API error: 429 throttled"
+                        continue
+                    if response.status_code != 200:
+                        raise ValueError(f"MS365 API error: {response.status_code}")
+                    by_id = {webinar_date.id: webinar_date for webinar_date in chunk}
+                    for item in response.json().get('responses', []):
+                        date_id = int(item['id'])
+                        status = item.get('status', 500)
+                        if status < 400:
+                            outcomes[date_id] = ''
+                            events[date_id] = item.get('body') or {}
+                            continue
+                        error = (item.get('body') or {}).get('error', {}).get('message', '')
+                        outcomes[date_id] = f"MS365 API error: {status} {error}".strip()
+                        if status == 429 and date_id in by_id:
+                            throttled.append(by_id[date_id])
+                            wait = max(wait, retry_after(item.get('headers')))
+                except Exception as e:
+                    logger.error(f"Error sending calendar invite batch: {str(e)}")
+                    for webinar_date in chunk:
+                        outcomes[webinar_date.id] = f"Error sending calendar invite: {str(e)}"
+            
+            if not throttled or attempt == THROTTLE_RETRIES or wait > THROTTLE_MAX_WAIT:
+                break
+            logger.warning(f"MS365 throttled {len(throttled)} calendar invites, retrying in {wait:.0f}s")
+            time.sleep(wait)
+            pending = throttled
+        
+        now = timezone.now()
+        for webinar_date in webinar_dates:
+            error = outcomes.get(webinar_date.id, "Missing from MS365 batch response")
+            # Failed invites keep no sent time, so pending_calendar_invite_dates picks them up again
+            webinar_date.calendar_invite_sent_at = None if error else now
+            webinar_date.calendar_invite_success = not error
+            webinar_date.calendar_invite_error = error
+            if webinar_date.id in events:
+                store_event_ids(webinar_date, events[webinar_date.id], save=False)
+        
+        WebinarDate.objects.bulk_update(
+            webinar_dates,
+            ['calendar_invite_sent_at', 'calendar_invite_success', 'calendar_invite_error',
+             'calendar_event_id', 'calendar_ical_uid']
+        )
+        
+        success_count = sum(1 for webinar_date in webinar_dates if webinar_date.calendar_invite_success)
+        logger.info(f"Sent bulk calendar invites: {success_count} of {len(webinar_dates)} succeeded")
+        return {'success': True, 'sent': success_count, 'failed': len(webinar_dates) - success_count}
     
     def send_clinic_calendar_invite(self, clinic_booking):
         """
         Send calendar invite for a clinic booking.
         Returns (success, message)
         """
-        from django.utils import timezone
-        from django.contrib.auth.models import Group
-        
         try:
-            if not self.settings.client_id or not self.settings.client_secret:
-                return False, "MS365 not configured"
-                
-            access_token = self.get_access_token()
-            if not access_token:
-                return False, "Failed to get MS365 access token"
-                
-            # Get users in the calendar group
-            calendar_group = Group.objects.filter(name='calendar').first()
-            if not calendar_group:
-                return False, "Calendar group not found"
-                
-            attendees = []
+            body, headers = self.build_clinic_invite(clinic_booking)
+            if body is None:
+                return False, headers
             
-            # Add the clinic customer as an attendee
-            attendees.append({
-                "emailAddress": {
-                    "address": clinic_booking.email,
-                    "name": clinic_booking.full_name
-                },
-                "type": "required"
-            })
+            response = self.save_event(clinic_booking, body, headers)
+            return self._clinic_invite_result(clinic_booking, response)
             
-            # Add calendar group members
-            for user in calendar_group.user_set.all():
-                if user.email:
-                    attendees.append({
-                        "emailAddress": {
-                            "address": user.email,
-                            "name": user.get_full_name() or user.username
-                        },
-                        "type": "required"
-                    })
+        except Exception as e:
+            error_msg = f"Error sending clinic calendar invite: {str(e)}"
+            logger.error(error_msg)
+            return False, error_msg
+    
+    async def asend_clinic_calendar_invite(self, clinic_booking):
+        """Async version of send_clinic_calendar_invite on the async HTTP client"""
+        from asgiref.sync import sync_to_async
+        
+        try:
+            # Building the invite fetches a token and queries the calendar group
+            body, headers = await sync_to_async(self.build_clinic_invite)(clinic_booking)
+            if body is None:
+                return False, headers
             
-            if len(attendees) <= 1:  # Only customer, no staff
-                return False, "No staff members in calendar group to invite"
-                
-            # Prepare meeting details
-            start_time = clinic_booking.clinic_date
-            end_time = start_time + timedelta(minutes=30)  # 30 minute clinic sessions
+            response = await self.asave_event(clinic_booking, body, headers)
+            return self._clinic_invite_result(clinic_booking, response)
             
-            # Format times for Graph API
-            start_time_str = start_time.strftime("%Y-%m-%dT%H:%M:%S")
-            end_time_str = end_time.strftime("%Y-%m-%dT%H:%M:%S")
+        except Exception as e:
+            error_msg = f"Error sending clinic calendar invite: {str(e)}"
+            logger.error(error_msg)
+            return False, error_msg
+    
+    def build_clinic_invite(self, clinic_booking):
+        """
+        Build the Graph event body and headers for a clinic booking invite.
+        Returns (body, headers), or (None, error message) if it can't be sent
+        """
+        if not self.settings.client_id or not self.settings.client_secret:
+            return None, "MS365 not configured"
             
-            # Create subject
-            subject = clinic_booking.zoom_meeting_subject
+        access_token = self.get_access_token()
+        if not access_token:
+            return None, "Failed to get MS365 access token"
             
-            # Create description with all clinic details
-            description = f"""
-            <h2>Clinic Session Details</h2>
-            <p><strong>Customer:</strong> {clinic_booking.full_name}</p>
-            <p><strong>Email:</strong> {clinic_booking.email}</p>
-            <p><strong>Organization:</strong> {clinic_booking.organization or 'Not provided'}</p>
-            <p><strong>Website:</strong> {clinic_booking.website or 'Not provided'}</p>
-            <p><strong>Date Submitted:</strong> {clinic_booking.created_at.strftime('%B %d, %Y at %I:%M %p %Z')}</p>
-            <p><strong>Clinic Date/Time:</strong> {start_time.strftime('%B %d, %Y at %I:%M %p %Z')}</p>
+        # Get users in the calendar group
+        calendar_group = Group.objects.filter(name='calendar').first()
+        if not calendar_group:
+            return None, "Calendar group not found"
             
-            <h3>Customer Question</h3>
-            <p>{clinic_booking.question}</p>
+        attendees = []
+        
+        # Add the clinic customer as an attendee
+        attendees.append({
+            "emailAddress": {
+                "address": clinic_booking.email,
+                "name": clinic_booking.full_name
+            },
+            "type": "required"
+        })
+        
+        # Add calendar group members
+        for user in calendar_group.user_set.all():
+            if user.email:
+                attendees.append({
+                    "emailAddress": {
+                        "address": user.email,
+                        "name": user.get_full_name() or user.username
+                    },
+                    "type": "required"
+                })
+        
+        if len(attendees) <= 1:  # Only customer, no staff
+            return None, "No staff members in calendar group to invite"
             
-            <h3>Zoom Meeting Details</h3>
+        # Prepare meeting details
+        start_time, end_time = event_times(clinic_booking)
+        
+        # Format times for Graph API
+        start_time_str = start_time.strftime("%Y-%m-%dT%H:%M:%S")
+        end_time_str = end_time.strftime("%Y-%m-%dT%H:%M:%S")
+        
+        # Create subject
+        subject = clinic_booking.zoom_meeting_subject
+        
+        # Create description with all clinic details
+        description = f"""
+        <h2>Clinic Session Details</h2>
+        <p><strong>Customer:</strong> {clinic_booking.full_name}</p>
+        <p><strong>Email:</strong> {clinic_booking.email}</p>
+        <p><strong>Organization:</strong> {clinic_booking.organization or 'Not provided'}</p>
+        <p><strong>Website:</strong> {clinic_booking.website or 'Not provided'}</p>
+        <p><strong>Date Submitted:</strong> {clinic_booking.created_at.strftime('%B %d, %Y at %I:%M %p %Z')}</p>
+        <p><strong>Clinic Date/Time:</strong> {start_time.strftime('%B %d, %Y at %I:%M %p %Z')}</p>
+        
+        <h3>Customer Question</h3>
+        <p>{clinic_booking.question}</p>
+        
+        <h3>Zoom Meeting Details</h3>
+        """
+        
+        if clinic_booking.zoom_meeting_id and clinic_booking.zoom_join_url:
+            description += f"""
+            <p><strong>Meeting ID:</strong> {clinic_booking.zoom_meeting_id}</p>
+            <p><strong>Join URL:</strong> <a href="{clinic_booking.zoom_join_url}">{clinic_booking.zoom_join_url}</a></p>
             """
-            
-            if clinic_booking.zoom_meeting_id and clinic_booking.zoom_join_url:
-                description += f"""
-                <p><strong>Meeting ID:</strong> {clinic_booking.zoom_meeting_id}</p>
-                <p><strong>Join URL:</strong> <a href="{clinic_booking.zoom_join_url}">{clinic_booking.zoom_join_url}</a></p>
-                """
-            else:
-                description += "<p>Zoom meeting details will be added when available.</p>"
-            
-            description += ""
-            
-            # Prepare request body
-            body = {
-                "subject": subject,
-                "body": {
-                    "contentType": "HTML",
-                    "content": description
-                },
-                "start": {
-                    "dateTime": start_time_str,
-                    "timeZone": "UTC"
-                },
-                "end": {
-                    "dateTime": end_time_str,
-                    "timeZone": "UTC"
-                },
-                "attendees": attendees,
-                "isOnlineMeeting": False,
-                "reminderMinutesBeforeStart": 15,
-                "showAs": "busy"
-            }
-            
-            # Create the event
-            headers = {
-                'Authorization': f'Bearer {access_token}',
-                'Content-Type': 'application/json'
-            }
-            
-            url = f"https://graph.microsoft.com/v1.0/users/{self.settings.owner_email}/calendar/events"
-            
-            response = requests.post(url, headers=headers, json=body)
-            
-            if response.status_code >= 400:
-                error_msg = f"Failed to create clinic calendar invite: {response.status_code} - {response.text}"
-                logger.error(error_msg)
-                return False, error_msg
-                
-            meeting = response.json()
-            logger.info(f"Created clinic calendar invite for {clinic_booking.full_name} on {start_time}")
-            return True, f"Calendar invite sent successfully for clinic with {clinic_booking.full_name}"
-            
-        except Exception as e:
-            error_msg = f"Error sending clinic calendar invite: {str(e)}"
+        else:
+            description += "<p>Zoom meeting details will be added when available.</p>"
+        
+        description += ""
+        
+        # Prepare request body
+        body = {
+            "subject": subject,
+            "body": {
+                "contentType": "HTML",
+                "content": description
+            },
+            "start": {
+                "dateTime": start_time_str,
+                "timeZone": "UTC"
+            },
+            "end": {
+                "dateTime": end_time_str,
+                "timeZone": "UTC"
+            },
+            "attendees": attendees,
+            "isOnlineMeeting": False,
+            "reminderMinutesBeforeStart": 15,
+            "showAs": "busy"
+        }
+        
+        # Create the event
+        headers = {
+            'Authorization': f'Bearer {access_token}',
+            'Content-Type': 'application/json'
+        }
+        
+        return body, headers
+    
+    def _clinic_invite_result(self, clinic_booking, response):
+        start_time, _ = event_times(clinic_booking)
+        
+        if response.status_code >= 400:
+            error_msg = f"Failed to create clinic calendar invite: {response.status_code} - {response.text}"
             logger.error(error_msg)
-            return False, error_msg
\ No newline at end of file
+            return False, error_msg
+        
+        meeting = response.json()
+        logger.info(f"Created clinic calendar invite for {clinic_booking.full_name} on {start_time}")
+        return True, f"Calendar invite sent successfully for clinic with {clinic_booking.full_name}"
+
+
+def pending_calendar_invite_dates():
+    """Upcoming webinar dates that have not had a calendar invite sent, or whose invite failed"""
+    from django.utils import timezone
+    from .models import WebinarDate
+    
+    return WebinarDate.alive.filter(
+        on_demand=False,
+        calendar_invite_sent_at=None,
+        date_time__gte=timezone.now()
+    ).select_related('webinar').order_by('date_time')
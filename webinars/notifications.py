@@ -0,0 +1,138 @@
+"""
+Coalescing of error notification emails.
+
+Errors are keyed by (recipient, error signature, webinar/bundle). The first
+error for a key is queued in the outbox straight away. Repeats within
+ERROR_DIGEST_WINDOW seconds only increment a cache counter and record the
+registrant, and are folded into one digest email that the outbox sends when
+the window ends (see render_digest, called by deliver_outbox).
+"""
+import hashlib
+import logging
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Seconds repeats are folded into a digest; 0 sends every error email
+DIGEST_WINDOW = getattr(settings, 'ERROR_DIGEST_WINDOW', 15 * 60)
+
+# Repeats are kept this long, so a digest survives a stalled delivery worker
+DIGEST_TTL = 24 * 60 * 60
+
+# Registrants listed in one digest; later repeats are only counted
+MAX_DIGEST_ITEMS = 500
+
+
+def error_signature(error_message):
+    """
+    Reduce an error message to a stable signature by dropping the parts that
+    vary between occurrences: numbers, quoted values and email addresses.
+    """
+    normalized = re.sub(r"\S+@\S+", "<email>", error_message)
+    normalized = re.sub(r"'[^']*'|\"[^\"]*\"", "<value>", normalized)
+    normalized = re.sub(r"\d+", "<n>", normalized)
+    return normalized.strip()[:200]
+
+
+def registrant_line(webhook_data):
+    """Describe the registrant in a webhook payload (or extracted attendee data) for a digest."""
+    payload = webhook_data.get('payload') if isinstance(webhook_data.get('payload'), dict) else webhook_data
+    first_name = payload.get('first_name') or payload.get('First Name') or payload.get('member_first_name') or ''
+    last_name = payload.get('last_name') or payload.get('Surname') or payload.get('member_last_name') or ''
+    email = payload.get('email') or payload.get('Email') or payload.get('member_email') or ''
+    name = f"{first_name} {last_name}".strip()
+    if email:
+        return f"{name} <{email}>" if name else email
+    return name or "(registrant unknown)"
+
+
+def _digest_key(to_email, signature, scope):
+    raw = f"{to_email.lower()}|{signature}|{scope}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def _cache_key(digest_key, suffix):
+    return f"error_digest:{digest_key}:{suffix}"
+
+
+def notify_error(to_email, subject, message, signature, scope='', registrant=''):
+    """
+    Queue an error notification, coalescing repeats of the same error.
+    
+    message is the email body, or a callable returning it; a callable is only
+    called when an email is actually queued, so repeats don't pay for building
+    it. The first occurrence in a window is queued as-is. A repeat costs a few
+    cache operations; the first repeat also queues the digest email, scheduled
+    for the end of the window.
+    """
+    from .email_service import enqueue_email
+    from .models import OutboundEmail
+    
+    render = message if callable(message) else lambda: message
+    
+    if DIGEST_WINDOW <= 0:
+        enqueue_email(to_email, subject, render())
+        return
+    
+    digest_key = _digest_key(to_email, signature, scope)
+    if cache.add(_cache_key(digest_key, 'first'), True, DIGEST_WINDOW):
+        enqueue_email(to_email, subject, render())
+        return
+    
+    count_key = _cache_key(digest_key, 'count')
+    cache.add(count_key, 0, DIGEST_TTL)
+    try:
+        count = cache.incr(count_key)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.add(count_key, 1, DIGEST_TTL)
+        count = 1
+    if count <= MAX_DIGEST_ITEMS:
+        cache.set(_cache_key(digest_key, f'item:{count}'), registrant, DIGEST_TTL)
+    
+    if cache.add(_cache_key(digest_key, 'digest'), True, DIGEST_TTL):
+        OutboundEmail.objects.create(
+            to_email=to_email,
+            subject=f"[Digest] {subject}"[:255],
+            message=render(),
+            digest_key=digest_key,
+            next_attempt_at=timezone.now() + timedelta(seconds=DIGEST_WINDOW)
+        )
+        logger.info(f"Coalescing repeats of '{subject}' to {to_email} into a digest")
+
+
+def render_digest(email):
+    """
+    Build a digest email's message from the repeats recorded in the cache and
+    reset the counters, so the next repeat starts a new digest.
+    
+    The email's stored message is the first repeat's notification and is kept
+    as an example. Clears email.digest_key so a retried delivery isn't rendered twice.
+    """
+    digest_key = email.digest_key
+    cache.delete(_cache_key(digest_key, 'digest'))
+    count_key = _cache_key(digest_key, 'count')
+    count = cache.get(count_key) or 0
+    item_keys = [_cache_key(digest_key, f'item:{n}') for n in range(1, min(count, MAX_DIGEST_ITEMS) + 1)]
+    items = cache.get_many(item_keys)
+    cache.delete_many([count_key] + item_keys)
+    
+    registrants = "\n".join(f"- {items[key]}" for key in item_keys if key in items)
+    if count > MAX_DIGEST_ITEMS:
+        registrants += f"\n- ... and {count - MAX_DIGEST_ITEMS} more"
+    
+    email.message = f"""
+This error occurred {count} more time(s) within {DIGEST_WINDOW // 60} minutes of the first notification.
+
+Affected registrants:
+{registrants or '(details expired)'}
+
+Example notification:
+{email.message}
+"""
+    email.digest_key = ''
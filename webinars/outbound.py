@@ -0,0 +1,223 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+import requests
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+
+# (connect, read) timeouts in seconds per integration, overridable with settings.OUTBOUND_TIMEOUTS
+DEFAULT_TIMEOUTS = {
+    'zoom': (3.05, 10),
+    'graph': (3.05, 15),
+}
+
+# Consecutive failures before a breaker opens, and how long it stays open,
+# overridable with settings.OUTBOUND_BREAKER
+DEFAULT_BREAKER = {
+    'failure_threshold': 5,
+    'reset_timeout': 60,
+}
+
+# Connections kept open per host by each pooled session; no less than the threads per
+# worker (see gunicorn.conf.py), overridable with settings.OUTBOUND_POOL_MAXSIZE
+POOL_MAXSIZE = getattr(settings, 'OUTBOUND_POOL_MAXSIZE', 10)
+
+# Total seconds a webhook request may spend on outbound calls, kept well under
+# gunicorn's worker timeout; overridable with settings.OUTBOUND_WEBHOOK_DEADLINE
+WEBHOOK_DEADLINE = getattr(settings, 'OUTBOUND_WEBHOOK_DEADLINE', 20)
+
+# The current request's deadline (a time.monotonic() value); a context variable so
+# it follows async views into the tasks and worker threads they start
+_deadline = ContextVar('outbound_deadline', default=None)
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+class OutboundUnavailableError(requests.RequestException):
+    """Raised instead of making a call when an integration can't be reached in time."""
+    pass
+
+
+class CircuitOpenError(OutboundUnavailableError):
+    """Raised when the integration's circuit breaker is open."""
+    pass
+
+
+class DeadlineExceededError(OutboundUnavailableError, requests.Timeout):
+    """Raised when the current request has no deadline budget left for the call."""
+    pass
+
+
+def is_unavailable_error(error):
+    """Return True if error means the integration is down or slow, so the call is worth retrying later."""
+    return isinstance(error, (OutboundUnavailableError, requests.ConnectionError, requests.Timeout))
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one integration with its state in the shared cache,
+    so every worker process sees the same open/closed state.
+    
+    After failure_threshold consecutive failures the breaker opens and calls
+    are refused for reset_timeout seconds. Once that has passed a single
+    worker is let through as a probe; its result closes or re-opens the breaker.
+    """
+    
+    def __init__(self, name):
+        self.name = name
+        config = {**DEFAULT_BREAKER, **getattr(settings, 'OUTBOUND_BREAKER', {})}
+        self.failure_threshold = config['failure_threshold']
+        self.reset_timeout = config['reset_timeout']
+    
+    def _key(self, suffix):
+        return f"outbound:breaker:{self.name}:{suffix}"
+    
+    def is_open(self):
+        """Return True if calls should be skipped right now."""
+        opened_until = cache.get(self._key('opened_until'))
+        if opened_until is None:
+            return False
+        if time.time() < opened_until:
+            return True
+        # Half-open: let exactly one caller probe the integration
+        return not cache.add(self._key('probe'), 1, timeout=self.reset_timeout)
+    
+    def record_success(self):
+        cache.delete_many([self._key('failures'), self._key('opened_until'), self._key('probe')])
+    
+    def record_failure(self):
+        key = self._key('failures')
+        cache.add(key, 0, timeout=None)
+        try:
+            failures = cache.incr(key)
+        except ValueError:
+            # Evicted between add and incr
+            cache.set(key, 1, timeout=None)
+            failures = 1
+        
+        if failures >= self.failure_threshold:
+            cache.set(self._key('opened_until'), time.time() + self.reset_timeout, timeout=None)
+            cache.delete(self._key('probe'))
+            logger.warning(f"Circuit breaker for {self.name} opened after {failures} consecutive failures")
+
+
+def is_available(integration):
+    """Return False if the integration's circuit breaker is open."""
+    return not CircuitBreaker(integration).is_open()
+
+
+@contextmanager
+def deadline(seconds):
+    """
+    Limit the total time outbound calls may take inside the block.
+    Nested deadlines can only shorten the budget, never extend it.
+    """
+    previous = _deadline.get()
+    new_deadline = time.monotonic() + seconds
+    token = _deadline.set(min(previous, new_deadline) if previous else new_deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def with_deadline(seconds):
+    """View decorator that gives the request a deadline budget for outbound calls."""
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(*args, **kwargs):
+                with deadline(seconds):
+                    return await view_func(*args, **kwargs)
+            return async_wrapper
+        
+        @wraps(view_func)
+        def wrapper(*args, **kwargs):
+            with deadline(seconds):
+                return view_func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def remaining_budget():
+    """Seconds left in the current deadline, or None if there is no deadline."""
+    current = _deadline.get()
+    if current is None:
+        return None
+    return current - time.monotonic()
+
+
+def get_timeout(integration):
+    """Return the (connect, read) timeout for an integration, trimmed to the deadline budget."""
+    timeouts = {**DEFAULT_TIMEOUTS, **getattr(settings, 'OUTBOUND_TIMEOUTS', {})}
+    connect, read = timeouts[integration]
+    
+    remaining = remaining_budget()
+    if remaining is None:
+        return connect, read
+    if remaining <= 0:
+        raise DeadlineExceededError(f"No deadline budget left for {integration} call")
+    return min(connect, remaining), min(read, remaining)
+
+
+def get_session(integration):
+    """
+    Return the process-wide pooled requests.Session for an integration, shared
+    by all of a worker's threads. Its connection pool is thread-safe; don't set
+    per-request state such as auth or headers on it.
+    """
+    session = _sessions.get(integration)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(integration)
+            if session is None:
+                session = requests.Session()
+                session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=POOL_MAXSIZE))
+                _sessions[integration] = session
+    return session
+
+
+def request(integration, method, url, session=None, **kwargs):
+    """
+    Make an HTTP request to an integration through its circuit breaker,
+    with the integration's timeout and the current deadline budget applied.
+    
+    Connection errors, timeouts and 5xx responses count as failures.
+    Raises CircuitOpenError or DeadlineExceededError without making the call.
+    """
+    breaker = CircuitBreaker(integration)
+    if breaker.is_open():
+        metrics.record_skipped_call(integration)
+        raise CircuitOpenError(f"{integration} is unavailable (circuit open), call skipped")
+    
+    try:
+        kwargs['timeout'] = get_timeout(integration)
+    except DeadlineExceededError:
+        metrics.record_skipped_call(integration)
+        raise
+    
+    with metrics.track_outbound_call(integration) as call:
+        try:
+            response = (session or requests).request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            breaker.record_failure()
+            raise
+        
+        if response.status_code >= 500:
+            call.outcome = 'error'
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+    return response
@@ -0,0 +1,117 @@
+"""
+Rate limiting for the public webhook and cron endpoints.
+
+Each request to a limited view spends a token from two buckets, one for its
+client IP and one for the endpoint as a whole; an empty bucket means a 429.
+The buckets live in the shared cache so every worker sees the same counts.
+Use a cache with atomic increments (Redis or Memcached) in production; with
+the database cache two workers can occasionally both take the last token.
+
+Settings:
+    RATE_LIMITS: bucket sizes and refill rates, see DEFAULT_RATE_LIMITS
+    RATE_LIMITED_VIEWS: URL names of the limited views
+    RATE_LIMIT_CLIENT_IP_HEADER: request.META key holding the client IP when
+        behind a proxy, e.g. 'HTTP_X_FORWARDED_FOR' (default REMOTE_ADDR)
+    RATE_LIMIT_MAX_IN_FLIGHT: limited requests a sync (WSGI) worker handles at
+        once before shedding
+    RATE_LIMIT_MAX_IN_FLIGHT_ASYNC: the same for an async (ASGI) worker; None,
+        the default, doesn't shed, as waiting webhooks don't tie up threads there
+"""
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# burst: the most requests allowed at once; rate: tokens added back per second
+DEFAULT_RATE_LIMITS = {
+    'ip': {'burst': 30, 'rate': 0.5},
+    'endpoint': {'burst': 300, 'rate': 10},
+}
+
+RATE_LIMITED_VIEWS = getattr(settings, 'RATE_LIMITED_VIEWS', (
+    'attendee_webhook',
+    'download_webhook',
+    'clinic_booking_webhook',
+    'cron_activate_pending',
+))
+
+CLIENT_IP_HEADER = getattr(settings, 'RATE_LIMIT_CLIENT_IP_HEADER', None)
+
+# Below gunicorn's threads per worker, so a flood of webhooks leaves a thread for the app pages
+MAX_IN_FLIGHT = getattr(settings, 'RATE_LIMIT_MAX_IN_FLIGHT', 3)
+
+# An ASGI worker handles webhooks on its event loop rather than one per thread,
+# so the thread-based cap above would only hold it to a fraction of its capacity
+MAX_IN_FLIGHT_ASYNC = getattr(settings, 'RATE_LIMIT_MAX_IN_FLIGHT_ASYNC', None)
+
+
+def get_rate_limits():
+    limits = getattr(settings, 'RATE_LIMITS', {})
+    return {scope: {**default, **limits.get(scope, {})} for scope, default in DEFAULT_RATE_LIMITS.items()}
+
+
+def client_ip(request):
+    """Return the client's IP, from CLIENT_IP_HEADER when behind a proxy."""
+    if CLIENT_IP_HEADER and request.META.get(CLIENT_IP_HEADER):
+        # The proxy in front of us appends the address it saw, so the last entry is the trusted one
+        return request.META[CLIENT_IP_HEADER].split(',')[-1].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+class TokenBucket:
+    """
+    A bucket of burst tokens refilled at rate tokens per second, kept in the
+    cache as request counts for two consecutive windows of burst / rate
+    seconds. The previous window's count is weighted by how much of it still
+    overlaps the last burst / rate seconds, which approximates the bucket
+    using only cache.incr rather than a read-modify-write of the token count.
+    """
+    
+    def __init__(self, key, burst, rate):
+        self.key = key
+        self.burst = burst
+        self.rate = rate
+        self.window = burst / rate
+    
+    def take(self, now=None):
+        """
+        Spend a token. Returns the seconds to wait before retrying when the
+        bucket is empty, or 0 when the request is allowed. Refused requests
+        still count, so a client that keeps retrying stays limited.
+        """
+        now = time.time() if now is None else now
+        slot, offset = divmod(now, self.window)
+        current_key = f"ratelimit:{self.key}:{int(slot)}"
+        
+        # add() is a no-op if the key exists, so concurrent requests don't reset the count
+        cache.add(current_key, 0, int(self.window * 2) + 1)
+        try:
+            current = cache.incr(current_key)
+        except ValueError:
+            # Expired between add() and incr()
+            cache.add(current_key, 1, int(self.window * 2) + 1)
+            current = 1
+        previous = cache.get(f"ratelimit:{self.key}:{int(slot) - 1}", 0)
+        
+        used = previous * (1 - offset / self.window) + current
+        if used <= self.burst:
+            return 0
+        return max(1, math.ceil((used - self.burst) / self.rate))
+
+
+def check(view_name, request):
+    """
+    Spend a token from the client's and the endpoint's buckets.
+    Returns (scope, retry_after) for the bucket that is empty, or None if allowed.
+    """
+    limits = get_rate_limits()
+    buckets = (
+        ('ip', TokenBucket(f"ip:{view_name}:{client_ip(request)}", **limits['ip'])),
+        ('endpoint', TokenBucket(f"endpoint:{view_name}", **limits['endpoint'])),
+    )
+    for scope, bucket in buckets:
+        retry_after = bucket.take()
+        if retry_after:
+            return scope, retry_after
+    return None
@@ -0,0 +1,31 @@
+"""
+Django REST Framework renderer and parser using the JSON codec (orjson when installed).
+"""
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from . import codec
+
+
+class CodecJSONRenderer(JSONRenderer):
+    """JSONRenderer that serializes with the codec; indents when the client asks for it."""
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return codec.dumps_pretty(data).encode('utf-8')
+        return codec.dumps(data)
+
+
+class CodecJSONParser(JSONParser):
+    """JSONParser that parses with the codec."""
+    renderer_class = CodecJSONRenderer
+    
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return codec.loads(stream.read())
+        except (codec.JSONDecodeError, UnicodeDecodeError) as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -1,10 +1,35 @@
+import hashlib
 import logging
+import threading
+import time
 from datetime import datetime, timezone
 from typing import Dict, Tuple, Optional
+from django.conf import settings as django_settings
 from django.utils import timezone as django_timezone
+from .metrics import track_outbound
 
 logger = logging.getLogger(__name__)
 
+# Salesforce sessions time out after two hours of inactivity by default; log in again
+# before then. Overridable with settings.SALESFORCE_SESSION_SECONDS
+SESSION_SECONDS = getattr(django_settings, 'SALESFORCE_SESSION_SECONDS', 60 * 60)
+
+# One logged-in connection per process, shared by all threads: (credentials key, connection, connected at)
+_connection = None
+_connection_lock = threading.Lock()
+
+
+def _credentials_key(sf_settings):
+    raw = f"{sf_settings.username}:{sf_settings.password}:{sf_settings.security_token}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _drop_connection():
+    """Forget the shared connection so the next call logs in again."""
+    global _connection
+    with _connection_lock:
+        _connection = None
+
 
 class SalesforceService:
     """Service for integrating with Salesforce API using simple-salesforce."""
@@ -25,32 +50,54 @@ class SalesforceService:
             self.settings = None
     
     def _connect(self) -> bool:
-        """Connect to Salesforce using simple-salesforce."""
+        """
+        Connect to Salesforce using simple-salesforce.
+        
+        The connection is shared by every SalesforceService in the process, so
+        syncs don't each log in; it is replaced when the settings change, after
+        SESSION_SECONDS, or when Salesforce reports the session expired.
+        """
+        global _connection
         if not self.settings:
             logger.error("No Salesforce settings available")
             return False
         
-        try:
-            from simple_salesforce import Salesforce
-            
-            # Connect to Salesforce
-            # Start with the simplest approach - let simple-salesforce handle the domain
-            logger.info(f"Attempting to connect to Salesforce with username: {self.settings.username}")
+        key = _credentials_key(self.settings)
+        with _connection_lock:
+            if _connection and _connection[0] == key and time.monotonic() - _connection[2] < SESSION_SECONDS:
+                self.sf = _connection[1]
+                return True
             
-            self.sf = Salesforce(
-                username=self.settings.username,
-                password=self.settings.password,
-                security_token=self.settings.security_token
-                # Don't specify domain initially - let simple-salesforce auto-detect
-            )
-            
-            logger.info("Successfully connected to Salesforce")
-            return True
+            try:
+                from simple_salesforce import Salesforce
+                
+                # Connect to Salesforce
+                # Start with the simplest approach - let simple-salesforce handle the domain
+                logger.info(f"Attempting to connect to Salesforce with username: {self.settings.username}")
+                
+                self.sf = Salesforce(
+                    username=self.settings.username,
+                    password=self.settings.password,
+                    security_token=self.settings.security_token
+                    # Don't specify domain initially - let simple-salesforce auto-detect
+                )
+                _connection = (key, self.sf, time.monotonic())
+                
+                logger.info("Successfully connected to Salesforce")
+                return True
             
-        except Exception as e:
-            logger.error(f"Error connecting to Salesforce: {str(e)}")
-            return False
+            except Exception as e:
+                logger.error(f"Error connecting to Salesforce: {str(e)}")
+                return False
+    
+    def _handle_error(self, e):
+        """Drop the shared connection if the call failed because its session expired."""
+        if type(e).__name__ == 'SalesforceExpiredSession':
+            logger.info("Salesforce session expired, logging in again on the next call")
+            self.sf = None
+            _drop_connection()
     
+    @track_outbound('salesforce')
     def find_account_by_name(self, account_name: str) -> Optional[str]:
         """Find Account by name, return Account ID if found."""
         if not account_name:
@@ -70,9 +117,11 @@ class SalesforceService:
             return None
             
         except Exception as e:
+            self._handle_error(e)
             logger.error(f"Error finding account by name: {str(e)}")
             return None
     
+    @track_outbound('salesforce')
     def create_account(self, account_name: str) -> Tuple[bool, str, str]:
         """Create a new Account in Salesforce."""
         if not account_name:
@@ -97,9 +146,11 @@ class SalesforceService:
                 return False, "", f"Failed to create Account: {result}"
                 
         except Exception as e:
+            self._handle_error(e)
             logger.error(f"Error creating account: {str(e)}")
             return False, "", f"Error creating account: {str(e)}"
     
+    @track_outbound('salesforce')
     def find_contact_by_email(self, email: str) -> Optional[str]:
         """Find Contact by email, return Contact ID if found."""
         if not email:
@@ -119,9 +170,11 @@ class SalesforceService:
             return None
             
         except Exception as e:
+            self._handle_error(e)
             logger.error(f"Error finding contact by email: {str(e)}")
             return None
     
+    @track_outbound('salesforce')
     def create_contact(self, first_name: str, last_name: str, email: str, account_id: str = None) -> Tuple[bool, str, str]:
         """Create a new Contact in Salesforce."""
         if not email:
@@ -157,9 +210,11 @@ class SalesforceService:
                 return False, "", f"Failed to create Contact: {result}"
                 
         except Exception as e:
+            self._handle_error(e)
             logger.error(f"Error creating contact: {str(e)}")
             return False, "", f"Error creating contact: {str(e)}"
     
+    @track_outbound('salesforce')
     def create_task(self, contact_id: str, subject: str, description: str) -> Tuple[bool, str, str]:
         """Create a completed Task in Salesforce assigned to Rachel CLINTON."""
         if not contact_id:
@@ -201,6 +256,7 @@ class SalesforceService:
                 return False, "", f"Failed to create Task: {result}"
                 
         except Exception as e:
+            self._handle_error(e)
             logger.error(f"Error creating task: {str(e)}")
             return False, "", f"Error creating task: {str(e)}"
     
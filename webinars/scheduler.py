@@ -0,0 +1,293 @@
+"""
+Periodic jobs run by the run_scheduler command.
+
+Any number of app nodes can run `manage.py run_scheduler`. They compete for a
+lease row (SchedulerLease) and only the holder runs jobs. The holder renews
+the lease every tick, and while a job is running; if it dies, another node
+takes over once the lease expires. Every run is recorded in JobRun, except
+the idle runs of frequent polling jobs registered with record_idle=False, and
+a job's next run is worked out from its last recorded start, so a new leader
+keeps the schedule.
+"""
+import io
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = 'scheduler'
+
+# A leader that hasn't renewed for this many seconds is replaced
+LEASE_SECONDS = getattr(settings, 'SCHEDULER_LEASE_SECONDS', 60)
+
+# Per-job interval overrides in seconds, e.g. {'sync_salesforce': 30 * 60}
+INTERVALS = getattr(settings, 'SCHEDULER_INTERVALS', {})
+
+
+class Job:
+    """
+    A registered periodic job: runs func every interval seconds plus up to
+    jitter seconds. Runs that succeed with no output are only recorded if
+    record_idle is set.
+    """
+    
+    def __init__(self, name, func, interval, jitter=0, record_idle=True):
+        self.name = name
+        self.func = func
+        self.interval = INTERVALS.get(name, interval)
+        self.jitter = jitter
+        self.record_idle = record_idle
+    
+    def next_delay(self):
+        return timedelta(seconds=self.interval + random.uniform(0, self.jitter))
+
+
+JOBS = {}
+
+
+def register(name, interval, jitter=0, record_idle=True):
+    """Decorator registering a function as a periodic job. Its return value is stored as the run output."""
+    def decorator(func):
+        JOBS[name] = Job(name, func, interval, jitter, record_idle)
+        return func
+    return decorator
+
+
+def _command(name, *args):
+    out = io.StringIO()
+    call_command(name, *args, stdout=out, stderr=out)
+    return out.getvalue()
+
+
+@register('deliver_emails', interval=60, jitter=10)
+def deliver_emails():
+    return _command('deliver_emails')
+
+
+@register('background_jobs', interval=5, record_idle=False)
+def background_jobs():
+    # Deployments with a dedicated run_background_jobs worker can set a long interval.
+    # --quiet prints nothing when no job was claimed, so idle polls leave no JobRun.
+    return _command('run_background_jobs', '--once', '--quiet')
+
+
+@register('activate_pending', interval=5 * 60, jitter=30)
+def activate_pending():
+    return _command('activate_pending', '--quiet')
+
+
+@register('register_zoom_pending', interval=10 * 60, jitter=60)
+def register_zoom_pending():
+    return _command('register_zoom_pending')
+
+
+@register('retry_clinic_bookings', interval=10 * 60, jitter=60)
+def retry_clinic_bookings():
+    return _command('retry_clinic_bookings')
+
+
+@register('sync_salesforce', interval=15 * 60, jitter=60)
+def sync_salesforce():
+    return _command('sync_salesforce')
+
+
+@register('reconcile_calendar', interval=60 * 60, jitter=5 * 60)
+def reconcile_calendar():
+    return _command('reconcile_calendar')
+
+
+@register('archive_attendees', interval=24 * 60 * 60, jitter=30 * 60)
+def archive_attendees():
+    return _command('archive_attendees')
+
+
+@register('retention', interval=24 * 60 * 60, jitter=30 * 60)
+def retention():
+    """
+    Delete webhook logs, sent emails, job history and finished background jobs
+    past their retention periods, and payload blobs nothing refers to.
+    """
+    from .models import WebhookLog, OutboundEmail, JobRun, BackgroundJob, PayloadBlob
+    
+    now = timezone.now()
+    webhook_days = getattr(settings, 'WEBHOOK_LOG_RETENTION_DAYS', 90)
+    email_days = getattr(settings, 'EMAIL_OUTBOX_RETENTION_DAYS', 30)
+    job_days = getattr(settings, 'JOB_RUN_RETENTION_DAYS', 30)
+    
+    webhook_logs, _ = WebhookLog.objects.filter(created_at__lt=now - timedelta(days=webhook_days)).delete()
+    emails, _ = OutboundEmail.objects.filter(
+        status=OutboundEmail.STATUS_SENT,
+        sent_at__lt=now - timedelta(days=email_days)
+    ).delete()
+    job_runs, _ = JobRun.objects.filter(started_at__lt=now - timedelta(days=job_days)).delete()
+    background_jobs = BackgroundJob.objects.filter(
+        status__in=[BackgroundJob.STATUS_SUCCEEDED, BackgroundJob.STATUS_FAILED],
+        finished_at__lt=now - timedelta(days=job_days)
+    ).delete()[1].get('webinars.BackgroundJob', 0)
+    # Recently stored blobs, new or reused, may belong to a webhook that hasn't saved its rows yet
+    payload_blobs, _ = PayloadBlob.unreferenced().filter(created_at__lt=now - timedelta(days=1)).delete()
+    return (f"Deleted {webhook_logs} webhook logs, {emails} sent emails, {job_runs} job runs, "
+            f"{background_jobs} background jobs, {payload_blobs} payload blobs")
+
+
+def default_holder():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def acquire_lease(holder, seconds=LEASE_SECONDS, name=LEASE_NAME):
+    """
+    Take or renew the lease for holder. Returns True if holder now has it.
+    
+    The conditional UPDATE only matches if holder already has the lease or it
+    has expired, so of several nodes racing for an expired lease exactly one wins.
+    """
+    from .models import SchedulerLease
+    
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=seconds)
+    updated = SchedulerLease.objects.filter(name=name).filter(
+        Q(holder=holder) | Q(expires_at__lt=now)
+    ).update(holder=holder, expires_at=expires_at)
+    if updated:
+        return True
+    
+    try:
+        with transaction.atomic():
+            SchedulerLease.objects.create(name=name, holder=holder, expires_at=expires_at)
+        return True
+    except IntegrityError:
+        # Another node holds it, or created it first
+        return False
+
+
+def release_lease(holder, name=LEASE_NAME):
+    """Give up the lease so another node can take over without waiting for it to expire."""
+    from .models import SchedulerLease
+    
+    SchedulerLease.objects.filter(name=name, holder=holder).update(holder='', expires_at=timezone.now())
+
+
+class Scheduler:
+    """Runs the registered jobs that are due while this process holds the lease."""
+    
+    def __init__(self, jobs=None, holder=None, tick=5):
+        self.jobs = list(JOBS.values()) if jobs is None else jobs
+        self.holder = holder or default_holder()
+        self.tick = tick
+        self.next_run = {}
+        self.is_leader = False
+        self.stopping = threading.Event()
+    
+    def last_run(self, job):
+        from .models import JobRun
+        return JobRun.objects.filter(job=job.name).order_by('-started_at').first()
+    
+    def schedule_from_history(self):
+        """Work out each job's next run from its last recorded start."""
+        now = timezone.now()
+        for job in self.jobs:
+            last = self.last_run(job)
+            self.next_run[job.name] = last.started_at + job.next_delay() if last else now
+    
+    def run_job(self, job):
+        """Run one job and record it in JobRun. Returns the JobRun, or None for an unrecorded idle run."""
+        from .models import JobRun
+        
+        run = JobRun(job=job.name, started_at=timezone.now(), holder=self.holder)
+        if job.record_idle:
+            run.save()
+        start = time.perf_counter()
+        try:
+            with self.heartbeat():
+                output = job.func()
+            run.success = True
+            run.output = str(output or '')
+        except Exception:
+            logger.exception("Scheduled job %s failed", job.name)
+            run.success = False
+            run.error = traceback.format_exc()
+        run.finished_at = timezone.now()
+        run.duration_ms = int((time.perf_counter() - start) * 1000)
+        
+        self.next_run[job.name] = run.started_at + job.next_delay()
+        if run.pk:
+            run.save(update_fields=['success', 'output', 'error', 'finished_at', 'duration_ms'])
+        elif run.success and not run.output:
+            return None
+        else:
+            run.save()
+        logger.info("Scheduled job %s finished in %sms (success=%s)", job.name, run.duration_ms, run.success)
+        return run
+    
+    @contextmanager
+    def heartbeat(self):
+        """Keep renewing the lease in a background thread while a long job runs."""
+        done = threading.Event()
+        
+        def renew():
+            try:
+                while not done.wait(LEASE_SECONDS / 3):
+                    if not acquire_lease(self.holder):
+                        logger.warning("Scheduler lease lost while a job was running")
+            finally:
+                connection.close()
+        
+        thread = threading.Thread(target=renew, name='scheduler-heartbeat', daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+    
+    def run_pending(self):
+        """Renew the lease and run the jobs that are due. Returns the JobRuns of this tick."""
+        close_old_connections()
+        if not acquire_lease(self.holder):
+            if self.is_leader:
+                logger.warning("Scheduler %s lost the lease", self.holder)
+                self.is_leader = False
+                self.next_run = {}
+            return []
+        
+        if not self.is_leader:
+            logger.info("Scheduler %s is now the leader", self.holder)
+            self.is_leader = True
+            self.schedule_from_history()
+        
+        runs = []
+        for job in self.jobs:
+            if self.stopping.is_set():
+                break
+            if self.next_run[job.name] <= timezone.now():
+                run = self.run_job(job)
+                if run:
+                    runs.append(run)
+        return runs
+    
+    def run_forever(self):
+        try:
+            while not self.stopping.is_set():
+                self.run_pending()
+                self.stopping.wait(self.tick)
+        finally:
+            if self.is_leader:
+                release_lease(self.holder)
+            logger.info("Scheduler %s stopped", self.holder)
+    
+    def stop(self, *args):
+        """Stop after the running job; usable as a signal handler."""
+        self.stopping.set()
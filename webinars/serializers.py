@@ -2,15 +2,36 @@ from rest_framework import serializers
 from .models import Webinar, WebinarDate, Attendee
 
 
-class WebinarSerializer(serializers.ModelSerializer):
+class DynamicFieldsMixin:
+    """
+    Restrict serialized fields with a comma separated ``?fields=`` query parameter.
+    Unknown field names are ignored.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if not request:
+            return
+        
+        requested = request.query_params.get('fields')
+        if requested:
+            allowed = {name.strip() for name in requested.split(',') if name.strip()}
+            for field_name in set(self.fields) - allowed:
+                self.fields.pop(field_name)
+
+
+class WebinarSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    date_count = serializers.IntegerField(read_only=True)
+    
     class Meta:
         model = Webinar
-        fields = ['id', 'name', 'kajabi_grant_activation_hook_url', 'created_at', 'updated_at']
+        fields = ['id', 'name', 'kajabi_grant_activation_hook_url', 'date_count', 'created_at', 'updated_at']
         read_only_fields = ['created_at', 'updated_at']
 
 
-class WebinarDateSerializer(serializers.ModelSerializer):
-    attendee_count = serializers.IntegerField(read_only=True)
+class WebinarDateSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    attendee_count = serializers.IntegerField(source='active_attendee_count', read_only=True)
     
     class Meta:
         model = WebinarDate
@@ -18,8 +39,17 @@ class WebinarDateSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class AttendeeSerializer(serializers.ModelSerializer):
+class AttendeeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Attendee
-        fields = ['id', 'webinar_date', 'first_name', 'last_name', 'email', 'created_at', 'updated_at']
-        read_only_fields = ['created_at', 'updated_at']
\ No newline at end of file
+        fields = ['id', 'webinar_date', 'first_name', 'last_name', 'email', 'organization', 'created_at', 'updated_at']
+        read_only_fields = ['created_at', 'updated_at']
+
+
+class BulkAttendeeSerializer(serializers.Serializer):
+    """One registration in a bulk attendee upsert."""
+    webinar_date = serializers.IntegerField()
+    first_name = serializers.CharField(max_length=100)
+    last_name = serializers.CharField(max_length=100, required=False, allow_blank=True, default='')
+    email = serializers.EmailField()
+    organization = serializers.CharField(max_length=255, required=False, allow_blank=True, default='')
@@ -0,0 +1,85 @@
+"""
+Unit tests for the admin changelists: constant query counts and autocomplete filters.
+"""
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+
+from .models import Webinar, WebinarDate, Attendee, WebinarBundle, BundleDate, BundleAttendee
+
+
+class AdminChangelistTests(TestCase):
+    """Test changelists don't run a query per row."""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'secret'))
+        self.webinars = []
+        for i in range(3):
+            webinar = Webinar.objects.create(
+                name=f"Webinar {i}",
+                kajabi_grant_activation_hook_url="https://example.com/webhook"
+            )
+            self.webinars.append(webinar)
+            bundle = WebinarBundle.objects.create(
+                name=f"Bundle {i}",
+                kajabi_grant_activation_hook_url="https://example.com/webhook"
+            )
+            for day in range(2):
+                webinar_date = WebinarDate.objects.create(
+                    webinar=webinar, date_time=timezone.now() + timedelta(days=day), zoom_meeting_id='123'
+                )
+                bundle_date = BundleDate.objects.create(bundle=bundle, date=(timezone.now() + timedelta(days=day)).date())
+                bundle_date.webinar_dates.add(webinar_date)
+                self.add_attendees(webinar_date, bundle_date, 3)
+
+    def add_attendees(self, webinar_date, bundle_date, count):
+        for n in range(count):
+            email = f'user{webinar_date.id}-{n}-{Attendee.objects.count()}@example.com'
+            Attendee.objects.create(webinar_date=webinar_date, first_name='Test', last_name=str(n), email=email)
+            BundleAttendee.objects.create(bundle_date=bundle_date, first_name='Test', last_name=str(n), email=email)
+
+    def changelist_queries(self, model_name, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(f'admin:webinars_{model_name}_changelist'), params or {})
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """Test each changelist runs the same number of queries after adding more rows."""
+        model_names = ['webinar', 'webinardate', 'attendee', 'webinarbundle', 'bundledate', 'bundleattendee']
+        before = {name: self.changelist_queries(name) for name in model_names}
+
+        for webinar_date in WebinarDate.objects.all():
+            self.add_attendees(webinar_date, webinar_date.bundle_dates.first(), 4)
+        Webinar.objects.create(name="Webinar 9", kajabi_grant_activation_hook_url="https://example.com/webhook")
+
+        after = {name: self.changelist_queries(name) for name in model_names}
+        self.assertEqual(before, after)
+
+    def test_annotated_counts(self):
+        """Test the annotated count columns match the live counts."""
+        Attendee.objects.filter(webinar_date__webinar=self.webinars[0]).first().soft_delete()
+
+        response = self.client.get(reverse('admin:webinars_webinardate_changelist'), {'o': '4'})
+
+        counts = [obj._attendee_count for obj in response.context['cl'].result_list]
+        self.assertEqual(counts, [2, 3, 3, 3, 3, 3])
+
+    def test_autocomplete_filter(self):
+        """Test the webinar filter only loads the selected webinar and filters by it."""
+        webinar = self.webinars[1]
+
+        response = self.client.get(
+            reverse('admin:webinars_attendee_changelist'),
+            {'webinar_date__webinar__id__exact': webinar.id}
+        )
+
+        self.assertEqual(response.context['cl'].result_count, 6)
+        self.assertContains(response, 'data-filter-param="webinar_date__webinar__id__exact"')
+        self.assertContains(response, f'<option value="{webinar.id}" selected>Webinar 1</option>', html=True)
+        self.assertNotContains(response, 'Webinar 2</option>')
+        self.assertContains(response, 'admin/js/autocomplete.js')
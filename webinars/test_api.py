@@ -0,0 +1,160 @@
+"""
+Unit tests for the REST API list endpoints.
+"""
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.utils import timezone
+from datetime import timedelta
+from rest_framework.test import APIClient
+
+from .models import Webinar, WebinarDate, Attendee
+
+
+class ApiListTests(TestCase):
+    """Test pagination, field selection, incremental sync and ETags."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='api', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        
+        self.webinar = Webinar.objects.create(
+            name="Test Webinar",
+            kajabi_grant_activation_hook_url="https://example.com/webhook"
+        )
+        self.webinar_date = WebinarDate.objects.create(
+            webinar=self.webinar,
+            date_time=timezone.now() + timedelta(days=7)
+        )
+        for i in range(3):
+            Attendee.objects.create(
+                webinar_date=self.webinar_date,
+                first_name=f"User{i}",
+                last_name="Test",
+                email=f"user{i}@example.com"
+            )
+    
+    def test_attendee_list_is_cursor_paginated(self):
+        """Test the attendee list pages with a cursor."""
+        response = self.client.get('/api/attendees/', {'page_size': 2})
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+        
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 1)
+    
+    def test_field_selection(self):
+        """Test ?fields= limits the serialized fields."""
+        response = self.client.get('/api/attendees/', {'fields': 'id,email'})
+        
+        self.assertEqual(set(response.data['results'][0]), {'id', 'email'})
+    
+    def test_updated_since(self):
+        """Test ?updated_since= only returns rows changed after the timestamp."""
+        cutoff = timezone.now()
+        Attendee.objects.filter(email="user0@example.com").update(updated_at=cutoff + timedelta(minutes=1))
+        
+        response = self.client.get('/api/attendees/', {'updated_since': cutoff.isoformat()})
+        
+        self.assertEqual([row['email'] for row in response.data['results']], ["user0@example.com"])
+    
+    def test_invalid_updated_since(self):
+        """Test an unparseable updated_since is rejected."""
+        response = self.client.get('/api/attendees/', {'updated_since': 'yesterday'})
+        
+        self.assertEqual(response.status_code, 400)
+    
+    def test_dates_action_annotates_counts(self):
+        """Test webinar dates report attendee counts without per-row queries."""
+        # Webinar lookup, ETag aggregate and one page query; nothing per row
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/webinars/{self.webinar.id}/dates/')
+        
+        self.assertEqual(response.data['results'][0]['attendee_count'], 3)
+    
+    def test_attendees_action_field_selection(self):
+        """Test the attendees action returns only requested fields."""
+        response = self.client.get(f'/api/webinar-dates/{self.webinar_date.id}/attendees/', {'fields': 'email'})
+        
+        self.assertEqual(set(response.data['results'][0]), {'id', 'email'})
+        self.assertEqual(len(response.data['results']), 3)
+    
+    def test_attendees_action_datetimes_match_serializers(self):
+        """Test the attendees action formats datetimes like the serializer-backed endpoints."""
+        exported = self.client.get(f'/api/webinar-dates/{self.webinar_date.id}/attendees/').json()['results']
+        serialized = {row['id']: row for row in self.client.get('/api/attendees/').json()['results']}
+        
+        for row in exported:
+            self.assertTrue(row['created_at'].endswith('Z'))
+            self.assertEqual(row['created_at'], serialized[row['id']]['created_at'])
+            self.assertEqual(row['updated_at'], serialized[row['id']]['updated_at'])
+    
+    def test_etag_returns_not_modified(self):
+        """Test an unchanged collection returns 304 for a matching If-None-Match."""
+        response = self.client.get('/api/attendees/')
+        etag = response['ETag']
+        
+        response = self.client.get('/api/attendees/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        
+        Attendee.objects.create(
+            webinar_date=self.webinar_date, first_name="New", last_name="User", email="new@example.com"
+        )
+        response = self.client.get('/api/attendees/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class ApiBulkAttendeeTests(TestCase):
+    """Test the bulk attendee upsert endpoint."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='api', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        
+        self.webinar = Webinar.objects.create(
+            name="Test Webinar",
+            kajabi_grant_activation_hook_url="https://example.com/webhook"
+        )
+        self.first_date = WebinarDate.objects.create(
+            webinar=self.webinar,
+            date_time=timezone.now() + timedelta(days=7)
+        )
+        self.second_date = WebinarDate.objects.create(
+            webinar=self.webinar,
+            date_time=timezone.now() + timedelta(days=14)
+        )
+    
+    def test_bulk_upsert_across_dates(self):
+        """Test registrations for several dates are written with per-item results."""
+        existing = Attendee.objects.create(
+            webinar_date=self.first_date, first_name="Old", last_name="Name", email="john@example.com"
+        )
+        
+        response = self.client.post('/api/attendees/bulk/', [
+            {'webinar_date': self.first_date.id, 'first_name': 'John', 'last_name': 'Doe', 'email': 'John@example.com'},
+            {'webinar_date': self.second_date.id, 'first_name': 'Jane', 'email': 'jane@example.com'},
+            {'webinar_date': self.second_date.id, 'first_name': 'Jane', 'email': 'JANE@example.com'},
+            {'webinar_date': self.second_date.id, 'first_name': 'Bad', 'email': 'not-an-email'},
+            {'webinar_date': 9999, 'first_name': 'Lost', 'email': 'lost@example.com'},
+        ], format='json')
+        
+        self.assertEqual(response.status_code, 200)
+        statuses = [result['status'] for result in response.data['results']]
+        self.assertEqual(statuses, ['updated', 'created', 'duplicate', 'error', 'error'])
+        self.assertEqual(response.data['results'][0]['id'], existing.id)
+        
+        jane = Attendee.objects.get(webinar_date=self.second_date, email='jane@example.com')
+        self.assertEqual(response.data['results'][1]['id'], jane.id)
+        # Side effects are left to the batch jobs
+        self.assertTrue(jane.salesforce_sync_pending)
+        self.assertEqual(jane.zoom_registrant_id, '')
+        self.assertEqual(Attendee.objects.get(pk=existing.pk).first_name, 'John')
+    
+    def test_bulk_requires_list(self):
+        """Test a non-list payload is rejected."""
+        response = self.client.post('/api/attendees/bulk/', {'email': 'john@example.com'}, format='json')
+        
+        self.assertEqual(response.status_code, 400)
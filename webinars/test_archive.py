@@ -0,0 +1,161 @@
+"""
+Unit tests for archiving attendees of past dates and the history views over both tables.
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from . import archive
+from .models import (
+    Attendee, ArchivedAttendee, AttendeeHistory, BundleAttendee, ArchivedBundleAttendee, BundleAttendeeHistory,
+    BundleDate, Webinar, WebinarBundle, WebinarDate
+)
+
+
+class ArchiveTests(TestCase):
+    """Test which dates are archived and that their attendees move intact."""
+    
+    def setUp(self):
+        self.webinar = Webinar.objects.create(
+            name="Test Webinar",
+            kajabi_grant_activation_hook_url="https://example.com/webhook"
+        )
+        self.past_date = WebinarDate.objects.create(webinar=self.webinar, date_time=timezone.now() - timedelta(days=200))
+        self.recent_date = WebinarDate.objects.create(webinar=self.webinar, date_time=timezone.now() - timedelta(days=10))
+        self.bundle = WebinarBundle.objects.create(
+            name="Test Bundle",
+            kajabi_grant_activation_hook_url="https://example.com/webhook"
+        )
+        self.bundle_date = BundleDate.objects.create(
+            bundle=self.bundle, date=(timezone.now() - timedelta(days=200)).date()
+        )
+    
+    def add_attendee(self, webinar_date, email, done=True, **fields):
+        return Attendee.objects.create(
+            webinar_date=webinar_date, first_name="Jane", last_name="Doe", email=email,
+            activation_sent_at=timezone.now() if done else None, activation_success=done or None,
+            salesforce_sync_pending=not done, zoom_registration_error='x' * 200, **fields
+        )
+    
+    def test_archives_finished_past_dates(self):
+        """Test a past date with all work done is archived and recent or pending dates stay hot."""
+        attendee = self.add_attendee(self.past_date, 'jane@example.com')
+        self.add_attendee(self.past_date, 'gone@example.com', done=False, deleted_at=timezone.now())
+        self.add_attendee(self.recent_date, 'recent@example.com')
+        pending_date = WebinarDate.objects.create(webinar=self.webinar, date_time=timezone.now() - timedelta(days=300))
+        self.add_attendee(pending_date, 'pending@example.com', done=False)
+        
+        self.assertEqual(archive.archive_dates(batch_size=1), (1, 2, 0, 0))
+        
+        self.assertEqual(
+            sorted(Attendee.objects.values_list('email', flat=True)), ['pending@example.com', 'recent@example.com']
+        )
+        archived = ArchivedAttendee.objects.get(pk=attendee.pk)
+        self.assertEqual(archived.email, 'jane@example.com')
+        self.assertEqual(archived.webinar_date, self.past_date)
+        self.assertEqual(archived.created_at, attendee.created_at)
+        self.assertEqual(archived.zoom_registration_error, 'x' * 200)
+        self.assertEqual(ArchivedAttendee.objects.count(), 2)
+        self.assertEqual(archive.archive_dates(), (0, 0, 0, 0))
+    
+    def test_archives_bundle_attendees(self):
+        """Test bundle attendees of a finished past bundle date are archived."""
+        BundleAttendee.objects.create(
+            bundle_date=self.bundle_date, first_name="Jane", last_name="Doe", email='jane@example.com',
+            activation_sent_at=timezone.now(), activation_success=True, salesforce_sync_pending=False
+        )
+        
+        self.assertEqual(archive.archive_dates(), (0, 0, 1, 1))
+        
+        self.assertFalse(BundleAttendee.objects.exists())
+        self.assertEqual(ArchivedBundleAttendee.objects.get().bundle_date, self.bundle_date)
+    
+    def test_history_views(self):
+        """Test the history views return hot and archived rows with the archived flag."""
+        self.add_attendee(self.past_date, 'old@example.com')
+        self.add_attendee(self.recent_date, 'new@example.com')
+        BundleAttendee.objects.create(
+            bundle_date=self.bundle_date, first_name="Jane", last_name="Doe", email='bundle@example.com',
+            activation_sent_at=timezone.now(), activation_success=True, salesforce_sync_pending=False
+        )
+        archive.archive_dates()
+        
+        self.assertEqual(
+            sorted(AttendeeHistory.objects.values_list('email', 'archived')),
+            [('new@example.com', False), ('old@example.com', True)]
+        )
+        self.assertEqual(self.past_date.attendee_history.get().zoom_registration_error, 'x' * 200)
+        self.assertEqual(BundleAttendeeHistory.objects.get(bundle_date=self.bundle_date).archived, True)
+    
+    def test_api_reads_archived_attendees(self):
+        """Test the attendees export and counts still include archived attendees."""
+        for n in range(3):
+            self.add_attendee(self.past_date, f'user{n}@example.com')
+        archive.archive_dates()
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='api', password='secret'))
+        
+        response = client.get(f'/api/webinar-dates/{self.past_date.id}/attendees/', {'fields': 'email'})
+        
+        self.assertEqual(len(response.data['results']), 3)
+        response = client.get(f'/api/webinar-dates/{self.past_date.id}/')
+        self.assertEqual(response.data['attendee_count'], 3)
+    
+    def test_archived_dates_keep_their_attendees(self):
+        """Test counts include archived attendees and dates with archived attendees can't be deleted."""
+        self.add_attendee(self.past_date, 'jane@example.com')
+        self.add_attendee(self.past_date, 'john@example.com')
+        BundleAttendee.objects.create(
+            bundle_date=self.bundle_date, first_name="Jane", last_name="Doe", email='bundle@example.com',
+            activation_sent_at=timezone.now(), activation_success=True, salesforce_sync_pending=False
+        )
+        archive.archive_dates()
+        self.client.force_login(User.objects.create_user(username='staff', password='secret'))
+        
+        self.assertEqual(self.past_date.attendee_count, 2)
+        self.assertEqual(self.past_date.archived_attendee_count, 2)
+        self.assertTrue(self.past_date.has_attendees)
+        self.assertEqual(self.bundle_date.attendee_count, 1)
+        self.assertTrue(self.bundle_date.has_attendees)
+        self.assertContains(self.client.get(f'/webinar-dates/{self.past_date.pk}/'), 'Archived Attendees:')
+        
+        self.client.post(f'/webinar-dates/{self.past_date.pk}/delete/')
+        self.client.post(f'/bundle-dates/{self.bundle_date.pk}/delete/')
+        
+        self.past_date.refresh_from_db()
+        self.bundle_date.refresh_from_db()
+        self.assertIsNone(self.past_date.deleted_at)
+        self.assertIsNone(self.bundle_date.deleted_at)
+    
+    def test_command(self):
+        """Test archive_attendees reports counts and does nothing in a dry run."""
+        self.add_attendee(self.past_date, 'jane@example.com')
+        
+        out = StringIO()
+        call_command('archive_attendees', dry_run=True, stdout=out)
+        self.assertIn('Webinar dates: 1 dates, 1 attendees to archive', out.getvalue())
+        self.assertEqual(Attendee.objects.count(), 1)
+        
+        out = StringIO()
+        call_command('archive_attendees', days=365, stdout=out)
+        self.assertIn('archived 0 attendees of 0 dates', out.getvalue())
+        
+        out = StringIO()
+        call_command('archive_attendees', stdout=out)
+        self.assertIn('Webinar dates: archived 1 attendees of 1 dates', out.getvalue())
+        self.assertFalse(Attendee.objects.exists())
+    
+    def test_archive_columns_match(self):
+        """Test the archive tables and views keep every attendee column."""
+        def columns(model):
+            return {field.column for field in model._meta.concrete_fields}
+        
+        self.assertEqual(columns(ArchivedAttendee) - {'archived_at'}, columns(Attendee))
+        self.assertEqual(columns(AttendeeHistory) - {'archived'}, columns(Attendee))
+        self.assertEqual(columns(ArchivedBundleAttendee) - {'archived_at'}, columns(BundleAttendee))
+        self.assertEqual(columns(BundleAttendeeHistory) - {'archived'}, columns(BundleAttendee))
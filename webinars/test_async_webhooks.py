@@ -0,0 +1,149 @@
+"""
+Unit tests for the async webhook views and the async HTTP client calls they make.
+"""
+import asyncio
+import json
+
+from django.test import TestCase, AsyncRequestFactory
+from django.core.cache import cache
+from unittest.mock import patch, MagicMock
+
+from settings.models import ZoomSettings
+from . import async_views
+from .models import Webinar, WebinarDate, Attendee, OnDemandAttendee, Download, ClinicBooking, WebhookLog
+from .utils import parse_webinar_date
+from .zoom_service import ZoomService
+
+
+class FakeIntegrations:
+    """Stands in for async_http.send, answering like Zoom and Kajabi after a short wait."""
+    
+    def __init__(self):
+        self.urls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    async def send(self, method, url, timeout=None, **kwargs):
+        self.urls.append(url)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.05)
+        self.in_flight -= 1
+        
+        if url == ZoomService.TOKEN_URL:
+            data = {'access_token': 'token'}
+        elif url.endswith('/registrants'):
+            data = {'registrant_id': 'reg-1', 'join_url': 'https://zoom.us/w/1'}
+        elif url.endswith('/users/me'):
+            data = {'id': 'host'}
+        elif url.endswith('/meetings'):
+            data = {'id': 42, 'join_url': 'https://zoom.us/j/42', 'start_url': 'https://zoom.us/s/42'}
+        else:
+            data = {}
+        return MagicMock(status_code=200, text='', json=MagicMock(return_value=data))
+
+
+class AsyncWebhookTests(TestCase):
+    """Test the async webhooks give the same results as the sync views."""
+    
+    def setUp(self):
+        cache.clear()
+        zoom_settings = ZoomSettings.get_settings()
+        zoom_settings.client_id = 'id'
+        zoom_settings.client_secret = 'secret'
+        zoom_settings.account_id = 'account'
+        zoom_settings.save()
+        
+        self.webinar = Webinar.objects.create(
+            name="Test Webinar",
+            kajabi_grant_activation_hook_url="https://example.com/webhook",
+            form_date_field="Webinar Date"
+        )
+        self.webinar_date = WebinarDate.objects.create(
+            webinar=self.webinar,
+            date_time=parse_webinar_date("21 August, 10-11:00 BST"),
+            zoom_meeting_id="123456"
+        )
+        self.factory = AsyncRequestFactory()
+        self.integrations = FakeIntegrations()
+        patcher = patch('webinars.async_http.send', side_effect=self.integrations.send)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def form_request(self, email, date):
+        data = {
+            "event": "form_submission.created",
+            "payload": {
+                "form_title": "Test Webinar",
+                "First Name": "John",
+                "Surname": "Doe",
+                "Email": email,
+                "Webinar Date": date
+            }
+        }
+        return self.factory.post('/api/attendee-webhook/', data=json.dumps(data), content_type='application/json')
+    
+    async def test_scheduled_attendee_registered_in_zoom(self):
+        """Test a form submission for a scheduled date registers the attendee through the async client."""
+        response = await async_views.attendee_webhook(self.form_request('john@example.com', "21 August, 10-11:00 BST"))
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(json.loads(response.content)['message'].endswith(' and registered in Zoom'))
+        attendee = await Attendee.objects.aget(email='john@example.com')
+        self.assertEqual(attendee.zoom_registrant_id, 'reg-1')
+        self.assertEqual(self.integrations.urls[-1], f"{ZoomService.BASE_URL}/webinars/123456/registrants")
+        
+        log = await WebhookLog.objects.aget()
+        self.assertTrue(log.success)
+        # Spans recorded in worker threads and async calls end up in the same trace
+        self.assertIn('db_upsert', log.timings)
+        self.assertIn('zoom', log.timings)
+    
+    async def test_outbound_calls_run_concurrently(self):
+        """Test webhooks waiting on Zoom and Kajabi don't wait for each other."""
+        responses = await asyncio.gather(
+            async_views.attendee_webhook(self.form_request('john@example.com', "21 August, 10-11:00 BST")),
+            async_views.attendee_webhook(self.form_request('jane@example.com', "On Demand")),
+        )
+        
+        self.assertEqual([response.status_code for response in responses], [200, 200])
+        self.assertEqual(self.integrations.max_in_flight, 2)
+        on_demand = await OnDemandAttendee.objects.aget(email='jane@example.com')
+        self.assertTrue(on_demand.activation_success)
+        self.assertIn('(activated immediately)', json.loads(responses[1].content)['message'])
+    
+    async def test_download_webhook(self):
+        """Test a download submission is recorded with the async ORM."""
+        request = self.factory.post('/api/download-webhook/', data=json.dumps({
+            'first_name': 'John', 'email': 'john@example.com', 'form_title': 'Guide'
+        }), content_type='application/json')
+        
+        response = await async_views.download_webhook(request)
+        
+        self.assertEqual(response.status_code, 200)
+        download = await Download.objects.aget()
+        self.assertEqual(json.loads(response.content)['download_id'], download.id)
+        self.assertTrue(download.salesforce_sync_pending)
+        self.assertEqual(await WebhookLog.objects.filter(success=True).acount(), 1)
+    
+    async def test_clinic_booking_webhook(self):
+        """Test a clinic booking gets its Zoom meeting from the async client."""
+        request = self.factory.post('/api/clinic-booking-webhook/', data=json.dumps({
+            'first_name': 'John', 'last_name': 'Doe', 'email': 'john@example.com',
+            'clinic_date': '2030-01-01T10:00:00', 'question': 'How do I start?'
+        }), content_type='application/json')
+        
+        response = await async_views.clinic_booking_webhook(request)
+        
+        self.assertEqual(response.status_code, 200)
+        booking = await ClinicBooking.objects.aget()
+        self.assertEqual(booking.zoom_meeting_id, '42')
+        self.assertEqual(booking.zoom_join_url, 'https://zoom.us/j/42')
+        self.assertEqual(booking.calendar_invite_error, 'MS365 not configured')
+    
+    async def test_non_post_returns_ok(self):
+        """Test non-POST requests are answered and logged like the sync views."""
+        response = await async_views.attendee_webhook(self.factory.get('/api/attendee-webhook/'))
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((await WebhookLog.objects.aget()).response_body, 'OK')
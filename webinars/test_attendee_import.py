@@ -0,0 +1,141 @@
+"""
+Unit tests for bulk CSV attendee import.
+"""
+from django.test import TestCase
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from datetime import timedelta
+from io import StringIO
+
+from .models import Webinar, WebinarDate, Attendee, WebinarBundle, BundleDate, BundleAttendee
+from .import_service import AttendeeImportService, AttendeeImportError
+
+
+def make_csv(content):
+    return SimpleUploadedFile('attendees.csv', content.encode('utf-8'), content_type='text/csv')
+
+
+class AttendeeImportServiceTests(TestCase):
+    """Test importing attendees for webinar and bundle dates."""
+    
+    def setUp(self):
+        self.webinar = Webinar.objects.create(
+            name="Test Webinar",
+            kajabi_grant_activation_hook_url="https://example.com/webhook"
+        )
+        self.webinar_date = WebinarDate.objects.create(
+            webinar=self.webinar,
+            date_time=timezone.now() + timedelta(days=7)
+        )
+        self.service = AttendeeImportService(chunk_size=2)
+    
+    def test_import_creates_attendees(self):
+        """Test that new rows are created across several chunks."""
+        csv_file = make_csv(
+            "First Name,Surname,Email,Organisation\n"
+            "John,Doe,john@example.com,Acme\n"
+            "Jane,Smith,jane@example.com,\n"
+            "Bob,Jones,bob@example.com,Widgets\n"
+        )
+        
+        result = self.service.import_for_webinar_date(self.webinar_date, csv_file)
+        
+        self.assertEqual(result['created'], 3)
+        self.assertEqual(result['errors'], [])
+        self.assertEqual(self.webinar_date.active_attendees().count(), 3)
+        john = Attendee.objects.get(email="john@example.com")
+        self.assertEqual(john.organization, "Acme")
+        self.assertTrue(john.salesforce_sync_pending)
+    
+    def test_import_dedupes_and_validates(self):
+        """Test duplicate and invalid rows are skipped."""
+        csv_file = make_csv(
+            "email,first_name,last_name\n"
+            "john@example.com,John,Doe\n"
+            "JOHN@example.com,Johnny,Doe\n"
+            "not-an-email,Bad,Row\n"
+            ",Missing,Email\n"
+        )
+        
+        result = self.service.import_for_webinar_date(self.webinar_date, csv_file)
+        
+        self.assertEqual(result['created'], 1)
+        self.assertEqual(result['duplicates'], 1)
+        self.assertEqual(len(result['errors']), 2)
+        self.assertEqual(Attendee.objects.count(), 1)
+    
+    def test_import_updates_and_restores_existing(self):
+        """Test existing attendees are updated and deleted ones restored."""
+        Attendee.objects.create(
+            webinar_date=self.webinar_date, first_name="Old", last_name="Name", email="john@example.com"
+        )
+        deleted = Attendee.objects.create(
+            webinar_date=self.webinar_date, first_name="Jane", last_name="Smith", email="jane@example.com"
+        )
+        deleted.soft_delete()
+        Attendee.objects.create(
+            webinar_date=self.webinar_date, first_name="Bob", last_name="Jones", email="bob@example.com"
+        )
+        
+        csv_file = make_csv(
+            "First Name,Last Name,Email\n"
+            "John,Doe,John@Example.com\n"
+            "Jane,Smith,jane@example.com\n"
+            "Bob,Jones,bob@example.com\n"
+        )
+        
+        result = self.service.import_for_webinar_date(self.webinar_date, csv_file)
+        
+        self.assertEqual(result['created'], 0)
+        self.assertEqual(result['updated'], 1)
+        self.assertEqual(result['restored'], 1)
+        self.assertEqual(result['unchanged'], 1)
+        self.assertEqual(Attendee.objects.count(), 3)
+        self.assertEqual(Attendee.objects.get(email="john@example.com").first_name, "John")
+        self.assertIsNone(Attendee.objects.get(email="jane@example.com").deleted_at)
+    
+    def test_import_requires_columns(self):
+        """Test a CSV without an email column is rejected."""
+        csv_file = make_csv("Name,Phone\nJohn,123\n")
+        
+        with self.assertRaises(AttendeeImportError):
+            self.service.import_for_webinar_date(self.webinar_date, csv_file)
+    
+    def test_import_bundle_attendees(self):
+        """Test importing attendees for a bundle date."""
+        bundle = WebinarBundle.objects.create(
+            name="Test Bundle",
+            kajabi_grant_activation_hook_url="https://example.com/bundle"
+        )
+        bundle_date = BundleDate.objects.create(bundle=bundle, date=timezone.now().date())
+        csv_file = make_csv("First Name,Email\nJohn,john@example.com\n")
+        
+        result = self.service.import_for_bundle_date(bundle_date, csv_file)
+        
+        self.assertEqual(result['created'], 1)
+        self.assertEqual(BundleAttendee.objects.filter(bundle_date=bundle_date).count(), 1)
+
+
+class RegisterZoomPendingTests(TestCase):
+    """Test which imported attendees register_zoom_pending picks up."""
+    
+    def test_only_upcoming_dates(self):
+        """Test attendees of past dates are not sent to Zoom."""
+        webinar = Webinar.objects.create(
+            name="Test Webinar",
+            kajabi_grant_activation_hook_url="https://example.com/webhook"
+        )
+        for days in (7, -7):
+            webinar_date = WebinarDate.objects.create(
+                webinar=webinar, date_time=timezone.now() + timedelta(days=days), zoom_meeting_id=f"meeting{days}"
+            )
+            Attendee.objects.create(
+                webinar_date=webinar_date, first_name="John", last_name="Doe", email="john@example.com"
+            )
+        
+        out = StringIO()
+        call_command('register_zoom_pending', dry_run=True, stdout=out)
+        
+        self.assertIn('Found 1 attendees pending Zoom registration across 1 webinars', out.getvalue())
+        self.assertIn('Zoom webinar meeting7', out.getvalue())
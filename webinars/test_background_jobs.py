@@ -0,0 +1,140 @@
+"""
+Unit tests for background jobs: queueing from views, chunked processing and progress polling.
+"""
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from unittest.mock import patch
+
+from .activation_service import KajabiActivationService
+from .background_jobs import claim_job, enqueue, run_job, run_pending_jobs
+from .models import Webinar, WebinarDate, Attendee, BackgroundJob
+
+
+def fake_activate(service, attendee):
+    if attendee.email.startswith('fail'):
+        return False, f"Failed to activate {attendee.email}"
+    attendee.activation_sent_at = timezone.now()
+    attendee.save()
+    return True, f"Activated {attendee.email}"
+
+
+class BackgroundJobTests(TestCase):
+    """Test queueing, running and polling background jobs."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user('staff', 'staff@example.com', 'secret')
+        self.client.force_login(self.user)
+        webinar = Webinar.objects.create(
+            name="Test Webinar",
+            kajabi_grant_activation_hook_url="https://example.com/webhook"
+        )
+        self.webinar_date = WebinarDate.objects.create(
+            webinar=webinar, date_time=timezone.now() - timedelta(hours=3)
+        )
+        for i in range(45):
+            Attendee.objects.create(
+                webinar_date=self.webinar_date, first_name='Test', last_name=str(i), email=f'user{i}@example.com'
+            )
+        Attendee.objects.create(webinar_date=self.webinar_date, first_name='Test', last_name='Fail', email='fail@example.com')
+        Attendee.objects.create(
+            webinar_date=self.webinar_date, first_name='Test', last_name='Done', email='done@example.com',
+            activation_sent_at=timezone.now()
+        )
+    
+    def test_view_queues_job(self):
+        """Test the activate view returns a job id straight away without activating anyone."""
+        with patch.object(KajabiActivationService, 'activate_attendee') as mock_activate:
+            response = self.client.post(reverse('activate_webinar_date', args=[self.webinar_date.id]))
+        
+        self.assertEqual(response.status_code, 202)
+        data = response.json()
+        job = BackgroundJob.objects.get(id=data['job_id'])
+        self.assertEqual(job.status, BackgroundJob.STATUS_PENDING)
+        self.assertEqual(job.requested_by, 'staff')
+        self.assertEqual(data['status_url'], reverse('background_job_status', args=[job.id]))
+        mock_activate.assert_not_called()
+        
+        # Queueing again while the job is pending returns the same job
+        response = self.client.post(reverse('activate_webinar_date', args=[self.webinar_date.id]))
+        self.assertEqual(response.json()['job_id'], job.id)
+    
+    @patch.object(KajabiActivationService, 'activate_attendee', autospec=True, side_effect=fake_activate)
+    def test_job_processes_items_in_chunks(self, mock_activate):
+        """Test a worker processes the items in chunks, recording progress and per-item results."""
+        job = enqueue(BackgroundJob.KIND_ACTIVATE_WEBINAR_DATE, self.webinar_date.id)
+        
+        run_pending_jobs()
+        
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.STATUS_SUCCEEDED)
+        self.assertEqual((job.total, job.processed, job.succeeded, job.failed), (47, 47, 45, 1))
+        self.assertEqual(job.message, "Processed 46 attendees: 45 successful, 1 failed.")
+        self.assertEqual(job.items.count(), 47)
+        self.assertIsNone(job.items.get(message__contains='done@example.com').success)
+        
+        response = self.client.get(reverse('background_job_status', args=[job.id]))
+        self.assertEqual(response.json()['progress'], 100)
+        self.assertTrue(response.json()['finished'])
+        
+        response = self.client.get(reverse('background_job_results', args=[job.id]))
+        data = response.json()
+        self.assertEqual((data['count'], data['page'], data['num_pages']), (47, 1, 1))
+        self.assertEqual(data['results'][0], {'position': 0, 'success': True, 'message': 'Activated user0@example.com'})
+    
+    @patch.object(KajabiActivationService, 'activate_attendee', autospec=True, side_effect=fake_activate)
+    def test_stalled_job_resumes_after_last_chunk(self, mock_activate):
+        """Test a job whose worker died is claimed again and continues where it stopped."""
+        job = enqueue(BackgroundJob.KIND_ACTIVATE_WEBINAR_DATE, self.webinar_date.id)
+        job = claim_job()
+        with patch('webinars.background_jobs.BackgroundJobItem.objects.bulk_create', side_effect=[None, RuntimeError]):
+            with self.assertRaises(RuntimeError):
+                run_job(job, chunk_size=20)
+        
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed), (BackgroundJob.STATUS_RUNNING, 20))
+        self.assertIsNone(claim_job())
+        
+        BackgroundJob.objects.filter(id=job.id).update(claimed_until=timezone.now() - timedelta(seconds=1))
+        run_job(claim_job(), chunk_size=20)
+        
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.STATUS_SUCCEEDED)
+        self.assertEqual(job.processed, 47)
+        # Attendees activated in the chunk that wasn't recorded are skipped, not activated twice
+        self.assertEqual(mock_activate.call_count, 46)
+    
+    @patch.object(KajabiActivationService, 'activate_attendee', autospec=True, side_effect=fake_activate)
+    def test_claim_is_renewed_per_item(self, mock_activate):
+        """Test a worker renews its claim before each item and stops once another worker has taken the job."""
+        job = enqueue(BackgroundJob.KIND_ACTIVATE_WEBINAR_DATE, self.webinar_date.id)
+        job = claim_job()
+        
+        def take_over(service, attendee):
+            if mock_activate.call_count == 5:
+                # The claim lapsed during a slow item and another worker claimed the job
+                BackgroundJob.objects.filter(id=job.id).update(claimed_until=timezone.now() + timedelta(hours=1))
+            return fake_activate(service, attendee)
+        
+        mock_activate.side_effect = take_over
+        run_job(job, chunk_size=20)
+        
+        # The worker stopped at the next item without saving progress or finishing the job
+        self.assertEqual(mock_activate.call_count, 5)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed), (BackgroundJob.STATUS_RUNNING, 0))
+        self.assertFalse(job.items.exists())
+    
+    @patch('webinars.ms365_service.MS365CalendarService.send_manual_calendar_invite')
+    def test_calendar_invite_job(self, mock_send):
+        """Test the calendar invite view queues a job whose message is the invite result."""
+        mock_send.return_value = (False, "MS365 not configured")
+        response = self.client.post(reverse('send_calendar_invite', args=[self.webinar_date.id]))
+        
+        job = run_pending_jobs()[0]
+        
+        self.assertEqual(job.id, response.json()['job_id'])
+        self.assertEqual(job.status, BackgroundJob.STATUS_FAILED)
+        self.assertEqual(job.message, "MS365 not configured")
@@ -0,0 +1,133 @@
+"""
+Unit tests for bulk calendar invites sent with Graph $batch requests.
+"""
+from django.test import TestCase
+from django.contrib.auth.models import Group, User
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch, MagicMock
+
+from settings.models import MS365Settings
+from .background_jobs import run_pending_jobs
+from .ms365_service import MS365CalendarService, pending_calendar_invite_dates
+from .models import BackgroundJob, Webinar, WebinarDate
+
+
+def batch_response(statuses):
+    response = MagicMock(status_code=200)
+    response.json.return_value = {
+        'responses': [{'id': str(date_id), 'status': status} for date_id, status in statuses.items()]
+    }
+    return response
+
+
+@patch.object(MS365CalendarService, 'get_access_token', return_value='token')
+class BulkCalendarInviteTests(TestCase):
+    """Test the bulk calendar invite dispatcher, command and view."""
+    
+    def setUp(self):
+        MS365Settings.objects.create(
+            client_id='client',
+            client_secret='secret',
+            tenant_id='tenant',
+            owner_email='owner@example.com'
+        )
+        group = Group.objects.create(name='calendar')
+        self.user = User.objects.create_user('staff', 'staff@example.com', 'secret')
+        group.user_set.add(self.user)
+        
+        webinar = Webinar.objects.create(
+            name="Test Webinar",
+            kajabi_grant_activation_hook_url="https://example.com/webhook"
+        )
+        start = timezone.now() + timedelta(days=1)
+        self.dates = [
+            WebinarDate.objects.create(webinar=webinar, date_time=start + timedelta(days=i))
+            for i in range(25)
+        ]
+        # Past dates and dates that already have an invite are skipped
+        WebinarDate.objects.create(webinar=webinar, date_time=timezone.now() - timedelta(days=1))
+        WebinarDate.objects.create(webinar=webinar, date_time=start, calendar_invite_sent_at=timezone.now())
+    
+    @patch('webinars.ms365_service.graph_client.request')
+    def test_invites_are_batched(self, mock_request, mock_token):
+        """Test invites go out in batches of 20 and outcomes are recorded."""
+        statuses = {webinar_date.id: 201 for webinar_date in self.dates}
+        statuses[self.dates[0].id] = 400
+        mock_request.side_effect = [
+            batch_response({date_id: statuses[date_id] for date_id in list(statuses)[:20]}),
+            batch_response({date_id: statuses[date_id] for date_id in list(statuses)[20:]}),
+        ]
+        
+        result = MS365CalendarService().send_bulk_calendar_invites(pending_calendar_invite_dates())
+        
+        self.assertEqual(result, {'success': True, 'sent': 24, 'failed': 1})
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(len(mock_request.call_args_list[0].kwargs['json']['requests']), 20)
+        
+        failed = WebinarDate.objects.get(id=self.dates[0].id)
+        self.assertFalse(failed.calendar_invite_success)
+        self.assertIn('400', failed.calendar_invite_error)
+        self.assertEqual(WebinarDate.objects.filter(calendar_invite_success=True).count(), 24)
+        # The failed invite keeps no sent time, so the next run retries it
+        self.assertIsNone(failed.calendar_invite_sent_at)
+        self.assertEqual(list(pending_calendar_invite_dates()), [failed])
+    
+    @patch('webinars.ms365_service.time.sleep')
+    @patch('webinars.ms365_service.graph_client.request')
+    def test_throttled_invites_are_retried(self, mock_request, mock_sleep, mock_token):
+        """Test 429 items are resent after their Retry-After and failed batches stay pending."""
+        dates = self.dates[:3]
+        throttled = batch_response({dates[0].id: 201, dates[1].id: 429})
+        throttled.json.return_value['responses'][1]['headers'] = {'Retry-After': '3'}
+        mock_request.side_effect = [throttled, batch_response({dates[1].id: 201}), ValueError('Connection reset')]
+        
+        result = MS365CalendarService().send_bulk_calendar_invites(dates[:2])
+        
+        self.assertEqual(result, {'success': True, 'sent': 2, 'failed': 0})
+        mock_sleep.assert_called_once_with(3.0)
+        self.assertEqual(len(mock_request.call_args_list[1].kwargs['json']['requests']), 1)
+        
+        result = MS365CalendarService().send_bulk_calendar_invites(dates[2:])
+        
+        self.assertEqual(result['failed'], 1)
+        failed = WebinarDate.objects.get(id=dates[2].id)
+        self.assertIsNone(failed.calendar_invite_sent_at)
+        self.assertIn('Connection reset', failed.calendar_invite_error)
+        self.assertIn(failed, pending_calendar_invite_dates())
+    
+    @patch('webinars.ms365_service.graph_client.request')
+    def test_command(self, mock_request, mock_token):
+        """Test the command sends invites for the pending dates."""
+        mock_request.return_value = batch_response({webinar_date.id: 201 for webinar_date in self.dates[:5]})
+        out = StringIO()
+        
+        call_command('send_calendar_invites', '--limit', '5', stdout=out)
+        
+        self.assertIn('5 sent, 0 failed', out.getvalue())
+    
+    @patch('webinars.ms365_service.graph_client.request')
+    def test_view(self, mock_request, mock_token):
+        """Test the view queues a background job that sends the invites a batch per chunk."""
+        mock_request.side_effect = [
+            batch_response({webinar_date.id: 201 for webinar_date in self.dates[:20]}),
+            batch_response({webinar_date.id: 201 for webinar_date in self.dates[20:]}),
+        ]
+        self.client.force_login(self.user)
+        
+        response = self.client.post(reverse('send_pending_calendar_invites'))
+        
+        self.assertEqual(response.status_code, 202)
+        mock_request.assert_not_called()
+        
+        job = run_pending_jobs()[0]
+        
+        self.assertEqual(job.id, response.json()['job_id'])
+        self.assertEqual(job.status, BackgroundJob.STATUS_SUCCEEDED)
+        self.assertEqual((job.total, job.succeeded), (25, 25))
+        self.assertEqual(job.message, "Calendar invites sent for 25 webinar dates")
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertFalse(pending_calendar_invite_dates().exists())
@@ -0,0 +1,150 @@
+"""
+Unit tests for calendar event ids and calendar reconciliation.
+"""
+from django.test import TestCase
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch, MagicMock
+
+from settings.models import MS365Settings
+from .calendar_sync import CalendarReconciler, GRAPH_TIME_FORMAT
+from .ms365_service import MS365CalendarService
+from .models import Webinar, WebinarDate
+
+
+def graph_event(event_id, start, subject='Webinar: Test Webinar'):
+    return {
+        'id': event_id,
+        'iCalUId': f'ical-{event_id}',
+        'subject': subject,
+        'start': {'dateTime': start.strftime(GRAPH_TIME_FORMAT) + '.0000000', 'timeZone': 'UTC'},
+        'end': {'dateTime': (start + timedelta(hours=1)).strftime(GRAPH_TIME_FORMAT) + '.0000000', 'timeZone': 'UTC'},
+    }
+
+
+@patch.object(MS365CalendarService, 'get_access_token', return_value='token')
+class CalendarSyncTests(TestCase):
+    """Test updating invites in place and reconciling with the owner calendar."""
+    
+    def setUp(self):
+        cache.clear()
+        MS365Settings.objects.create(
+            client_id='client',
+            client_secret='secret',
+            tenant_id='tenant',
+            owner_email='owner@example.com'
+        )
+        group = Group.objects.create(name='calendar')
+        group.user_set.add(User.objects.create_user('staff', 'staff@example.com', 'secret'))
+        
+        self.webinar = Webinar.objects.create(
+            name="Test Webinar",
+            kajabi_grant_activation_hook_url="https://example.com/webhook"
+        )
+        self.start = (timezone.now() + timedelta(days=7)).replace(second=0, microsecond=0)
+    
+    def graph(self, responses):
+        """Fake graph_client.request that answers GETs and POSTs from the given lists."""
+        calls = []
+        
+        def fake_request(method, url, **kwargs):
+            calls.append((method, url, kwargs))
+            return responses[method].pop(0)
+        return fake_request, calls
+    
+    def response(self, data, status_code=200):
+        response = MagicMock(status_code=status_code)
+        response.json.return_value = data
+        return response
+    
+    def test_manual_invite_updates_existing_event(self, mock_token):
+        """Test re-sending an invite PATCHes the stored event instead of creating another."""
+        webinar_date = WebinarDate.objects.create(
+            webinar=self.webinar, date_time=self.start, calendar_event_id='evt1'
+        )
+        fake_request, calls = self.graph({'PATCH': [self.response({'id': 'evt1'})]})
+        
+        with patch('webinars.ms365_service.graph_client.request', side_effect=fake_request):
+            success, message = MS365CalendarService().send_manual_calendar_invite(webinar_date)
+        
+        self.assertTrue(success)
+        self.assertEqual([call[0] for call in calls], ['PATCH'])
+        self.assertTrue(calls[0][1].endswith('/events/evt1'))
+    
+    def test_manual_invite_stores_event_ids(self, mock_token):
+        """Test a new invite records the Graph event id and iCalUId."""
+        webinar_date = WebinarDate.objects.create(webinar=self.webinar, date_time=self.start)
+        fake_request, calls = self.graph({'POST': [self.response({'id': 'evt9', 'iCalUId': 'ical-9'}, 201)]})
+        
+        with patch('webinars.ms365_service.graph_client.request', side_effect=fake_request):
+            MS365CalendarService().send_manual_calendar_invite(webinar_date)
+        
+        webinar_date.refresh_from_db()
+        self.assertEqual(webinar_date.calendar_event_id, 'evt9')
+        self.assertEqual(webinar_date.calendar_ical_uid, 'ical-9')
+    
+    def test_reconcile_patches_only_changed_events(self, mock_token):
+        """Test moved dates are PATCHed, unchanged ones skipped and legacy invites linked."""
+        moved = WebinarDate.objects.create(
+            webinar=self.webinar, date_time=self.start, calendar_event_id='evt1',
+            calendar_invite_sent_at=timezone.now()
+        )
+        WebinarDate.objects.create(
+            webinar=self.webinar, date_time=self.start + timedelta(days=1), calendar_event_id='evt2',
+            calendar_invite_sent_at=timezone.now()
+        )
+        legacy = WebinarDate.objects.create(
+            webinar=self.webinar, date_time=self.start + timedelta(days=2),
+            calendar_invite_sent_at=timezone.now()
+        )
+        delta = {
+            'value': [
+                graph_event('evt1', self.start - timedelta(hours=1)),
+                graph_event('evt2', self.start + timedelta(days=1)),
+                graph_event('evt3', self.start + timedelta(days=2)),
+            ],
+            '@odata.deltaLink': 'https://graph.microsoft.com/v1.0/delta?token=1',
+        }
+        fake_request, calls = self.graph({
+            'GET': [self.response(delta), self.response({'value': [], '@odata.deltaLink': 'token=2'})],
+            'POST': [self.response({'responses': [{'id': '0', 'status': 200}]})],
+        })
+        
+        with patch('webinars.calendar_sync.graph_client.request', side_effect=fake_request):
+            result = CalendarReconciler().reconcile()
+            second = CalendarReconciler().reconcile()
+        
+        self.assertEqual(result['patched'], 1)
+        self.assertEqual(result['unchanged'], 2)
+        self.assertEqual(result['linked'], 1)
+        batch = calls[1][2]['json']['requests']
+        self.assertEqual(len(batch), 1)
+        self.assertTrue(batch[0]['url'].endswith('/events/evt1'))
+        self.assertEqual(batch[0]['body']['start']['dateTime'], moved.date_time.strftime(GRAPH_TIME_FORMAT))
+        legacy.refresh_from_db()
+        self.assertEqual(legacy.calendar_event_id, 'evt3')
+        
+        # The second run only reads the delta since the first and has nothing to update
+        self.assertEqual(calls[2][1], 'https://graph.microsoft.com/v1.0/delta?token=1')
+        self.assertEqual(second['patched'], 0)
+        self.assertEqual(len(calls), 3)
+    
+    def test_command_dry_run(self, mock_token):
+        """Test the command reports changes without patching."""
+        WebinarDate.objects.create(
+            webinar=self.webinar, date_time=self.start, calendar_event_id='evt1',
+            calendar_invite_sent_at=timezone.now()
+        )
+        delta = {'value': [graph_event('evt1', self.start - timedelta(hours=1))], '@odata.deltaLink': 'token=1'}
+        fake_request, calls = self.graph({'GET': [self.response(delta)]})
+        out = StringIO()
+        
+        with patch('webinars.calendar_sync.graph_client.request', side_effect=fake_request):
+            call_command('reconcile_calendar', '--dry-run', stdout=out)
+        
+        self.assertIn('1 updated', out.getvalue())
+        self.assertEqual([call[0] for call in calls], ['GET'])
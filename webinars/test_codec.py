@@ -0,0 +1,138 @@
+"""
+Unit tests for the JSON codec layer: both codecs, JSON columns, webhook responses and the API.
+"""
+import datetime
+import decimal
+import json
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.translation import gettext_lazy
+from unittest.mock import patch
+from rest_framework.test import APIClient
+
+from . import codec
+from .codec import StdlibCodec, OrjsonCodec, CODECS
+from .models import Download, WebhookLog, Webinar
+
+
+class CodecTests(TestCase):
+    """Test the codecs encode the same JSON."""
+    
+    VALUE = {
+        'name': 'Café',
+        'amount': decimal.Decimal('49.00'),
+        'when': datetime.datetime(2025, 6, 19, 10, 0),
+        'label': gettext_lazy('Webinar'),
+        'items': [1, 2.5, None, True],
+    }
+    EXPECTED = {
+        'name': 'Café',
+        'amount': '49.00',
+        'when': '2025-06-19T10:00:00',
+        'label': 'Webinar',
+        'items': [1, 2.5, None, True],
+    }
+    
+    def check_codec(self, json_codec):
+        encoded = json_codec.dumps(self.VALUE)
+        
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(json.loads(encoded), self.EXPECTED)
+        self.assertEqual(json_codec.loads(encoded), self.EXPECTED)
+        self.assertEqual(json_codec.loads(encoded.decode('utf-8')), self.EXPECTED)
+        self.assertIn('\n  "name"', json_codec.dumps_pretty(self.VALUE))
+        with self.assertRaises(codec.JSONDecodeError):
+            json_codec.loads(b'{not json')
+        with self.assertRaises(TypeError):
+            json_codec.dumps({'value': object()})
+    
+    def test_stdlib_codec(self):
+        """Test the stdlib fallback handles Django's extra types and compact output."""
+        self.check_codec(StdlibCodec())
+        self.assertEqual(StdlibCodec().dumps({'a': 1}), b'{"a":1}')
+    
+    @skipUnless('orjson' in CODECS, "orjson is not installed")
+    def test_orjson_codec(self):
+        """Test orjson gives the same output as the stdlib codec."""
+        self.check_codec(OrjsonCodec())
+        self.assertEqual(OrjsonCodec().dumps(self.EXPECTED), StdlibCodec().dumps(self.EXPECTED))
+    
+    def test_codec_setting(self):
+        """Test JSON_CODEC picks the codec and unknown names fall back to the stdlib."""
+        self.assertEqual(codec.get_codec('stdlib').name, 'stdlib')
+        self.assertEqual(codec.get_codec('missing').name, 'stdlib')
+
+
+class CodecStorageTests(TestCase):
+    """Test JSON columns and webhook logs written through the codec."""
+    
+    def test_json_column_round_trip(self):
+        """Test Download.payload is stored and read back through the codec."""
+        Download.objects.create(
+            first_name='Zoë', email='zoe@example.com', form_title='Guide',
+            payload={'event': 'form_submission.created', 'payload': {'First Name': 'Zoë'}}
+        )
+        
+        download = Download.objects.get(email='zoe@example.com')
+        self.assertEqual(download.payload['payload']['First Name'], 'Zoë')
+    
+    def test_response_serialized_once_for_log(self):
+        """Test the webhook log stores the bytes sent in the response."""
+        with patch('webinars.views.json_response', wraps=codec.json_response) as mock_response:
+            response = self.client.post('/api/download-webhook/', data=json.dumps({
+                'first_name': 'John', 'email': 'john@example.com', 'form_title': 'Guide'
+            }), content_type='application/json')
+        
+        self.assertEqual(mock_response.call_count, 1)
+        log = WebhookLog.objects.get()
+        self.assertEqual(log.response_body, response.content.decode('utf-8'))
+        self.assertEqual(log.headers['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(log.response_body)['status'], 'success')
+    
+    @patch('webinars.codec.codec', StdlibCodec())
+    def test_stdlib_fallback_webhook(self):
+        """Test webhooks work the same without orjson."""
+        response = self.client.post('/api/download-webhook/', data=json.dumps({
+            'first_name': 'John', 'email': 'john@example.com', 'form_title': 'Guide'
+        }), content_type='application/json')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Download.objects.get().payload['form_title'], 'Guide')
+    
+    def test_benchmark_command(self):
+        """Test the micro-benchmark runs over every payload shape."""
+        out = StringIO()
+        call_command('benchmark_json', number=10, stdout=out)
+        
+        self.assertIn('parse purchase', out.getvalue())
+        self.assertIn('serialize response', out.getvalue())
+
+
+class CodecApiTests(TestCase):
+    """Test the DRF renderer and parser."""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='api', password='secret'))
+    
+    def test_create_and_list(self):
+        """Test JSON request bodies are parsed and responses rendered by the codec."""
+        response = self.client.post('/api/webinars/', {
+            'name': 'Café hour', 'kajabi_grant_activation_hook_url': 'https://example.com/hook'
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Webinar.objects.get().name, 'Café hour')
+        
+        response = self.client.get('/api/webinars/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content)['results'][0]['name'], 'Café hour')
+    
+    def test_invalid_json_is_400(self):
+        """Test a malformed body is a parse error rather than a server error."""
+        response = self.client.post('/api/webinars/', data='{"name": ', content_type='application/json')
+        
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,149 @@
+"""
+Unit tests for compressed text and JSON columns and the recompress_fields command.
+"""
+import zlib
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from unittest.mock import patch
+
+from . import compression
+from .models import Attendee, Download, PayloadBlob, WebhookLog, Webinar, WebinarDate
+
+TRACEBACK = 'Traceback (most recent call last):\n' + '  File "/app/webinars/views.py", line 420, in attendee_webhook\n' * 40
+
+
+def stored_value(model, field, pk):
+    """The bytes (or legacy text) actually in the column."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT {field} FROM {model._meta.db_table} WHERE {model._meta.pk.column} = %s', [pk])
+        return cursor.fetchone()[0]
+
+
+class CompressionTests(TestCase):
+    """Test the storage format."""
+    
+    def test_round_trip(self):
+        """Test long text is compressed and short text stored with just the header."""
+        compressed = compression.compress(TRACEBACK)
+        
+        self.assertEqual(compressed[:2], b'\x00\x01')
+        self.assertLess(len(compressed), len(TRACEBACK) / 10)
+        self.assertEqual(compression.decompress(compressed), TRACEBACK)
+        self.assertEqual(compression.compress('Zoom error'), b'\x00\x00Zoom error')
+        self.assertEqual(compression.decompress(b'\x00\x00Zoom error'), 'Zoom error')
+        self.assertEqual(compression.compress(''), b'')
+        self.assertEqual(compression.decompress(b''), '')
+    
+    def test_plain_text_read_unchanged(self):
+        """Test values written before compression are read as they are."""
+        self.assertEqual(compression.decompress('{"event": "x"}'), '{"event": "x"}')
+        self.assertEqual(compression.decompress(b'{"event": "x"}'), '{"event": "x"}')
+        self.assertEqual(compression.decompress(memoryview('Café'.encode('utf-8'))), 'Café')
+    
+    @patch('webinars.compression.METHOD', 'stored')
+    def test_stored_method(self):
+        """Test compression can be turned off while still reading compressed values."""
+        self.assertEqual(compression.compress(TRACEBACK)[:2], b'\x00\x00')
+        self.assertEqual(compression.decompress(b'\x00\x01' + zlib.compress(b'hello')), 'hello')
+    
+    @patch('webinars.compression.zstandard', None)
+    def test_zstd_requires_zstandard(self):
+        """Test zstd without zstandard installed is a configuration error."""
+        with self.assertRaises(ImproperlyConfigured):
+            compression.compress(TRACEBACK, method='zstd')
+
+
+class CompressedFieldTests(TestCase):
+    """Test the model fields read and write transparently."""
+    
+    def setUp(self):
+        webinar = Webinar.objects.create(name='Test Webinar', kajabi_grant_activation_hook_url='https://example.com/hook')
+        self.webinar_date = WebinarDate.objects.create(webinar=webinar, date_time='2025-06-19T10:00:00Z')
+    
+    def test_text_field(self):
+        """Test error text is compressed in the column and read back as text."""
+        attendee = Attendee.objects.create(
+            webinar_date=self.webinar_date, first_name='John', last_name='Doe',
+            email='john@example.com', zoom_registration_error=TRACEBACK
+        )
+        
+        self.assertEqual(bytes(stored_value(Attendee, 'zoom_registration_error', attendee.pk))[:2], b'\x00\x01')
+        attendee.refresh_from_db()
+        self.assertEqual(attendee.zoom_registration_error, TRACEBACK)
+        self.assertEqual(Attendee.objects.values_list('zoom_registration_error', flat=True).get(), TRACEBACK)
+    
+    def test_empty_value_lookups(self):
+        """Test the field='' filters the services use still work."""
+        Attendee.objects.create(webinar_date=self.webinar_date, first_name='A', last_name='A', email='a@example.com')
+        Attendee.objects.create(
+            webinar_date=self.webinar_date, first_name='B', last_name='B', email='b@example.com',
+            zoom_registration_error='Zoom API error: 429'
+        )
+        
+        self.assertEqual(Attendee.objects.filter(zoom_registration_error='').get().email, 'a@example.com')
+        self.assertEqual(Attendee.objects.exclude(zoom_registration_error='').get().email, 'b@example.com')
+        Attendee.objects.update(zoom_registration_error='')
+        self.assertEqual(Attendee.objects.filter(zoom_registration_error='').count(), 2)
+    
+    def test_json_field(self):
+        """Test payloads and headers are compressed and read back as JSON."""
+        payload = {'event': 'form_submission.created', 'payload': {'First Name': 'Zoë', 'notes': 'x' * 500}}
+        download = Download.objects.create(first_name='Zoë', email='zoe@example.com', form_title='Guide', payload=payload)
+        log = WebhookLog.objects.create(
+            method='POST', path='/api/download-webhook/', headers={'Content-Type': 'application/json'},
+            body=TRACEBACK, response_status=200
+        )
+        
+        self.assertEqual(bytes(stored_value(PayloadBlob, 'data', download.payload_blob_id))[:2], b'\x00\x01')
+        self.assertEqual(Download.objects.get().payload, payload)
+        log = WebhookLog.objects.get()
+        self.assertEqual(log.headers, {'Content-Type': 'application/json'})
+        self.assertEqual(log.body_preview, TRACEBACK[:100] + '...')
+    
+    def test_admin_changelist(self):
+        """Test the webhook log changelist and search work on compressed rows."""
+        WebhookLog.objects.create(method='POST', path='/api/download-webhook/', headers={}, body=TRACEBACK, response_status=500)
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'secret'))
+        
+        response = self.client.get('/admin/webinars/webhooklog/', {'q': 'download'})
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Traceback (most recent call last)')
+
+
+class RecompressCommandTests(TestCase):
+    """Test recompress_fields rewrites plain rows and reports the saving."""
+    
+    def test_recompresses_plain_rows(self):
+        """Test rows written before compression are rewritten compressed."""
+        log = WebhookLog.objects.create(method='POST', path='/api/attendee-webhook/', headers={}, response_status=500)
+        with connection.cursor() as cursor:
+            cursor.execute('UPDATE webinars_webhooklog SET error_message = %s WHERE id = %s', [TRACEBACK, log.pk])
+        
+        out = StringIO()
+        call_command('recompress_fields', model=['WebhookLog'], batch_size=1, dry_run=True, stdout=out)
+        self.assertIn('Would save', out.getvalue())
+        self.assertEqual(stored_value(WebhookLog, 'error_message', log.pk), TRACEBACK)
+        
+        out = StringIO()
+        call_command('recompress_fields', model=['WebhookLog'], batch_size=1, stdout=out)
+        
+        self.assertIn('WebhookLog: 1 rows rewritten', out.getvalue())
+        self.assertIn('Saved', out.getvalue())
+        self.assertEqual(bytes(stored_value(WebhookLog, 'error_message', log.pk))[:2], b'\x00\x01')
+        self.assertEqual(WebhookLog.objects.get().error_message, TRACEBACK)
+        
+        out = StringIO()
+        call_command('recompress_fields', model=['WebhookLog'], stdout=out)
+        self.assertIn('WebhookLog: 0 rows rewritten', out.getvalue())
+    
+    def test_unknown_model(self):
+        """Test naming a model without compressed fields is an error."""
+        with self.assertRaises(CommandError):
+            call_command('recompress_fields', model=['Webinar'], stdout=StringIO())
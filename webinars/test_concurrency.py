@@ -0,0 +1,188 @@
+"""
+Concurrency tests for the service layer under gthread workers: parallel
+webhooks and service calls sharing sessions, tokens and the Salesforce login.
+"""
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TransactionTestCase, Client, override_settings, skipUnlessDBFeature
+from unittest.mock import patch, MagicMock
+import requests
+
+from settings.models import ZoomSettings, SalesforceSettings
+from . import outbound, salesforce_service
+from .models import Webinar, WebinarDate, Attendee, WebhookLog
+from .salesforce_service import SalesforceService
+from .utils import parse_webinar_date
+from .zoom_service import ZoomService
+
+THREADS = 8
+
+# A cache shared by the threads without database writes, so the only locking is the services' own
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def run_in_threads(func, args_list):
+    """Run func once per args in a pool of threads, starting them together, and return the results."""
+    barrier = threading.Barrier(min(len(args_list), THREADS))
+    
+    def call(args):
+        try:
+            barrier.wait()
+            return func(*args)
+        finally:
+            connection.close()
+    
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        return list(executor.map(call, args_list))
+
+
+class FakeZoom:
+    """Stands in for requests.Session.request, answering like Zoom after a short wait."""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.token_fetches = 0
+        self.registrations = 0
+        self.sessions = set()
+    
+    def request(self, session, method, url, **kwargs):
+        with self.lock:
+            self.sessions.add(id(session))
+            if url == ZoomService.TOKEN_URL:
+                self.token_fetches += 1
+                data = {'access_token': 'token', 'expires_in': 3600}
+            else:
+                self.registrations += 1
+                data = {'registrant_id': f'reg-{self.registrations}', 'join_url': 'https://zoom.us/w/1'}
+        time.sleep(0.02)
+        return MagicMock(status_code=200, text='', json=MagicMock(return_value=data))
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ParallelWebhookTests(TransactionTestCase):
+    """Test parallel webhooks and Zoom calls give the same results as the same calls one at a time."""
+    
+    def setUp(self):
+        cache.clear()
+        zoom_settings = ZoomSettings.get_settings()
+        zoom_settings.client_id = 'id'
+        zoom_settings.client_secret = 'secret'
+        zoom_settings.account_id = 'account'
+        zoom_settings.save()
+        
+        self.webinar = Webinar.objects.create(
+            name="Test Webinar",
+            kajabi_grant_activation_hook_url="https://example.com/webhook",
+            form_date_field="Webinar Date"
+        )
+        self.webinar_date = WebinarDate.objects.create(
+            webinar=self.webinar,
+            date_time=parse_webinar_date("21 August, 10-11:00 BST"),
+            zoom_meeting_id="123456"
+        )
+        self.zoom = FakeZoom()
+        patcher = patch.object(requests.Session, 'request', autospec=True, side_effect=self.zoom.request)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def post_webhook(self, email):
+        data = {
+            "event": "form_submission.created",
+            "payload": {
+                "form_title": "Test Webinar",
+                "First Name": "John",
+                "Surname": "Doe",
+                "Email": email,
+                "Webinar Date": "21 August, 10-11:00 BST"
+            }
+        }
+        return Client().post('/api/attendee-webhook/', data=json.dumps(data), content_type='application/json')
+    
+    # In-memory SQLite test databases raise "table is locked" for concurrent writes
+    @skipUnlessDBFeature('test_db_allows_multiple_connections')
+    def test_parallel_webhooks(self):
+        """Test parallel webhooks register every attendee once with a single Zoom token fetch."""
+        emails = [f'user{i}@example.com' for i in range(THREADS)]
+        
+        responses = run_in_threads(self.post_webhook, [(email,) for email in emails])
+        
+        self.assertEqual([response.status_code for response in responses], [200] * THREADS)
+        self.assertEqual(self.zoom.token_fetches, 1)
+        self.assertEqual(self.zoom.registrations, THREADS)
+        self.assertEqual(
+            sorted(Attendee.objects.values_list('email', flat=True)), emails
+        )
+        self.assertFalse(Attendee.objects.filter(zoom_registrant_id='').exists())
+        self.assertEqual(WebhookLog.objects.filter(success=True).count(), THREADS)
+        # Every thread used the shared Zoom session
+        self.assertEqual(self.zoom.sessions, {id(outbound.get_session('zoom'))})
+    
+    def test_parallel_registrations(self):
+        """Test parallel Zoom registrations share one token fetch and the pooled session."""
+        results = run_in_threads(
+            lambda email: ZoomService().register_attendee('123456', 'John', 'Doe', email),
+            [(f'user{i}@example.com',) for i in range(THREADS)]
+        )
+        
+        self.assertTrue(all(result['success'] for result in results))
+        self.assertEqual(len({result['registrant_id'] for result in results}), THREADS)
+        self.assertEqual(self.zoom.token_fetches, 1)
+        self.assertEqual(self.zoom.sessions, {id(outbound.get_session('zoom'))})
+    
+    def test_expired_token_fetched_once(self):
+        """Test threads finding the cached token gone wait for one refresh instead of each fetching one."""
+        ZoomService()._get_access_token()
+        cache.clear()
+        
+        tokens = run_in_threads(lambda: ZoomService()._get_access_token(), [()] * THREADS)
+        
+        self.assertEqual(tokens, ['token'] * THREADS)
+        self.assertEqual(self.zoom.token_fetches, 2)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class SharedClientTests(TransactionTestCase):
+    """Test the per-process clients are created once however many threads ask for them."""
+    
+    def setUp(self):
+        salesforce_service._drop_connection()
+        self.addCleanup(salesforce_service._drop_connection)
+    
+    def test_sessions_shared(self):
+        """Test each integration gets one pooled session across threads."""
+        sessions = run_in_threads(outbound.get_session, [('zoom',), ('graph',)] * THREADS)
+        
+        self.assertEqual(len({id(session) for session in sessions[::2]}), 1)
+        self.assertEqual(len({id(session) for session in sessions[1::2]}), 1)
+        self.assertIsNot(sessions[0], sessions[1])
+    
+    @patch('simple_salesforce.Salesforce')
+    def test_salesforce_login_shared(self, mock_salesforce):
+        """Test parallel Salesforce services log in once and share the connection."""
+        SalesforceSettings.objects.create(username='user', password='pass', security_token='token')
+        
+        def connect():
+            service = SalesforceService()
+            return service._connect() and service.sf
+        
+        connections = run_in_threads(connect, [()] * THREADS)
+        
+        self.assertEqual(mock_salesforce.call_count, 1)
+        self.assertEqual(connections, [mock_salesforce.return_value] * THREADS)
+    
+    @patch('simple_salesforce.Salesforce')
+    def test_salesforce_expired_session_logs_in_again(self, mock_salesforce):
+        """Test an expired session drops the shared connection so the next call logs in again."""
+        from simple_salesforce.exceptions import SalesforceExpiredSession
+        SalesforceSettings.objects.create(username='user', password='pass', security_token='token')
+        mock_salesforce.return_value.query.side_effect = SalesforceExpiredSession('url', 401, 'Contact', 'expired')
+        
+        self.assertIsNone(SalesforceService().find_contact_by_email('john@example.com'))
+        SalesforceService().find_contact_by_email('john@example.com')
+        
+        self.assertEqual(mock_salesforce.call_count, 2)
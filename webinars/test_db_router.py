@@ -0,0 +1,163 @@
+"""
+Unit tests for the read-replica database router, its decorators and read-your-writes stickiness.
+"""
+import time
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.test import TestCase, TransactionTestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from unittest.mock import patch
+from rest_framework.test import APIClient
+
+from . import db_router
+from .db_router import read_replica, read_primary, on_replica, replica_reads, ReplicaRouter
+from .models import Webinar
+
+HAS_REPLICA = db_router.REPLICA_ALIAS in settings.DATABASES
+
+
+@replica_reads
+def read_alias_view(request):
+    """Stands in for a list view, returning the alias its reads would use."""
+    return Webinar.objects.all().db
+
+
+@replica_reads
+async def async_read_alias_view(request):
+    return Webinar.objects.all().db
+
+
+class ReplicaRoutingTests(TestCase):
+    """Test reads go to the replica only when it's configured and caught up."""
+    
+    def setUp(self):
+        cache.clear()
+        patcher = patch('webinars.db_router.replica_configured', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    @patch('webinars.db_router.replica_lag', return_value=0)
+    def test_reads_go_to_replica(self, mock_lag):
+        """Test reads inside read_replica() use the replica and writes the primary."""
+        with read_replica():
+            self.assertEqual(Webinar.objects.all().db, db_router.REPLICA_ALIAS)
+            self.assertEqual(ReplicaRouter().db_for_write(Webinar), 'default')
+            with read_primary():
+                self.assertEqual(Webinar.objects.all().db, 'default')
+        
+        self.assertEqual(Webinar.objects.all().db, 'default')
+        self.assertEqual(on_replica(Webinar.objects.all()).db, db_router.REPLICA_ALIAS)
+    
+    @patch('webinars.db_router.replica_lag', return_value=30)
+    def test_lagging_replica_falls_back_to_primary(self, mock_lag):
+        """Test a replica further behind than READ_REPLICA_MAX_LAG isn't read from."""
+        with self.assertLogs('webinars.db_router', level='WARNING'):
+            with read_replica():
+                self.assertEqual(Webinar.objects.all().db, 'default')
+    
+    @patch('webinars.db_router.replica_lag', return_value=None)
+    def test_stopped_replication_falls_back_to_primary(self, mock_lag):
+        """Test a replica that isn't replicating isn't read from."""
+        with read_replica():
+            self.assertEqual(Webinar.objects.all().db, 'default')
+    
+    @patch('webinars.db_router.replica_lag', side_effect=DatabaseError("gone away"))
+    def test_unreachable_replica_falls_back_to_primary(self, mock_lag):
+        """Test an unreachable replica is logged and the primary used."""
+        with self.assertLogs('webinars.db_router', level='WARNING'):
+            with read_replica():
+                self.assertEqual(Webinar.objects.all().db, 'default')
+    
+    @patch('webinars.db_router.replica_lag', return_value=0)
+    def test_lag_check_cached(self, mock_lag):
+        """Test the lag is checked once per LAG_CHECK_SECONDS rather than per request."""
+        for _ in range(3):
+            with read_replica():
+                pass
+        
+        self.assertEqual(mock_lag.call_count, 1)
+    
+    def test_not_configured(self):
+        """Test reads stay on the primary without a replica alias."""
+        with patch('webinars.db_router.replica_configured', return_value=False):
+            with read_replica():
+                self.assertEqual(Webinar.objects.all().db, 'default')
+
+
+@patch('webinars.db_router.replica_lag', return_value=0)
+@patch('webinars.db_router.replica_configured', return_value=True)
+class ReplicaReadsDecoratorTests(TestCase):
+    """Test the view decorator and read-your-writes stickiness."""
+    
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+    
+    def get_request(self, method='get', session=None):
+        request = getattr(self.factory, method)('/')
+        request.session = session if session is not None else SessionStore()
+        return request
+    
+    def test_get_reads_from_replica(self, mock_configured, mock_lag):
+        """Test a GET's reads go to the replica."""
+        self.assertEqual(read_alias_view(self.get_request()), db_router.REPLICA_ALIAS)
+    
+    def test_post_reads_from_primary(self, mock_configured, mock_lag):
+        """Test a POST's reads stay on the primary."""
+        self.assertEqual(read_alias_view(self.get_request('post')), 'default')
+    
+    def test_recent_write_pins_session_to_primary(self, mock_configured, mock_lag):
+        """Test a session that wrote recently reads from the primary until STICKY_SECONDS pass."""
+        session = SessionStore()
+        session[db_router.STICKY_SESSION_KEY] = time.time() + db_router.STICKY_SECONDS
+        self.assertEqual(read_alias_view(self.get_request(session=session)), 'default')
+        
+        session[db_router.STICKY_SESSION_KEY] = time.time() - 1
+        self.assertEqual(read_alias_view(self.get_request(session=session)), db_router.REPLICA_ALIAS)
+    
+    async def test_async_view(self, mock_configured, mock_lag):
+        """Test the decorator routes an async view's reads too."""
+        self.assertEqual(await async_read_alias_view(self.get_request()), db_router.REPLICA_ALIAS)
+    
+    def test_post_by_user_pins_session(self, mock_configured, mock_lag):
+        """Test the middleware pins a logged-in user's session after a POST."""
+        user = User.objects.create_user(username='staff', password='secret')
+        client = APIClient()
+        client.force_login(user)
+        self.assertNotIn(db_router.STICKY_SESSION_KEY, client.session)
+        
+        client.post('/api/webinars/', {'name': 'New Webinar'}, format='json')
+        self.assertGreater(client.session[db_router.STICKY_SESSION_KEY], time.time())
+    
+    def test_anonymous_post_not_pinned(self, mock_configured, mock_lag):
+        """Test webhooks don't get sessions created for them."""
+        response = self.client.post('/api/download-webhook/', {}, content_type='application/json')
+        
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+
+@skipUnless(HAS_REPLICA, "needs a replica alias in DATABASES, e.g. one with TEST['MIRROR'] = 'default'")
+class ReplicaDatabaseTests(TransactionTestCase):
+    """
+    Test list views read from a real second alias. A TransactionTestCase, as
+    the replica's own connection can't see rows inside a TestCase transaction.
+    """
+    databases = '__all__'
+    
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='staff', password='secret')
+        self.client.force_login(self.user)
+    
+    def test_dashboard_reads_from_replica(self):
+        """Test the dashboard's queries run on the replica connection."""
+        with CaptureQueriesContext(connections[db_router.REPLICA_ALIAS]) as queries:
+            response = self.client.get('/')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(any('webinars_webinar' in query['sql'] for query in queries.captured_queries))
@@ -0,0 +1,184 @@
+"""
+Unit tests for the email outbox, error digests and the deliver_emails command.
+"""
+from django.test import TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from io import StringIO
+from unittest.mock import patch, MagicMock
+
+from settings.models import MS365Settings
+from . import email_service
+from .email_service import EmailService, enqueue_email, deliver_outbox, send_webhook_error_email
+from .models import OutboundEmail
+from .notifications import error_signature
+
+
+class EmailOutboxTests(TestCase):
+    """Test queueing and batched delivery of outbox emails."""
+    
+    def setUp(self):
+        MS365Settings.objects.create(
+            client_id='client',
+            client_secret='secret',
+            tenant_id='tenant',
+            owner_email='owner@example.com'
+        )
+    
+    def batch_response(self, statuses):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {
+            'responses': [{'id': str(email_id), 'status': status} for email_id, status in statuses.items()]
+        }
+        return response
+    
+    @patch.object(EmailService, 'send_email')
+    def test_error_email_is_queued(self, mock_send):
+        """Test webhook error emails are written to the outbox instead of being sent."""
+        send_webhook_error_email('admin@example.com', 'Something broke', {'email': 'a@example.com'})
+        
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.to_email, 'admin@example.com')
+        self.assertEqual(email.status, OutboundEmail.STATUS_PENDING)
+        self.assertIn('Something broke', email.message)
+        mock_send.assert_not_called()
+    
+    @patch.object(EmailService, 'send_email_via_django', return_value=(False, 'SMTP down'))
+    @patch.object(EmailService, 'get_access_token', return_value='token')
+    @patch('webinars.email_service.graph_client.request')
+    def test_batch_delivery_and_retry(self, mock_request, mock_token, mock_django):
+        """Test emails are sent in one $batch call and failures are rescheduled."""
+        sent = enqueue_email('one@example.com', 'Hello', 'Body')
+        failed = enqueue_email('two@example.com', 'Hello', 'Body')
+        mock_request.return_value = self.batch_response({sent.id: 202, failed.id: 503})
+        
+        counts = deliver_outbox()
+        
+        self.assertEqual(counts, {'sent': 1, 'retrying': 1, 'failed': 0})
+        mock_request.assert_called_once()
+        self.assertTrue(mock_request.call_args.args[1].endswith('/$batch'))
+        self.assertEqual(len(mock_request.call_args.kwargs['json']['requests']), 2)
+        
+        sent.refresh_from_db()
+        failed.refresh_from_db()
+        self.assertEqual(sent.status, OutboundEmail.STATUS_SENT)
+        self.assertEqual(sent.sent_via, 'ms365')
+        self.assertEqual(failed.status, OutboundEmail.STATUS_PENDING)
+        self.assertEqual(failed.attempts, 1)
+        self.assertGreater(failed.next_attempt_at, timezone.now())
+        self.assertIn('SMTP down', failed.last_error)
+    
+    @patch.object(EmailService, 'get_access_token', return_value='token')
+    @patch('webinars.email_service.graph_client.request')
+    def test_batches_of_twenty(self, mock_request, mock_token):
+        """Test more than 20 due emails are split into several $batch calls."""
+        emails = [enqueue_email(f'user{i}@example.com', 'Hello', 'Body') for i in range(25)]
+        mock_request.side_effect = [
+            self.batch_response({email.id: 202 for email in emails[:20]}),
+            self.batch_response({email.id: 202 for email in emails[20:]}),
+        ]
+        
+        counts = deliver_outbox()
+        
+        self.assertEqual(counts['sent'], 25)
+        self.assertEqual(mock_request.call_count, 2)
+    
+    @patch.object(EmailService, 'send_email_via_django', return_value=(False, 'SMTP down'))
+    @patch.object(EmailService, 'get_access_token', return_value=None)
+    def test_gives_up_after_max_attempts(self, mock_token, mock_django):
+        """Test an email that keeps failing is marked failed at the attempt limit."""
+        email = enqueue_email('one@example.com', 'Hello', 'Body')
+        OutboundEmail.objects.filter(id=email.id).update(attempts=email_service.OUTBOX_MAX_ATTEMPTS - 1)
+        
+        counts = deliver_outbox()
+        
+        email.refresh_from_db()
+        self.assertEqual(counts['failed'], 1)
+        self.assertEqual(email.status, OutboundEmail.STATUS_FAILED)
+    
+    def test_command_dry_run(self):
+        """Test the command lists due emails without sending them."""
+        enqueue_email('one@example.com', 'Hello', 'Body')
+        out = StringIO()
+        
+        call_command('deliver_emails', '--dry-run', stdout=out)
+        
+        self.assertIn('Would send email', out.getvalue())
+        self.assertEqual(OutboundEmail.objects.get().attempts, 0)
+
+
+class ErrorDigestTests(TestCase):
+    """Test coalescing of repeated error notifications into digests."""
+    
+    def setUp(self):
+        cache.clear()
+    
+    def test_repeats_are_coalesced(self):
+        """Test the first error is queued and repeats only create one digest."""
+        for i in range(3):
+            send_webhook_error_email(
+                'admin@example.com',
+                f"No webinar date found for attendee {i}",
+                {'first_name': 'Ann', 'last_name': f'Lee{i}', 'email': f'ann{i}@example.com'},
+                scope='webinar:1'
+            )
+        
+        immediate = OutboundEmail.objects.get(digest_key='')
+        digest = OutboundEmail.objects.exclude(digest_key='').get()
+        self.assertLessEqual(immediate.next_attempt_at, timezone.now())
+        self.assertGreater(digest.next_attempt_at, timezone.now())
+        self.assertTrue(digest.subject.startswith('[Digest]'))
+    
+    def test_repeats_do_not_build_message(self):
+        """Test a repeat folded into an existing digest doesn't serialize the webhook data."""
+        for _ in range(2):
+            send_webhook_error_email('admin@example.com', 'Broken mapping', {'email': 'a@example.com'})
+        
+        with patch('webinars.email_service.codec.dumps_pretty') as mock_dumps:
+            send_webhook_error_email('admin@example.com', 'Broken mapping', {'email': 'b@example.com'})
+        
+        mock_dumps.assert_not_called()
+        self.assertEqual(OutboundEmail.objects.count(), 2)
+    
+    def test_evicted_count_restarts(self):
+        """Test a repeat counter evicted between add and incr starts again at one."""
+        send_webhook_error_email('admin@example.com', 'Broken mapping', {})
+        
+        with patch('webinars.notifications.cache.incr', side_effect=ValueError):
+            send_webhook_error_email('admin@example.com', 'Broken mapping', {'email': 'a@example.com'})
+        
+        self.assertEqual(OutboundEmail.objects.exclude(digest_key='').count(), 1)
+    
+    def test_scopes_are_separate(self):
+        """Test the same error for different webinars is not coalesced."""
+        send_webhook_error_email('admin@example.com', 'Broken mapping', {}, scope='webinar:1')
+        send_webhook_error_email('admin@example.com', 'Broken mapping', {}, scope='webinar:2')
+        
+        self.assertEqual(OutboundEmail.objects.filter(digest_key='').count(), 2)
+    
+    def test_digest_lists_registrants(self):
+        """Test the digest message is built at delivery and lists every repeat."""
+        for i in range(3):
+            send_webhook_error_email(
+                'admin@example.com',
+                'Broken mapping',
+                {'payload': {'First Name': 'Ann', 'Surname': 'Lee', 'Email': f'ann{i}@example.com'}}
+            )
+        OutboundEmail.objects.update(next_attempt_at=timezone.now())
+        
+        counts = deliver_outbox()
+        
+        digest = OutboundEmail.objects.get(subject__startswith='[Digest]')
+        self.assertEqual(counts['sent'], 2)
+        self.assertEqual(digest.digest_key, '')
+        self.assertIn('2 more time(s)', digest.message)
+        self.assertIn('Ann Lee <ann1@example.com>', digest.message)
+        self.assertIn('Ann Lee <ann2@example.com>', digest.message)
+    
+    def test_error_signature_ignores_values(self):
+        """Test signatures ignore numbers, quoted values and email addresses."""
+        self.assertEqual(
+            error_signature("Attendee 12 'Jo' a@example.com failed"),
+            error_signature("Attendee 345 'Sam' b@example.com failed")
+        )
@@ -0,0 +1,116 @@
+"""
+Unit tests for the shared Microsoft Graph client.
+"""
+from django.test import TestCase
+from django.core.cache import cache
+from unittest.mock import patch, MagicMock
+
+from settings.models import MS365Settings
+from . import graph_client
+from .email_service import EmailService
+from .ms365_service import MS365CalendarService
+
+
+class GraphClientTests(TestCase):
+    """Test the shared MSAL app, token cache and pooled session."""
+    
+    def setUp(self):
+        cache.clear()
+        graph_client._apps.clear()
+        graph_client._tokens.clear()
+        MS365Settings.objects.create(
+            client_id='client',
+            client_secret='secret',
+            tenant_id='tenant',
+            owner_email='owner@example.com'
+        )
+    
+    def tearDown(self):
+        graph_client._apps.clear()
+        graph_client._tokens.clear()
+    
+    def make_app(self):
+        app = MagicMock()
+        app.acquire_token_for_client.return_value = {'access_token': 'token'}
+        app.token_cache.has_state_changed = True
+        app.token_cache.serialize.return_value = 'serialized-cache'
+        return app
+    
+    @patch('msal.ConfidentialClientApplication')
+    def test_services_share_one_app(self, mock_app_class):
+        """Test both services and repeated instances reuse a single MSAL app."""
+        mock_app_class.return_value = self.make_app()
+        
+        self.assertEqual(EmailService().get_access_token(), 'token')
+        self.assertEqual(EmailService().get_access_token(), 'token')
+        self.assertEqual(MS365CalendarService().get_access_token(), 'token')
+        
+        mock_app_class.assert_called_once()
+    
+    @patch('msal.ConfidentialClientApplication')
+    def test_token_cache_is_shared(self, mock_app_class):
+        """Test the token cache is saved to and loaded from the shared cache."""
+        first_app = self.make_app()
+        mock_app_class.return_value = first_app
+        graph_client.get_access_token(MS365Settings.get_settings())
+        
+        key = graph_client._token_cache_key(graph_client._credentials_key(MS365Settings.get_settings()))
+        self.assertEqual(cache.get(key), 'serialized-cache')
+        
+        # A new process starts with an empty app and loads the shared cache
+        graph_client._apps.clear()
+        second_app = self.make_app()
+        mock_app_class.return_value = second_app
+        graph_client.get_access_token(MS365Settings.get_settings())
+        
+        second_app.token_cache.deserialize.assert_called_once_with('serialized-cache')
+    
+    @patch('msal.ConfidentialClientApplication')
+    def test_token_answered_from_memory(self, mock_app_class):
+        """Test a fresh token is returned without the lock, the shared cache or MSAL."""
+        app = self.make_app()
+        app.acquire_token_for_client.return_value = {'access_token': 'token', 'expires_in': 3600}
+        mock_app_class.return_value = app
+        ms365_settings = MS365Settings.get_settings()
+        graph_client.get_access_token(ms365_settings)
+        
+        credentials_lock = graph_client._credentials_lock(graph_client._credentials_key(ms365_settings))
+        with credentials_lock, patch('webinars.graph_client.cache') as mock_cache:
+            self.assertEqual(graph_client.get_access_token(ms365_settings), 'token')
+        
+        mock_cache.get.assert_not_called()
+        app.acquire_token_for_client.assert_called_once()
+        self.assertIsNot(credentials_lock, graph_client._credentials_lock('other-credentials'))
+    
+    @patch('msal.ConfidentialClientApplication')
+    def test_expiring_token_is_refreshed(self, mock_app_class):
+        """Test a token inside the refresh margin goes back through MSAL."""
+        app = self.make_app()
+        app.acquire_token_for_client.return_value = {'access_token': 'token', 'expires_in': 60}
+        mock_app_class.return_value = app
+        
+        graph_client.get_access_token(MS365Settings.get_settings())
+        graph_client.get_access_token(MS365Settings.get_settings())
+        
+        self.assertEqual(app.acquire_token_for_client.call_count, 2)
+    
+    @patch('msal.ConfidentialClientApplication')
+    def test_token_error_returns_none(self, mock_app_class):
+        """Test a failed token request returns None."""
+        app = self.make_app()
+        app.acquire_token_for_client.return_value = {'error': 'invalid_client'}
+        mock_app_class.return_value = app
+        
+        self.assertIsNone(graph_client.get_access_token(MS365Settings.get_settings()))
+    
+    def test_requests_use_pooled_session(self):
+        """Test Graph requests go through the shared session with a timeout."""
+        session = graph_client.get_session()
+        self.assertIs(graph_client.get_session(), session)
+        
+        with patch.object(session, 'request', return_value=MagicMock(status_code=202)) as mock_request:
+            graph_client.request('POST', f'{graph_client.GRAPH_URL}/users/owner@example.com/sendMail', json={})
+            graph_client.request('POST', f'{graph_client.GRAPH_URL}/users/owner@example.com/sendMail', json={})
+        
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertIn('timeout', mock_request.call_args.kwargs)
@@ -0,0 +1,105 @@
+"""
+Unit tests for the queued JSON logging pipeline.
+"""
+import json
+import logging
+import logging.config
+import os
+import tempfile
+import threading
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from .log_pipeline import JsonFormatter, SamplingFilter, SizedTimedRotatingFileHandler
+
+
+class CollectingHandler(logging.Handler):
+    """Handler that keeps formatted records in memory."""
+    
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+    
+    def emit(self, record):
+        self.messages.append(self.format(record))
+
+
+class LogPipelineTests(SimpleTestCase):
+    """Test the formatter, filter and handlers used by LOGGING."""
+    
+    def make_record(self, level=logging.INFO, msg='Registered attendee %s', args=('a@example.com',), **extra):
+        record = logging.LogRecord('webinars.test', level, __file__, 1, msg, args, None)
+        record.__dict__.update(extra)
+        return record
+    
+    def test_json_formatter(self):
+        """Test records become one JSON object with the message and extra fields."""
+        line = JsonFormatter().format(self.make_record(webhook_log_id=7))
+        
+        entry = json.loads(line)
+        self.assertEqual(entry['message'], 'Registered attendee a@example.com')
+        self.assertEqual(entry['level'], 'INFO')
+        self.assertEqual(entry['logger'], 'webinars.test')
+        self.assertEqual(entry['webhook_log_id'], 7)
+        self.assertNotIn('\n', line)
+    
+    def test_sampling_filter_keeps_warnings(self):
+        """Test a zero sampling rate drops info records but never warnings."""
+        sampler = SamplingFilter(rate=0)
+        
+        self.assertFalse(sampler.filter(self.make_record()))
+        self.assertTrue(sampler.filter(self.make_record(level=logging.WARNING)))
+    
+    def test_rotates_by_size(self):
+        """Test the file handler rolls over once the file reaches maxBytes."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'webhook.log')
+            handler = SizedTimedRotatingFileHandler(path, maxBytes=200, when='midnight', backupCount=3)
+            try:
+                for _ in range(10):
+                    handler.emit(self.make_record(msg='x' * 60, args=()))
+            finally:
+                handler.close()
+            
+            self.assertGreater(len(os.listdir(directory)), 1)
+            self.assertLess(os.path.getsize(path), 200)
+    
+    def test_queue_handler_delivers_on_listener_thread(self):
+        """Test dictConfig wires the queue handler to its targets and formats lazily."""
+        collector = CollectingHandler()
+        self.addCleanup(logging.config.dictConfig, settings.LOGGING)
+        logging.config.dictConfig({
+            'version': 1,
+            'disable_existing_loggers': False,
+            'handlers': {
+                'queue': {
+                    '()': 'webinars.log_pipeline.QueueListenerHandler',
+                    'handlers': ['collect'],
+                },
+                'collect': {
+                    '()': lambda: collector,
+                },
+            },
+            'loggers': {
+                'webinars.pipeline_test': {
+                    'handlers': ['queue'],
+                    'level': 'INFO',
+                    'propagate': False,
+                },
+            },
+        })
+        queue_handler = logging.getLogger('webinars.pipeline_test').handlers[0]
+        
+        class Payload:
+            formatted_on = None
+            
+            def __str__(self):
+                Payload.formatted_on = threading.current_thread()
+                return 'payload'
+        
+        logging.getLogger('webinars.pipeline_test').info('Body: %s', Payload())
+        queue_handler.stop()
+        
+        self.assertEqual(collector.messages, ['Body: payload'])
+        self.assertIsNot(Payload.formatted_on, threading.main_thread())
@@ -0,0 +1,152 @@
+"""
+Unit tests for the Prometheus metrics endpoint.
+"""
+from django.db import connection, connections
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from datetime import timedelta
+from unittest.mock import patch, MagicMock
+
+from .models import Webinar, WebinarDate, Attendee
+from .activation_service import KajabiActivationService
+from .middleware import count_query, fingerprint, MetricsMiddleware, QueryStats
+
+
+@override_settings(METRICS_TOKEN='secret')
+class MetricsEndpointTests(TestCase):
+    """Test the /metrics/ scrape endpoint."""
+    
+    def setUp(self):
+        self.client = Client(headers={'Authorization': 'Bearer secret'})
+        self.webinar = Webinar.objects.create(
+            name="Test Webinar",
+            kajabi_grant_activation_hook_url="https://example.com/webhook"
+        )
+        self.webinar_date = WebinarDate.objects.create(
+            webinar=self.webinar,
+            date_time=timezone.now() - timedelta(days=1)
+        )
+        self.attendee = Attendee.objects.create(
+            webinar_date=self.webinar_date,
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            zoom_registration_error="Zoom said no"
+        )
+    
+    def test_queue_depth_gauges(self):
+        """Test the gauges report pending work from the database."""
+        response = self.client.get('/metrics/')
+        
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('webinars_pending_activations{kind="webinar"} 1.0', body)
+        self.assertIn('webinars_pending_salesforce_syncs{model="Attendee"} 1.0', body)
+        self.assertIn('webinars_failed_zoom_registrations 1.0', body)
+    
+    def test_request_metrics(self):
+        """Test requests are counted per view with their query counts."""
+        self.client.get('/api/attendee-webhook/')
+        
+        body = self.client.get('/metrics/').content.decode()
+        self.assertIn('webinars_http_requests_total{status="200",view="attendee_webhook"}', body)
+        self.assertIn('webinars_http_request_db_queries_count{view="attendee_webhook"}', body)
+    
+    def test_db_time_metrics(self):
+        """Test the time requests spend in the database is recorded per view."""
+        self.client.get('/api/attendee-webhook/')
+        
+        body = self.client.get('/metrics/').content.decode()
+        self.assertIn('webinars_http_request_db_seconds_count{view="attendee_webhook"}', body)
+    
+    @override_settings(QUERY_BUDGET={'queries': 0})
+    def test_over_query_budget_logged(self):
+        """Test a request over the query budget is counted and logged with its repeated queries."""
+        with self.assertLogs('webinars.middleware', level='WARNING') as logs:
+            self.client.get('/api/attendee-webhook/')
+        
+        self.assertIn('/api/attendee-webhook/ (attendee_webhook) over query budget', logs.output[0])
+        body = self.client.get('/metrics/').content.decode()
+        self.assertIn('webinars_http_requests_over_query_budget_total{view="attendee_webhook"}', body)
+    
+    def test_within_query_budget_not_logged(self):
+        """Test requests within the budget aren't logged."""
+        with self.assertNoLogs('webinars.middleware', level='WARNING'):
+            self.client.get('/api/attendee-webhook/')
+    
+    async def test_async_request_metrics(self):
+        """Test requests on the ASGI handler are counted by the async middleware path."""
+        await self.async_client.get('/api/download-webhook/')
+        
+        body = (await self.async_client.get('/metrics/', headers={'Authorization': 'Bearer secret'})).content.decode()
+        self.assertIn('webinars_http_requests_total{status="200",view="download_webhook"}', body)
+    
+    @override_settings(QUERY_BUDGET={'queries': 0})
+    async def test_async_request_queries_counted(self):
+        """Test queries an async view makes through sync_to_async count towards its query budget."""
+        with self.assertLogs('webinars.middleware', level='WARNING') as logs:
+            await self.async_client.post(
+                '/api/download-webhook/', {'email': 'jane@example.com'}, content_type='application/json'
+            )
+        
+        self.assertIn('/api/download-webhook/ (download_webhook) over query budget', logs.output[0])
+    
+    @patch('webinars.activation_service.requests.post')
+    def test_outbound_metrics(self, mock_post):
+        """Test outbound Kajabi calls are counted by outcome."""
+        mock_post.return_value = MagicMock(status_code=500, text="error")
+        
+        KajabiActivationService().activate_attendee(self.attendee)
+        
+        body = self.client.get('/metrics/').content.decode()
+        self.assertIn('webinars_outbound_requests_total{integration="kajabi",outcome="error"}', body)
+    
+    def test_token_required(self):
+        """Test a configured token must be sent as a bearer token."""
+        self.assertEqual(Client().get('/metrics/').status_code, 401)
+        self.assertEqual(Client().get('/metrics/', HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+        self.assertEqual(self.client.get('/metrics/').status_code, 200)
+    
+    @override_settings(METRICS_TOKEN='')
+    def test_closed_without_token(self):
+        """Test without a token nobody can scrape, and with DEBUG on only internal addresses can."""
+        self.assertEqual(self.client.get('/metrics/', REMOTE_ADDR='127.0.0.1').status_code, 403)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get('/metrics/', REMOTE_ADDR='10.0.0.5').status_code, 200)
+            self.assertEqual(self.client.get('/metrics/', REMOTE_ADDR='8.8.8.8').status_code, 403)
+
+
+class QueryStatsTests(TestCase):
+    """Test the per-request query stats used for the query budget."""
+    
+    def test_fingerprint_ignores_parameters(self):
+        """Test queries differing only in literals or IN list length share a fingerprint."""
+        self.assertEqual(
+            fingerprint("SELECT * FROM webinars_attendee WHERE id = 12 AND email = 'a@b.com'"),
+            fingerprint("SELECT *  FROM webinars_attendee\nWHERE id = 7 AND email = 'c@d.com'")
+        )
+        self.assertEqual(
+            fingerprint('SELECT * FROM "webinars_attendee" WHERE "id" IN (%s, %s, %s)'),
+            'SELECT * FROM "webinars_attendee" WHERE "id" IN (...)'
+        )
+    
+    def test_repeated_queries_counted(self):
+        """Test an N+1 loop shows up as one repeated fingerprint."""
+        queries = QueryStats()
+        with connection.execute_wrapper(queries):
+            for pk in range(3):
+                list(Webinar.objects.filter(pk=pk))
+            Attendee.objects.count()
+        
+        self.assertEqual(queries.count, 4)
+        self.assertEqual(len(queries.top_repeated()), 1)
+        self.assertEqual(queries.top_repeated()[0][1], 3)
+        self.assertTrue(queries.over_budget({'queries': 3, 'db_seconds': 10}))
+        self.assertFalse(queries.over_budget({'queries': 4, 'db_seconds': 10}))
+    
+    def test_every_alias_is_measured(self):
+        """Test the middleware counts queries on every database alias, not just the default."""
+        request = RequestFactory().get('/')
+        with MetricsMiddleware(lambda request: None).measure(request):
+            for alias in connections:
+                self.assertEqual(connections[alias].execute_wrappers.count(count_query), 1)
@@ -0,0 +1,164 @@
+"""
+Unit tests for the outbound call layer: circuit breakers and deadline budgets.
+"""
+from django.test import TestCase, override_settings
+from django.core.management import call_command
+from django.core.cache import cache
+from django.utils import timezone
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch, MagicMock
+import requests
+
+from settings.models import ZoomSettings
+from . import outbound
+from .models import Webinar, WebinarDate, Attendee
+from .zoom_service import ZoomService
+
+
+@override_settings(OUTBOUND_BREAKER={'failure_threshold': 2, 'reset_timeout': 60})
+class OutboundRequestTests(TestCase):
+    """Test timeouts, the circuit breaker and the deadline budget."""
+    
+    def setUp(self):
+        cache.clear()
+    
+    @patch('webinars.outbound.requests.request')
+    def test_timeout_is_applied(self, mock_request):
+        """Test the integration's timeout is passed to requests."""
+        mock_request.return_value = MagicMock(status_code=200)
+        
+        outbound.request('zoom', 'GET', 'https://api.zoom.us/v2/users/me')
+        
+        self.assertEqual(mock_request.call_args.kwargs['timeout'], outbound.DEFAULT_TIMEOUTS['zoom'])
+    
+    @patch('webinars.outbound.requests.request')
+    def test_breaker_opens_and_skips_calls(self, mock_request):
+        """Test repeated failures open the breaker so later calls are not made."""
+        mock_request.side_effect = requests.ConnectionError("down")
+        
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                outbound.request('zoom', 'GET', 'https://api.zoom.us/v2/users/me')
+        
+        with self.assertRaises(outbound.CircuitOpenError):
+            outbound.request('zoom', 'GET', 'https://api.zoom.us/v2/users/me')
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertFalse(outbound.is_available('zoom'))
+        # Other integrations are unaffected
+        self.assertTrue(outbound.is_available('graph'))
+    
+    @patch('webinars.outbound.requests.request')
+    def test_success_resets_failures(self, mock_request):
+        """Test a successful call clears the failure count."""
+        mock_request.side_effect = [
+            requests.Timeout("slow"), MagicMock(status_code=200), requests.Timeout("slow")
+        ]
+        
+        with self.assertRaises(requests.Timeout):
+            outbound.request('graph', 'POST', 'https://graph.microsoft.com/v1.0/x')
+        outbound.request('graph', 'POST', 'https://graph.microsoft.com/v1.0/x')
+        with self.assertRaises(requests.Timeout):
+            outbound.request('graph', 'POST', 'https://graph.microsoft.com/v1.0/x')
+        
+        self.assertTrue(outbound.is_available('graph'))
+    
+    @patch('webinars.outbound.requests.request')
+    def test_deadline_budget(self, mock_request):
+        """Test the deadline trims the timeout and stops calls once spent."""
+        mock_request.return_value = MagicMock(status_code=200)
+        
+        with outbound.deadline(2):
+            outbound.request('zoom', 'GET', 'https://api.zoom.us/v2/users/me')
+            connect, read = mock_request.call_args.kwargs['timeout']
+            self.assertLessEqual(read, 2)
+        
+        with outbound.deadline(0):
+            with self.assertRaises(outbound.DeadlineExceededError):
+                outbound.request('zoom', 'GET', 'https://api.zoom.us/v2/users/me')
+
+
+class ZoomUnavailableTests(TestCase):
+    """Test webhook registrations are queued while Zoom is unavailable."""
+    
+    def setUp(self):
+        cache.clear()
+        zoom_settings = ZoomSettings.get_settings()
+        zoom_settings.client_id = 'id'
+        zoom_settings.client_secret = 'secret'
+        zoom_settings.account_id = 'account'
+        zoom_settings.save()
+        
+        self.webinar = Webinar.objects.create(
+            name="Test Webinar",
+            kajabi_grant_activation_hook_url="https://example.com/webhook"
+        )
+        self.webinar_date = WebinarDate.objects.create(
+            webinar=self.webinar,
+            date_time=timezone.now() + timedelta(days=7),
+            zoom_meeting_id="123456"
+        )
+    
+    def open_zoom_breaker(self):
+        cache.set('outbound:breaker:zoom:opened_until', timezone.now().timestamp() + 60)
+    
+    @patch('webinars.outbound.requests.request')
+    def test_register_attendee_is_retryable(self, mock_request):
+        """Test an open breaker returns a retryable failure without calling Zoom."""
+        self.open_zoom_breaker()
+        
+        result = ZoomService().register_attendee("123456", "John", "Doe", "john@example.com")
+        
+        self.assertFalse(result['success'])
+        self.assertTrue(result['retryable'])
+        mock_request.assert_not_called()
+    
+    @patch('webinars.outbound.requests.request')
+    def test_webhook_queues_zoom_registration(self, mock_request):
+        """Test the webhook records the attendee and leaves Zoom registration for retry."""
+        self.open_zoom_breaker()
+        
+        response = self.client.post(
+            '/api/attendee-webhook/',
+            data={
+                'webinar_date_id': self.webinar_date.id,
+                'first_name': 'John',
+                'last_name': 'Doe',
+                'email': 'john@example.com'
+            },
+            content_type='application/json'
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('queued for retry', response.json()['message'])
+        attendee = Attendee.objects.get(email='john@example.com')
+        self.assertEqual(attendee.zoom_registrant_id, '')
+        self.assertEqual(attendee.zoom_registration_error, '')
+        mock_request.assert_not_called()
+    
+    @patch('webinars.outbound.requests.request')
+    def test_register_zoom_pending_retries_after_outage(self, mock_request):
+        """Test attendees skipped while the breaker is open are registered on a later run."""
+        Attendee.objects.create(
+            webinar_date=self.webinar_date, first_name="John", last_name="Doe", email="john@example.com"
+        )
+        self.open_zoom_breaker()
+        
+        out = StringIO()
+        call_command('register_zoom_pending', stdout=out)
+        
+        self.assertIn('0 successful, 0 failed, 1 left for retry', out.getvalue())
+        self.assertEqual(Attendee.objects.get().zoom_registration_error, '')
+        mock_request.assert_not_called()
+        
+        cache.clear()
+        out = StringIO()
+        with patch.object(ZoomService, '_make_api_request', return_value={'registrants': [
+            {'email': 'john@example.com', 'registrant_id': 'abc', 'join_url': 'https://zoom.us/w/1'}
+        ]}):
+            call_command('register_zoom_pending', stdout=out)
+        
+        self.assertIn('1 successful, 0 failed', out.getvalue())
+        attendee = Attendee.objects.get()
+        self.assertEqual(attendee.zoom_registrant_id, 'abc')
+        self.assertEqual(attendee.zoom_registration_error, '')
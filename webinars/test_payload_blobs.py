@@ -0,0 +1,153 @@
+"""
+Unit tests for the content-addressed payload store behind Download.payload and WebhookLog.body.
+"""
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, AsyncRequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from . import async_views
+from .models import Download, PayloadBlob, WebhookLog
+from .scheduler import retention
+
+BODY = json.dumps({
+    'event': 'form_submission.created',
+    'payload': {'First Name': 'Jane', 'Email': 'jane@example.com', 'form_title': 'WordPress security checklist'},
+})
+
+
+class PayloadBlobTests(TestCase):
+    """Test payloads are stored once and read back transparently."""
+    
+    def test_store_dedupes(self):
+        """Test storing the same text twice keeps one row keyed by its hash."""
+        first = PayloadBlob.store(BODY)
+        second = PayloadBlob.store(BODY)
+        
+        self.assertEqual(first.digest, second.digest)
+        self.assertEqual(len(first.digest), 64)
+        self.assertEqual(PayloadBlob.objects.get().data, BODY)
+        self.assertIsNone(PayloadBlob.store(''))
+    
+    def test_store_reuses_blob_without_query(self):
+        """Test a blob already stored for the same text is returned without touching the database."""
+        blob = PayloadBlob.store(BODY)
+        
+        with self.assertNumQueries(0):
+            self.assertIs(PayloadBlob.store(BODY, blob), blob)
+    
+    def test_store_refreshes_created_at(self):
+        """Test storing a payload again keeps an old unreferenced blob out of retention's reach."""
+        old = timezone.now() - timedelta(days=30)
+        PayloadBlob.store(BODY)
+        PayloadBlob.objects.update(created_at=old)
+        
+        PayloadBlob.store(BODY)
+        
+        self.assertGreater(PayloadBlob.objects.get().created_at, old)
+        retention()
+        self.assertTrue(PayloadBlob.objects.exists())
+    
+    def test_webhook_log_list_queries(self):
+        """Test the webhook log list reads the body previews without a query per log."""
+        self.client.force_login(User.objects.create_user('staff', 'staff@example.com', 'secret'))
+        
+        def list_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/webhook-logs/')
+            self.assertContains(response, 'jane@example.com')
+            return len(queries)
+        
+        WebhookLog.objects.create(method='POST', path='/webhook/', headers={}, body=BODY, response_status=200)
+        before = list_queries()
+        for n in range(5):
+            WebhookLog.objects.create(method='POST', path='/webhook/', headers={}, body=f'{{"n": {n}}}', response_status=200)
+        
+        self.assertEqual(list_queries(), before)
+    
+    def test_models_read_through_blob(self):
+        """Test Download.payload and WebhookLog.body are set and read as before."""
+        download = Download.objects.create(first_name='Jane', email='jane@example.com', form_title='Guide', payload={'a': 1})
+        WebhookLog.objects.create(method='POST', path='/webhook/', headers={}, body='{"a":1}', response_status=200)
+        
+        download = Download.objects.get()
+        log = WebhookLog.objects.get()
+        self.assertEqual(download.payload, {'a': 1})
+        self.assertEqual(log.body, '{"a":1}')
+        self.assertEqual(download.payload_blob_id, log.body_blob_id)
+        self.assertEqual(PayloadBlob.objects.count(), 1)
+        
+        download.payload = {'a': 2}
+        download.save()
+        self.assertEqual(Download.objects.get().payload, {'a': 2})
+    
+    def test_download_webhook_shares_body(self):
+        """Test a JSON download webhook stores its body once for the download and the log."""
+        for _ in range(2):
+            response = self.client.post('/api/download-webhook/', data=BODY, content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+        
+        blob = PayloadBlob.objects.get()
+        self.assertEqual(blob.data, BODY)
+        self.assertEqual(set(Download.objects.values_list('payload_blob', flat=True)), {blob.digest})
+        self.assertEqual(set(WebhookLog.objects.values_list('body_blob', flat=True)), {blob.digest})
+        self.assertEqual(Download.objects.first().payload, json.loads(BODY))
+    
+    def test_form_download_webhook(self):
+        """Test a form-encoded submission keeps its raw body in the log and its fields as the payload."""
+        response = self.client.post('/api/download-webhook/', data={
+            'first_name': 'Jane', 'email': 'jane@example.com', 'form_title': 'Guide'
+        })
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Download.objects.get().payload['form_title'], 'Guide')
+        self.assertIn('name="form_title"', WebhookLog.objects.get().body)
+        self.assertEqual(PayloadBlob.objects.count(), 2)
+    
+    async def test_async_download_webhook_shares_body(self):
+        """Test the async download webhook shares the stored body too."""
+        request = AsyncRequestFactory().post('/api/download-webhook/', data=BODY, content_type='application/json')
+        
+        response = await async_views.download_webhook(request)
+        
+        self.assertEqual(response.status_code, 200)
+        download = await Download.objects.aget()
+        log = await WebhookLog.objects.aget()
+        self.assertEqual(download.payload_blob_id, log.body_blob_id)
+        self.assertEqual(await PayloadBlob.objects.acount(), 1)
+
+
+class BackfillCommandTests(TestCase):
+    """Test backfill_payload_blobs moves rows written before payload blobs."""
+    
+    def test_backfill(self):
+        """Test legacy payloads and bodies move into shared blobs and read the same."""
+        download = Download.objects.create(first_name='Jane', email='jane@example.com', form_title='Guide', payload={})
+        Download.objects.filter(pk=download.pk).update(payload_blob=None, legacy_payload={'a': 1})
+        for _ in range(2):
+            log = WebhookLog.objects.create(method='POST', path='/webhook/', headers={}, response_status=200)
+            WebhookLog.objects.filter(pk=log.pk).update(legacy_body=BODY)
+        PayloadBlob.objects.all().delete()
+        
+        out = StringIO()
+        call_command('backfill_payload_blobs', dry_run=True, stdout=out)
+        self.assertIn('WebhookLog bodies: 2 rows to move', out.getvalue())
+        self.assertEqual(PayloadBlob.objects.count(), 0)
+        
+        out = StringIO()
+        call_command('backfill_payload_blobs', batch_size=1, stdout=out)
+        
+        self.assertIn('Download payloads: moved 1 rows into 1 distinct payloads', out.getvalue())
+        self.assertIn('WebhookLog bodies: moved 2 rows into 1 distinct payloads', out.getvalue())
+        self.assertEqual(PayloadBlob.objects.count(), 2)
+        download = Download.objects.get()
+        self.assertEqual(download.payload, {'a': 1})
+        self.assertIsNone(download.legacy_payload)
+        self.assertEqual([log.body for log in WebhookLog.objects.all()], [BODY, BODY])
+        self.assertFalse(WebhookLog.objects.exclude(legacy_body='').exists())
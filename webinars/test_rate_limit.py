@@ -0,0 +1,133 @@
+"""
+Unit tests for rate limiting and load shedding on the public webhook endpoints.
+"""
+import json
+
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory, override_settings
+from unittest.mock import patch
+
+from .models import Download, WebhookLog
+from .rate_limit import TokenBucket, client_ip
+
+
+class TokenBucketTests(TestCase):
+    """Test the cache-backed token bucket."""
+    
+    def setUp(self):
+        cache.clear()
+    
+    def test_burst_then_refused(self):
+        """Test a full bucket allows burst requests and then refuses with a retry delay."""
+        bucket = TokenBucket('test', burst=3, rate=1)
+        
+        self.assertEqual([bucket.take(now=100.0) for _ in range(3)], [0, 0, 0])
+        self.assertEqual(bucket.take(now=100.0), 1)
+    
+    def test_refills_over_time(self):
+        """Test tokens come back as the previous window's requests age out."""
+        bucket = TokenBucket('test', burst=4, rate=1)
+        for _ in range(4):
+            bucket.take(now=100.0)
+        
+        # Halfway through the next window half of the previous requests still count
+        self.assertEqual([bucket.take(now=106.0) for _ in range(3)], [0, 0, 1])
+        self.assertEqual(bucket.take(now=120.0), 0)
+    
+    def test_buckets_are_separate(self):
+        """Test one key's requests don't spend another key's tokens."""
+        TokenBucket('a', burst=1, rate=1).take(now=100.0)
+        
+        self.assertEqual(TokenBucket('b', burst=1, rate=1).take(now=100.0), 0)
+        self.assertGreater(TokenBucket('a', burst=1, rate=1).take(now=100.0), 0)
+    
+    def test_client_ip_from_proxy_header(self):
+        """Test the client IP is the last X-Forwarded-For entry when behind a proxy."""
+        request = RequestFactory().post('/', REMOTE_ADDR='127.0.0.1', HTTP_X_FORWARDED_FOR='10.0.0.9, 203.0.113.5')
+        
+        with patch('webinars.rate_limit.CLIENT_IP_HEADER', None):
+            self.assertEqual(client_ip(request), '127.0.0.1')
+        with patch('webinars.rate_limit.CLIENT_IP_HEADER', 'HTTP_X_FORWARDED_FOR'):
+            self.assertEqual(client_ip(request), '203.0.113.5')
+
+
+@override_settings(
+    RATE_LIMITS={'ip': {'burst': 2, 'rate': 0.1}, 'endpoint': {'burst': 3, 'rate': 0.1}},
+    METRICS_TOKEN='secret'
+)
+class RateLimitMiddlewareTests(TestCase):
+    """Test the middleware refuses floods cheaply and leaves other views alone."""
+    
+    def setUp(self):
+        cache.clear()
+    
+    def post_download(self, ip='203.0.113.5'):
+        return self.client.post('/api/download-webhook/', data=json.dumps({
+            'first_name': 'John', 'email': 'john@example.com', 'form_title': 'Guide'
+        }), content_type='application/json', REMOTE_ADDR=ip)
+    
+    def test_client_over_limit_gets_429(self):
+        """Test a client over its bucket gets a 429 without the webhook running or being logged."""
+        responses = [self.post_download() for _ in range(3)]
+        
+        self.assertEqual([response.status_code for response in responses], [200, 200, 429])
+        self.assertTrue(int(responses[2]['Retry-After']) >= 1)
+        self.assertEqual(Download.objects.count(), 2)
+        self.assertEqual(WebhookLog.objects.count(), 2)
+        
+        body = self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer secret').content.decode()
+        self.assertIn('webinars_rate_limited_requests_total{reason="ip",view="download_webhook"}', body)
+    
+    def test_endpoint_limit_across_clients(self):
+        """Test the endpoint bucket limits all clients together."""
+        statuses = [self.post_download(ip=f'203.0.113.{i}').status_code for i in range(4)]
+        
+        self.assertEqual(statuses, [200, 200, 200, 429])
+    
+    def test_clients_limited_separately(self):
+        """Test one client's flood doesn't use up another client's bucket."""
+        self.post_download()
+        self.post_download()
+        
+        self.assertEqual(self.post_download(ip='198.51.100.7').status_code, 200)
+    
+    def test_other_views_not_limited(self):
+        """Test views outside RATE_LIMITED_VIEWS aren't counted."""
+        for _ in range(5):
+            self.assertNotEqual(self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer secret').status_code, 429)
+    
+    @patch('webinars.rate_limit.MAX_IN_FLIGHT', 0)
+    def test_load_shed_when_busy(self):
+        """Test webhooks are shed with a 503 when the worker has too many in flight."""
+        response = self.post_download()
+        
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(WebhookLog.objects.count(), 0)
+        body = self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer secret').content.decode()
+        self.assertIn('webinars_rate_limited_requests_total{reason="shed",view="download_webhook"}', body)
+    
+    @patch('webinars.rate_limit.MAX_IN_FLIGHT', 1)
+    @patch('webinars.rate_limit.check', side_effect=ConnectionError("cache down"))
+    def test_cache_failure_lets_requests_through(self, mock_check):
+        """Test a failing rate limit check lets requests through without leaking in-flight slots."""
+        with self.assertLogs('webinars.middleware', level='ERROR'):
+            statuses = [self.post_download().status_code for _ in range(3)]
+        
+        self.assertEqual(statuses, [200, 200, 200])
+    
+    @patch('webinars.rate_limit.MAX_IN_FLIGHT', 0)
+    async def test_async_workers_not_capped_by_thread_limit(self):
+        """Test the sync in-flight cap doesn't shed requests on the async path."""
+        response = await self.async_client.get('/api/attendee-webhook/', REMOTE_ADDR='203.0.113.5')
+        
+        self.assertEqual(response.status_code, 200)
+    
+    async def test_async_client_over_limit(self):
+        """Test the async middleware path refuses over-limit requests too."""
+        statuses = []
+        for _ in range(3):
+            response = await self.async_client.get('/api/attendee-webhook/', REMOTE_ADDR='203.0.113.5')
+            statuses.append(response.status_code)
+        
+        self.assertEqual(statuses, [200, 200, 429])
@@ -0,0 +1,136 @@
+"""
+Unit tests for the scheduler: leader election, due jobs and run history.
+"""
+from django.test import TestCase
+from django.core.management import call_command
+from django.utils import timezone
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import MagicMock
+
+from .scheduler import Job, Scheduler, acquire_lease, release_lease, retention
+from .models import SchedulerLease, JobRun, WebhookLog, OutboundEmail, PayloadBlob
+
+
+class SchedulerLeaseTests(TestCase):
+    """Test leader election with the lease row."""
+    
+    def test_only_one_holder(self):
+        """Test a second node can't take a lease that hasn't expired."""
+        self.assertTrue(acquire_lease('node-a:1'))
+        self.assertFalse(acquire_lease('node-b:2'))
+        # The holder can renew
+        self.assertTrue(acquire_lease('node-a:1'))
+        self.assertEqual(SchedulerLease.objects.get().holder, 'node-a:1')
+    
+    def test_expired_lease_is_taken_over(self):
+        """Test another node takes over once the lease expires."""
+        acquire_lease('node-a:1')
+        SchedulerLease.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        
+        self.assertTrue(acquire_lease('node-b:2'))
+        self.assertFalse(acquire_lease('node-a:1'))
+    
+    def test_release(self):
+        """Test a released lease is free straight away."""
+        acquire_lease('node-a:1')
+        release_lease('node-a:1')
+        
+        self.assertTrue(acquire_lease('node-b:2'))
+
+
+class SchedulerTests(TestCase):
+    """Test due jobs are run and recorded."""
+    
+    def setUp(self):
+        self.func = MagicMock(return_value='done')
+        self.job = Job('test_job', self.func, interval=60)
+    
+    def test_runs_due_jobs_and_records_history(self):
+        """Test a job that has never run runs and is recorded."""
+        scheduler = Scheduler(jobs=[self.job], holder='node-a:1')
+        
+        runs = scheduler.run_pending()
+        
+        self.assertEqual(len(runs), 1)
+        run = JobRun.objects.get()
+        self.assertTrue(run.success)
+        self.assertEqual(run.output, 'done')
+        self.assertEqual(run.holder, 'node-a:1')
+        self.assertIsNotNone(run.duration_ms)
+        
+        # Not due again until the interval has passed
+        self.assertEqual(scheduler.run_pending(), [])
+        self.assertEqual(self.func.call_count, 1)
+    
+    def test_schedule_resumes_from_history(self):
+        """Test a new leader doesn't re-run a job that ran within its interval."""
+        JobRun.objects.create(job='test_job', started_at=timezone.now() - timedelta(seconds=30), success=True)
+        
+        self.assertEqual(Scheduler(jobs=[self.job], holder='node-b:2').run_pending(), [])
+        
+        JobRun.objects.update(started_at=timezone.now() - timedelta(seconds=90))
+        self.assertEqual(len(Scheduler(jobs=[self.job], holder='node-b:2').run_pending()), 1)
+    
+    def test_idle_runs_not_recorded(self):
+        """Test a job registered with record_idle=False only records runs that did something."""
+        self.func.return_value = ''
+        job = Job('test_job', self.func, interval=0, record_idle=False)
+        scheduler = Scheduler(jobs=[job], holder='node-a:1')
+        
+        self.assertEqual(scheduler.run_pending(), [])
+        self.assertFalse(JobRun.objects.exists())
+        
+        self.func.return_value = 'Job 1: done'
+        runs = scheduler.run_pending()
+        
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(JobRun.objects.get().output, 'Job 1: done')
+        self.assertEqual(self.func.call_count, 2)
+    
+    def test_follower_runs_nothing(self):
+        """Test a node without the lease doesn't run jobs."""
+        acquire_lease('node-a:1')
+        scheduler = Scheduler(jobs=[self.job], holder='node-b:2')
+        
+        self.assertEqual(scheduler.run_pending(), [])
+        self.assertFalse(scheduler.is_leader)
+        self.func.assert_not_called()
+    
+    def test_failed_job_is_recorded(self):
+        """Test an exception is stored on the run and doesn't stop the scheduler."""
+        self.func.side_effect = RuntimeError('boom')
+        other = MagicMock(return_value='')
+        scheduler = Scheduler(jobs=[self.job, Job('other', other, interval=60)], holder='node-a:1')
+        
+        runs = scheduler.run_pending()
+        
+        self.assertFalse(runs[0].success)
+        self.assertIn('RuntimeError: boom', runs[0].error)
+        self.assertTrue(runs[1].success)
+    
+    def test_retention(self):
+        """Test the retention job deletes old logs, sent emails, job runs and unreferenced payload blobs."""
+        old = timezone.now() - timedelta(days=365)
+        log = WebhookLog.objects.create(method='POST', path='/webhook/', headers={}, body='{"old":1}', response_status=200)
+        WebhookLog.objects.filter(id=log.id).update(created_at=old)
+        WebhookLog.objects.create(method='POST', path='/webhook/', headers={}, body='{"new":1}', response_status=200)
+        PayloadBlob.objects.update(created_at=old)
+        OutboundEmail.objects.create(to_email='a@example.com', subject='Old', message='',
+                                     status=OutboundEmail.STATUS_SENT, sent_at=old)
+        OutboundEmail.objects.create(to_email='a@example.com', subject='Pending', message='')
+        JobRun.objects.create(job='test_job', started_at=old)
+        
+        self.assertEqual(retention(), "Deleted 1 webhook logs, 1 sent emails, 1 job runs, 0 background jobs, 1 payload blobs")
+        self.assertEqual(WebhookLog.objects.count(), 1)
+        self.assertEqual(PayloadBlob.objects.get().data, '{"new":1}')
+        self.assertEqual(OutboundEmail.objects.get().subject, 'Pending')
+    
+    def test_command_once(self):
+        """Test run_scheduler --once runs the selected job."""
+        out = StringIO()
+        
+        call_command('run_scheduler', '--once', '--job', 'retention', stdout=out)
+        
+        self.assertIn('1 succeeded, 0 failed', out.getvalue())
+        self.assertEqual(JobRun.objects.get().job, 'retention')
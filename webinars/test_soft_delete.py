@@ -0,0 +1,109 @@
+"""
+Unit tests for the soft-delete managers and the indexes behind the deleted_at filters.
+"""
+from datetime import timedelta
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from .activation_service import KajabiActivationService
+from .metrics import QueueDepthCollector
+from .models import Attendee, BundleAttendee, BundleDate, Download, Webinar, WebinarDate
+
+
+def index_name(model, fields):
+    """Name of the Meta.indexes entry on fields."""
+    return next(index.name for index in model._meta.indexes if index.fields == fields)
+
+
+class SoftDeleteManagerTests(TestCase):
+    """Test alive, all_objects and the queryset helpers."""
+    
+    def setUp(self):
+        self.webinar = Webinar.objects.create(
+            name="Test Webinar",
+            kajabi_grant_activation_hook_url="https://example.com/webhook"
+        )
+        self.live = WebinarDate.objects.create(webinar=self.webinar, date_time=timezone.now())
+        self.gone = WebinarDate.objects.create(webinar=self.webinar, date_time=timezone.now(), deleted_at=timezone.now())
+    
+    def test_managers(self):
+        """Test alive leaves out soft-deleted rows, all_objects and objects keep them."""
+        self.assertEqual(list(WebinarDate.alive.all()), [self.live])
+        self.assertEqual(WebinarDate.all_objects.count(), 2)
+        self.assertEqual(WebinarDate.objects.count(), 2)
+        self.assertEqual(list(WebinarDate.objects.deleted()), [self.gone])
+        with self.assertRaises(WebinarDate.DoesNotExist):
+            WebinarDate.alive.get(pk=self.gone.pk)
+    
+    def test_related_managers(self):
+        """Test related managers have alive() and still see every row by default."""
+        self.assertEqual(list(self.webinar.webinardate_set.alive()), [self.live])
+        self.assertEqual(list(self.webinar.active_dates()), [self.live])
+        self.assertEqual(self.webinar.webinardate_set.count(), 2)
+        self.assertEqual(self.gone.webinar, self.webinar)
+    
+    def test_work_queues_skip_soft_deleted(self):
+        """Test the pending-work lookups in the services and commands leave out soft-deleted rows."""
+        past = WebinarDate.objects.create(webinar=self.webinar, date_time=timezone.now() - timedelta(hours=3))
+        for email, deleted_at in (('live@example.com', None), ('gone@example.com', timezone.now())):
+            Attendee.objects.create(
+                webinar_date=past, first_name="Jane", last_name="Doe", email=email,
+                salesforce_sync_pending=True, deleted_at=deleted_at
+            )
+        
+        with patch.object(KajabiActivationService, 'activate_attendee', return_value=(True, 'ok')) as mock_activate:
+            KajabiActivationService().activate_pending_attendees()
+        
+        self.assertEqual([call.args[0].email for call in mock_activate.call_args_list], ['live@example.com'])
+        gauges = {
+            metric.name: {sample.labels.get('kind') or sample.labels.get('model'): sample.value for sample in metric.samples}
+            for metric in QueueDepthCollector().collect()
+        }
+        self.assertEqual(gauges['webinars_pending_activations']['webinar'], 1)
+        self.assertEqual(gauges['webinars_pending_salesforce_syncs']['Attendee'], 1)
+    
+    def test_soft_deleted_page_is_404(self):
+        """Test views looking up through alive return 404 for soft-deleted rows."""
+        self.client.force_login(User.objects.create_user(username='staff', password='secret'))
+        
+        self.assertEqual(self.client.get(f'/webinar-dates/{self.live.pk}/').status_code, 200)
+        self.assertEqual(self.client.get(f'/webinar-dates/{self.gone.pk}/').status_code, 404)
+
+
+@skipUnless(connection.vendor == 'sqlite', "Plans are checked against SQLite's planner")
+class SoftDeleteIndexTests(TestCase):
+    """Test the hot deleted_at filters are index searches rather than table scans."""
+    
+    def assertUsesIndex(self, queryset, model, fields):
+        plan = queryset.explain()
+        self.assertIn(f'USING INDEX {index_name(model, fields)}', plan)
+    
+    def test_query_plans(self):
+        """Test each hot query searches its composite index."""
+        webinar = Webinar(pk=1)
+        webinar_date = WebinarDate(pk=1)
+        bundle_date = BundleDate(pk=1)
+        now = timezone.now()
+        
+        self.assertUsesIndex(
+            webinar.active_dates().order_by('date_time'), WebinarDate, ['webinar', 'deleted_at', 'date_time']
+        )
+        self.assertUsesIndex(
+            WebinarDate.alive.filter(on_demand=False, date_time__gte=now, date_time__lte=now),
+            WebinarDate, ['deleted_at', 'date_time']
+        )
+        self.assertUsesIndex(BundleDate.alive.filter(date__gte=now.date()), BundleDate, ['deleted_at', 'date'])
+        self.assertUsesIndex(webinar_date.active_attendees(), Attendee, ['webinar_date', 'deleted_at'])
+        self.assertUsesIndex(bundle_date.active_attendees(), BundleAttendee, ['bundle_date', 'deleted_at'])
+        self.assertUsesIndex(
+            Attendee.alive.filter(activation_sent_at=None), Attendee, ['deleted_at', 'activation_sent_at']
+        )
+        self.assertUsesIndex(
+            Attendee.alive.filter(salesforce_sync_pending=True), Attendee, ['deleted_at', 'salesforce_sync_pending']
+        )
+        self.assertUsesIndex(Download.alive.all(), Download, ['deleted_at', '-created_at'])
@@ -0,0 +1,78 @@
+"""
+Unit tests for webhook stage timings and the timing report.
+"""
+from django.test import TestCase
+from django.core.management import call_command
+from django.utils import timezone
+from datetime import timedelta
+from io import StringIO
+
+from . import timing
+from .models import Webinar, WebinarDate, WebhookLog
+
+
+class TimingTests(TestCase):
+    """Test span collection."""
+    
+    def test_spans_are_summed_per_stage(self):
+        """Test repeated stages accumulate and spans outside a trace are ignored."""
+        with timing.span('ignored'):
+            pass
+        
+        with timing.trace() as timings:
+            with timing.span('db_upsert'):
+                pass
+            with timing.span('db_upsert'):
+                pass
+            with timing.span('zoom'):
+                pass
+        
+        self.assertEqual(set(timings), {'db_upsert', 'zoom'})
+        self.assertIsNone(timing.current_timings())
+    
+    def test_webhook_log_records_stages(self):
+        """Test a Kajabi webhook stores per-stage timings on its log."""
+        webinar = Webinar.objects.create(
+            name="Test Webinar",
+            kajabi_grant_activation_hook_url="https://example.com/webhook"
+        )
+        date_time = timezone.now().replace(second=0, microsecond=0) + timedelta(days=7)
+        WebinarDate.objects.create(webinar=webinar, date_time=date_time)
+        
+        response = self.client.post(
+            '/api/attendee-webhook/',
+            data={
+                'event': 'form_submission.created',
+                'payload': {
+                    'form_title': 'Test Webinar',
+                    'First Name': 'John',
+                    'Email': 'john@example.com',
+                    'Webinar options': f"{date_time.day} {date_time:%B}, {date_time:%H:%M} GMT"
+                }
+            },
+            content_type='application/json'
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        log = WebhookLog.objects.get()
+        self.assertTrue({'alias_lookup', 'date_parse', 'date_lookup', 'db_upsert'} <= set(log.timings))
+
+
+class TimingReportTests(TestCase):
+    """Test the webhook_timing_report command."""
+    
+    def test_report_percentiles(self):
+        """Test stage percentiles are reported."""
+        for i in range(1, 11):
+            WebhookLog.objects.create(
+                method='POST', path='/api/attendee-webhook/', headers={}, response_status=200,
+                success=True, processing_time_ms=i * 10, timings={'zoom': float(i), 'db_upsert': 1.0}
+            )
+        
+        out = StringIO()
+        call_command('webhook_timing_report', stdout=out)
+        output = out.getvalue()
+        
+        self.assertIn('10 requests', output)
+        zoom_line = next(line for line in output.splitlines() if line.startswith('zoom'))
+        self.assertEqual(zoom_line.split()[1:], ['10', '5.0', '9.0', '10.0', '10.0', '10.0'])
@@ -0,0 +1,85 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+
+# A context variable rather than a thread local, so a trace started in an async
+# view also collects the spans of the sync code it runs in worker threads
+_timings = ContextVar('timings', default=None)
+
+
+@contextmanager
+def trace():
+    """
+    Collect per-stage durations for everything inside the block.
+    Yields the dict of stage name -> milliseconds that spans add to.
+    """
+    timings = {}
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+def traced(view_func):
+    """View decorator that collects stage timings for the request."""
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(*args, **kwargs):
+            with trace():
+                return await view_func(*args, **kwargs)
+        return async_wrapper
+    
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        with trace():
+            return view_func(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def span(name):
+    """
+    Time the block as stage name in the current trace.
+    Repeated stages are summed; outside a trace this does nothing.
+    """
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        timings[name] = round(timings.get(name, 0) + elapsed, 1)
+
+
+def timed(name):
+    """Decorator that records every call of the function as stage name."""
+    def decorator(func):
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_timings():
+    """Return a copy of the current trace's stage timings, or None outside a trace."""
+    timings = _timings.get()
+    if timings is None:
+        return None
+    return dict(timings)
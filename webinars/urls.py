@@ -1,7 +1,12 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
 from . import api
+from . import async_views
+
+# Serve the webhooks with the async views when running on the ASGI entry point
+webhook_views = async_views if getattr(settings, 'ASYNC_WEBHOOKS', False) else views
 
 # REST API Router
 router = DefaultRouter()
@@ -29,6 +34,7 @@ urlpatterns = [
     
     # Attendee URLs
     path('webinar-dates/<int:webinar_date_id>/attendees/add/', views.AttendeeCreateView.as_view(), name='attendee_create'),
+    path('webinar-dates/<int:webinar_date_id>/attendees/import/', views.attendee_import_view, name='attendee_import'),
     
     # Bundle URLs
     path('bundles/', views.BundleListView.as_view(), name='bundle_list'),
@@ -45,11 +51,12 @@ urlpatterns = [
     
     # Bundle Attendee URLs
     path('bundle-dates/<int:bundle_date_id>/attendees/add/', views.BundleAttendeeCreateView.as_view(), name='bundle_attendee_create'),
+    path('bundle-dates/<int:bundle_date_id>/attendees/import/', views.bundle_attendee_import_view, name='bundle_attendee_import'),
     
     # API Webhooks
-    path('api/attendee-webhook/', views.attendee_webhook, name='attendee_webhook'),
-    path('api/download-webhook/', views.download_webhook, name='download_webhook'),
-    path('api/clinic-booking-webhook/', views.clinic_booking_webhook, name='clinic_booking_webhook'),
+    path('api/attendee-webhook/', webhook_views.attendee_webhook, name='attendee_webhook'),
+    path('api/download-webhook/', webhook_views.download_webhook, name='download_webhook'),
+    path('api/clinic-booking-webhook/', webhook_views.clinic_booking_webhook, name='clinic_booking_webhook'),
     
     # Activation URLs
     path('activate/attendee/<int:attendee_id>/', views.activate_attendee_view, name='activate_attendee'),
@@ -57,8 +64,16 @@ urlpatterns = [
     path('activate/bundle-date/<int:bundle_date_id>/', views.activate_bundle_date_view, name='activate_bundle_date'),
     path('api/cron/activate-pending/', views.cron_activate_pending, name='cron_activate_pending'),
     
+    # Background Job URLs
+    path('jobs/<int:job_id>/', views.background_job_status, name='background_job_status'),
+    path('jobs/<int:job_id>/results/', views.background_job_results, name='background_job_results'),
+    
+    # Metrics
+    path('metrics/', views.metrics_view, name='metrics'),
+    
     # Calendar Invite URLs
     path('send-calendar-invite/<int:webinar_date_id>/', views.send_calendar_invite_view, name='send_calendar_invite'),
+    path('send-calendar-invites/', views.send_pending_calendar_invites_view, name='send_pending_calendar_invites'),
     
     # Webhook Log URLs
     path('webhook-logs/', views.webhook_log_list, name='webhook_log_list'),
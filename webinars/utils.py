@@ -1,12 +1,16 @@
 import re
+import asyncio
 import logging
 from datetime import datetime, timedelta
+from asgiref.sync import sync_to_async
 from dateutil.parser import parse
 from django.utils import timezone
-import json
+from . import codec
+from .timing import timed, span
 
 logger = logging.getLogger(__name__)
 
+@timed('date_parse')
 def parse_webinar_date(date_str):
     """
     Parse a date string from Kajabi webinar form or checkout.
@@ -49,6 +53,7 @@ def parse_webinar_date(date_str):
         return None
 
 
+@timed('alias_lookup')
 def find_webinar_by_form_title(form_title):
     """
     Find a webinar that matches a form title.
@@ -56,7 +61,7 @@ def find_webinar_by_form_title(form_title):
     """
     from .models import Webinar
     
-    webinars = Webinar.objects.filter(deleted_at=None)
+    webinars = Webinar.alive.all()
     
     # First try exact match against all names (main name + aliases)
     for webinar in webinars:
@@ -73,6 +78,7 @@ def find_webinar_by_form_title(form_title):
     return None
 
 
+@timed('alias_lookup')
 def find_bundle_by_form_title(form_title):
     """
     Find a bundle that matches a form title.
@@ -80,7 +86,7 @@ def find_bundle_by_form_title(form_title):
     """
     from .models import WebinarBundle
     
-    bundles = WebinarBundle.objects.filter(deleted_at=None)
+    bundles = WebinarBundle.alive.all()
     
     # First try exact match against all names (main name + aliases)
     for bundle in bundles:
@@ -97,6 +103,7 @@ def find_bundle_by_form_title(form_title):
     return None
 
 
+@timed('date_lookup')
 def find_webinar_date(webinar, date_time):
     """
     Find a webinar date close to the given date and time.
@@ -121,6 +128,7 @@ def find_webinar_date(webinar, date_time):
     return None
 
 
+@timed('db_upsert')
 def create_on_demand_attendee(webinar, first_name, last_name, email, organization=''):
     """
     Create or update an on-demand attendee for a webinar.
@@ -164,6 +172,7 @@ def create_on_demand_attendee(webinar, first_name, last_name, email, organizatio
     return attendee, created
 
 
+@timed('date_lookup')
 def find_bundle_date(bundle, date_time):
     """
     Find a bundle date that matches the given date.
@@ -186,15 +195,21 @@ def find_bundle_date(bundle, date_time):
     return None
 
 
+@timed('error_email')
 def send_unrecognized_date_error_email(error_email, webinar_or_bundle_name, date_str, parsed_date, webhook_data, is_bundle=False):
-    """Send an error email when a booking is made for an unrecognized date."""
-    from .email_service import send_notification_email
+    """
+    Send an error email when a booking is made for an unrecognized date.
+    Repeated bookings for the same missing date are coalesced into a digest.
+    """
+    from .notifications import notify_error, registrant_line
     
     entity_type = "bundle" if is_bundle else "webinar"
     
     subject = f"Booking for Unrecognized {entity_type.title()} Date - {webinar_or_bundle_name}"
     
-    message = f"""
+    # Only built when an email is actually queued, not for repeats folded into a digest
+    def message():
+        return f"""
 BOOKING FOR UNRECOGNIZED DATE RECEIVED
 
 A booking has been received for a {entity_type} date that does not exist in the system.
@@ -213,7 +228,7 @@ ACTION REQUIRED:
 2. Manually register this attendee for the correct date
 
 Raw Webhook Data:
-{json.dumps(webhook_data, indent=2)}
+{codec.dumps_pretty(webhook_data)}
 
 This booking was rejected because auto-creation of dates has been disabled.
 Please create the date manually and register the attendee.
@@ -223,20 +238,151 @@ Kajabi Webinar Manager
     """
     
     try:
-        send_notification_email(
+        notify_error(
             to_email=error_email,
             subject=subject,
-            message=message
+            message=message,
+            signature=f"unrecognized_date:{date_str}",
+            scope=f"{entity_type}:{webinar_or_bundle_name}",
+            registrant=registrant_line(webhook_data)
         )
         logger.info(f"Sent unrecognized date error email to {error_email} for {entity_type} {webinar_or_bundle_name}")
     except Exception as e:
         logger.error(f"Failed to send unrecognized date error email: {str(e)}")
 
 
-def process_kajabi_webhook(data, request):
+class ZoomRegistration:
+    """
+    Registers an attendee upserted from a webhook in the date's Zoom webinar.
+    run() uses ZoomService, arun() its async methods; status() is the suffix
+    for the webhook's result message.
+    """
+    
+    def __init__(self, attendee, webinar_date):
+        self.attendee = attendee
+        self.webinar_date = webinar_date
+    
+    @property
+    def needed(self):
+        return bool(self.webinar_date.zoom_meeting_id and not self.attendee.zoom_registrant_id)
+    
+    def run(self):
+        if not self.needed:
+            return
+        try:
+            from .zoom_service import ZoomService
+            zoom_service = ZoomService()
+            
+            result = zoom_service.register_attendee(
+                self.webinar_date.zoom_meeting_id,
+                self.attendee.first_name,
+                self.attendee.last_name,
+                self.attendee.email
+            )
+            self._record(result)
+        except Exception as e:
+            self._record_error(e)
+        self.attendee.save()
+    
+    async def arun(self):
+        if not self.needed:
+            return
+        try:
+            from .zoom_service import ZoomService
+            zoom_service = await sync_to_async(ZoomService)()
+            
+            result = await zoom_service.aregister_attendee(
+                self.webinar_date.zoom_meeting_id,
+                self.attendee.first_name,
+                self.attendee.last_name,
+                self.attendee.email
+            )
+            self._record(result)
+        except Exception as e:
+            self._record_error(e)
+        await self.attendee.asave()
+    
+    def _record(self, result):
+        attendee = self.attendee
+        if result['success']:
+            attendee.zoom_registrant_id = result['registrant_id']
+            attendee.zoom_join_url = result['join_url']
+            attendee.zoom_invite_link = result.get('invite_link', result['join_url'])
+            attendee.zoom_registered_at = timezone.now()
+            attendee.zoom_registration_error = ''
+            logger.info("Registered attendee %s in Zoom webinar %s", attendee.email, self.webinar_date.zoom_meeting_id)
+        elif result.get('retryable'):
+            # Zoom is unavailable; leave no error so register_zoom_pending retries it
+            logger.warning("Zoom unavailable, queued registration of %s for retry: %s", attendee.email, result['error'])
+        else:
+            attendee.zoom_registration_error = result['error']
+            logger.warning("Failed to register attendee %s in Zoom: %s", attendee.email, result['error'])
+    
+    def _record_error(self, e):
+        error_msg = f"Error registering attendee in Zoom: {str(e)}"
+        self.attendee.zoom_registration_error = error_msg
+        logger.error(error_msg)
+    
+    def status(self):
+        if not self.webinar_date.zoom_meeting_id:
+            return ""
+        if self.attendee.zoom_registrant_id:
+            return " and registered in Zoom"
+        if self.attendee.zoom_registration_error:
+            return " (Zoom registration failed)"
+        return " (Zoom registration queued for retry)"
+
+
+class OnDemandActivation:
+    """
+    Activates the grant offer of an on-demand attendee upserted from a webhook.
+    run() uses KajabiActivationService, arun() its async methods; status() is
+    the suffix for the webhook's result message.
+    """
+    
+    def __init__(self, attendee):
+        self.attendee = attendee
+    
+    def run(self):
+        if self.attendee.activation_sent_at:
+            return
+        try:
+            from .activation_service import activate_attendee
+            self._log(*activate_attendee(self.attendee))
+        except Exception as e:
+            logger.error("Error activating on-demand attendee %s: %s", self.attendee.email, str(e))
+    
+    async def arun(self):
+        if self.attendee.activation_sent_at:
+            return
+        try:
+            from .activation_service import aactivate_attendee
+            self._log(*await aactivate_attendee(self.attendee))
+        except Exception as e:
+            logger.error("Error activating on-demand attendee %s: %s", self.attendee.email, str(e))
+    
+    def _log(self, success, activation_message):
+        if success:
+            logger.info("Immediately activated on-demand attendee %s: %s", self.attendee.email, activation_message)
+        else:
+            logger.warning("Failed to activate on-demand attendee %s: %s", self.attendee.email, activation_message)
+    
+    def status(self):
+        if self.attendee.activation_sent_at and self.attendee.activation_success:
+            return " (activated immediately)"
+        if self.attendee.activation_sent_at and not self.attendee.activation_success:
+            return " (activation failed)"
+        return ""
+
+
+def process_kajabi_webhook(data, request, followups=None):
     """
     Process Kajabi webhook data and register attendee.
     Returns (success, message, attendee_id)
+    
+    If a followups list is given, the attendee's Zoom registration or on-demand
+    activation is appended to it instead of run, and the message leaves out
+    its status; see aprocess_kajabi_webhook.
     """
     from .models import Webinar, WebinarDate, Attendee, WebinarBundle, BundleDate, BundleAttendee
     
@@ -279,8 +425,8 @@ def process_kajabi_webhook(data, request):
             date_str = payload.get(webinar.form_date_field, '')
             
             # Debug logging
-            logger.info(f"Form submission extraction - Webinar: {webinar.name}, form_date_field: '{webinar.form_date_field}'")
-            logger.info(f"Extracted - first_name: '{first_name}', email: '{email}', date_str: '{date_str}'")
+            logger.info("Form submission extraction - Webinar: %s, form_date_field: '%s'", webinar.name, webinar.form_date_field)
+            logger.info("Extracted - first_name: '%s', email: '%s', date_str: '%s'", first_name, email, date_str)
             
         elif event_type == 'purchase.created':
             # Process purchase event
@@ -332,26 +478,17 @@ def process_kajabi_webhook(data, request):
         if parsed_date == 'on_demand':
             attendee, created = create_on_demand_attendee(webinar, first_name, last_name, email, organization)
             
-            # For on-demand attendees, activate immediately
-            if not attendee.activation_sent_at:
-                try:
-                    from .activation_service import activate_attendee
-                    success, activation_message = activate_attendee(attendee)
-                    if success:
-                        logger.info(f"Immediately activated on-demand attendee {email}: {activation_message}")
-                    else:
-                        logger.warning(f"Failed to activate on-demand attendee {email}: {activation_message}")
-                except Exception as e:
-                    logger.error(f"Error activating on-demand attendee {email}: {str(e)}")
-            
             status = "Created" if created else "Updated"
-            activation_status = ""
-            if attendee.activation_sent_at and attendee.activation_success:
-                activation_status = " (activated immediately)"
-            elif attendee.activation_sent_at and not attendee.activation_success:
-                activation_status = " (activation failed)"
+            message = f"{status} on-demand attendee for {webinar.name}"
+            
+            # For on-demand attendees, activate immediately
+            activation = OnDemandActivation(attendee)
+            if followups is not None:
+                followups.append(activation)
+                return True, message, attendee.id
+            activation.run()
             
-            return True, f"{status} on-demand attendee for {webinar.name}{activation_status}", attendee.id
+            return True, f"{message}{activation.status()}", attendee.id
         else:
             # Find matching webinar date (no auto-creation for regular dates)
             webinar_date = find_webinar_date(webinar, parsed_date)
@@ -376,15 +513,16 @@ def process_kajabi_webhook(data, request):
                 return False, f"No webinar date found for {date_str}. Error email sent to {webinar.error_notification_email}.", None
         
             # Create or update regular attendee for scheduled dates
-            attendee, created = Attendee.objects.get_or_create(
-                webinar_date=webinar_date,
-                email=email,
-                defaults={
-                    'first_name': first_name,
-                    'last_name': last_name,
-                    'organization': organization
-                }
-            )
+            with span('db_upsert'):
+                attendee, created = Attendee.objects.get_or_create(
+                    webinar_date=webinar_date,
+                    email=email,
+                    defaults={
+                        'first_name': first_name,
+                        'last_name': last_name,
+                        'organization': organization
+                    }
+                )
             
             # If attendee already existed, update their details
             if not created:
@@ -406,50 +544,19 @@ def process_kajabi_webhook(data, request):
                 
                 if updated:
                     attendee.save()
-                    logger.info(f"Updated existing attendee {email} with new details")
+                    logger.info("Updated existing attendee %s with new details", email)
             
-            # Try to register attendee in Zoom if webinar has Zoom meeting ID
-            if webinar_date.zoom_meeting_id and not attendee.zoom_registrant_id:
-                try:
-                    from .zoom_service import ZoomService
-                    zoom_service = ZoomService()
-                    
-                    result = zoom_service.register_attendee(
-                        webinar_date.zoom_meeting_id,
-                        first_name,
-                        last_name,
-                        email
-                    )
-                    
-                    if result['success']:
-                        attendee.zoom_registrant_id = result['registrant_id']
-                        attendee.zoom_join_url = result['join_url']
-                        attendee.zoom_invite_link = result.get('invite_link', result['join_url'])
-                        attendee.zoom_registered_at = timezone.now()
-                        attendee.zoom_registration_error = ''
-                        logger.info(f"Registered attendee {email} in Zoom webinar {webinar_date.zoom_meeting_id}")
-                    else:
-                        attendee.zoom_registration_error = result['error']
-                        logger.warning(f"Failed to register attendee {email} in Zoom: {result['error']}")
-                    
-                    attendee.save()
-                    
-                except Exception as e:
-                    error_msg = f"Error registering attendee in Zoom: {str(e)}"
-                    attendee.zoom_registration_error = error_msg
-                    attendee.save()
-                    logger.error(error_msg)
-        
             status = "Created" if created else "Updated"
-            zoom_status = ""
+            message = f"{status} attendee for {webinar.name} on {webinar_date.date_time}"
             
-            if webinar_date.zoom_meeting_id:
-                if attendee.zoom_registrant_id:
-                    zoom_status = " and registered in Zoom"
-                elif attendee.zoom_registration_error:
-                    zoom_status = " (Zoom registration failed)"
+            # Try to register attendee in Zoom if webinar has Zoom meeting ID
+            registration = ZoomRegistration(attendee, webinar_date)
+            if followups is not None:
+                followups.append(registration)
+                return True, message, attendee.id
+            registration.run()
             
-            return True, f"{status} attendee for {webinar.name} on {webinar_date.date_time}{zoom_status}", attendee.id
+            return True, f"{message}{registration.status()}", attendee.id
     
     except Exception as e:
         error_message = f"Error processing webhook: {str(e)}"
@@ -457,14 +564,33 @@ def process_kajabi_webhook(data, request):
         
         # Send error notification email with details
         try:
-            error_email = webinar.error_notification_email if 'webinar' in locals() and webinar else "info@awesometechtraining.com"
-            send_webhook_error_email(error_email, error_message, data)
+            error_webinar = webinar if 'webinar' in locals() and webinar else None
+            error_email = error_webinar.error_notification_email if error_webinar else "info@awesometechtraining.com"
+            send_webhook_error_email(
+                error_email, error_message, data,
+                scope=f"webinar:{error_webinar.id}" if error_webinar else ''
+            )
         except Exception as email_error:
-            logger.error(f"Failed to send error email: {str(email_error)}")
+            logger.error("Failed to send error email: %s", str(email_error))
         
         return False, error_message, None
 
 
+async def aprocess_kajabi_webhook(data, request):
+    """
+    Async version of process_kajabi_webhook for the async webhook views.
+    Matching the payload and the attendee upsert run in a worker thread; the
+    Zoom registrations and activations left as followups then run concurrently
+    on the async HTTP client.
+    """
+    followups = []
+    success, message, attendee_id = await sync_to_async(process_kajabi_webhook)(data, request, followups=followups)
+    if followups:
+        await asyncio.gather(*(followup.arun() for followup in followups))
+        message += ''.join(followup.status() for followup in followups)
+    return success, message, attendee_id
+
+
 def process_bundle_webhook(bundle, payload, webhook_type, data):
     """
     Process webhook for bundle purchases.
@@ -538,15 +664,16 @@ def process_bundle_webhook(bundle, payload, webhook_type, data):
             return False, f"No bundle date found for {date_str}. Error email sent to {bundle.error_notification_email}.", None
         
         # Create or update bundle attendee
-        attendee, created = BundleAttendee.objects.get_or_create(
-            bundle_date=bundle_date,
-            email=email,
-            defaults={
-                'first_name': first_name,
-                'last_name': last_name,
-                'organization': organization
-            }
-        )
+        with span('db_upsert'):
+            attendee, created = BundleAttendee.objects.get_or_create(
+                bundle_date=bundle_date,
+                email=email,
+                defaults={
+                    'first_name': first_name,
+                    'last_name': last_name,
+                    'organization': organization
+                }
+            )
         
         # If attendee already existed, update their details
         if not created:
@@ -568,7 +695,7 @@ def process_bundle_webhook(bundle, payload, webhook_type, data):
             
             if updated:
                 attendee.save()
-                logger.info(f"Updated existing bundle attendee {email} with new details")
+                logger.info("Updated existing bundle attendee %s with new details", email)
         
         status = "Created" if created else "Updated"
         return True, f"{status} bundle attendee for {bundle.name} on {bundle_date.date}", attendee.id
@@ -580,20 +707,21 @@ def process_bundle_webhook(bundle, payload, webhook_type, data):
         # Send error notification email with details
         try:
             error_email = bundle.error_notification_email
-            send_webhook_error_email(error_email, error_message, data)
+            send_webhook_error_email(error_email, error_message, data, scope=f"bundle:{bundle.id}")
         except Exception as email_error:
-            logger.error(f"Failed to send error email: {str(email_error)}")
+            logger.error("Failed to send error email: %s", str(email_error))
         
         return False, error_message, None
 
 
-def send_webhook_error_email(to_email, error_message, webhook_data):
+@timed('error_email')
+def send_webhook_error_email(to_email, error_message, webhook_data, scope=''):
     """Send an email notification about webhook processing errors using enhanced email service."""
     # Import the enhanced email function
     from .email_service import send_webhook_error_email as enhanced_send_webhook_error_email
     
     # Use the enhanced email service
-    enhanced_send_webhook_error_email(to_email, error_message, webhook_data)
+    enhanced_send_webhook_error_email(to_email, error_message, webhook_data, scope=scope)
 
 
 def process_clinic_booking(clinic_booking):
@@ -606,39 +734,28 @@ def process_clinic_booking(clinic_booking):
     Returns:
         None - Updates are made directly to the clinic_booking instance
     """
+    from . import outbound
+    
     logger.info(f"Processing clinic booking {clinic_booking.id} for {clinic_booking.email}")
     
     # Create Zoom meeting
-    try:
-        from .zoom_service import ZoomService
-        
-        zoom_service = ZoomService()
-        result = zoom_service.create_meeting(
-            topic=clinic_booking.zoom_meeting_subject,
-            start_time=clinic_booking.clinic_date,
-            duration=30,  # 30 minute clinic sessions
-            agenda=f"Clinic session for {clinic_booking.full_name} from {clinic_booking.organization or 'N/A'}. Question: {clinic_booking.question[:100]}{'...' if len(clinic_booking.question) > 100 else ''}",
-            attendee_email=clinic_booking.email,
-            attendee_name=clinic_booking.full_name
-        )
-        
-        if result['success']:
-            clinic_booking.zoom_meeting_id = result['meeting_id']
-            clinic_booking.zoom_join_url = result['join_url']
-            clinic_booking.zoom_created_at = timezone.now()
-            clinic_booking.zoom_creation_error = ''
-            logger.info(f"Created Zoom meeting {result['meeting_id']} for clinic booking {clinic_booking.id}")
-        else:
-            clinic_booking.zoom_creation_error = result['error']
-            logger.warning(f"Failed to create Zoom meeting for clinic booking {clinic_booking.id}: {result['error']}")
-        
-        clinic_booking.save()
-        
-    except Exception as e:
-        error_msg = f"Error creating Zoom meeting for clinic booking: {str(e)}"
-        clinic_booking.zoom_creation_error = error_msg
-        clinic_booking.save()
-        logger.error(error_msg)
+    if clinic_booking.zoom_meeting_id:
+        logger.info(f"Clinic booking {clinic_booking.id} already has Zoom meeting {clinic_booking.zoom_meeting_id}")
+    elif not outbound.is_available('zoom'):
+        # Send the invite together with the meeting once Zoom is back
+        logger.warning(f"Zoom unavailable, queued clinic booking {clinic_booking.id} for retry")
+        return
+    else:
+        _create_clinic_zoom_meeting(clinic_booking)
+        if not clinic_booking.zoom_meeting_id and not clinic_booking.zoom_creation_error:
+            logger.warning(f"Zoom unavailable, queued clinic booking {clinic_booking.id} for retry")
+            return
+    
+    if clinic_booking.calendar_invite_success:
+        return
+    if not outbound.is_available('graph'):
+        logger.warning(f"Microsoft Graph unavailable, queued calendar invite for clinic booking {clinic_booking.id} for retry")
+        return
     
     # Send calendar invites
     try:
@@ -646,22 +763,124 @@ def process_clinic_booking(clinic_booking):
         
         ms365_service = MS365CalendarService()
         success, message = ms365_service.send_clinic_calendar_invite(clinic_booking)
+        _record_clinic_invite(clinic_booking, success, message)
+    except Exception as e:
+        _record_clinic_invite_error(clinic_booking, e)
+    clinic_booking.save()
+
+
+async def aprocess_clinic_booking(clinic_booking):
+    """
+    Async version of process_clinic_booking for the async webhook views, making
+    the Zoom and Graph calls on the async HTTP client.
+    """
+    from . import outbound
+    
+    logger.info(f"Processing clinic booking {clinic_booking.id} for {clinic_booking.email}")
+    
+    if clinic_booking.zoom_meeting_id:
+        logger.info(f"Clinic booking {clinic_booking.id} already has Zoom meeting {clinic_booking.zoom_meeting_id}")
+    elif not await sync_to_async(outbound.is_available)('zoom'):
+        logger.warning(f"Zoom unavailable, queued clinic booking {clinic_booking.id} for retry")
+        return
+    else:
+        await _acreate_clinic_zoom_meeting(clinic_booking)
+        if not clinic_booking.zoom_meeting_id and not clinic_booking.zoom_creation_error:
+            logger.warning(f"Zoom unavailable, queued clinic booking {clinic_booking.id} for retry")
+            return
+    
+    if clinic_booking.calendar_invite_success:
+        return
+    if not await sync_to_async(outbound.is_available)('graph'):
+        logger.warning(f"Microsoft Graph unavailable, queued calendar invite for clinic booking {clinic_booking.id} for retry")
+        return
+    
+    try:
+        from .ms365_service import MS365CalendarService
         
-        if success:
-            clinic_booking.calendar_invite_sent_at = timezone.now()
-            clinic_booking.calendar_invite_success = True
-            clinic_booking.calendar_invite_error = ''
-            logger.info(f"Sent calendar invites for clinic booking {clinic_booking.id}: {message}")
-        else:
-            clinic_booking.calendar_invite_success = False
-            clinic_booking.calendar_invite_error = message
-            logger.warning(f"Failed to send calendar invites for clinic booking {clinic_booking.id}: {message}")
+        ms365_service = await sync_to_async(MS365CalendarService)()
+        success, message = await ms365_service.asend_clinic_calendar_invite(clinic_booking)
+        _record_clinic_invite(clinic_booking, success, message)
+    except Exception as e:
+        _record_clinic_invite_error(clinic_booking, e)
+    await clinic_booking.asave()
+
+
+def _record_clinic_invite(clinic_booking, success, message):
+    if success:
+        clinic_booking.calendar_invite_sent_at = timezone.now()
+        clinic_booking.calendar_invite_success = True
+        clinic_booking.calendar_invite_error = ''
+        logger.info(f"Sent calendar invites for clinic booking {clinic_booking.id}: {message}")
+    else:
+        clinic_booking.calendar_invite_success = False
+        clinic_booking.calendar_invite_error = message
+        logger.warning(f"Failed to send calendar invites for clinic booking {clinic_booking.id}: {message}")
+
+
+def _record_clinic_invite_error(clinic_booking, e):
+    error_msg = f"Error sending calendar invites for clinic booking: {str(e)}"
+    clinic_booking.calendar_invite_error = error_msg
+    clinic_booking.calendar_invite_success = False
+    logger.error(error_msg)
+
+
+def _clinic_meeting_kwargs(clinic_booking):
+    return {
+        'topic': clinic_booking.zoom_meeting_subject,
+        'start_time': clinic_booking.clinic_date,
+        'duration': 30,  # 30 minute clinic sessions
+        'agenda': f"Clinic session for {clinic_booking.full_name} from {clinic_booking.organization or 'N/A'}. Question: {clinic_booking.question[:100]}{'...' if len(clinic_booking.question) > 100 else ''}",
+        'attendee_email': clinic_booking.email,
+        'attendee_name': clinic_booking.full_name
+    }
+
+
+def _record_clinic_zoom_meeting(clinic_booking, result):
+    """Record a create_meeting result on the booking. Returns False if Zoom was unavailable and nothing changed."""
+    if result['success']:
+        clinic_booking.zoom_meeting_id = result['meeting_id']
+        clinic_booking.zoom_join_url = result['join_url']
+        clinic_booking.zoom_created_at = timezone.now()
+        clinic_booking.zoom_creation_error = ''
+        logger.info(f"Created Zoom meeting {result['meeting_id']} for clinic booking {clinic_booking.id}")
+    elif result.get('retryable'):
+        return False
+    else:
+        clinic_booking.zoom_creation_error = result['error']
+        logger.warning(f"Failed to create Zoom meeting for clinic booking {clinic_booking.id}: {result['error']}")
+    return True
+
+
+def _record_clinic_zoom_error(clinic_booking, e):
+    error_msg = f"Error creating Zoom meeting for clinic booking: {str(e)}"
+    clinic_booking.zoom_creation_error = error_msg
+    logger.error(error_msg)
+
+
+def _create_clinic_zoom_meeting(clinic_booking):
+    """Create the Zoom meeting for a clinic booking, leaving no error if Zoom was unavailable."""
+    try:
+        from .zoom_service import ZoomService
         
-        clinic_booking.save()
+        zoom_service = ZoomService()
+        result = zoom_service.create_meeting(**_clinic_meeting_kwargs(clinic_booking))
+        if not _record_clinic_zoom_meeting(clinic_booking, result):
+            return
+    except Exception as e:
+        _record_clinic_zoom_error(clinic_booking, e)
+    clinic_booking.save()
+
+
+async def _acreate_clinic_zoom_meeting(clinic_booking):
+    """Async version of _create_clinic_zoom_meeting."""
+    try:
+        from .zoom_service import ZoomService
         
+        zoom_service = await sync_to_async(ZoomService)()
+        result = await zoom_service.acreate_meeting(**_clinic_meeting_kwargs(clinic_booking))
+        if not _record_clinic_zoom_meeting(clinic_booking, result):
+            return
     except Exception as e:
-        error_msg = f"Error sending calendar invites for clinic booking: {str(e)}"
-        clinic_booking.calendar_invite_error = error_msg
-        clinic_booking.calendar_invite_success = False
-        clinic_booking.save()
-        logger.error(error_msg)
\ No newline at end of file
+        _record_clinic_zoom_error(clinic_booking, e)
+    await clinic_booking.asave()
@@ -9,15 +9,21 @@ from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.utils import timezone
 
-from .models import Webinar, WebinarDate, Attendee, WebinarBundle, BundleDate, BundleAttendee, Download, ClinicBooking
-from .forms import WebinarForm, WebinarDateForm, AttendeeForm, WebinarBundleForm, BundleDateForm, BundleAttendeeForm
+from .models import Webinar, WebinarDate, Attendee, WebinarBundle, BundleDate, BundleAttendee, Download, ClinicBooking, BackgroundJob
+from .forms import WebinarForm, WebinarDateForm, AttendeeForm, WebinarBundleForm, BundleDateForm, BundleAttendeeForm, AttendeeImportForm
+from .db_router import replica_reads
+from .outbound import with_deadline, WEBHOOK_DEADLINE
+from .timing import traced, current_timings
+from . import codec
+from .codec import json_response, response_text
 
 
 # Dashboard View
 @login_required
+@replica_reads
 def dashboard(request):
-    webinars = Webinar.objects.filter(deleted_at=None)
-    bundles = WebinarBundle.objects.filter(deleted_at=None)
+    webinars = Webinar.alive.all()
+    bundles = WebinarBundle.alive.all()
     return render(request, 'webinars/dashboard.html', {
         'webinars': webinars,
         'bundles': bundles
@@ -31,7 +37,7 @@ class WebinarDetailView(LoginRequiredMixin, DetailView):
     context_object_name = 'webinar'
     
     def get_queryset(self):
-        return Webinar.objects.filter(deleted_at=None)
+        return Webinar.alive.all()
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -41,9 +47,8 @@ class WebinarDetailView(LoginRequiredMixin, DetailView):
         
         # Get on-demand attendees directly
         from .models import OnDemandAttendee
-        on_demand_attendees = OnDemandAttendee.objects.filter(
-            webinar=self.object,
-            deleted_at=None
+        on_demand_attendees = OnDemandAttendee.alive.filter(
+            webinar=self.object
         ).order_by('-created_at')
         
         context['on_demand_attendees'] = on_demand_attendees
@@ -74,7 +79,7 @@ class WebinarUpdateView(LoginRequiredMixin, UpdateView):
     template_name = 'webinars/webinar_form.html'
     
     def get_queryset(self):
-        return Webinar.objects.filter(deleted_at=None)
+        return Webinar.alive.all()
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -88,7 +93,7 @@ class WebinarUpdateView(LoginRequiredMixin, UpdateView):
 
 @login_required
 def webinar_delete(request, pk):
-    webinar = get_object_or_404(Webinar, pk=pk, deleted_at=None)
+    webinar = get_object_or_404(Webinar.alive, pk=pk)
     
     if request.method == 'POST':
         webinar.soft_delete()
@@ -105,7 +110,7 @@ class WebinarDateDetailView(LoginRequiredMixin, DetailView):
     context_object_name = 'webinar_date'
     
     def get_queryset(self):
-        return WebinarDate.objects.filter(deleted_at=None)
+        return WebinarDate.alive.all()
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -120,13 +125,13 @@ class WebinarDateCreateView(LoginRequiredMixin, CreateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        webinar = get_object_or_404(Webinar, pk=self.kwargs['webinar_id'], deleted_at=None)
+        webinar = get_object_or_404(Webinar.alive, pk=self.kwargs['webinar_id'])
         context['webinar'] = webinar
         context['title'] = f'Add New Date for {webinar.name}'
         return context
     
     def form_valid(self, form):
-        webinar = get_object_or_404(Webinar, pk=self.kwargs['webinar_id'], deleted_at=None)
+        webinar = get_object_or_404(Webinar.alive, pk=self.kwargs['webinar_id'])
         form.instance.webinar = webinar
         messages.success(self.request, 'Webinar date created successfully.')
         return super().form_valid(form)
@@ -141,7 +146,7 @@ class WebinarDateUpdateView(LoginRequiredMixin, UpdateView):
     template_name = 'webinars/webinar_date_form.html'
     
     def get_queryset(self):
-        return WebinarDate.objects.filter(deleted_at=None)
+        return WebinarDate.alive.all()
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -159,7 +164,7 @@ class WebinarDateUpdateView(LoginRequiredMixin, UpdateView):
 
 @login_required
 def webinar_date_delete(request, pk):
-    webinar_date = get_object_or_404(WebinarDate, pk=pk, deleted_at=None)
+    webinar_date = get_object_or_404(WebinarDate.alive, pk=pk)
     webinar_id = webinar_date.webinar.id
     
     if webinar_date.has_attendees:
@@ -176,34 +181,17 @@ def webinar_date_delete(request, pk):
 
 @login_required
 def create_zoom_webinar(request, pk):
-    webinar_date = get_object_or_404(WebinarDate, pk=pk, deleted_at=None)
+    webinar_date = get_object_or_404(WebinarDate.alive, pk=pk)
     
     # Check if Zoom meeting already exists
     if webinar_date.zoom_meeting_id:
         messages.warning(request, 'A Zoom meeting already exists for this webinar date.')
         return redirect('webinar_date_detail', pk=pk)
     
-    try:
-        from .zoom_service import ZoomService
-        zoom_service = ZoomService()
-        
-        # Create the Zoom webinar
-        webinar_data = zoom_service.create_webinar(webinar_date)
-        
-        # Save the webinar ID to the webinar date
-        webinar_date.zoom_meeting_id = webinar_data['webinar_id']
-        webinar_date.save()
-        
-        messages.success(
-            request, 
-            f'Zoom webinar created successfully! Webinar ID: {webinar_data["webinar_id"]}'
-        )
-        
-    except Exception as e:
-        messages.error(
-            request, 
-            f'Failed to create Zoom webinar: {str(e)}. Please check your Zoom settings.'
-        )
+    # The Zoom API call runs in a background job; the meeting id shows up once it completes
+    from .background_jobs import enqueue
+    enqueue(BackgroundJob.KIND_CREATE_ZOOM_WEBINAR, webinar_date.id, request.user)
+    messages.info(request, 'Creating the Zoom webinar. Refresh this page in a moment to see the Webinar ID.')
     
     return redirect('webinar_date_detail', pk=pk)
 
@@ -216,14 +204,14 @@ class AttendeeCreateView(LoginRequiredMixin, CreateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        webinar_date = get_object_or_404(WebinarDate, pk=self.kwargs['webinar_date_id'], deleted_at=None)
+        webinar_date = get_object_or_404(WebinarDate.alive, pk=self.kwargs['webinar_date_id'])
         context['webinar_date'] = webinar_date
         context['title'] = f'Add Attendee to {webinar_date.webinar.name}'
         context['is_bundle'] = False
         return context
     
     def form_valid(self, form):
-        webinar_date = get_object_or_404(WebinarDate, pk=self.kwargs['webinar_date_id'], deleted_at=None)
+        webinar_date = get_object_or_404(WebinarDate.alive, pk=self.kwargs['webinar_date_id'])
         form.instance.webinar_date = webinar_date
         
         # Check if attendee already exists
@@ -258,14 +246,14 @@ class BundleAttendeeCreateView(LoginRequiredMixin, CreateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        bundle_date = get_object_or_404(BundleDate, pk=self.kwargs['bundle_date_id'], deleted_at=None)
+        bundle_date = get_object_or_404(BundleDate.alive, pk=self.kwargs['bundle_date_id'])
         context['bundle_date'] = bundle_date
         context['title'] = f'Add Attendee to {bundle_date.bundle.name}'
         context['is_bundle'] = True
         return context
     
     def form_valid(self, form):
-        bundle_date = get_object_or_404(BundleDate, pk=self.kwargs['bundle_date_id'], deleted_at=None)
+        bundle_date = get_object_or_404(BundleDate.alive, pk=self.kwargs['bundle_date_id'])
         form.instance.bundle_date = bundle_date
         
         # Check if attendee already exists
@@ -293,8 +281,79 @@ class BundleAttendeeCreateView(LoginRequiredMixin, CreateView):
         return reverse('bundle_date_detail', args=[self.kwargs['bundle_date_id']])
 
 
+@login_required
+def attendee_import_view(request, webinar_date_id):
+    """Bulk import attendees for a webinar date from a CSV file."""
+    webinar_date = get_object_or_404(WebinarDate.alive, pk=webinar_date_id)
+    
+    if request.method == 'POST':
+        form = AttendeeImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            from .import_service import import_webinar_date_attendees, AttendeeImportError
+            try:
+                result = import_webinar_date_attendees(webinar_date, form.cleaned_data['csv_file'])
+            except AttendeeImportError as e:
+                messages.error(request, str(e))
+            else:
+                _report_import_result(request, result)
+                return redirect('webinar_date_detail', pk=webinar_date.id)
+    else:
+        form = AttendeeImportForm()
+    
+    return render(request, 'webinars/attendee_import.html', {
+        'form': form,
+        'webinar_date': webinar_date,
+        'title': f'Import Attendees to {webinar_date.webinar.name}',
+        'is_bundle': False,
+    })
+
+
+@login_required
+def bundle_attendee_import_view(request, bundle_date_id):
+    """Bulk import attendees for a bundle date from a CSV file."""
+    bundle_date = get_object_or_404(BundleDate.alive, pk=bundle_date_id)
+    
+    if request.method == 'POST':
+        form = AttendeeImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            from .import_service import import_bundle_date_attendees, AttendeeImportError
+            try:
+                result = import_bundle_date_attendees(bundle_date, form.cleaned_data['csv_file'])
+            except AttendeeImportError as e:
+                messages.error(request, str(e))
+            else:
+                _report_import_result(request, result)
+                return redirect('bundle_date_detail', pk=bundle_date.id)
+    else:
+        form = AttendeeImportForm()
+    
+    return render(request, 'webinars/attendee_import.html', {
+        'form': form,
+        'bundle_date': bundle_date,
+        'title': f'Import Attendees to {bundle_date.bundle.name}',
+        'is_bundle': True,
+    })
+
+
+def _report_import_result(request, result):
+    """Turn an import result into flash messages."""
+    messages.success(
+        request,
+        f"Import complete: {result['created']} added, {result['updated']} updated, "
+        f"{result['restored']} restored, {result['unchanged']} unchanged, "
+        f"{result['duplicates']} duplicate rows skipped."
+    )
+    if result['errors']:
+        shown = result['errors'][:10]
+        more = len(result['errors']) - len(shown)
+        error_text = '; '.join(shown) + (f' (and {more} more)' if more else '')
+        messages.warning(request, f"{len(result['errors'])} rows were rejected: {error_text}")
+
+
 # Attendee Views
 @csrf_exempt
+@with_deadline(WEBHOOK_DEADLINE)
+@traced
 def attendee_webhook(request):
     """Webhook endpoint for registering attendees from Kajabi."""
     import logging
@@ -302,16 +361,17 @@ def attendee_webhook(request):
     from .models import WebhookLog
     
     logger = logging.getLogger('webinars')
+    payload_logger = logging.getLogger('webinars.payloads')
     start_time = time.time()
     
     # Log all inbound requests
-    logger.info(f"Webhook request received - Method: {request.method}, Path: {request.path}")
-    logger.info(f"Headers: {dict(request.headers)}")
+    logger.info("Webhook request received - Method: %s, Path: %s", request.method, request.path)
+    payload_logger.info("Headers: %s", dict(request.headers))
     
     # Always return 200 OK for non-POST requests (GET, HEAD, OPTIONS)
     if request.method != 'POST':
         from django.http import HttpResponse
-        logger.info(f"Non-POST request ({request.method}) - returning 200 OK")
+        logger.info("Non-POST request (%s) - returning 200 OK", request.method)
         response = HttpResponse('OK', content_type='text/plain', status=200)
         
         # Save to database
@@ -323,7 +383,8 @@ def attendee_webhook(request):
             response_status=response.status_code,
             response_body='OK',
             success=True,
-            processing_time_ms=int((time.time() - start_time) * 1000)
+            processing_time_ms=int((time.time() - start_time) * 1000),
+            timings=current_timings()
         )
         
         return response
@@ -331,26 +392,25 @@ def attendee_webhook(request):
     if request.method == 'POST':
         # Log request body
         body_unicode = request.body.decode('utf-8')
-        logger.info(f"POST body: {body_unicode}")
+        payload_logger.info("POST body: %s", body_unicode)
         
         try:
             # Try to parse JSON data from the request body
             try:
-                import json
-                if body_unicode:
-                    data = json.loads(body_unicode)
+                if request.body:
+                    data = codec.loads(request.body)
                 else:
                     data = {}
-            except json.JSONDecodeError:
+            except codec.JSONDecodeError:
                 # Fall back to form data if not valid JSON
                 data = request.POST.dict()
-                logger.info(f"Parsed as form data: {data}")
+                payload_logger.info("Parsed as form data: %s", data)
             
             # Support direct API calls with specific parameters
             if 'webinar_date_id' in data or 'webinar_date_id' in request.GET:
-                logger.info(f"Processing as direct webhook call")
+                logger.info("Processing as direct webhook call")
                 result = handle_direct_webhook(request, data)
-                logger.info(f"Direct webhook result - Status: {result.status_code}")
+                logger.info("Direct webhook result - Status: %s", result.status_code)
                 
                 # Save to database
                 response_body = result.content.decode('utf-8') if hasattr(result, 'content') else ''
@@ -363,24 +423,25 @@ def attendee_webhook(request):
                     response_body=response_body,
                     success=(result.status_code < 400),
                     error_message='' if result.status_code < 400 else 'Direct webhook error',
-                    processing_time_ms=int((time.time() - start_time) * 1000)
+                    processing_time_ms=int((time.time() - start_time) * 1000),
+                    timings=current_timings()
                 )
                 
                 return result
             
             # Process Kajabi webhook data
-            logger.info(f"Processing Kajabi webhook data")
+            logger.info("Processing Kajabi webhook data")
             from .utils import process_kajabi_webhook
             success, message, attendee_id = process_kajabi_webhook(data, request)
             
             if success:
-                logger.info(f"Webhook processed successfully - Message: {message}, Attendee ID: {attendee_id}")
+                logger.info("Webhook processed successfully - Message: %s, Attendee ID: %s", message, attendee_id)
                 response_data = {
                     'status': 'success',
                     'message': message,
                     'attendee_id': attendee_id
                 }
-                response = JsonResponse(response_data)
+                response = json_response(response_data)
                 
                 # Save to database
                 WebhookLog.objects.create(
@@ -389,20 +450,21 @@ def attendee_webhook(request):
                     headers=dict(request.headers),
                     body=body_unicode,
                     response_status=response.status_code,
-                    response_body=json.dumps(response_data),
+                    response_body=response_text(response),
                     success=True,
                     error_message='',
-                    processing_time_ms=int((time.time() - start_time) * 1000)
+                    processing_time_ms=int((time.time() - start_time) * 1000),
+                    timings=current_timings()
                 )
                 
                 return response
             else:
-                logger.warning(f"Webhook processing failed - Message: {message}")
+                logger.warning("Webhook processing failed - Message: %s", message)
                 response_data = {
                     'status': 'error',
                     'message': message
                 }
-                response = JsonResponse(response_data, status=400)
+                response = json_response(response_data, status=400)
                 
                 # Save to database
                 WebhookLog.objects.create(
@@ -411,10 +473,11 @@ def attendee_webhook(request):
                     headers=dict(request.headers),
                     body=body_unicode,
                     response_status=response.status_code,
-                    response_body=json.dumps(response_data),
+                    response_body=response_text(response),
                     success=False,
                     error_message=message,
-                    processing_time_ms=int((time.time() - start_time) * 1000)
+                    processing_time_ms=int((time.time() - start_time) * 1000),
+                    timings=current_timings()
                 )
                 
                 return response
@@ -424,8 +487,8 @@ def attendee_webhook(request):
             error_message = f"Unhandled exception: {str(e)}\n{traceback.format_exc()}"
             
             # Log the error (using the same logger instance)
-            logger.error(f"Webhook exception - {error_message}")
-            logger.error(f"Request data that caused error: {data}")
+            logger.error("Webhook exception - %s", error_message)
+            logger.error("Request data that caused error: %s", data)
             
             # Send error notification email
             from .utils import send_webhook_error_email
@@ -438,13 +501,13 @@ def attendee_webhook(request):
                      'request_GET': dict(request.GET)}
                 )
             except Exception as email_error:
-                logger.error(f"Failed to send error email: {str(email_error)}")
+                logger.error("Failed to send error email: %s", str(email_error))
             
             response_data = {
                 'status': 'error',
                 'message': str(e)
             }
-            response = JsonResponse(response_data, status=500)
+            response = json_response(response_data, status=500)
             
             # Save to database
             WebhookLog.objects.create(
@@ -453,10 +516,11 @@ def attendee_webhook(request):
                 headers=dict(request.headers),
                 body=body_unicode,
                 response_status=response.status_code,
-                response_body=json.dumps(response_data),
+                response_body=response_text(response),
                 success=False,
                 error_message=error_message,
-                processing_time_ms=int((time.time() - start_time) * 1000)
+                processing_time_ms=int((time.time() - start_time) * 1000),
+                timings=current_timings()
             )
             
             return response
@@ -468,23 +532,26 @@ def attendee_webhook(request):
 
 
 @csrf_exempt
+@with_deadline(WEBHOOK_DEADLINE)
+@traced
 def download_webhook(request):
     """Webhook endpoint for download form submissions."""
     import logging
     import time
-    from .models import WebhookLog
+    from .models import WebhookLog, PayloadBlob
     
     logger = logging.getLogger('webinars')
+    payload_logger = logging.getLogger('webinars.payloads')
     start_time = time.time()
     
     # Log all inbound requests
-    logger.info(f"Download webhook request received - Method: {request.method}, Path: {request.path}")
-    logger.info(f"Headers: {dict(request.headers)}")
+    logger.info("Download webhook request received - Method: %s, Path: %s", request.method, request.path)
+    payload_logger.info("Headers: %s", dict(request.headers))
     
     # Always return 200 OK for non-POST requests (GET, HEAD, OPTIONS)
     if request.method != 'POST':
         from django.http import HttpResponse
-        logger.info(f"Non-POST request ({request.method}) - returning 200 OK")
+        logger.info("Non-POST request (%s) - returning 200 OK", request.method)
         response = HttpResponse('OK', content_type='text/plain', status=200)
         
         # Save to database
@@ -496,7 +563,8 @@ def download_webhook(request):
             response_status=response.status_code,
             response_body='OK',
             success=True,
-            processing_time_ms=int((time.time() - start_time) * 1000)
+            processing_time_ms=int((time.time() - start_time) * 1000),
+            timings=current_timings()
         )
         
         return response
@@ -504,20 +572,22 @@ def download_webhook(request):
     if request.method == 'POST':
         # Log request body
         body_unicode = request.body.decode('utf-8')
-        logger.info(f"POST body: {body_unicode}")
+        payload_logger.info("POST body: %s", body_unicode)
         
+        body_blob = None
         try:
             # Try to parse JSON data from the request body
             try:
-                import json
-                if body_unicode:
-                    data = json.loads(body_unicode)
+                if request.body:
+                    data = codec.loads(request.body)
+                    # The payload is the body itself, stored once for the download and its log entry
+                    body_blob = PayloadBlob.store(body_unicode)
                 else:
                     data = {}
-            except json.JSONDecodeError:
+            except codec.JSONDecodeError:
                 # Fall back to form data if not valid JSON
                 data = request.POST.dict()
-                logger.info(f"Parsed as form data: {data}")
+                payload_logger.info("Parsed as form data: %s", data)
             
             # Check if this is a Kajabi webhook with nested payload
             if 'event' in data and 'payload' in data:
@@ -542,12 +612,12 @@ def download_webhook(request):
             
             # Validate required fields
             if not all([first_name, email, form_title]):
-                logger.warning(f"Download webhook missing required fields - first_name: '{first_name}', email: '{email}', form_title: '{form_title}'")
+                logger.warning("Download webhook missing required fields - first_name: '%s', email: '%s', form_title: '%s'", first_name, email, form_title)
                 response_data = {
                     'status': 'error',
                     'message': 'Missing required fields: first_name, email, form_title'
                 }
-                response = JsonResponse(response_data, status=400)
+                response = json_response(response_data, status=400)
                 
                 # Save to database
                 WebhookLog.objects.create(
@@ -555,34 +625,40 @@ def download_webhook(request):
                     path=request.path,
                     headers=dict(request.headers),
                     body=body_unicode,
+                    body_blob=body_blob,
                     response_status=response.status_code,
-                    response_body=json.dumps(response_data),
+                    response_body=response_text(response),
                     success=False,
                     error_message='Missing required fields',
-                    processing_time_ms=int((time.time() - start_time) * 1000)
+                    processing_time_ms=int((time.time() - start_time) * 1000),
+                    timings=current_timings()
                 )
                 
                 return response
             
             # Create the download record
+            if body_blob:
+                payload_fields = {'payload_blob': body_blob}
+            else:
+                payload_fields = {'payload': data}
             download = Download.objects.create(
                 first_name=first_name,
                 last_name=last_name,
                 email=email,
                 form_title=form_title,
-                payload=data,
+                **payload_fields,
                 organization=organization,  # Organization extracted above
                 salesforce_sync_pending=True  # Mark for Salesforce sync
             )
             
-            logger.info(f"Created download record {download.id} for {email} - {form_title}")
+            logger.info("Created download record %s for %s - %s", download.id, email, form_title)
             
             response_data = {
                 'status': 'success',
                 'message': f'Download recorded for {email}',
                 'download_id': download.id
             }
-            response = JsonResponse(response_data)
+            response = json_response(response_data)
             
             # Save to database
             WebhookLog.objects.create(
@@ -590,11 +666,13 @@ def download_webhook(request):
                 path=request.path,
                 headers=dict(request.headers),
                 body=body_unicode,
+                body_blob=body_blob,
                 response_status=response.status_code,
-                response_body=json.dumps(response_data),
+                response_body=response_text(response),
                 success=True,
                 error_message='',
-                processing_time_ms=int((time.time() - start_time) * 1000)
+                processing_time_ms=int((time.time() - start_time) * 1000),
+                timings=current_timings()
             )
             
             return response
@@ -604,14 +682,14 @@ def download_webhook(request):
             error_message = f"Unhandled exception: {str(e)}\n{traceback.format_exc()}"
             
             # Log the error
-            logger.error(f"Download webhook exception - {error_message}")
-            logger.error(f"Request data that caused error: {data}")
+            logger.error("Download webhook exception - %s", error_message)
+            logger.error("Request data that caused error: %s", data)
             
             response_data = {
                 'status': 'error',
                 'message': str(e)
             }
-            response = JsonResponse(response_data, status=500)
+            response = json_response(response_data, status=500)
             
             # Save to database
             WebhookLog.objects.create(
@@ -619,11 +697,13 @@ def download_webhook(request):
                 path=request.path,
                 headers=dict(request.headers),
                 body=body_unicode,
+                body_blob=body_blob,
                 response_status=response.status_code,
-                response_body=json.dumps(response_data),
+                response_body=response_text(response),
                 success=False,
                 error_message=error_message,
-                processing_time_ms=int((time.time() - start_time) * 1000)
+                processing_time_ms=int((time.time() - start_time) * 1000),
+                timings=current_timings()
             )
             
             return response
@@ -638,10 +718,11 @@ def handle_direct_webhook(request, data):
     """Handle direct webhook API calls with specific parameters."""
     import logging
     logger = logging.getLogger('webinars')
+    payload_logger = logging.getLogger('webinars.payloads')
     
     # Get data from either JSON body, POST data, or query parameters
     params = {**request.GET.dict(), **data}
-    logger.info(f"Direct webhook parameters: {params}")
+    payload_logger.info("Direct webhook parameters: %s", params)
     
     webinar_date_id = params.get('webinar_date_id')
     first_name = params.get('first_name')
@@ -651,7 +732,7 @@ def handle_direct_webhook(request, data):
     
     # Validate required fields
     if not all([webinar_date_id, first_name, email]):
-        logger.warning(f"Direct webhook missing required fields - webinar_date_id: {webinar_date_id}, first_name: {first_name}, email: {email}")
+        logger.warning("Direct webhook missing required fields - webinar_date_id: %s, first_name: %s, email: %s", webinar_date_id, first_name, email)
         return JsonResponse({
             'status': 'error',
             'message': 'Missing required fields: webinar_date_id, first_name, email'
@@ -659,9 +740,9 @@ def handle_direct_webhook(request, data):
     
     # Get webinar date
     try:
-        webinar_date = WebinarDate.objects.get(pk=webinar_date_id, deleted_at=None)
+        webinar_date = WebinarDate.alive.get(pk=webinar_date_id)
     except WebinarDate.DoesNotExist:
-        logger.warning(f"Direct webhook webinar date not found: {webinar_date_id}")
+        logger.warning("Direct webhook webinar date not found: %s", webinar_date_id)
         return JsonResponse({
             'status': 'error',
             'message': f'Webinar date not found: {webinar_date_id}'
@@ -754,6 +835,10 @@ def handle_direct_webhook(request, data):
                     attendee.zoom_registration_error = ''
                     zoom_status = " and registered in Zoom"
                     logger.info(f"Registered attendee {email} in Zoom webinar {webinar_date.zoom_meeting_id}")
+                elif result.get('retryable'):
+                    # Zoom is unavailable; leave no error so register_zoom_pending retries it
+                    zoom_status = " (Zoom registration queued for retry)"
+                    logger.warning(f"Zoom unavailable, queued registration of {email} for retry: {result['error']}")
                 else:
                     attendee.zoom_registration_error = result['error']
                     zoom_status = " (Zoom registration failed)"
@@ -793,7 +878,7 @@ class BundleListView(LoginRequiredMixin, ListView):
     context_object_name = 'bundles'
     
     def get_queryset(self):
-        return WebinarBundle.objects.filter(deleted_at=None)
+        return WebinarBundle.alive.all()
 
 
 class BundleDetailView(LoginRequiredMixin, DetailView):
@@ -802,7 +887,7 @@ class BundleDetailView(LoginRequiredMixin, DetailView):
     context_object_name = 'bundle'
     
     def get_queryset(self):
-        return WebinarBundle.objects.filter(deleted_at=None)
+        return WebinarBundle.alive.all()
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -832,7 +917,7 @@ class BundleUpdateView(LoginRequiredMixin, UpdateView):
     template_name = 'webinars/bundle_form.html'
     
     def get_queryset(self):
-        return WebinarBundle.objects.filter(deleted_at=None)
+        return WebinarBundle.alive.all()
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -846,7 +931,7 @@ class BundleUpdateView(LoginRequiredMixin, UpdateView):
 
 @login_required
 def bundle_delete(request, pk):
-    bundle = get_object_or_404(WebinarBundle, pk=pk, deleted_at=None)
+    bundle = get_object_or_404(WebinarBundle.alive, pk=pk)
     
     if request.method == 'POST':
         bundle.soft_delete()
@@ -863,12 +948,12 @@ class BundleDateDetailView(LoginRequiredMixin, DetailView):
     context_object_name = 'bundle_date'
     
     def get_queryset(self):
-        return BundleDate.objects.filter(deleted_at=None)
+        return BundleDate.alive.all()
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['attendees'] = self.object.active_attendees()
-        context['webinar_dates'] = self.object.webinar_dates.filter(deleted_at=None)
+        context['webinar_dates'] = self.object.webinar_dates.alive()
         return context
 
 
@@ -879,7 +964,7 @@ class BundleDateCreateView(LoginRequiredMixin, CreateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        bundle = get_object_or_404(WebinarBundle, pk=self.kwargs['bundle_id'], deleted_at=None)
+        bundle = get_object_or_404(WebinarBundle.alive, pk=self.kwargs['bundle_id'])
         context['bundle'] = bundle
         context['title'] = f'Add New Date for {bundle.name}'
         return context
@@ -894,7 +979,7 @@ class BundleDateCreateView(LoginRequiredMixin, CreateView):
         return super().post(request, *args, **kwargs)
     
     def form_valid(self, form):
-        bundle = get_object_or_404(WebinarBundle, pk=self.kwargs['bundle_id'], deleted_at=None)
+        bundle = get_object_or_404(WebinarBundle.alive, pk=self.kwargs['bundle_id'])
         form.instance.bundle = bundle
         messages.success(self.request, 'Bundle date created successfully.')
         return super().form_valid(form)
@@ -909,7 +994,7 @@ class BundleDateUpdateView(LoginRequiredMixin, UpdateView):
     template_name = 'webinars/bundle_date_form.html'
     
     def get_queryset(self):
-        return BundleDate.objects.filter(deleted_at=None)
+        return BundleDate.alive.all()
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -927,7 +1012,7 @@ class BundleDateUpdateView(LoginRequiredMixin, UpdateView):
 
 @login_required
 def bundle_date_delete(request, pk):
-    bundle_date = get_object_or_404(BundleDate, pk=pk, deleted_at=None)
+    bundle_date = get_object_or_404(BundleDate.alive, pk=pk)
     bundle_id = bundle_date.bundle.id
     
     if bundle_date.has_attendees:
@@ -952,11 +1037,11 @@ def activate_attendee_view(request, attendee_id):
     # Try to get regular attendee first
     attendee = None
     try:
-        attendee = Attendee.objects.get(pk=attendee_id, deleted_at=None)
+        attendee = Attendee.alive.get(pk=attendee_id)
     except Attendee.DoesNotExist:
         # Try bundle attendee
         try:
-            attendee = BundleAttendee.objects.get(pk=attendee_id, deleted_at=None)
+            attendee = BundleAttendee.alive.get(pk=attendee_id)
         except BundleAttendee.DoesNotExist:
             return JsonResponse({'success': False, 'message': 'Attendee not found'}, status=404)
     
@@ -974,50 +1059,56 @@ def activate_attendee_view(request, attendee_id):
 
 @login_required
 def activate_webinar_date_view(request, webinar_date_id):
-    """Activate grant offers for all attendees of a webinar date."""
+    """Queue a background job activating grant offers for all attendees of a webinar date."""
     if request.method != 'POST':
         return JsonResponse({'success': False, 'message': 'Invalid request method'}, status=405)
     
-    webinar_date = get_object_or_404(WebinarDate, pk=webinar_date_id, deleted_at=None)
+    webinar_date = get_object_or_404(WebinarDate.alive, pk=webinar_date_id)
+    return _enqueue_job_response(request, BackgroundJob.KIND_ACTIVATE_WEBINAR_DATE, webinar_date.id)
+
+
+def _enqueue_job_response(request, kind, object_id):
+    """Queue a background job and return its id and status URL for the page to poll."""
+    from .background_jobs import enqueue, job_status
     
-    # Import and use activation service
-    from .activation_service import activate_webinar_date_attendees
-    success_count, failure_count, activation_messages = activate_webinar_date_attendees(webinar_date)
+    job = enqueue(kind, object_id, request.user)
+    data = job_status(job)
+    data.update(
+        success=True,
+        message='Job queued',
+        status_url=reverse('background_job_status', args=[job.id]),
+        results_url=reverse('background_job_results', args=[job.id]),
+    )
+    return JsonResponse(data, status=202)
+
+
+@login_required
+def background_job_status(request, job_id):
+    """Progress counters of a background job, polled by the page that queued it."""
+    from .background_jobs import job_status
     
-    # Create summary message
-    total = success_count + failure_count
-    if total == 0:
-        message = "No attendees found to activate."
-    else:
-        message = f"Processed {total} attendees: {success_count} successful, {failure_count} failed."
+    job = get_object_or_404(BackgroundJob.objects.defer('item_keys'), pk=job_id)
+    return JsonResponse(job_status(job))
+
+
+@login_required
+def background_job_results(request, job_id):
+    """Per-item results of a background job, paginated."""
+    from django.core.paginator import Paginator
     
-    if failure_count == 0 and success_count > 0:
-        messages.success(request, message)
-        return JsonResponse({
-            'success': True, 
-            'message': message,
-            'details': activation_messages,
-            'success_count': success_count,
-            'failure_count': failure_count
-        })
-    elif success_count > 0:
-        messages.warning(request, message)
-        return JsonResponse({
-            'success': True, 
-            'message': message,
-            'details': activation_messages,
-            'success_count': success_count,
-            'failure_count': failure_count
-        })
-    else:
-        messages.error(request, message)
-        return JsonResponse({
-            'success': False, 
-            'message': message,
-            'details': activation_messages,
-            'success_count': success_count,
-            'failure_count': failure_count
-        }, status=400)
+    job = get_object_or_404(BackgroundJob.objects.defer('item_keys'), pk=job_id)
+    page = Paginator(job.items.all(), 50).get_page(request.GET.get('page'))
+    return JsonResponse({
+        'job_id': job.id,
+        'status': job.status,
+        'count': page.paginator.count,
+        'page': page.number,
+        'num_pages': page.paginator.num_pages,
+        'results': [
+            {'position': item.position, 'success': item.success, 'message': item.message}
+            for item in page
+        ],
+    })
 
 
 @csrf_exempt
@@ -1025,6 +1116,7 @@ def cron_activate_pending(request):
     """
     Cron job endpoint to activate all pending attendees.
     Should be called periodically (e.g., every hour) by a cron job.
+    Deployments running the run_scheduler command don't need it.
     """
     if request.method not in ['GET', 'POST']:
         return JsonResponse({'success': False, 'message': 'Invalid request method'}, status=405)
@@ -1055,109 +1147,73 @@ def cron_activate_pending(request):
     })
 
 
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint.
+    The scraper must send settings.METRICS_TOKEN as a bearer token. With no
+    token set the endpoint is closed, except with DEBUG on, where scrapers on
+    loopback, private or INTERNAL_IPS addresses are answered for local
+    development. Client addresses aren't trusted in production, as behind the
+    proxy they depend on what it puts in the forwarded-for header.
+    """
+    import hmac
+    from django.conf import settings
+    from django.http import HttpResponse
+    from prometheus_client import CONTENT_TYPE_LATEST
+    from .metrics import render_metrics, is_internal_address
+    from .rate_limit import client_ip
+    
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        authorization = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(authorization.encode(), f'Bearer {token}'.encode()):
+            return HttpResponse('Unauthorized', content_type='text/plain', status=401)
+    elif not (settings.DEBUG and is_internal_address(client_ip(request))):
+        return HttpResponse('Forbidden', content_type='text/plain', status=403)
+    
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE_LATEST)
+
+
 @login_required
 def activate_bundle_date_view(request, bundle_date_id):
-    """Activate grant offers for all attendees of a bundle date."""
+    """Queue a background job activating grant offers for all attendees of a bundle date."""
     if request.method != 'POST':
         return JsonResponse({'success': False, 'message': 'Invalid request method'}, status=405)
     
-    bundle_date = get_object_or_404(BundleDate, pk=bundle_date_id, deleted_at=None)
-    
-    # Import and use activation service
-    from .activation_service import KajabiActivationService
-    service = KajabiActivationService()
-    
-    attendees = bundle_date.active_attendees()
-    success_count = 0
-    failure_count = 0
-    activation_messages = []
-    
-    for attendee in attendees:
-        # Skip if already activated
-        if attendee.activation_sent_at:
-            activation_messages.append(f"Skipped {attendee.email} (already activated)")
-            continue
-        
-        success, message = service.activate_attendee(attendee)
-        if success:
-            success_count += 1
-        else:
-            failure_count += 1
-        activation_messages.append(message)
-    
-    # Create summary message
-    total = success_count + failure_count
-    if total == 0:
-        message = "No attendees found to activate."
-    else:
-        message = f"Processed {total} attendees: {success_count} successful, {failure_count} failed."
-    
-    if failure_count == 0 and success_count > 0:
-        messages.success(request, message)
-        return JsonResponse({
-            'success': True, 
-            'message': message,
-            'details': activation_messages,
-            'success_count': success_count,
-            'failure_count': failure_count
-        })
-    elif success_count > 0:
-        messages.warning(request, message)
-        return JsonResponse({
-            'success': True, 
-            'message': message,
-            'details': activation_messages,
-            'success_count': success_count,
-            'failure_count': failure_count
-        })
-    else:
-        messages.error(request, message)
-        return JsonResponse({
-            'success': False, 
-            'message': message,
-            'details': activation_messages,
-            'success_count': success_count,
-            'failure_count': failure_count
-        }, status=400)
+    bundle_date = get_object_or_404(BundleDate.alive, pk=bundle_date_id)
+    return _enqueue_job_response(request, BackgroundJob.KIND_ACTIVATE_BUNDLE_DATE, bundle_date.id)
 
 
 @login_required
 def send_calendar_invite_view(request, webinar_date_id):
-    """Send calendar invite for a webinar date."""
+    """Queue a background job sending the calendar invite for a webinar date."""
     if request.method != 'POST':
         return JsonResponse({'success': False, 'message': 'Invalid request method'}, status=405)
     
-    webinar_date = get_object_or_404(WebinarDate, pk=webinar_date_id, deleted_at=None)
+    webinar_date = get_object_or_404(WebinarDate.alive, pk=webinar_date_id)
+    return _enqueue_job_response(request, BackgroundJob.KIND_SEND_CALENDAR_INVITE, webinar_date.id)
+
+
+@login_required
+def send_pending_calendar_invites_view(request):
+    """Queue a background job sending calendar invites for every upcoming webinar date that doesn't have one yet."""
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'message': 'Invalid request method'}, status=405)
     
-    try:
-        # Import and use MS365 service
-        from .ms365_service import MS365CalendarService
-        ms365_service = MS365CalendarService()
-        
-        # Send calendar invite
-        success, message = ms365_service.send_manual_calendar_invite(webinar_date)
-        
-        if success:
-            messages.success(request, message)
-            return JsonResponse({'success': True, 'message': message})
-        else:
-            messages.error(request, message)
-            return JsonResponse({'success': False, 'message': message}, status=400)
-            
-    except Exception as e:
-        error_msg = f"Error sending calendar invite: {str(e)}"
-        messages.error(request, error_msg)
-        return JsonResponse({'success': False, 'message': error_msg}, status=500)
+    # The job works out the pending dates when it starts; there is no single object it acts on
+    return _enqueue_job_response(request, BackgroundJob.KIND_SEND_PENDING_CALENDAR_INVITES, 0)
 
 
 # Webhook Log Views
 @login_required
+@replica_reads
 def webhook_log_list(request):
     """List all webhook logs with pagination."""
     from .models import WebhookLog
     from django.core.paginator import Paginator
     
-    webhook_logs = WebhookLog.objects.all()
+    # The body preview reads through the payload blob
+    webhook_logs = WebhookLog.objects.select_related('body_blob')
     
     # Filter by success/failure if requested
     status_filter = request.GET.get('status')
@@ -1235,17 +1291,17 @@ def sync_attendee_salesforce(request, attendee_id):
     
     # Check regular attendees first
     try:
-        attendee = Attendee.objects.get(pk=attendee_id, deleted_at=None)
+        attendee = Attendee.alive.get(pk=attendee_id)
         attendee_type = "Attendee"
     except Attendee.DoesNotExist:
         # Try on-demand attendees
         try:
-            attendee = OnDemandAttendee.objects.get(pk=attendee_id, deleted_at=None)
+            attendee = OnDemandAttendee.alive.get(pk=attendee_id)
             attendee_type = "OnDemandAttendee"
         except OnDemandAttendee.DoesNotExist:
             # Try bundle attendees
             try:
-                attendee = BundleAttendee.objects.get(pk=attendee_id, deleted_at=None)
+                attendee = BundleAttendee.alive.get(pk=attendee_id)
                 attendee_type = "BundleAttendee"
             except BundleAttendee.DoesNotExist:
                 return JsonResponse({'success': False, 'message': 'Attendee not found'}, status=404)
@@ -1275,7 +1331,7 @@ def register_attendee_zoom(request, attendee_id):
     if request.method != 'POST':
         return JsonResponse({'success': False, 'message': 'Invalid request method'}, status=405)
     
-    attendee = get_object_or_404(Attendee, pk=attendee_id, deleted_at=None)
+    attendee = get_object_or_404(Attendee.alive, pk=attendee_id)
     
     # Check if webinar date has Zoom meeting ID
     if not attendee.webinar_date.zoom_meeting_id:
@@ -1341,6 +1397,7 @@ def register_attendee_zoom(request, attendee_id):
 
 # Forthcoming Webinars View
 @login_required
+@replica_reads
 def forthcoming_webinars(request):
     """Display all forthcoming webinars across the system."""
     from django.utils import timezone
@@ -1348,16 +1405,14 @@ def forthcoming_webinars(request):
     
     # Get all future webinar dates (excluding on-demand and deleted)
     current_time = timezone.now()
-    webinar_dates = WebinarDate.objects.filter(
-        deleted_at=None,
+    webinar_dates = WebinarDate.alive.filter(
         webinar__deleted_at=None,  # Also exclude dates from deleted webinars
         on_demand=False,
         date_time__gte=current_time
     ).select_related('webinar').order_by('date_time')
     
     # Get bundle dates with future webinars
-    bundle_dates = BundleDate.objects.filter(
-        deleted_at=None,
+    bundle_dates = BundleDate.alive.filter(
         bundle__deleted_at=None,  # Also exclude dates from deleted bundles
         date__gte=current_time.date()
     ).select_related('bundle').prefetch_related('webinar_dates').order_by('date')
@@ -1380,8 +1435,7 @@ def forthcoming_webinars(request):
     # Add bundle dates
     for bundle in bundle_dates:
         # Find the earliest webinar time on this date
-        webinar_dates_on_day = bundle.webinar_dates.filter(
-            deleted_at=None,
+        webinar_dates_on_day = bundle.webinar_dates.alive().filter(
             date_time__date=bundle.date
         ).order_by('date_time')
         
@@ -1400,7 +1454,7 @@ def forthcoming_webinars(request):
             'zoom_meeting_id': None,  # Bundles don't have direct Zoom IDs
             'attendee_count': bundle.attendee_count,
             'detail_url': bundle.get_absolute_url(),
-            'webinar_count': bundle.webinar_dates.filter(deleted_at=None).count()
+            'webinar_count': bundle.webinar_dates.alive().count()
         })
     
     # Sort all events by date_time
@@ -1414,11 +1468,12 @@ def forthcoming_webinars(request):
 
 # Download Views
 @login_required
+@replica_reads
 def download_list(request):
     """Display all downloads with pagination."""
     from django.core.paginator import Paginator
     
-    downloads = Download.objects.filter(deleted_at=None).order_by('-created_at')
+    downloads = Download.alive.order_by('-created_at')
     
     # Filter by form title if requested
     form_title_filter = request.GET.get('form_title')
@@ -1449,7 +1504,7 @@ def download_list(request):
 @login_required
 def download_detail(request, pk):
     """View details of a specific download."""
-    download = get_object_or_404(Download, pk=pk, deleted_at=None)
+    download = get_object_or_404(Download.alive, pk=pk)
     
     return render(request, 'webinars/download_detail.html', {
         'download': download,
@@ -1462,7 +1517,7 @@ def sync_download_salesforce(request, download_id):
     if request.method != 'POST':
         return JsonResponse({'success': False, 'message': 'Invalid request method'}, status=405)
     
-    download = get_object_or_404(Download, pk=download_id, deleted_at=None)
+    download = get_object_or_404(Download.alive, pk=download_id)
     
     try:
         from .salesforce_service import SalesforceService
@@ -1485,11 +1540,12 @@ def sync_download_salesforce(request, download_id):
 
 # Clinic Booking Views
 @login_required
+@replica_reads
 def clinic_booking_list(request):
     """Display all clinic bookings with pagination."""
     from django.core.paginator import Paginator
     
-    clinic_bookings = ClinicBooking.objects.filter(deleted_at=None).order_by('-created_at')
+    clinic_bookings = ClinicBooking.alive.order_by('-created_at')
     
     # Filter by organization if requested
     organization_filter = request.GET.get('organization')
@@ -1540,7 +1596,7 @@ def clinic_booking_list(request):
 @login_required
 def clinic_booking_detail(request, pk):
     """View details of a specific clinic booking."""
-    clinic_booking = get_object_or_404(ClinicBooking, pk=pk, deleted_at=None)
+    clinic_booking = get_object_or_404(ClinicBooking.alive, pk=pk)
     
     return render(request, 'webinars/clinic_booking_detail.html', {
         'clinic_booking': clinic_booking,
@@ -1553,7 +1609,7 @@ def sync_clinic_booking_salesforce(request, clinic_booking_id):
     if request.method != 'POST':
         return JsonResponse({'success': False, 'message': 'Invalid request method'}, status=405)
     
-    clinic_booking = get_object_or_404(ClinicBooking, pk=clinic_booking_id, deleted_at=None)
+    clinic_booking = get_object_or_404(ClinicBooking.alive, pk=clinic_booking_id)
     
     try:
         from .salesforce_service import SalesforceService
@@ -1575,6 +1631,8 @@ def sync_clinic_booking_salesforce(request, clinic_booking_id):
 
 
 @csrf_exempt
+@with_deadline(WEBHOOK_DEADLINE)
+@traced
 def clinic_booking_webhook(request):
     """Webhook endpoint for clinic booking form submissions."""
     import logging
@@ -1582,16 +1640,17 @@ def clinic_booking_webhook(request):
     from .models import WebhookLog
     
     logger = logging.getLogger("webinars")
+    payload_logger = logging.getLogger("webinars.payloads")
     start_time = time.time()
     
     # Log all inbound requests
-    logger.info(f"Clinic booking webhook request received - Method: {request.method}, Path: {request.path}")
-    logger.info(f"Headers: {dict(request.headers)}")
+    logger.info("Clinic booking webhook request received - Method: %s, Path: %s", request.method, request.path)
+    payload_logger.info("Headers: %s", dict(request.headers))
     
     # Always return 200 OK for non-POST requests (GET, HEAD, OPTIONS)
     if request.method != "POST":
         from django.http import HttpResponse
-        logger.info(f"Non-POST request ({request.method}) - returning 200 OK")
+        logger.info("Non-POST request (%s) - returning 200 OK", request.method)
         response = HttpResponse("OK", content_type="text/plain", status=200)
         
         # Save to database
@@ -1603,7 +1662,8 @@ def clinic_booking_webhook(request):
             response_status=response.status_code,
             response_body="OK",
             success=True,
-            processing_time_ms=int((time.time() - start_time) * 1000)
+            processing_time_ms=int((time.time() - start_time) * 1000),
+            timings=current_timings()
         )
         
         return response
@@ -1611,20 +1671,19 @@ def clinic_booking_webhook(request):
     if request.method == "POST":
         # Log request body
         body_unicode = request.body.decode("utf-8")
-        logger.info(f"POST body: {body_unicode}")
+        payload_logger.info("POST body: %s", body_unicode)
         
         try:
             # Try to parse JSON data from the request body
             try:
-                import json
-                if body_unicode:
-                    data = json.loads(body_unicode)
+                if request.body:
+                    data = codec.loads(request.body)
                 else:
                     data = {}
-            except json.JSONDecodeError:
+            except codec.JSONDecodeError:
                 # Fall back to form data if not valid JSON
                 data = request.POST.dict()
-                logger.info(f"Parsed as form data: {data}")
+                payload_logger.info("Parsed as form data: %s", data)
             
             # Extract fields based on expected structure
             # For now using placeholders as requested
@@ -1638,12 +1697,12 @@ def clinic_booking_webhook(request):
             
             # Validate required fields
             if not all([first_name, last_name, email, clinic_date, question]):
-                logger.warning(f"Clinic booking webhook missing required fields - first_name: \"{first_name}\", last_name: \"{last_name}\", email: \"{email}\", clinic_date: \"{clinic_date}\", question: \"{question}\"")
+                logger.warning("Clinic booking webhook missing required fields - first_name: \"%s\", last_name: \"%s\", email: \"%s\", clinic_date: \"%s\", question: \"%s\"", first_name, last_name, email, clinic_date, question)
                 response_data = {
                     "status": "error",
                     "message": "Missing required fields: first_name, last_name, email, clinic_date, question"
                 }
-                response = JsonResponse(response_data, status=400)
+                response = json_response(response_data, status=400)
                 
                 # Save to database
                 WebhookLog.objects.create(
@@ -1652,10 +1711,11 @@ def clinic_booking_webhook(request):
                     headers=dict(request.headers),
                     body=body_unicode,
                     response_status=response.status_code,
-                    response_body=json.dumps(response_data),
+                    response_body=response_text(response),
                     success=False,
                     error_message="Missing required fields",
-                    processing_time_ms=int((time.time() - start_time) * 1000)
+                    processing_time_ms=int((time.time() - start_time) * 1000),
+                    timings=current_timings()
                 )
                 
                 return response
@@ -1669,7 +1729,7 @@ def clinic_booking_webhook(request):
                 if timezone.is_naive(clinic_datetime):
                     clinic_datetime = timezone.make_aware(clinic_datetime)
             except Exception as e:
-                logger.warning(f"Could not parse clinic date \"{clinic_date}\": {e}")
+                logger.warning("Could not parse clinic date \"%s\": %s", clinic_date, e)
                 # Keep the default datetime for now
             
             # Create the clinic booking record
@@ -1684,7 +1744,7 @@ def clinic_booking_webhook(request):
                 salesforce_sync_pending=True  # Mark for Salesforce sync
             )
             
-            logger.info(f"Created clinic booking record {clinic_booking.id} for {email} - {clinic_datetime}")
+            logger.info("Created clinic booking record %s for %s - %s", clinic_booking.id, email, clinic_datetime)
             
             # Trigger Zoom meeting creation and calendar invites
             try:
@@ -1700,7 +1760,7 @@ def clinic_booking_webhook(request):
                 "message": f"Clinic booking recorded for {email}",
                 "booking_id": clinic_booking.id
             }
-            response = JsonResponse(response_data)
+            response = json_response(response_data)
             
             # Save to database
             WebhookLog.objects.create(
@@ -1709,10 +1769,11 @@ def clinic_booking_webhook(request):
                 headers=dict(request.headers),
                 body=body_unicode,
                 response_status=response.status_code,
-                response_body=json.dumps(response_data),
+                response_body=response_text(response),
                 success=True,
                 error_message="",
-                processing_time_ms=int((time.time() - start_time) * 1000)
+                processing_time_ms=int((time.time() - start_time) * 1000),
+                timings=current_timings()
             )
             
             return response
@@ -1729,7 +1790,7 @@ def clinic_booking_webhook(request):
                 "status": "error",
                 "message": str(e)
             }
-            response = JsonResponse(response_data, status=500)
+            response = json_response(response_data, status=500)
             
             # Save to database
             WebhookLog.objects.create(
@@ -1738,10 +1799,11 @@ def clinic_booking_webhook(request):
                 headers=dict(request.headers),
                 body=body_unicode,
                 response_status=response.status_code,
-                response_body=json.dumps(response_data),
+                response_body=response_text(response),
                 success=False,
                 error_message=error_message,
-                processing_time_ms=int((time.time() - start_time) * 1000)
+                processing_time_ms=int((time.time() - start_time) * 1000),
+                timings=current_timings()
             )
             
             return response
@@ -1,9 +1,22 @@
+import hashlib
+import threading
 import requests
 import jwt
 import time
 from datetime import datetime, timedelta
+from asgiref.sync import sync_to_async
 from django.conf import settings as django_settings
+from django.core.cache import cache
 from settings.models import ZoomSettings
+from . import async_http, outbound
+from .timing import timed
+
+
+# Server-to-Server OAuth tokens last an hour; stop using a cached one this many seconds early
+TOKEN_EXPIRY_MARGIN = 5 * 60
+
+# Held while fetching a token, so a worker's threads don't each fetch one when it expires
+_token_lock = threading.Lock()
 
 
 class ZoomAPIError(Exception):
@@ -11,10 +24,16 @@ class ZoomAPIError(Exception):
     pass
 
 
+class ZoomUnavailableError(ZoomAPIError):
+    """Zoom is down, slow or its circuit breaker is open; the call is worth retrying later."""
+    pass
+
+
 class ZoomService:
     """Service for interacting with Zoom API to create meetings/webinars."""
     
     BASE_URL = "https://api.zoom.us/v2"
+    TOKEN_URL = "https://zoom.us/oauth/token"
     
     def __init__(self):
         self.zoom_settings = ZoomSettings.get_settings()
@@ -42,57 +61,132 @@ class ZoomService:
         token = jwt.encode(payload, self.zoom_settings.client_secret, algorithm='HS256')
         return token
     
-    def _get_access_token(self):
-        """Get access token using Server-to-Server OAuth."""
-        try:
-            url = "https://zoom.us/oauth/token"
-            data = {
+    def _token_request_kwargs(self):
+        """Request arguments for the Server-to-Server OAuth token request."""
+        return {
+            'data': {
                 'grant_type': 'account_credentials',
                 'account_id': self.zoom_settings.account_id
-            }
-            
-            auth = (self.zoom_settings.client_id, self.zoom_settings.client_secret)
-            
-            response = requests.post(url, data=data, auth=auth)
-            response.raise_for_status()
+            },
+            'auth': (self.zoom_settings.client_id, self.zoom_settings.client_secret)
+        }
+    
+    def _token_error(self, e):
+        if outbound.is_unavailable_error(e):
+            return ZoomUnavailableError(f"Failed to get access token: {str(e)}")
+        return ZoomAPIError(f"Failed to get access token: {str(e)}")
+    
+    def _token_cache_key(self):
+        # Secrets aren't put in cache keys directly; changed credentials still get a new key
+        raw = f"{self.zoom_settings.account_id}:{self.zoom_settings.client_id}:{self.zoom_settings.client_secret}"
+        return f"zoom:access_token:{hashlib.sha256(raw.encode()).hexdigest()[:16]}"
+    
+    def _store_token(self, token_response):
+        access_token = token_response['access_token']
+        timeout = int(token_response.get('expires_in', 3600)) - TOKEN_EXPIRY_MARGIN
+        if timeout > 0:
+            cache.set(self._token_cache_key(), access_token, timeout)
+        return access_token
+    
+    def _get_access_token(self):
+        """
+        Get access token using Server-to-Server OAuth.
+        
+        The token is kept in the shared cache until shortly before it expires,
+        so every thread and worker uses the same one instead of fetching a
+        token per API call.
+        """
+        access_token = cache.get(self._token_cache_key())
+        if access_token:
+            return access_token
+        
+        with _token_lock:
+            # Another thread may have fetched one while we waited
+            access_token = cache.get(self._token_cache_key())
+            if access_token:
+                return access_token
+            try:
+                response = outbound.request(
+                    'zoom', 'POST', self.TOKEN_URL, session=outbound.get_session('zoom'), **self._token_request_kwargs()
+                )
+                response.raise_for_status()
+                
+                return self._store_token(response.json())
+            except requests.RequestException as e:
+                raise self._token_error(e)
+    
+    async def _aget_access_token(self):
+        """Async version of _get_access_token on the async HTTP client."""
+        access_token = await sync_to_async(cache.get)(self._token_cache_key())
+        if access_token:
+            return access_token
+        
+        try:
+            response = await async_http.request('zoom', 'POST', self.TOKEN_URL, **self._token_request_kwargs())
+            async_http.raise_for_status(response)
             
-            return response.json()['access_token']
+            return await sync_to_async(self._store_token)(response.json())
         except requests.RequestException as e:
-            raise ZoomAPIError(f"Failed to get access token: {str(e)}")
+            raise self._token_error(e)
+    
+    def _api_request_kwargs(self, method, access_token, data=None):
+        """Request arguments for an authenticated API request."""
+        if method.upper() not in ('POST', 'GET', 'PATCH'):
+            raise ZoomAPIError(f"Unsupported HTTP method: {method}")
+        
+        kwargs = {
+            'headers': {
+                'Authorization': f'Bearer {access_token}',
+                'Content-Type': 'application/json'
+            }
+        }
+        if method.upper() != 'GET':
+            kwargs['json'] = data
+        return kwargs
+    
+    def _api_error(self, e):
+        """Return the ZoomAPIError to raise for a failed API request."""
+        error_msg = f"Zoom API request failed: {str(e)}"
+        if outbound.is_unavailable_error(e):
+            return ZoomUnavailableError(error_msg)
+        if hasattr(e, 'response') and e.response is not None:
+            if e.response.status_code == 401:
+                # The cached token was revoked or has expired; fetch a new one next time
+                cache.delete(self._token_cache_key())
+            try:
+                error_details = e.response.json()
+                error_msg += f" - {error_details.get('message', 'Unknown error')}"
+            except:
+                error_msg += f" - HTTP {e.response.status_code}"
+        return ZoomAPIError(error_msg)
     
     def _make_api_request(self, method, endpoint, data=None):
         """Make authenticated API request to Zoom."""
         access_token = self._get_access_token()
+        kwargs = self._api_request_kwargs(method, access_token, data)
         
-        headers = {
-            'Authorization': f'Bearer {access_token}',
-            'Content-Type': 'application/json'
-        }
+        try:
+            response = outbound.request(
+                'zoom', method.upper(), f"{self.BASE_URL}{endpoint}", session=outbound.get_session('zoom'), **kwargs
+            )
+            response.raise_for_status()
+            return response.json()
         
-        url = f"{self.BASE_URL}{endpoint}"
+        except requests.RequestException as e:
+            raise self._api_error(e)
+    
+    async def _amake_api_request(self, method, endpoint, data=None):
+        """Async version of _make_api_request on the async HTTP client."""
+        access_token = await self._aget_access_token()
+        kwargs = self._api_request_kwargs(method, access_token, data)
         
         try:
-            if method.upper() == 'POST':
-                response = requests.post(url, json=data, headers=headers)
-            elif method.upper() == 'GET':
-                response = requests.get(url, headers=headers)
-            elif method.upper() == 'PATCH':
-                response = requests.patch(url, json=data, headers=headers)
-            else:
-                raise ZoomAPIError(f"Unsupported HTTP method: {method}")
-            
-            response.raise_for_status()
+            response = await async_http.request('zoom', method.upper(), f"{self.BASE_URL}{endpoint}", **kwargs)
+            async_http.raise_for_status(response)
             return response.json()
         
         except requests.RequestException as e:
-            error_msg = f"Zoom API request failed: {str(e)}"
-            if hasattr(e, 'response') and e.response is not None:
-                try:
-                    error_details = e.response.json()
-                    error_msg += f" - {error_details.get('message', 'Unknown error')}"
-                except:
-                    error_msg += f" - HTTP {e.response.status_code}"
-            raise ZoomAPIError(error_msg)
+            raise self._api_error(e)
     
     def create_webinar(self, webinar_date):
         """
@@ -152,6 +246,7 @@ class ZoomService:
             'zoom_response': webinar_response
         }
     
+    @timed('zoom')
     def register_attendee(self, webinar_id, first_name, last_name, email):
         """
         Register an attendee for a Zoom webinar.
@@ -174,19 +269,88 @@ class ZoomService:
         endpoint = f"/webinars/{webinar_id}/registrants"
         try:
             response = self._make_api_request('POST', endpoint, registrant_data)
+            return self._registration_result(response)
+        except ZoomAPIError as e:
+            return self._registration_error(e)
+    
+    @timed('zoom')
+    async def aregister_attendee(self, webinar_id, first_name, last_name, email):
+        """Async version of register_attendee on the async HTTP client."""
+        registrant_data = {
+            "first_name": first_name,
+            "last_name": last_name,
+            "email": email
+        }
+        
+        endpoint = f"/webinars/{webinar_id}/registrants"
+        try:
+            response = await self._amake_api_request('POST', endpoint, registrant_data)
+            return self._registration_result(response)
+        except ZoomAPIError as e:
+            return self._registration_error(e)
+    
+    def _registration_result(self, response):
+        return {
+            'success': True,
+            'registrant_id': response.get('registrant_id'),
+            'join_url': response.get('join_url'),
+            'invite_link': response.get('registrant_url', response.get('join_url', '')),
+            'zoom_response': response
+        }
+    
+    def _registration_error(self, e):
+        return {
+            'success': False,
+            'error': str(e),
+            'retryable': isinstance(e, ZoomUnavailableError)
+        }
+    
+    @timed('zoom')
+    def batch_register_attendees(self, webinar_id, registrants):
+        """
+        Register up to 30 attendees for a Zoom webinar in a single request.
+        
+        Args:
+            webinar_id: Zoom webinar ID
+            registrants: list of dicts with first_name, last_name and email
+        
+        Returns:
+            dict: success flag and a mapping of lowercased email to registrant data
+        """
+        batch_data = {
+            "auto_approve": True,
+            "registrants": [
+                {
+                    "first_name": registrant['first_name'],
+                    "last_name": registrant['last_name'],
+                    "email": registrant['email']
+                }
+                for registrant in registrants
+            ]
+        }
+        
+        endpoint = f"/webinars/{webinar_id}/batch_registrants"
+        try:
+            response = self._make_api_request('POST', endpoint, batch_data)
+            registered = {}
+            for registrant in response.get('registrants', []):
+                registered[registrant.get('email', '').lower()] = {
+                    'registrant_id': registrant.get('registrant_id'),
+                    'join_url': registrant.get('join_url'),
+                    'invite_link': registrant.get('join_url', '')
+                }
             return {
                 'success': True,
-                'registrant_id': response.get('registrant_id'),
-                'join_url': response.get('join_url'),
-                'invite_link': response.get('registrant_url', response.get('join_url', '')),
-                'zoom_response': response
+                'registrants': registered
             }
         except ZoomAPIError as e:
             return {
                 'success': False,
-                'error': str(e)
+                'error': str(e),
+                'retryable': isinstance(e, ZoomUnavailableError)
             }
     
+    @timed('zoom')
     def create_meeting(self, topic, start_time, duration=30, agenda="", attendee_email=None, attendee_name=None):
         """
         Create a Zoom meeting for clinic sessions.
@@ -202,8 +366,40 @@ class ZoomService:
         Returns:
             dict: Meeting data including meeting_id, join_url, etc.
         """
-        # Prepare meeting data
-        meeting_data = {
+        meeting_data = self._meeting_data(topic, start_time, duration, agenda)
+        
+        try:
+            # Use 'me' to get the current authenticated user
+            user_response = self._make_api_request('GET', '/users/me')
+            user_id = user_response['id']
+            
+            # Create the meeting
+            endpoint = f"/users/{user_id}/meetings"
+            meeting_response = self._make_api_request('POST', endpoint, meeting_data)
+            
+            return self._meeting_result(meeting_response)
+        
+        except ZoomAPIError as e:
+            return self._meeting_error(e)
+    
+    @timed('zoom')
+    async def acreate_meeting(self, topic, start_time, duration=30, agenda="", attendee_email=None, attendee_name=None):
+        """Async version of create_meeting on the async HTTP client."""
+        meeting_data = self._meeting_data(topic, start_time, duration, agenda)
+        
+        try:
+            user_response = await self._amake_api_request('GET', '/users/me')
+            endpoint = f"/users/{user_response['id']}/meetings"
+            meeting_response = await self._amake_api_request('POST', endpoint, meeting_data)
+            
+            return self._meeting_result(meeting_response)
+        
+        except ZoomAPIError as e:
+            return self._meeting_error(e)
+    
+    def _meeting_data(self, topic, start_time, duration, agenda):
+        """Build the request body for a clinic meeting."""
+        return {
             "topic": topic,
             "type": 2,  # Scheduled meeting
             "start_time": start_time.strftime("%Y-%m-%dT%H:%M:%S"),
@@ -227,32 +423,25 @@ class ZoomService:
                 "allow_multiple_devices": True
             }
         }
-        
-        try:
-            # Use 'me' to get the current authenticated user
-            user_response = self._make_api_request('GET', '/users/me')
-            user_id = user_response['id']
-            
-            # Create the meeting
-            endpoint = f"/users/{user_id}/meetings"
-            meeting_response = self._make_api_request('POST', endpoint, meeting_data)
-            
-            return {
-                'success': True,
-                'meeting_id': str(meeting_response['id']),
-                'join_url': meeting_response['join_url'],
-                'start_url': meeting_response['start_url'],
-                'password': meeting_response.get('password', ''),
-                'zoom_response': meeting_response
-            }
-            
-        except ZoomAPIError as e:
-            return {
-                'success': False,
-                'error': str(e),
-                'meeting_id': None,
-                'join_url': None
-            }
+    
+    def _meeting_result(self, meeting_response):
+        return {
+            'success': True,
+            'meeting_id': str(meeting_response['id']),
+            'join_url': meeting_response['join_url'],
+            'start_url': meeting_response['start_url'],
+            'password': meeting_response.get('password', ''),
+            'zoom_response': meeting_response
+        }
+    
+    def _meeting_error(self, e):
+        return {
+            'success': False,
+            'error': str(e),
+            'retryable': isinstance(e, ZoomUnavailableError),
+            'meeting_id': None,
+            'join_url': None
+        }
     
     def test_connection(self):
         """Test the Zoom API connection and return account info."""